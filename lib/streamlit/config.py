@@ -596,6 +596,46 @@ _create_option(
     type_=bool,
 )
 
+_create_option(
+    "runner.bytecodeCacheDir",
+    description="""
+        Directory in which the compiled bytecode of the app's scripts is
+        persisted, so that restarted Streamlit processes (or other processes
+        on this host that use the same directory) don't need to compile the
+        scripts again. If empty, compiled bytecode is only cached in memory.
+    """,
+    visibility="hidden",
+    default_val="",
+    type_=str,
+)
+
+_create_option(
+    "runner.profileScriptRuns",
+    description="""
+        Record a profile of every script run, with the wall time of each
+        command, the cache hits and misses of each cached function, the size
+        of each delta and the time spent deserializing widget values. The
+        profiles of the most recent script runs are served to local clients
+        at `/_stcore/profile`. This slows down script runs and should only
+        be used in development.
+    """,
+    visibility="hidden",
+    default_val=False,
+    type_=bool,
+)
+
+_create_option(
+    "runner.profileTraceDir",
+    description="""
+        Directory to which the profile of every script run is written as a
+        Chrome trace-event JSON file, if `runner.profileScriptRuns` is set.
+        If empty, profiles are only kept in memory.
+    """,
+    visibility="hidden",
+    default_val="",
+    type_=str,
+)
+
 _create_option(
     "runner.enforceSerializableSessionState",
     description="""
@@ -695,6 +735,33 @@ _create_option(
     type_=bool,
 )
 
+_create_option(
+    "server.rerunOnlyDependentPages",
+    description="""
+        When a module of the app changes, only rerun (or notify) the sessions
+        whose current page may have imported the module. The modules a page
+        may depend on are tracked across its runs. If false, all sessions
+        are rerun when any watched module changes.
+    """,
+    visibility="hidden",
+    default_val=True,
+    type_=bool,
+)
+
+_create_option(
+    "server.scheduleFragmentRuns",
+    description="""
+        Schedule the runs of fragments with `run_every` on the server instead
+        of in the browser. Runs of a fragment are skipped while the session is
+        disconnected or a script run is still in progress, and the runs of
+        fragments with the same interval are aligned across sessions so their
+        cached functions are only computed once per interval.
+    """,
+    visibility="hidden",
+    default_val=False,
+    type_=bool,
+)
+
 _create_option(
     "server.allowRunOnSave",
     description="""
@@ -790,6 +857,56 @@ _create_option(
     type_=int,
 )
 
+_create_option(
+    "server.streamUploadsToDisk",
+    description="""
+        Stream files uploaded with the file_uploader to a temporary directory,
+        and memory-map them instead of keeping them in memory.
+    """,
+    visibility="hidden",
+    default_val=False,
+    type_=bool,
+)
+
+_create_option(
+    "server.maxTotalUploadSize",
+    description="""
+        Max total size, in megabytes, of the uploaded files of all sessions,
+        including uploads in progress. Uploads that exceed it are rejected
+        while they're streamed. Only applies if server.streamUploadsToDisk is
+        true. If 0, there's no limit.
+    """,
+    visibility="hidden",
+    default_val=0,
+    type_=int,
+)
+
+_create_option(
+    "server.maxSessionUploadSize",
+    description="""
+        Max total size, in megabytes, of the uploaded files of a single
+        session, including uploads in progress. Uploads that exceed it are
+        rejected while they're streamed. Only applies if
+        server.streamUploadsToDisk is true. If 0, there's no limit.
+    """,
+    visibility="hidden",
+    default_val=0,
+    type_=int,
+)
+
+_create_option(
+    "server.mediaFileMemoryBudget",
+    description="""
+        Max total size, in megabytes, of the media and download files (e.g. of
+        st.image, st.video and st.download_button) kept in memory. When it's
+        exceeded, the least recently used files are moved to a temporary
+        directory and served from disk. If 0, all files are kept in memory.
+    """,
+    visibility="hidden",
+    default_val=0,
+    type_=int,
+)
+
 _create_option(
     "server.maxMessageSize",
     description="""
@@ -800,6 +917,147 @@ _create_option(
     type_=int,
 )
 
+_create_option(
+    "server.messageCacheMaxBytes",
+    description="""
+        Max size, in bytes, of the ForwardMsgs kept in the server's message
+        cache. When the cache grows beyond this size, the least recently used
+        messages are evicted. A value of 0 disables the limit.
+    """,
+    visibility="hidden",
+    default_val=0,
+    type_=int,
+)
+
+_create_option(
+    "server.forwardMsgBatchSize",
+    description="""
+        Max number of ForwardMsgs sent to a single session before the server
+        yields to other sessions. Larger values reduce event loop overhead for
+        scripts that emit many deltas; smaller values improve fairness between
+        sessions.
+    """,
+    visibility="hidden",
+    default_val=64,
+    type_=int,
+)
+
+_create_option(
+    "server.forwardMsgFlushInterval",
+    description="""
+        Time, in seconds, the server waits between two passes over the session
+        message queues. This bounds the latency added to outgoing ForwardMsgs
+        in exchange for larger batches.
+    """,
+    visibility="hidden",
+    default_val=0.01,
+    type_=float,
+)
+
+_create_option(
+    "server.dataframePageSize",
+    description="""
+        Number of rows above which `st.dataframe` keeps the table on the server
+        and only sends the first page of this many rows to the browser. The
+        remaining rows are requested by the frontend on demand. Only takes
+        effect for clients that declare support for requesting rows
+        (ContextInfo.supports_dataframe_sources), other clients are always
+        sent the full table. A value of 0 always sends the full table.
+    """,
+    visibility="hidden",
+    default_val=0,
+    type_=int,
+)
+
+_create_option(
+    "server.cacheDataDiskIndex",
+    description="""
+        Keep an index of the files persisted by `@st.cache_data(persist="disk")`.
+        With the index, persisted entries respect the `ttl` and `max_entries`
+        of their function, and the total size of the cache directory can be
+        limited with `server.cacheDataDiskMaxSize`.
+    """,
+    visibility="hidden",
+    default_val=False,
+    type_=bool,
+)
+
+_create_option(
+    "server.cacheDataDiskMaxSize",
+    description="""
+        Maximum total size in bytes of the files persisted by
+        `@st.cache_data(persist="disk")`, or of the values shared through
+        `server.cacheDataSharedPath`. When exceeded, the least recently used
+        entries are removed. Only used if `server.cacheDataDiskIndex` is
+        enabled or `server.cacheDataSharedPath` is set. A value of 0 disables
+        the limit.
+    """,
+    visibility="hidden",
+    default_val=0,
+    type_=int,
+)
+
+_create_option(
+    "server.cacheDataSharedPath",
+    description="""
+        Directory in which `@st.cache_data` values are shared by all Streamlit
+        processes on this host that use the same directory. Only one process
+        computes a missing value, and the others read it from the directory.
+        Using a memory-backed directory (e.g. `/dev/shm` on Linux) is
+        recommended. If empty, values are not shared between processes.
+    """,
+    visibility="hidden",
+    default_val="",
+    type_=str,
+)
+
+_create_option(
+    "server.cacheHashingMode",
+    description="""
+        How `@st.cache_data` and `@st.cache_resource` hash large dataframes and
+        arrays passed to cached functions.
+
+        - "strict"      : Hash all values.
+        - "approximate" : Hash only a sample of the rows of large dataframes
+                          and of the values of large arrays. This is faster,
+                          but values that only differ outside of the sample
+                          get the same cache key.
+    """,
+    visibility="hidden",
+    default_val="strict",
+    type_=str,
+)
+
+_create_option(
+    "server.cacheHashMemoizeMutable",
+    description="""
+        Within a script run, the hashes of Arrow tables and read-only numpy
+        arrays passed to `@st.cache_data` and `@st.cache_resource` functions
+        are computed once and reused. If true, the hashes of Pandas and Polars
+        dataframes and writeable numpy arrays are reused as well, as long as
+        their shape, dtypes, and index are unchanged. Only enable this if
+        these values are not changed in place during a script run.
+    """,
+    visibility="hidden",
+    default_val=False,
+    type_=bool,
+)
+
+_create_option(
+    "server.cachePrewarm",
+    description="""
+        If true, the server prewarms the caches of the app's
+        `@st.cache_data` and `@st.cache_resource` functions when it starts.
+        The app's script is run once, and the cached functions are called with
+        the argument sets declared with their `prewarm` parameter. The health
+        check endpoint reports that the server isn't ready until prewarming
+        has completed.
+    """,
+    visibility="hidden",
+    default_val=False,
+    type_=bool,
+)
+
 _create_option(
     "server.enableArrowTruncation",
     description="""
@@ -19,7 +19,6 @@ from __future__ import annotations
 import contextlib
 import dataclasses
 import inspect
-import math
 import re
 from collections import ChainMap, UserDict, UserList, deque
 from collections.abc import ItemsView, Iterable, Mapping, Sequence
@@ -54,6 +53,7 @@ from streamlit.type_util import (
 
 if TYPE_CHECKING:
     import numpy as np
+    import numpy.typing as npt
     import pyarrow as pa
     from pandas import DataFrame, Index, Series
     from pandas.core.indexing import _iLocIndexer
@@ -772,27 +772,27 @@ def convert_arrow_table_to_arrow_bytes(table: pa.Table) -> bytes:
     bytes
         The serialized Arrow IPC bytes.
     """
-    try:
-        table = _maybe_truncate_table(table)
-    except RecursionError as err:
-        # This is a very unlikely edge case, but we want to make sure that
-        # it doesn't lead to unexpected behavior.
-        # If there is a recursion error, we just return the table as-is
-        # which will lead to the normal message limit exceed error.
-        _LOGGER.warning(
-            "Recursion error while truncating Arrow table. This is not "
-            "supposed to happen.",
-            exc_info=err,
-        )
+    table = _maybe_truncate_table(table)
 
     import pyarrow as pa
 
-    # Convert table to bytes
-    sink = pa.BufferOutputStream()
-    writer = pa.RecordBatchStreamWriter(sink, table.schema)
-    writer.write_table(table)
-    writer.close()
-    return cast(bytes, sink.getvalue().to_pybytes())
+    # Compute the exact size of the serialized stream first. This is cheap
+    # since the mock stream doesn't copy any data, and it lets us write the
+    # stream into a single preallocated buffer instead of a growing
+    # BufferOutputStream, which reallocates and copies the data every time
+    # it runs out of capacity (and can end up ~2x larger than needed).
+    mock_sink = pa.MockOutputStream()
+    with pa.RecordBatchStreamWriter(mock_sink, table.schema) as writer:
+        writer.write_table(table)
+
+    buffer = pa.allocate_buffer(mock_sink.size())
+    with pa.RecordBatchStreamWriter(
+        pa.FixedSizeBufferWriter(buffer), table.schema
+    ) as writer:
+        writer.write_table(table)
+
+    # Protobuf bytes fields only accept `bytes`, so we need a single copy here.
+    return cast(bytes, buffer.to_pybytes())
 
 
 def convert_pandas_df_to_arrow_bytes(df: DataFrame) -> bytes:
@@ -808,10 +808,29 @@ def convert_pandas_df_to_arrow_bytes(df: DataFrame) -> bytes:
     bytes
         The serialized Arrow IPC bytes.
     """
+    return convert_arrow_table_to_arrow_bytes(convert_pandas_df_to_arrow_table(df))
+
+
+def convert_pandas_df_to_arrow_table(df: DataFrame) -> pa.Table:
+    """Convert pandas.DataFrame to pyarrow.Table.
+
+    If the dataframe contains Arrow-incompatible column types, they are
+    automatically fixed before the conversion.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        A dataframe to convert.
+
+    Returns
+    -------
+    pyarrow.Table
+        The converted Arrow table.
+    """
     import pyarrow as pa
 
     try:
-        table = pa.Table.from_pandas(df)
+        return pa.Table.from_pandas(df)
     except (pa.ArrowTypeError, pa.ArrowInvalid, pa.ArrowNotImplementedError) as ex:
         _LOGGER.info(
             "Serialization of dataframe to Arrow table was unsuccessful. "
@@ -820,8 +839,88 @@ def convert_pandas_df_to_arrow_bytes(df: DataFrame) -> bytes:
             exc_info=ex,
         )
         df = fix_arrow_incompatible_column_types(df)
-        table = pa.Table.from_pandas(df)
-    return convert_arrow_table_to_arrow_bytes(table)
+        return pa.Table.from_pandas(df)
+
+
+def query_arrow_table(
+    table: pa.Table,
+    start: int = 0,
+    stop: int | None = None,
+    sort_column: str | None = None,
+    ascending: bool = True,
+    filters: Mapping[str, str] | None = None,
+) -> tuple[pa.Table, int]:
+    """Select a range of rows from a pyarrow.Table.
+
+    This is used to answer row-range requests for dataframes that are served
+    from a server-side data source. Filters are applied first, then the
+    sorting, and finally the row range is selected.
+
+    Parameters
+    ----------
+    table : pyarrow.Table
+        The table to query.
+
+    start : int
+        The index of the first row to return (after filtering and sorting).
+
+    stop : int or None
+        The index after the last row to return. If None, all rows
+        starting at ``start`` are returned.
+
+    sort_column : str or None
+        The name of the column to sort by. If None, the original row order
+        is kept.
+
+    ascending : bool
+        Whether to sort in ascending or descending order.
+
+    filters : Mapping[str, str] or None
+        A mapping of column names to substrings. Only rows where the string
+        representation of every given column contains the given substring are
+        returned.
+
+    Returns
+    -------
+    tuple[pyarrow.Table, int]
+        The selected rows and the total number of rows that matched the
+        filters.
+
+    Raises
+    ------
+    KeyError
+        If a column used for sorting or filtering doesn't exist.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    for column_name in [sort_column, *(filters or {})]:
+        if column_name is not None and column_name not in table.column_names:
+            raise KeyError(column_name)
+
+    if filters:
+        mask = None
+        for column_name, value in filters.items():
+            column_mask = pc.match_substring(
+                pc.cast(table.column(column_name), pa.string()), value
+            )
+            mask = column_mask if mask is None else pc.and_(mask, column_mask)
+        table = table.filter(pc.fill_null(mask, False))
+
+    num_rows = table.num_rows
+    start = min(max(start, 0), num_rows)
+    stop = num_rows if stop is None else min(max(stop, start), num_rows)
+
+    if sort_column is not None:
+        # Only materialize the requested range instead of sorting the whole
+        # table, since the sort indices are much cheaper than the data itself.
+        indices = pc.sort_indices(
+            table,
+            sort_keys=[(sort_column, "ascending" if ascending else "descending")],
+        )
+        return table.take(indices.slice(start, stop - start)), num_rows
+
+    return table.slice(start, stop - start), num_rows
 
 
 def convert_arrow_bytes_to_pandas_df(source: bytes) -> DataFrame:
@@ -950,79 +1049,132 @@ def convert_anything_to_list(obj: OptionSequence[V_co]) -> list[V_co]:
         return [obj]  # type: ignore
 
 
-def _maybe_truncate_table(
-    table: pa.Table, truncated_rows: int | None = None
-) -> pa.Table:
+def _get_cumulative_row_byte_sizes(table: pa.Table) -> npt.NDArray[np.float64]:
+    """Estimate the Arrow size in bytes of every prefix of a table.
+
+    The returned array contains at position ``i`` the estimated ``nbytes`` of
+    ``table.slice(0, i + 1)``. The estimate is based on the buffer layout of
+    the column types: fixed-width columns contribute a constant number of
+    bytes per row, variable-width columns (strings and binaries) contribute
+    the actual length of each value, and the dictionaries of dictionary
+    encoded columns are counted once. For all other column types, the
+    column's bytes are assumed to be evenly distributed across its rows.
+
+    Parameters
+    ----------
+    table : pyarrow.Table
+        The table to estimate the row sizes for. Must not be empty.
+
+    Returns
+    -------
+    numpy.ndarray
+        The monotonically increasing, cumulative byte sizes of the table rows.
+    """
+    import numpy as np
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    num_rows = table.num_rows
+    # Bytes that are independent of the number of rows:
+    shared_bytes = 0.0
+    # Bytes that every row adds:
+    bytes_per_row = 0.0
+    # Bytes that differ from row to row:
+    variable_row_bytes = np.zeros(num_rows, dtype=np.float64)
+
+    for column in table.columns:
+        column_type = column.type
+
+        if column.null_count > 0:
+            # Validity bitmap:
+            bytes_per_row += 1 / 8
+
+        if pa.types.is_dictionary(column_type):
+            bytes_per_row += column_type.index_type.bit_width / 8
+            shared_bytes += max(
+                (chunk.dictionary.nbytes for chunk in column.chunks), default=0
+            )
+        elif pa.types.is_string(column_type) or pa.types.is_binary(column_type):
+            # 32-bit offsets + the actual data:
+            bytes_per_row += 4
+            variable_row_bytes += (
+                pc.binary_length(column).fill_null(0).to_numpy(zero_copy_only=False)
+            )
+        elif pa.types.is_large_string(column_type) or pa.types.is_large_binary(
+            column_type
+        ):
+            # 64-bit offsets + the actual data:
+            bytes_per_row += 8
+            variable_row_bytes += (
+                pc.binary_length(column).fill_null(0).to_numpy(zero_copy_only=False)
+            )
+        else:
+            try:
+                bytes_per_row += column_type.bit_width / 8
+            except ValueError:
+                # Not a fixed-width type (e.g. nested types):
+                bytes_per_row += column.nbytes / num_rows
+
+    cumulative_row_bytes = np.cumsum(variable_row_bytes)
+    cumulative_row_bytes += np.arange(1, num_rows + 1) * bytes_per_row
+    cumulative_row_bytes += shared_bytes
+    return cumulative_row_bytes
+
+
+def _maybe_truncate_table(table: pa.Table) -> pa.Table:
     """Experimental feature to automatically truncate tables that
     are larger than the maximum allowed message size. It needs to be enabled
     via the server.enableArrowTruncation config option.
 
+    The row cut-off is computed in a single pass: the byte sizes of all
+    table prefixes are estimated from the column buffers, and the number
+    of rows that still fit into the message is found via binary search.
+
     Parameters
     ----------
     table : pyarrow.Table
         A table to truncate.
 
-    truncated_rows : int or None
-        The number of rows that have been truncated so far. This is used by
-        the recursion logic to keep track of the total number of truncated
-        rows.
-
     """
 
-    if config.get_option("server.enableArrowTruncation"):
-        # This is an optimization problem: We don't know at what row
-        # the perfect cut-off is to comply with the max size. But we want to figure
-        # it out in as few iterations as possible. We almost always will cut out
-        # more than required to keep the iterations low.
-
-        # The maximum size allowed for protobuf messages in bytes:
-        max_message_size = int(config.get_option("server.maxMessageSize") * 1e6)
-        # We add 1 MB for other overhead related to the protobuf message.
-        # This is a very conservative estimate, but it should be good enough.
-        table_size = int(table.nbytes + 1 * 1e6)
-        table_rows = table.num_rows
-
-        if table_rows > 1 and table_size > max_message_size:
-            # targeted rows == the number of rows the table should be truncated to.
-            # Calculate an approximation of how many rows we need to truncate to.
-            targeted_rows = math.ceil(table_rows * (max_message_size / table_size))
-            # Make sure to cut out at least a couple of rows to avoid running
-            # this logic too often since it is quite inefficient and could lead
-            # to infinity recursions without these precautions.
-            targeted_rows = math.floor(
-                max(
-                    min(
-                        # Cut out:
-                        # an additional 5% of the estimated num rows to cut out:
-                        targeted_rows - math.floor((table_rows - targeted_rows) * 0.05),
-                        # at least 1% of table size:
-                        table_rows - (table_rows * 0.01),
-                        # at least 5 rows:
-                        table_rows - 5,
-                    ),
-                    1,  # but it should always have at least 1 row
-                )
-            )
-            sliced_table = table.slice(0, targeted_rows)
-            return _maybe_truncate_table(
-                sliced_table, (truncated_rows or 0) + (table_rows - targeted_rows)
-            )
+    if not config.get_option("server.enableArrowTruncation"):
+        return table
 
-        if truncated_rows:
-            displayed_rows = string_util.simplify_number(table.num_rows)
-            total_rows = string_util.simplify_number(table.num_rows + truncated_rows)
+    import numpy as np
 
-            if displayed_rows == total_rows:
-                # If the simplified numbers are the same,
-                # we just display the exact numbers.
-                displayed_rows = str(table.num_rows)
-                total_rows = str(table.num_rows + truncated_rows)
-            _show_data_information(
-                f"⚠️ Showing {displayed_rows} out of {total_rows} "
-                "rows due to data size limitations."
-            )
+    # The maximum size allowed for protobuf messages in bytes:
+    max_message_size = int(config.get_option("server.maxMessageSize") * 1e6)
+    # We subtract 1 MB for other overhead related to the protobuf message.
+    # This is a very conservative estimate, but it should be good enough.
+    max_table_size = max_message_size - int(1e6)
+    table_rows = table.num_rows
+
+    if table_rows <= 1 or table.nbytes <= max_table_size:
+        return table
+
+    cumulative_row_bytes = _get_cumulative_row_byte_sizes(table)
+    # The number of rows whose cumulative size still fits into the limit,
+    # but it should always have at least 1 row:
+    targeted_rows = max(
+        int(np.searchsorted(cumulative_row_bytes, max_table_size, side="right")), 1
+    )
+    if targeted_rows >= table_rows:
+        return table
+
+    displayed_rows = string_util.simplify_number(targeted_rows)
+    total_rows = string_util.simplify_number(table_rows)
+
+    if displayed_rows == total_rows:
+        # If the simplified numbers are the same,
+        # we just display the exact numbers.
+        displayed_rows = str(targeted_rows)
+        total_rows = str(table_rows)
+    _show_data_information(
+        f"⚠️ Showing {displayed_rows} out of {total_rows} "
+        "rows due to data size limitations."
+    )
 
-    return table
+    return table.slice(0, targeted_rows)
 
 
 def is_colum_type_arrow_incompatible(column: Series[Any] | Index) -> bool:
@@ -28,7 +28,7 @@ from typing import (
 
 from typing_extensions import TypeAlias
 
-from streamlit import dataframe_util
+from streamlit import config, dataframe_util, runtime
 from streamlit.elements.lib.column_config_utils import (
     INDEX_IDENTIFIER,
     ColumnConfigMappingInput,
@@ -583,7 +583,7 @@ class ArrowMixin:
 
         if isinstance(data, pa.Table):
             # For pyarrow tables, we can just serialize the table directly
-            proto.data = dataframe_util.convert_arrow_table_to_arrow_bytes(data)
+            table = data
         else:
             # For all other data formats, we need to convert them to a pandas.DataFrame
             # thereby, we also apply some data specific configs
@@ -604,8 +604,29 @@ class ArrowMixin:
                 data, ensure_copy=False
             )
             apply_data_specific_configs(column_config_mapping, data_format)
-            # Serialize the data to bytes:
-            proto.data = dataframe_util.convert_pandas_df_to_arrow_bytes(data_df)
+            table = dataframe_util.convert_pandas_df_to_arrow_table(data_df)
+
+        page_size = config.get_option("server.dataframePageSize")
+        if (
+            page_size > 0
+            and table.num_rows > page_size
+            # The styler's display values are computed for the full table:
+            and not dataframe_util.is_pandas_styler(data)
+            and runtime.exists()
+            # Clients that don't request the other rows would only show the
+            # first page:
+            and _client_supports_dataframe_sources()
+        ):
+            # Keep the full table on the server and only send the first page.
+            # The frontend requests all other rows from the data source.
+            proto.data_source_url = runtime.get_instance().dataframe_source_mgr.add(
+                table, self.dg._get_delta_path_str()
+            )
+            proto.data_source_num_rows = table.num_rows
+            table = table.slice(0, page_size)
+
+        # Serialize the data to bytes:
+        proto.data = dataframe_util.convert_arrow_table_to_arrow_bytes(table)
 
         if hide_index is not None:
             update_column_config(
@@ -960,3 +981,15 @@ def marshall(proto: ArrowProto, data: Data, default_uuid: str | None = None) ->
         marshall_styler(proto, data, default_uuid)
 
     proto.data = dataframe_util.convert_anything_to_arrow_bytes(data)
+
+
+def _client_supports_dataframe_sources() -> bool:
+    """True if the client of the current script run requests the rows of
+    dataframes that are kept on the server.
+    """
+    ctx = get_script_run_ctx()
+    return (
+        ctx is not None
+        and ctx.context_info is not None
+        and ctx.context_info.supports_dataframe_sources
+    )
@@ -19,6 +19,7 @@ from datetime import date, datetime, time, timedelta
 from typing import (
     TYPE_CHECKING,
     Any,
+    Final,
     Literal,
     Union,
     overload,
@@ -147,6 +148,13 @@ def _register_element_id(
         raise StreamlitDuplicateElementId(element_type)
 
 
+# The element ID digests of recently computed element ID inputs, shared by all
+# sessions. Only short inputs are memoized, to bound the memory use.
+_element_id_digests: dict[str, str] = {}
+_MAX_MEMOIZED_ELEMENT_IDS: Final = 10_000
+_MAX_MEMOIZED_ELEMENT_ID_INPUT_LENGTH: Final = 256
+
+
 def _compute_element_id(
     element_type: str,
     user_key: str | None = None,
@@ -163,20 +171,55 @@ def _compute_element_id(
     use it to be distinct. The element ID includes an easily identified prefix, and the
     user_key as a suffix, to make it easy to identify it and know if a key maps to it.
     """
-    h = hashlib.new("md5", usedforsecurity=False)
-    h.update(element_type.encode("utf-8"))
+    # All inputs are joined into a single string that is hashed at once,
+    # which is considerably faster than many small hash updates.
+    parts = [element_type]
     if user_key:
         # Adding this to the hash isn't necessary for uniqueness since the
         # key is also appended to the ID as raw text. But since the hash and
         # the appending of the key are two slightly different aspects, it
         # still gets put into the hash.
-        h.update(user_key.encode("utf-8"))
+        parts.append(user_key)
     # This will iterate in a consistent order when the provided arguments have
     # consistent order; dicts are always in insertion order.
     for k, v in kwargs.items():
-        h.update(str(k).encode("utf-8"))
-        h.update(str(v).encode("utf-8"))
-    return f"{GENERATED_ELEMENT_ID_PREFIX}-{h.hexdigest()}-{user_key}"
+        parts.append(k)
+        parts.append(v if type(v) is str else _element_id_value_to_str(v))
+    element_id_input = "\x00".join(parts)
+
+    # Creating a hash object is the most expensive step for typical widgets,
+    # and the same widgets compute the same IDs on every rerun.
+    digest = _element_id_digests.get(element_id_input)
+    if digest is None:
+        digest = hashlib.sha1(
+            element_id_input.encode("utf-8"), usedforsecurity=False
+        ).hexdigest()
+        if len(element_id_input) <= _MAX_MEMOIZED_ELEMENT_ID_INPUT_LENGTH:
+            if len(_element_id_digests) >= _MAX_MEMOIZED_ELEMENT_IDS:
+                _element_id_digests.clear()
+            _element_id_digests[element_id_input] = digest
+    return f"{GENERATED_ELEMENT_ID_PREFIX}-{digest}-{user_key}"
+
+
+def _element_id_value_to_str(value: Any) -> str:
+    """Return the string that represents an argument in the element ID.
+
+    Sequences of strings, like the formatted options of a widget, are joined
+    instead of converted with `str()`, which escapes and quotes every option
+    and is slow for long sequences.
+    """
+    if isinstance(value, (list, tuple)):
+        try:
+            joined = "\x00".join(value)
+        except TypeError:
+            # Not all items are strings.
+            return str(value)
+        # The separators are only unambiguous if no item contains one. The
+        # leading separator distinguishes joined sequences from `str()`
+        # results, which never contain a raw NUL character.
+        if joined.count("\x00") == max(len(value) - 1, 0):
+            return f"\x00{len(value)}\x00{joined}"
+    return str(value)
 
 
 def compute_and_register_element_id(
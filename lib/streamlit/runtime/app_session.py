@@ -38,10 +38,15 @@ from streamlit.proto.NewSession_pb2 import (
     UserInfo,
 )
 from streamlit.runtime import caching
+from streamlit.runtime.forward_msg_cache import (
+    populate_hash_if_needed,
+    serialize_forward_msg_payload,
+)
 from streamlit.runtime.forward_msg_queue import ForwardMsgQueue
 from streamlit.runtime.fragment import FragmentStorage, MemoryFragmentStorage
 from streamlit.runtime.metrics_util import Installation
 from streamlit.runtime.pages_manager import PagesManager
+from streamlit.runtime.runtime_util import is_cacheable_msg
 from streamlit.runtime.scriptrunner import RerunData, ScriptRunner, ScriptRunnerEvent
 from streamlit.runtime.secrets import secrets_singleton
 from streamlit.string_util import to_snake_case
@@ -143,6 +148,15 @@ class AppSession:
         self._browser_queue = ForwardMsgQueue()
         self._message_enqueued_callback = message_enqueued_callback
 
+        # Cacheable messages are hashed when they're enqueued (usually on the
+        # script thread). We keep their serialized payloads, keyed by hash, so
+        # that the Runtime can send them without serializing them again on
+        # the eventloop thread.
+        self._serialized_payloads: dict[str, bytes] = {}
+        # The serialized payloads of the messages returned by the last call
+        # to flush_browser_queue.
+        self._flushed_serialized_payloads: dict[str, bytes] = {}
+
         self._state = AppSessionState.APP_NOT_RUNNING
 
         # Need to remember the client state here because when a script reruns
@@ -229,7 +243,25 @@ class AppSession:
             be delivered to the browser.
 
         """
-        return self._browser_queue.flush()
+        msgs = self._browser_queue.flush()
+
+        # Only keep the payloads of the flushed messages. Payloads of messages
+        # that were composed away in the queue are dropped here.
+        payloads = self._serialized_payloads
+        self._serialized_payloads = {}
+        self._flushed_serialized_payloads = {
+            msg.hash: payloads[msg.hash] for msg in msgs if msg.hash in payloads
+        }
+
+        return msgs
+
+    def get_serialized_payload(self, msg_hash: str) -> bytes | None:
+        """Return the serialized payload of a message returned by the last
+        call to flush_browser_queue, or None if it isn't available.
+
+        See `forward_msg_cache.serialize_forward_msg_payload`.
+        """
+        return self._flushed_serialized_payloads.get(msg_hash, None)
 
     def shutdown(self) -> None:
         """Shut down the AppSession.
@@ -247,6 +279,8 @@ class AppSession:
                 rt = runtime.get_instance()
                 rt.media_file_mgr.clear_session_refs(self.id)
                 rt.media_file_mgr.remove_orphaned_files()
+                rt.dataframe_source_mgr.clear_session_refs(self.id)
+                rt.dataframe_source_mgr.remove_orphaned_sources()
 
             # Shut down the ScriptRunner, if one is active.
             # self._state must not be set to SHUTDOWN_REQUESTED until
@@ -275,6 +309,15 @@ class AppSession:
         if self._debug_last_backmsg_id:
             msg.debug_last_backmsg_id = self._debug_last_backmsg_id
 
+        if msg.hash == "":
+            # Hash cacheable messages here rather than on the eventloop
+            # thread, and keep their serialized payload around for sending.
+            payload = serialize_forward_msg_payload(msg)
+            if is_cacheable_msg(msg, payload):
+                self._serialized_payloads[populate_hash_if_needed(msg, payload)] = (
+                    payload
+                )
+
         self._browser_queue.enqueue(msg)
         if self._message_enqueued_callback:
             self._message_enqueued_callback()
@@ -381,6 +424,9 @@ class AppSession:
 
             if client_state.HasField("context_info"):
                 self._client_state.context_info.CopyFrom(client_state.context_info)
+            # Scheduled fragment runs are requested with the query string the
+            # browser currently shows.
+            self._client_state.query_string = client_state.query_string
 
             rerun_data = RerunData(
                 client_state.query_string,
@@ -394,6 +440,40 @@ class AppSession:
         else:
             rerun_data = RerunData()
 
+        self._request_rerun_with_data(rerun_data)
+
+    def request_scheduled_fragment_run(self, fragment_id: str) -> None:
+        """Request a run of a fragment with `run_every` that's scheduled on
+        the server (see `server.scheduleFragmentRuns`).
+
+        The run is skipped if a script run is still in progress, so that the
+        ticks of slow fragments don't pile up and a pending full app run isn't
+        turned into a fragment run. The run uses the current widget states of
+        the session.
+
+        Notes
+        -----
+        Threading: UNSAFE. Must be called on the eventloop thread.
+        """
+        if self._state != AppSessionState.APP_NOT_RUNNING:
+            return
+
+        if not self._fragment_storage.contains(fragment_id):
+            return
+
+        self._request_rerun_with_data(
+            RerunData(
+                query_string=self._client_state.query_string,
+                page_script_hash=self._client_state.page_script_hash,
+                fragment_id=fragment_id,
+                is_auto_rerun=True,
+                context_info=self._client_state.context_info
+                if self._client_state.HasField("context_info")
+                else None,
+            )
+        )
+
+    def _request_rerun_with_data(self, rerun_data: RerunData) -> None:
         if self._scriptrunner is not None:
             if (
                 bool(config.get_option("runner.fastReruns"))
@@ -458,10 +538,19 @@ class AppSession:
             None,
         )
 
+        current_page_script_hash = self._client_state.page_script_hash
         if changed_page_script_hash is not None:
-            current_page_script_hash = self._client_state.page_script_hash
             return changed_page_script_hash == current_page_script_hash
 
+        if self._local_sources_watcher is not None and config.get_option(
+            "server.rerunOnlyDependentPages"
+        ):
+            # Only rerun if the current page may have imported the changed
+            # module.
+            return self._local_sources_watcher.page_depends_on(
+                current_page_script_hash, filepath
+            )
+
         return True
 
     def _on_source_file_changed(self, filepath: str | None = None) -> None:
@@ -494,6 +583,7 @@ class AppSession:
         self._browser_queue.clear(
             retain_lifecycle_msgs=True, fragment_ids_this_run=fragment_ids_this_run
         )
+        self._serialized_payloads = {}
 
     def _on_scriptrunner_event(
         self,
@@ -605,6 +695,14 @@ class AppSession:
             if page_script_hash != self._client_state.page_script_hash:
                 self._client_state.page_script_hash = page_script_hash
 
+            if self._local_sources_watcher:
+                self._local_sources_watcher.mark_run_started()
+
+            if not fragment_ids_this_run and _is_fragment_scheduling_enabled():
+                # A full app run schedules the fragments it still contains
+                # again.
+                runtime.get_instance().fragment_scheduler.unschedule_session(self.id)
+
             self._clear_queue(fragment_ids_this_run)
 
             self._enqueue_forward_msg(
@@ -639,7 +737,10 @@ class AppSession:
                 # LocalSourcesWatcher to account for any source code changes
                 # that change which modules should be watched.
                 if self._local_sources_watcher:
-                    self._local_sources_watcher.update_watched_modules()
+                    self._local_sources_watcher.update_page_dependencies(
+                        self._client_state.page_script_hash,
+                        full_run=event == ScriptRunnerEvent.SCRIPT_STOPPED_WITH_SUCCESS,
+                    )
                     self._local_sources_watcher.update_watched_pages()
             else:
                 # The script didn't complete successfully: send the exception
@@ -661,7 +762,9 @@ class AppSession:
                 )
             )
             if self._local_sources_watcher:
-                self._local_sources_watcher.update_watched_modules()
+                self._local_sources_watcher.update_page_dependencies(
+                    self._client_state.page_script_hash, full_run=False
+                )
 
         elif event == ScriptRunnerEvent.SHUTDOWN:
             assert client_state is not None, (
@@ -672,6 +775,7 @@ class AppSession:
                 # Only clear media files if the script is done running AND the
                 # session is actually shutting down.
                 runtime.get_instance().media_file_mgr.clear_session_refs(self.id)
+                runtime.get_instance().dataframe_source_mgr.clear_session_refs(self.id)
 
             self._client_state = client_state
             self._scriptrunner = None
@@ -680,7 +784,21 @@ class AppSession:
             assert forward_msg is not None, (
                 "null forward_msg in ENQUEUE_FORWARD_MSG event"
             )
-            self._enqueue_forward_msg(forward_msg)
+            if forward_msg.HasField("page_info_changed"):
+                self._client_state.query_string = (
+                    forward_msg.page_info_changed.query_string
+                )
+
+            if forward_msg.HasField("auto_rerun") and _is_fragment_scheduling_enabled():
+                # The fragment is run by the server, the browser doesn't need
+                # to know about it.
+                runtime.get_instance().fragment_scheduler.schedule(
+                    self.id,
+                    forward_msg.auto_rerun.fragment_id,
+                    forward_msg.auto_rerun.interval,
+                )
+            else:
+                self._enqueue_forward_msg(forward_msg)
 
         # Send a message if our run state changed
         app_was_running = prev_state == AppSessionState.APP_IS_RUNNING
@@ -885,6 +1003,10 @@ class AppSession:
             page_proto.icon = page_info["icon"]
 
 
+def _is_fragment_scheduling_enabled() -> bool:
+    return bool(config.get_option("server.scheduleFragmentRuns")) and runtime.exists()
+
+
 # Config.ToolbarMode.ValueType does not exist at runtime (only in the pyi stubs), so
 # we need to use quotes.
 # This field will be available at runtime as of protobuf 3.20.1, but
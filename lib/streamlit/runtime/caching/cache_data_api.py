@@ -16,8 +16,10 @@
 
 from __future__ import annotations
 
+import contextlib
 import pickle
 import threading
+import time
 import types
 from typing import (
     TYPE_CHECKING,
@@ -37,6 +39,7 @@ import streamlit as st
 from streamlit import runtime
 from streamlit.errors import StreamlitAPIException
 from streamlit.logger import get_logger
+from streamlit.runtime.caching import cache_value_serializer
 from streamlit.runtime.caching.cache_errors import CacheError, CacheKeyNotFoundError
 from streamlit.runtime.caching.cache_type import CacheType
 from streamlit.runtime.caching.cache_utils import (
@@ -68,8 +71,11 @@ from streamlit.runtime.stats import CacheStat, CacheStatsProvider, group_stats
 from streamlit.time_util import time_to_seconds
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from contextlib import AbstractContextManager
     from datetime import timedelta
 
+    from streamlit.runtime.caching.cache_prewarm import PrewarmArgs
     from streamlit.runtime.caching.hashing import HashFuncsDict
 
 _LOGGER: Final = get_logger(__name__)
@@ -79,6 +85,11 @@ CACHE_DATA_MESSAGE_REPLAY_CTX = CachedMessageReplayContext(CacheType.DATA)
 # The cache persistence options we support: "disk" or None
 CachePersistType: TypeAlias = Union[Literal["disk"], None]
 
+# The timer used to decide whether a cached value is stale. This is the wall
+# clock time, since values may be shared with other processes. It's exposed
+# as a constant so that it can be patched in unit tests.
+STALE_TIMER = time.time
+
 
 class CachedDataFuncInfo(CachedFuncInfo):
     """Implements the CachedFuncInfo interface for @st.cache_data"""
@@ -91,15 +102,21 @@ class CachedDataFuncInfo(CachedFuncInfo):
         max_entries: int | None,
         ttl: float | timedelta | str | None,
         hash_funcs: HashFuncsDict | None = None,
+        max_size: int | None = None,
+        prewarm: list[PrewarmArgs] | None = None,
+        stale_while_revalidate: float | timedelta | str | None = None,
     ):
         super().__init__(
             func,
             show_spinner=show_spinner,
             hash_funcs=hash_funcs,
+            prewarm=prewarm,
         )
         self.persist = persist
         self.max_entries = max_entries
+        self.max_size = max_size
         self.ttl = ttl
+        self.stale_while_revalidate = stale_while_revalidate
 
         self.validate_params()
 
@@ -123,6 +140,8 @@ class CachedDataFuncInfo(CachedFuncInfo):
             max_entries=self.max_entries,
             ttl=self.ttl,
             display_name=self.display_name,
+            max_size=self.max_size,
+            stale_while_revalidate=self.stale_while_revalidate,
         )
 
     def validate_params(self) -> None:
@@ -137,6 +156,8 @@ class CachedDataFuncInfo(CachedFuncInfo):
             persist=self.persist,
             max_entries=self.max_entries,
             ttl=self.ttl,
+            max_size=self.max_size,
+            stale_while_revalidate=self.stale_while_revalidate,
         )
 
 
@@ -154,6 +175,8 @@ class DataCaches(CacheStatsProvider):
         max_entries: int | None,
         ttl: int | float | timedelta | str | None,
         display_name: str,
+        max_size: int | None = None,
+        stale_while_revalidate: int | float | timedelta | str | None = None,
     ) -> DataCache:
         """Return the mem cache for the given key.
 
@@ -161,6 +184,9 @@ class DataCaches(CacheStatsProvider):
         """
 
         ttl_seconds = time_to_seconds(ttl, coerce_none_to_inf=False)
+        stale_seconds = time_to_seconds(
+            stale_while_revalidate, coerce_none_to_inf=False
+        )
 
         # Get the existing cache, if it exists, and validate that its params
         # haven't changed.
@@ -170,7 +196,9 @@ class DataCaches(CacheStatsProvider):
                 cache is not None
                 and cache.ttl_seconds == ttl_seconds
                 and cache.max_entries == max_entries
+                and cache.max_size == max_size
                 and cache.persist == persist
+                and cache.stale_while_revalidate_seconds == stale_seconds
             ):
                 return cache
 
@@ -199,9 +227,10 @@ class DataCaches(CacheStatsProvider):
             cache_context = self.create_cache_storage_context(
                 function_key=key,
                 function_name=display_name,
-                ttl_seconds=ttl_seconds,
+                ttl_seconds=_storage_ttl_seconds(ttl_seconds, stale_seconds),
                 max_entries=max_entries,
                 persist=persist,
+                max_size=max_size,
             )
             cache_storage_manager = self.get_storage_manager()
             storage = cache_storage_manager.create(cache_context)
@@ -213,6 +242,8 @@ class DataCaches(CacheStatsProvider):
                 max_entries=max_entries,
                 ttl_seconds=ttl_seconds,
                 display_name=display_name,
+                max_size=max_size,
+                stale_while_revalidate_seconds=stale_seconds,
             )
             self._function_caches[key] = cache
             return cache
@@ -249,6 +280,8 @@ class DataCaches(CacheStatsProvider):
         persist: CachePersistType,
         max_entries: int | None,
         ttl: int | float | timedelta | str | None,
+        max_size: int | None = None,
+        stale_while_revalidate: int | float | timedelta | str | None = None,
     ) -> None:
         """Validate that the cache params are valid for given storage.
 
@@ -260,13 +293,17 @@ class DataCaches(CacheStatsProvider):
         """
 
         ttl_seconds = time_to_seconds(ttl, coerce_none_to_inf=False)
+        stale_seconds = time_to_seconds(
+            stale_while_revalidate, coerce_none_to_inf=False
+        )
 
         cache_context = self.create_cache_storage_context(
             function_key="DUMMY_KEY",
             function_name=function_name,
-            ttl_seconds=ttl_seconds,
+            ttl_seconds=_storage_ttl_seconds(ttl_seconds, stale_seconds),
             max_entries=max_entries,
             persist=persist,
+            max_size=max_size,
         )
         try:
             self.get_storage_manager().check_context(cache_context)
@@ -286,6 +323,7 @@ class DataCaches(CacheStatsProvider):
         persist: CachePersistType,
         ttl_seconds: float | None,
         max_entries: int | None,
+        max_size: int | None = None,
     ) -> CacheStorageContext:
         return CacheStorageContext(
             function_key=function_key,
@@ -293,6 +331,7 @@ class DataCaches(CacheStatsProvider):
             ttl_seconds=ttl_seconds,
             max_entries=max_entries,
             persist=persist,
+            max_size=max_size,
         )
 
     def get_storage_manager(self) -> CacheStorageManager:
@@ -305,6 +344,17 @@ class DataCaches(CacheStatsProvider):
             return MemoryCacheStorageManager()
 
 
+def _storage_ttl_seconds(
+    ttl_seconds: float | None, stale_seconds: float | None
+) -> float | None:
+    """Return the TTL of the entries in the cache storage. Stale entries are
+    kept in the storage until the stale_while_revalidate period is over.
+    """
+    if ttl_seconds is None or stale_seconds is None:
+        return ttl_seconds
+    return ttl_seconds + stale_seconds
+
+
 # Singleton DataCaches instance
 _data_caches = DataCaches()
 
@@ -353,6 +403,9 @@ class CacheDataAPI:
         persist: CachePersistType | bool = None,
         experimental_allow_widgets: bool = False,
         hash_funcs: HashFuncsDict | None = None,
+        max_size: int | None = None,
+        prewarm: list[PrewarmArgs] | None = None,
+        stale_while_revalidate: float | timedelta | str | None = None,
     ) -> Callable[[F], F]: ...
 
     def __call__(
@@ -365,6 +418,9 @@ class CacheDataAPI:
         persist: CachePersistType | bool = None,
         experimental_allow_widgets: bool = False,
         hash_funcs: HashFuncsDict | None = None,
+        max_size: int | None = None,
+        prewarm: list[PrewarmArgs] | None = None,
+        stale_while_revalidate: float | timedelta | str | None = None,
     ):
         return self._decorator(
             func,
@@ -374,6 +430,9 @@ class CacheDataAPI:
             show_spinner=show_spinner,
             experimental_allow_widgets=experimental_allow_widgets,
             hash_funcs=hash_funcs,
+            max_size=max_size,
+            prewarm=prewarm,
+            stale_while_revalidate=stale_while_revalidate,
         )
 
     def _decorator(
@@ -386,12 +445,17 @@ class CacheDataAPI:
         persist: CachePersistType | bool,
         experimental_allow_widgets: bool,
         hash_funcs: HashFuncsDict | None = None,
+        max_size: int | None = None,
+        prewarm: list[PrewarmArgs] | None = None,
+        stale_while_revalidate: float | timedelta | str | None = None,
     ):
         """Decorator to cache functions that return data (e.g. dataframe transforms, database queries, ML inference).
 
         Cached objects are stored in "pickled" form, which means that the return
         value of a cached function must be pickleable. Each caller of the cached
-        function gets its own copy of the cached data.
+        function gets its own copy of the cached data. Pandas and Polars
+        dataframes and PyArrow tables are stored in the Arrow IPC format
+        instead, which is faster to read back for large dataframes.
 
         You can clear a function's cache with ``func.clear()`` or clear the entire
         cache with ``st.cache_data.clear()``.
@@ -451,6 +515,36 @@ class CacheDataAPI:
             the provided function to generate a hash for it. See below for an example
             of how this can be used.
 
+        max_size : int or None
+            The maximum total size in bytes of the entries to keep in the
+            in-memory cache, or None for no size limit. The size of an entry is
+            the length of its serialized value. When a new entry doesn't fit, the
+            least recently used entries are removed. Defaults to None.
+
+        stale_while_revalidate : float, timedelta, str, or None
+            The time after an entry's ``ttl`` has passed during which the
+            expired entry is still returned, while the function is run again
+            in a background thread to refresh it. Only one refresh runs per
+            entry at a time. After this time, the entry is removed from the
+            cache. Supports the same formats as ``ttl``, which is required.
+            If None (default), expired entries are never returned.
+
+            Entries whose function calls Streamlit commands are always
+            refreshed in the script run, because the commands can only be
+            recorded in a script run.
+
+        prewarm : list of tuples or dicts, or None
+            Argument sets to call the function with when the caches are
+            prewarmed before the app accepts sessions, either with the
+            ``server.cachePrewarm`` config option or with the
+            ``streamlit cache warm`` command. Each tuple contains positional
+            arguments, and each dict contains keyword arguments, e.g.
+            ``prewarm=[(), ("2024",), {"year": "2025"}]``. Defaults to None.
+
+            The ``streamlit cache warm`` command runs in its own process, so
+            it only prewarms values that outlive it, e.g. with
+            ``persist="disk"``.
+
         .. deprecated::
             The cached widget replay functionality was removed in 1.38. Please
             remove the ``experimental_allow_widgets`` parameter from your
@@ -561,6 +655,11 @@ class CacheDataAPI:
                 f"Unsupported persist option '{persist}'. Valid values are 'disk' or None."
             )
 
+        if stale_while_revalidate is not None and ttl is None:
+            raise StreamlitAPIException(
+                "`stale_while_revalidate` requires `ttl` to be set."
+            )
+
         if experimental_allow_widgets:
             show_widget_replay_deprecation("cache_data")
 
@@ -573,6 +672,9 @@ class CacheDataAPI:
                     max_entries=max_entries,
                     ttl=ttl,
                     hash_funcs=hash_funcs,
+                    max_size=max_size,
+                    prewarm=prewarm,
+                    stale_while_revalidate=stale_while_revalidate,
                 )
             )
 
@@ -587,6 +689,9 @@ class CacheDataAPI:
                 max_entries=max_entries,
                 ttl=ttl,
                 hash_funcs=hash_funcs,
+                max_size=max_size,
+                prewarm=prewarm,
+                stale_while_revalidate=stale_while_revalidate,
             )
         )
 
@@ -607,6 +712,8 @@ class DataCache(Cache):
         max_entries: int | None,
         ttl_seconds: float | None,
         display_name: str,
+        max_size: int | None = None,
+        stale_while_revalidate_seconds: float | None = None,
     ):
         super().__init__()
         self.key = key
@@ -614,7 +721,9 @@ class DataCache(Cache):
         self.storage = storage
         self.ttl_seconds = ttl_seconds
         self.max_entries = max_entries
+        self.max_size = max_size
         self.persist = persist
+        self.stale_while_revalidate_seconds = stale_while_revalidate_seconds
 
     def get_stats(self) -> list[CacheStat]:
         if isinstance(self.storage, CacheStatsProvider):
@@ -634,7 +743,7 @@ class DataCache(Cache):
             raise CacheError(str(e)) from e
 
         try:
-            entry = pickle.loads(pickled_entry)
+            entry = cache_value_serializer.loads(pickled_entry)
             if not isinstance(entry, CachedResult):
                 # Loaded an old cache file format, remove it and let the caller
                 # rerun the function.
@@ -653,13 +762,54 @@ class DataCache(Cache):
             main_id = st._main.id
             sidebar_id = st.sidebar.id
             entry = CachedResult(value, messages, main_id, sidebar_id)
-            pickled_entry = pickle.dumps(entry)
+            if self.stale_while_revalidate_seconds is not None:
+                entry.computed_at = STALE_TIMER()
+            pickled_entry = cache_value_serializer.dumps(entry)
         except (pickle.PicklingError, TypeError) as exc:
             raise CacheError(f"Failed to pickle {key}") from exc
         self.storage.set(key, pickled_entry)
 
+    def is_stale(self, result: CachedResult) -> bool:
+        """Return True if the result's ttl has passed. The storage keeps such
+        results for another stale_while_revalidate_seconds.
+        """
+        if (
+            self.stale_while_revalidate_seconds is None
+            or self.ttl_seconds is None
+            or result.computed_at is None
+        ):
+            return False
+        return STALE_TIMER() - result.computed_at >= self.ttl_seconds
+
+    def compute_value_lock(self, value_key: str) -> AbstractContextManager[Any]:
+        """Return the lock that should be held while computing a new cached value.
+
+        If the storage provides a compute lock (e.g. because it's shared
+        between processes), it's acquired after the in-process lock.
+        """
+        value_lock = super().compute_value_lock(value_key)
+        # Custom storages may not implement the optional compute_value_lock.
+        compute_storage_lock = getattr(self.storage, "compute_value_lock", None)
+        storage_lock = (
+            compute_storage_lock(value_key)
+            if compute_storage_lock is not None
+            else None
+        )
+        if storage_lock is None:
+            return value_lock
+        return _acquire_locks(value_lock, storage_lock)
+
     def _clear(self, key: str | None = None) -> None:
         if not key:
             self.storage.clear()
         else:
             self.storage.delete(key)
+
+
+@contextlib.contextmanager
+def _acquire_locks(*locks: AbstractContextManager[Any]) -> Iterator[None]:
+    """Acquire the given locks in order, and release them in reverse order."""
+    with contextlib.ExitStack() as stack:
+        for lock in locks:
+            stack.enter_context(lock)
+        yield
@@ -0,0 +1,134 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2025)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Prewarming of st.cache_data and st.cache_resource functions.
+
+Cached functions declare the argument sets to prewarm their cache with via
+the `prewarm` parameter of their decorator. Decorating a function registers
+it here, and `prewarm_cached_functions` calls all registered functions with
+their argument sets, e.g. before the server accepts sessions.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Final, Union
+
+from typing_extensions import TypeAlias
+
+from streamlit.errors import StreamlitAPIException
+from streamlit.logger import get_logger
+
+_LOGGER: Final = get_logger(__name__)
+
+# An argument set to prewarm a cached function with: a tuple of positional
+# arguments, or a dict of keyword arguments.
+PrewarmArgs: TypeAlias = Union[tuple[Any, ...], dict[str, Any]]
+
+# Calls the cached function with positional and keyword arguments.
+PrewarmFunc: TypeAlias = Callable[[tuple[Any, ...], dict[str, Any]], Any]
+
+# The maximum number of cached functions that are called at the same time.
+_PREWARM_MAX_WORKERS: Final = 4
+
+# The registered functions and argument sets, by function key.
+_prewarm_funcs: dict[
+    str, tuple[str, PrewarmFunc, list[tuple[tuple[Any, ...], dict[str, Any]]]]
+] = {}
+_prewarm_funcs_lock = threading.Lock()
+
+
+def register_prewarm_function(
+    function_key: str,
+    display_name: str,
+    func: PrewarmFunc,
+    prewarm: list[PrewarmArgs],
+) -> None:
+    """Register a cached function to be prewarmed with the given argument sets.
+
+    Registering a function with the same key again (e.g. because the script
+    was rerun) replaces the previous registration.
+
+    Raises
+    ------
+    StreamlitAPIException
+        Raised if an argument set is neither a tuple nor a dict.
+    """
+    arg_sets: list[tuple[tuple[Any, ...], dict[str, Any]]] = []
+    for args in prewarm:
+        if isinstance(args, tuple):
+            arg_sets.append((args, {}))
+        elif isinstance(args, dict):
+            arg_sets.append(((), args))
+        else:
+            raise StreamlitAPIException(
+                f"The `prewarm` argument sets of `{display_name}` must be tuples "
+                f"of positional arguments or dicts of keyword arguments, not "
+                f"`{type(args).__name__}`."
+            )
+
+    with _prewarm_funcs_lock:
+        _prewarm_funcs[function_key] = (display_name, func, arg_sets)
+
+
+def clear_prewarm_functions() -> None:
+    """Forget all registered functions."""
+    with _prewarm_funcs_lock:
+        _prewarm_funcs.clear()
+
+
+def prewarm_cached_functions(max_workers: int = _PREWARM_MAX_WORKERS) -> int:
+    """Call all registered functions with their argument sets, on a thread pool.
+
+    Exceptions raised by the functions are logged.
+
+    Returns
+    -------
+    int
+        The number of calls that raised an exception.
+    """
+    with _prewarm_funcs_lock:
+        calls = [
+            (display_name, func, args, kwargs)
+            for display_name, func, arg_sets in _prewarm_funcs.values()
+            for args, kwargs in arg_sets
+        ]
+
+    if not calls:
+        return 0
+
+    def call(display_name: str, func: PrewarmFunc, args, kwargs) -> bool:
+        try:
+            func(args, kwargs)
+            return True
+        except Exception:
+            _LOGGER.warning("Failed to prewarm %s.", display_name, exc_info=True)
+            return False
+
+    start_time = time.perf_counter()
+    with ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="StreamlitCachePrewarm"
+    ) as executor:
+        results = list(executor.map(lambda c: call(*c), calls))
+
+    failures = results.count(False)
+    _LOGGER.info(
+        "Prewarmed %s cached function calls in %.2f seconds (%s failed).",
+        len(calls),
+        time.perf_counter() - start_time,
+        failures,
+    )
+    return failures
@@ -21,7 +21,6 @@ import threading
 import types
 from typing import TYPE_CHECKING, Any, Callable, Final, TypeVar, cast, overload
 
-from cachetools import TTLCache
 from typing_extensions import TypeAlias
 
 import streamlit as st
@@ -47,6 +46,9 @@ from streamlit.time_util import time_to_seconds
 if TYPE_CHECKING:
     from datetime import timedelta
 
+    from cachetools import TTLCache
+
+    from streamlit.runtime.caching.cache_prewarm import PrewarmArgs
     from streamlit.runtime.caching.hashing import HashFuncsDict
 
 _LOGGER: Final = get_logger(__name__)
@@ -80,6 +82,7 @@ class ResourceCaches(CacheStatsProvider):
         max_entries: int | float | None,
         ttl: float | timedelta | str | None,
         validate: ValidateFunc | None,
+        max_size: int | float | None = None,
     ) -> ResourceCache:
         """Return the mem cache for the given key.
 
@@ -87,6 +90,8 @@ class ResourceCaches(CacheStatsProvider):
         """
         if max_entries is None:
             max_entries = math.inf
+        if max_size is None:
+            max_size = math.inf
 
         ttl_seconds = time_to_seconds(ttl)
 
@@ -98,6 +103,7 @@ class ResourceCaches(CacheStatsProvider):
                 cache is not None
                 and cache.ttl_seconds == ttl_seconds
                 and cache.max_entries == max_entries
+                and cache.max_size == max_size
                 and _equal_validate_funcs(cache.validate, validate)
             ):
                 return cache
@@ -110,6 +116,7 @@ class ResourceCaches(CacheStatsProvider):
                 max_entries=max_entries,
                 ttl_seconds=ttl_seconds,
                 validate=validate,
+                max_size=max_size,
             )
             self._function_caches[key] = cache
             return cache
@@ -151,13 +158,17 @@ class CachedResourceFuncInfo(CachedFuncInfo):
         ttl: float | timedelta | str | None,
         validate: ValidateFunc | None,
         hash_funcs: HashFuncsDict | None = None,
+        max_size: int | None = None,
+        prewarm: list[PrewarmArgs] | None = None,
     ):
         super().__init__(
             func,
             show_spinner=show_spinner,
             hash_funcs=hash_funcs,
+            prewarm=prewarm,
         )
         self.max_entries = max_entries
+        self.max_size = max_size
         self.ttl = ttl
         self.validate = validate
 
@@ -181,6 +192,7 @@ class CachedResourceFuncInfo(CachedFuncInfo):
             max_entries=self.max_entries,
             ttl=self.ttl,
             validate=self.validate,
+            max_size=self.max_size,
         )
 
 
@@ -222,6 +234,8 @@ class CacheResourceAPI:
         validate: ValidateFunc | None = None,
         experimental_allow_widgets: bool = False,
         hash_funcs: HashFuncsDict | None = None,
+        max_size: int | None = None,
+        prewarm: list[PrewarmArgs] | None = None,
     ) -> Callable[[F], F]: ...
 
     def __call__(
@@ -234,6 +248,8 @@ class CacheResourceAPI:
         validate: ValidateFunc | None = None,
         experimental_allow_widgets: bool = False,
         hash_funcs: HashFuncsDict | None = None,
+        max_size: int | None = None,
+        prewarm: list[PrewarmArgs] | None = None,
     ):
         return self._decorator(
             func,
@@ -243,6 +259,8 @@ class CacheResourceAPI:
             validate=validate,
             experimental_allow_widgets=experimental_allow_widgets,
             hash_funcs=hash_funcs,
+            max_size=max_size,
+            prewarm=prewarm,
         )
 
     def _decorator(
@@ -255,6 +273,8 @@ class CacheResourceAPI:
         validate: ValidateFunc | None,
         experimental_allow_widgets: bool,
         hash_funcs: HashFuncsDict | None = None,
+        max_size: int | None = None,
+        prewarm: list[PrewarmArgs] | None = None,
     ):
         """Decorator to cache functions that return global resources (e.g. database connections, ML models).
 
@@ -323,6 +343,21 @@ class CacheResourceAPI:
             the provided function to generate a hash for it. See below for an example
             of how this can be used.
 
+        max_size : int or None
+            The maximum total size in bytes of the entries to keep in the cache,
+            or None for no size limit. The size of an entry is estimated with
+            ``pympler.asizeof`` when it is added to the cache. When a new entry
+            doesn't fit, the least recently used entries are removed. Entries
+            larger than ``max_size`` are not cached. Defaults to None.
+
+        prewarm : list of tuples or dicts, or None
+            Argument sets to call the function with when the server prewarms
+            the caches before accepting sessions, which is enabled with the
+            ``server.cachePrewarm`` config option. Each tuple contains
+            positional arguments, and each dict contains keyword arguments,
+            e.g. ``prewarm=[(), ("gpt2",), {"model": "bert"}]``. Defaults to
+            None.
+
         .. deprecated::
             The cached widget replay functionality was removed in 1.38. Please
             remove the ``experimental_allow_widgets`` parameter from your
@@ -425,6 +460,8 @@ class CacheResourceAPI:
                     ttl=ttl,
                     validate=validate,
                     hash_funcs=hash_funcs,
+                    max_size=max_size,
+                    prewarm=prewarm,
                 )
             )
 
@@ -436,6 +473,8 @@ class CacheResourceAPI:
                 ttl=ttl,
                 validate=validate,
                 hash_funcs=hash_funcs,
+                max_size=max_size,
+                prewarm=prewarm,
             )
         )
 
@@ -445,6 +484,14 @@ class CacheResourceAPI:
         _resource_caches.clear_all()
 
 
+def _get_entry_size(entry: CachedResult) -> int:
+    """Estimate the memory size of a cached resource entry."""
+    # Lazy-load vendored package to prevent import of numpy
+    from streamlit.vendor.pympler.asizeof import asizeof
+
+    return asizeof(entry)
+
+
 class ResourceCache(Cache):
     """Manages cached values for a single st.cache_resource function."""
 
@@ -455,19 +502,31 @@ class ResourceCache(Cache):
         ttl_seconds: float,
         validate: ValidateFunc | None,
         display_name: str,
+        max_size: float = math.inf,
     ):
         super().__init__()
         self.key = key
         self.display_name = display_name
-        self._mem_cache: TTLCache[str, CachedResult] = TTLCache(
-            maxsize=max_entries, ttl=ttl_seconds, timer=cache_utils.TTLCACHE_TIMER
+        self._max_entries = max_entries
+        self._max_size = max_size
+        self._mem_cache: TTLCache[str, CachedResult] = cache_utils.create_ttl_cache(
+            max_entries=max_entries,
+            ttl_seconds=ttl_seconds,
+            max_size=max_size,
+            # Measuring resources is expensive, so only do it if they're
+            # bounded by size. The stats measure them in the background.
+            getsizeof=None if math.isinf(max_size) else _get_entry_size,
         )
         self._mem_cache_lock = threading.Lock()
         self.validate = validate
 
     @property
     def max_entries(self) -> float:
-        return self._mem_cache.maxsize
+        return self._max_entries
+
+    @property
+    def max_size(self) -> float:
+        return self._max_size
 
     @property
     def ttl_seconds(self) -> float:
@@ -498,7 +557,16 @@ class ResourceCache(Cache):
         sidebar_id = st.sidebar.id
 
         with self._mem_cache_lock:
-            self._mem_cache[key] = CachedResult(value, messages, main_id, sidebar_id)
+            try:
+                self._mem_cache[key] = CachedResult(
+                    value, messages, main_id, sidebar_id
+                )
+            except ValueError:
+                _LOGGER.warning(
+                    "The result of the cached function '%s' is larger than its "
+                    "max_size and won't be cached.",
+                    self.display_name,
+                )
 
     def _clear(self, key: str | None = None) -> None:
         with self._mem_cache_lock:
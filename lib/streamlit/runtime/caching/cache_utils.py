@@ -20,11 +20,15 @@ import contextlib
 import functools
 import hashlib
 import inspect
+import math
 import threading
 import time
 from abc import abstractmethod
 from collections import defaultdict
-from typing import TYPE_CHECKING, Any, Callable, Final
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable, Final, TypeVar
+
+from cachetools import TTLCache
 
 from streamlit import type_util
 from streamlit.dataframe_util import is_unevaluated_data_object
@@ -39,6 +43,7 @@ from streamlit.runtime.caching.cache_errors import (
     UnserializableReturnValueError,
     get_cached_func_name_md,
 )
+from streamlit.runtime.caching.cache_prewarm import register_prewarm_function
 from streamlit.runtime.caching.cached_message_replay import (
     CachedMessageReplayContext,
     CachedResult,
@@ -46,13 +51,16 @@ from streamlit.runtime.caching.cached_message_replay import (
     replay_cached_messages,
 )
 from streamlit.runtime.caching.hashing import HashFuncsDict, update_hash
+from streamlit.runtime.script_run_profile import get_current_profile
 from streamlit.runtime.scriptrunner_utils.script_run_context import (
     in_cached_function,
 )
 
 if TYPE_CHECKING:
+    from contextlib import AbstractContextManager
     from types import FunctionType
 
+    from streamlit.runtime.caching.cache_prewarm import PrewarmArgs
     from streamlit.runtime.caching.cache_type import CacheType
 
 _LOGGER: Final = get_logger(__name__)
@@ -61,6 +69,72 @@ _LOGGER: Final = get_logger(__name__)
 # is exposed here as a constant so that it can be patched in unit tests.
 TTLCACHE_TIMER = time.monotonic
 
+# The maximum number of stale cached values that are recomputed in the
+# background at the same time.
+_MAX_REVALIDATION_WORKERS: Final = 4
+
+_revalidation_executor: ThreadPoolExecutor | None = None
+_revalidation_executor_lock = threading.Lock()
+
+_VT = TypeVar("_VT")
+
+
+class _SizeBoundedTTLCache(TTLCache[str, _VT]):
+    """A TTLCache that is bounded by the total size of its entries
+    and by the number of entries.
+    """
+
+    def __init__(
+        self,
+        max_entries: float,
+        max_size: float,
+        ttl_seconds: float,
+        getsizeof: Callable[[_VT], float],
+    ):
+        super().__init__(
+            maxsize=max_size, ttl=ttl_seconds, timer=TTLCACHE_TIMER, getsizeof=getsizeof
+        )
+        self.max_entries = max_entries
+
+    def __setitem__(self, key: str, value: _VT) -> None:  # type: ignore[override]
+        # TTLCache evicts the least recently used entries until the new
+        # entry fits into max_size, we additionally enforce max_entries.
+        super().__setitem__(key, value)
+        while len(self) > self.max_entries:
+            self.popitem()
+
+
+def create_ttl_cache(
+    max_entries: float,
+    ttl_seconds: float,
+    max_size: float = math.inf,
+    getsizeof: Callable[[_VT], float] | None = None,
+) -> TTLCache[str, _VT]:
+    """Create the in-memory TTLCache for the entries of a cached function.
+
+    If getsizeof is given, the cache keeps the total size of its entries as
+    measured by getsizeof in its `currsize`. If max_size is also finite, the
+    cache evicts the least recently used entries whenever that total exceeds
+    max_size, and setting a single entry that is larger than max_size raises
+    a ValueError.
+    """
+    if getsizeof is None:
+        return TTLCache(maxsize=max_entries, ttl=ttl_seconds, timer=TTLCACHE_TIMER)
+    return _SizeBoundedTTLCache(max_entries, max_size, ttl_seconds, getsizeof)
+
+
+def _get_revalidation_executor() -> ThreadPoolExecutor:
+    """Return the thread pool used to recompute stale cached values."""
+    global _revalidation_executor
+
+    with _revalidation_executor_lock:
+        if _revalidation_executor is None:
+            _revalidation_executor = ThreadPoolExecutor(
+                max_workers=_MAX_REVALIDATION_WORKERS,
+                thread_name_prefix="StreamlitCacheRevalidation",
+            )
+        return _revalidation_executor
+
 
 class Cache:
     """Function cache interface. Caches persist across script runs."""
@@ -68,6 +142,8 @@ class Cache:
     def __init__(self):
         self._value_locks: dict[str, threading.Lock] = defaultdict(threading.Lock)
         self._value_locks_lock = threading.Lock()
+        # The value_keys that are currently recomputed in the background.
+        self._revalidating_keys: set[str] = set()
 
     @abstractmethod
     def read_result(self, value_key: str) -> CachedResult:
@@ -90,7 +166,7 @@ class Cache:
         # a compute_value_lock for this value_key after the result is written.
         raise NotImplementedError
 
-    def compute_value_lock(self, value_key: str) -> threading.Lock:
+    def compute_value_lock(self, value_key: str) -> AbstractContextManager[Any]:
         """Return the lock that should be held while computing a new cached value.
         In a popular app with a cache that hasn't been pre-warmed, many sessions may try
         to access a not-yet-cached value simultaneously. We use a lock to ensure that
@@ -100,6 +176,28 @@ class Cache:
         with self._value_locks_lock:
             return self._value_locks[value_key]
 
+    def is_stale(self, result: CachedResult) -> bool:
+        """Return True if result is stale, which means that it's still returned,
+        but recomputed in the background.
+        """
+        return False
+
+    def start_revalidation(self, value_key: str) -> bool:
+        """Mark value_key as being recomputed in the background.
+
+        Returns False if the value is already being recomputed, so that only
+        one recomputation per value runs at a time.
+        """
+        with self._value_locks_lock:
+            if value_key in self._revalidating_keys:
+                return False
+            self._revalidating_keys.add(value_key)
+            return True
+
+    def finish_revalidation(self, value_key: str) -> None:
+        with self._value_locks_lock:
+            self._revalidating_keys.discard(value_key)
+
     def clear(self, key: str | None = None):
         """Clear values from this cache.
         If no argument is passed, all items are cleared from the cache.
@@ -129,10 +227,12 @@ class CachedFuncInfo:
         func: FunctionType,
         show_spinner: bool | str,
         hash_funcs: HashFuncsDict | None,
+        prewarm: list[PrewarmArgs] | None = None,
     ):
         self.func = func
         self.show_spinner = show_spinner
         self.hash_funcs = hash_funcs
+        self.prewarm = prewarm
 
     @property
     def cache_type(self) -> CacheType:
@@ -190,6 +290,13 @@ class CachedFunc:
     def __init__(self, info: CachedFuncInfo):
         self._info = info
         self._function_key = _make_function_key(info.cache_type, info.func)
+        if info.prewarm:
+            register_prewarm_function(
+                self._function_key,
+                f"{info.func.__module__}.{info.func.__qualname__}",
+                self._get_or_create_cached_value,
+                info.prewarm,
+            )
 
     def __repr__(self):
         return f"<CachedFunc: {self._info.func}>"
@@ -239,7 +346,13 @@ class CachedFunc:
 
         with contextlib.suppress(CacheKeyNotFoundError):
             cached_result = cache.read_result(value_key)
-            return self._handle_cache_hit(cached_result)
+            if not cache.is_stale(cached_result):
+                return self._handle_cache_hit(cached_result)
+            # Stale values that replay messages are recomputed in the script
+            # thread below, since messages can only be recorded in a script run.
+            if not cached_result.messages:
+                self._revalidate_in_background(cache, value_key, func_args, func_kwargs)
+                return self._handle_cache_hit(cached_result)
 
         # only show spinner if there is a message to show and always only for the
         # outermost cache function if cache functions are nested, because the outermost
@@ -261,13 +374,49 @@ class CachedFunc:
     def _handle_cache_hit(self, result: CachedResult) -> Any:
         """Handle a cache hit: replay the result's cached messages, and return its
         value."""
+        profile = get_current_profile()
+        start_time = time.perf_counter()
         replay_cached_messages(
             result,
             self._info.cache_type,
             self._info.func,
         )
+        if profile is not None:
+            profile.record_cache_access(self._info.func, hit=True, start=start_time)
         return result.value
 
+    def _revalidate_in_background(
+        self,
+        cache: Cache,
+        value_key: str,
+        func_args: tuple[Any, ...],
+        func_kwargs: dict[str, Any],
+    ) -> None:
+        """Recompute a stale cached value on the revalidation thread pool,
+        unless it's already being recomputed.
+        """
+        if not cache.start_revalidation(value_key):
+            return
+
+        def revalidate() -> None:
+            try:
+                self._handle_cache_miss(cache, value_key, func_args, func_kwargs)
+            except Exception:
+                # The stale value is kept until it expires.
+                _LOGGER.warning(
+                    "Failed to recompute the stale cached value of %s.",
+                    self._info.func.__qualname__,
+                    exc_info=True,
+                )
+            finally:
+                cache.finish_revalidation(value_key)
+
+        try:
+            _get_revalidation_executor().submit(revalidate)
+        except RuntimeError:
+            # The thread pool was shut down, the stale value is kept.
+            cache.finish_revalidation(value_key)
+
     def _handle_cache_miss(
         self,
         cache: Cache,
@@ -303,18 +452,25 @@ class CachedFunc:
             # before computing.
             try:
                 cached_result = cache.read_result(value_key)
-                # Another thread computed the value before us. Early exit!
-                return self._handle_cache_hit(cached_result)
+                if not cache.is_stale(cached_result):
+                    # Another thread computed the value before us. Early exit!
+                    return self._handle_cache_hit(cached_result)
             except CacheKeyNotFoundError:
                 # No cache hit -> we will call the cached function
                 # below.
                 pass
 
             # We acquired the lock before any other thread. Compute the value!
+            profile = get_current_profile()
+            start_time = time.perf_counter()
             with self._info.cached_message_replay_ctx.calling_cached_function(
                 self._info.func
             ):
                 computed_value = self._info.func(*func_args, **func_kwargs)
+            if profile is not None:
+                profile.record_cache_access(
+                    self._info.func, hit=False, start=start_time
+                )
 
             # We've computed our value, and now we need to write it back to the cache
             # along with any "replay messages" that were generated during value computation.
@@ -0,0 +1,228 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2025)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Serialization of @st.cache_data results.
+
+By default, cached results are pickled. For value types that have a more
+efficient representation, a CacheValueSerializer can serialize the value
+separately from the rest of the CachedResult. Dataframes are stored as Arrow
+IPC streams: reading them back doesn't need to unpickle every object, and
+the Arrow buffers are read directly from the stored bytes.
+
+The serialized entry has the following layout:
+
+    _MAGIC | serializer name length (uint16) | pickled result length (uint64)
+    | serializer name | pickled CachedResult without value | serialized value
+
+Entries that don't start with _MAGIC are plain pickled CachedResults.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import pickle
+import struct
+from typing import TYPE_CHECKING, Any, Final, Protocol
+
+from streamlit.logger import get_logger
+from streamlit.type_util import is_type
+
+if TYPE_CHECKING:
+    from streamlit.runtime.caching.cached_message_replay import CachedResult
+
+_LOGGER: Final = get_logger(__name__)
+
+_MAGIC: Final = b"STCV\x01"
+_HEADER: Final = struct.Struct(f"<{len(_MAGIC)}sHQ")
+
+
+class CacheValueSerializer(Protocol):
+    """Serializes cached values of specific types to bytes."""
+
+    @property
+    def name(self) -> str:
+        """A unique name that is stored with every serialized value."""
+        ...
+
+    def serialize(self, value: Any) -> bytes | None:
+        """Serialize the value, or return None if the value isn't supported."""
+        ...
+
+    def deserialize(self, data: memoryview) -> Any:
+        """Deserialize a value that was serialized by this serializer."""
+        ...
+
+
+class ArrowValueSerializer:
+    """Stores pandas and polars DataFrames and pyarrow Tables as Arrow IPC
+    streams.
+
+    Deserializing a pyarrow Table or polars DataFrame doesn't copy the data,
+    deserializing a pandas DataFrame copies it once.
+    """
+
+    _TYPE_STRS: Final = {
+        "pandas": "pandas.core.frame.DataFrame",
+        "polars": "polars.dataframe.frame.DataFrame",
+        "pyarrow": "pyarrow.lib.Table",
+    }
+
+    def __init__(self, kind: str):
+        self._kind = kind
+        self._type_str = self._TYPE_STRS[kind]
+
+    @property
+    def name(self) -> str:
+        return f"arrow-{self._kind}"
+
+    def serialize(self, value: Any) -> bytes | None:
+        # Only exact types are supported, subclasses (e.g. GeoDataFrame)
+        # may hold state that doesn't round-trip through Arrow.
+        if not is_type(value, self._type_str):
+            return None
+
+        if self._kind == "pandas" and not _round_trips_through_arrow(value):
+            return None
+
+        import pyarrow as pa
+
+        try:
+            if self._kind == "pandas":
+                table = pa.Table.from_pandas(value)
+            elif self._kind == "polars":
+                table = value.to_arrow()
+            else:
+                table = value
+        except (pa.ArrowException, ValueError, TypeError) as ex:
+            _LOGGER.debug("Failed to convert cached value to Arrow", exc_info=ex)
+            return None
+
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes()
+
+    def deserialize(self, data: memoryview) -> Any:
+        import pyarrow as pa
+
+        table = pa.ipc.open_stream(pa.py_buffer(data)).read_all()
+        if self._kind == "pandas":
+            # Deduplicating strings hashes every value, which makes the
+            # conversion slower than unpickling the DataFrame.
+            return table.to_pandas(deduplicate_objects=False)
+        if self._kind == "polars":
+            import polars as pl
+
+            return pl.from_arrow(table)
+        return table
+
+
+def _round_trips_through_arrow(df: Any) -> bool:
+    """True if converting the pandas DataFrame to Arrow and back returns an
+    equivalent DataFrame, so that a cache hit returns the same value as the
+    cached function.
+
+    This isn't the case if:
+
+    - An object column or index level holds anything but strings, bytes or
+      None. Arrow converts other Python objects (e.g. lists become numpy
+      arrays), and other missing values (e.g. NaN) become None.
+    - A column or index level is categorical, since its categories are
+      returned as a read-only array.
+    - The DataFrame has non-default flags, which aren't stored in Arrow.
+    """
+    import pandas as pd
+    from pandas.api.types import infer_dtype
+
+    if not df.flags.allows_duplicate_labels:
+        return False
+
+    indexes = df.index.levels if isinstance(df.index, pd.MultiIndex) else [df.index]
+    arrays = [df.iloc[:, i] for i in range(df.shape[1])] + list(indexes)
+    for array in arrays:
+        if isinstance(array.dtype, pd.CategoricalDtype):
+            return False
+        if array.dtype != object:
+            continue
+        if infer_dtype(array, skipna=True) not in ("string", "bytes", "empty"):
+            return False
+        missing = pd.isna(array)
+        if missing.any() and any(v is not None for v in array[missing]):
+            return False
+    return True
+
+
+_SERIALIZERS: Final[list[CacheValueSerializer]] = [
+    ArrowValueSerializer("pandas"),
+    ArrowValueSerializer("polars"),
+    ArrowValueSerializer("pyarrow"),
+]
+
+
+def dumps(entry: CachedResult) -> bytes:
+    """Serialize a CachedResult. Values that aren't supported by any
+    CacheValueSerializer are pickled together with the rest of the result.
+
+    Raises
+    ------
+    pickle.PicklingError, TypeError
+        Raised if the result can't be pickled.
+    """
+    for serializer in _SERIALIZERS:
+        value_bytes = serializer.serialize(entry.value)
+        if value_bytes is None:
+            continue
+
+        name = serializer.name.encode("utf-8")
+        pickled_result = pickle.dumps(dataclasses.replace(entry, value=None))
+        return b"".join(
+            [
+                _HEADER.pack(_MAGIC, len(name), len(pickled_result)),
+                name,
+                pickled_result,
+                value_bytes,
+            ]
+        )
+
+    return pickle.dumps(entry)
+
+
+def loads(data: bytes | memoryview) -> Any:
+    """Deserialize an entry that was serialized with `dumps`.
+
+    Raises
+    ------
+    pickle.UnpicklingError
+        Raised if the entry can't be deserialized.
+    """
+    # The data can also be a memoryview of a memory-mapped cache file.
+    if bytes(data[: len(_MAGIC)]) != _MAGIC:
+        return pickle.loads(data)
+
+    try:
+        _, name_length, result_length = _HEADER.unpack_from(data)
+        view = memoryview(data)
+        offset = _HEADER.size
+        name = bytes(view[offset : offset + name_length]).decode("utf-8")
+        offset += name_length
+        entry = pickle.loads(view[offset : offset + result_length])
+        offset += result_length
+
+        serializer = next(s for s in _SERIALIZERS if s.name == name)
+        entry.value = serializer.deserialize(view[offset:])
+        return entry
+    except pickle.UnpicklingError:
+        raise
+    except Exception as ex:
+        raise pickle.UnpicklingError("Failed to deserialize cached value") from ex
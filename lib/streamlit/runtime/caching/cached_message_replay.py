@@ -80,6 +80,8 @@ class CachedResult:
     messages: list[MsgData]
     main_id: str
     sidebar_id: str
+    # The time.time() at which the value was computed, or None if unknown.
+    computed_at: float | None = None
 
 
 """
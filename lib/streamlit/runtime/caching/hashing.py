@@ -31,6 +31,7 @@ import tempfile
 import threading
 import uuid
 import weakref
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
 from re import Pattern
 from types import MappingProxyType
@@ -38,22 +39,28 @@ from typing import Any, Callable, Final, Union, cast
 
 from typing_extensions import TypeAlias
 
-from streamlit import logger, type_util, util
+from streamlit import config, logger, type_util, util
 from streamlit.errors import StreamlitAPIException
 from streamlit.runtime.caching.cache_errors import UnhashableTypeError
 from streamlit.runtime.caching.cache_type import CacheType
+from streamlit.runtime.scriptrunner_utils.script_run_context import get_script_run_ctx
 from streamlit.runtime.uploaded_file_manager import UploadedFile
 
 _LOGGER: Final = logger.get_logger(__name__)
 
-# If a dataframe has more than this many rows, we consider it large and hash a sample.
+# In approximate hashing mode, if a dataframe has more than this many rows,
+# we consider it large and hash a sample.
 _PANDAS_ROWS_LARGE: Final = 50_000
 _PANDAS_SAMPLE_SIZE: Final = 10_000
 
-# Similar to dataframes, we also sample large numpy arrays.
+# Similar to dataframes, we also sample large numpy arrays in approximate mode.
 _NP_SIZE_LARGE: Final = 500_000
 _NP_SAMPLE_SIZE: Final = 100_000
 
+# In strict hashing mode, buffers are hashed in chunks of this size, and
+# values with at least this many bytes are hashed on multiple threads.
+_HASH_CHUNK_BYTES: Final = 4 * 1024 * 1024
+
 HashFuncsDict: TypeAlias = dict[Union[str, type[Any]], Callable[[Any], Any]]
 
 # Arbitrary item to denote where we found a cycle in a hashed object.
@@ -158,10 +165,102 @@ def update_hash(
 
     hash_stacks.current.hash_source = hash_source
 
-    ch = _CacheFuncHasher(cache_type, hash_funcs)
+    strict = config.get_option("server.cacheHashingMode") != "approximate"
+    ctx = get_script_run_ctx(suppress_warning=True)
+    ch = _CacheFuncHasher(
+        cache_type,
+        hash_funcs,
+        strict=strict,
+        memo=ctx.hash_memo if ctx is not None else None,
+        memoize_mutable=config.get_option("server.cacheHashMemoizeMutable"),
+    )
     ch.update(hasher, val)
 
 
+def _is_read_only_array(arr: Any) -> bool:
+    """True if arr and all arrays it is a view of are read-only."""
+    import numpy as np
+
+    while isinstance(arr, np.ndarray):
+        if arr.flags.writeable:
+            return False
+        arr = arr.base
+    return True
+
+
+def _hash_memo_fingerprint(
+    obj: Any, memoize_mutable: bool
+) -> tuple[tuple[Any, ...], tuple[Any, ...]] | None:
+    """Return the fingerprint of a large value whose hash can be memoized
+    within a script run, or None if the hash of obj can't be memoized.
+
+    The memoized hash of a value is only reused if the fingerprint of the
+    value is unchanged. The fingerprint is a tuple of cheap properties (shape,
+    dtypes, and the ids of the index and of the data buffers), together with
+    the objects whose ids are part of the fingerprint, which are kept alive
+    so that their ids can't be reused.
+
+    Arrow data and read-only numpy arrays are immutable, so their hash is
+    always memoized. Pandas and Polars dataframes and writeable numpy arrays
+    can be changed in place without changing their fingerprint, so their hash
+    is only memoized if memoize_mutable is set.
+    """
+    if _is_arrow_data(obj):
+        return (), ()
+
+    if type_util.is_type(obj, "numpy.ndarray"):
+        if _is_read_only_array(obj):
+            return (), ()
+        if memoize_mutable:
+            data_ptr = obj.__array_interface__["data"][0]
+            return (obj.shape, obj.strides, obj.dtype.str, data_ptr), ()
+        return None
+
+    if not memoize_mutable:
+        return None
+
+    if type_util.is_type(obj, "pandas.core.frame.DataFrame"):
+        dtypes = tuple(str(dtype) for dtype in obj.dtypes)
+        fingerprint = (obj.shape, dtypes, id(obj.index), id(obj.columns))
+        return fingerprint, (obj.index, obj.columns)
+
+    if type_util.is_type(obj, "pandas.core.series.Series"):
+        fingerprint = (obj.shape, str(obj.dtype), obj.name, id(obj.index))
+        return fingerprint, (obj.index,)
+
+    if type_util.is_type(obj, "polars.dataframe.frame.DataFrame"):
+        return (obj.shape, str(obj.schema), obj.n_chunks("all")), ()
+
+    if type_util.is_type(obj, "polars.series.series.Series"):
+        return (obj.shape, str(obj.dtype), obj.name, obj.n_chunks()), ()
+
+    return None
+
+
+def clear_hash_memo(obj: Any = None) -> None:
+    """Forget the memoized hashes of the current script run.
+
+    Call this after changing a dataframe or array in place within a script
+    run, if `server.cacheHashMemoizeMutable` is enabled.
+
+    Parameters
+    ----------
+    obj : Any
+        The value whose memoized hash should be forgotten. If None, all
+        memoized hashes of the current script run are forgotten.
+    """
+    ctx = get_script_run_ctx(suppress_warning=True)
+    if ctx is None:
+        return
+
+    if obj is None:
+        ctx.hash_memo.clear()
+        return
+
+    for key in [key for key in ctx.hash_memo if key[0] == id(obj)]:
+        ctx.hash_memo.pop(key, None)
+
+
 class _HashStack:
     """Stack of what has been hashed, for debug and circular reference detection.
 
@@ -277,10 +376,164 @@ def _key(obj: Any | None) -> Any:
     return NoResult
 
 
+_hash_executor: ThreadPoolExecutor | None = None
+_hash_executor_lock = threading.Lock()
+
+
+def _get_hash_executor() -> ThreadPoolExecutor:
+    """Return the thread pool used to hash large values in parallel."""
+    global _hash_executor
+
+    with _hash_executor_lock:
+        if _hash_executor is None:
+            _hash_executor = ThreadPoolExecutor(
+                max_workers=min(8, os.cpu_count() or 1),
+                thread_name_prefix="StreamlitHashing",
+            )
+        return _hash_executor
+
+
+def _parallel_map(func: Callable[[Any], bytes], items: list[Any], nbytes: int):
+    """Apply func to all items, on the hashing thread pool if the items are
+    large enough for that to pay off.
+
+    hashlib releases the GIL while hashing large buffers, and numpy and pandas
+    release it for most of their vectorized operations.
+    """
+    if len(items) > 1 and nbytes >= _HASH_CHUNK_BYTES:
+        return list(_get_hash_executor().map(func, items))
+    return [func(item) for item in items]
+
+
+def _buffer_digest(buffer: Any) -> bytes:
+    # SHA-1 is faster than MD5 for large buffers on most CPUs, since it is
+    # commonly hardware-accelerated.
+    return hashlib.new("sha1", buffer, usedforsecurity=False).digest()
+
+
+def _numpy_digests(arr: Any, parallel: bool = True) -> list[bytes]:
+    """Return the digests of the raw buffer of a non-object numpy array, in
+    chunks of _HASH_CHUNK_BYTES.
+
+    If parallel is False, the chunks are always hashed on the current thread.
+    This must be used when called from the hashing thread pool itself, since
+    waiting for the pool from one of its threads can deadlock.
+    """
+    import numpy as np
+
+    data = np.ascontiguousarray(arr).reshape(-1).view(np.uint8)
+    chunks = [
+        data[start : start + _HASH_CHUNK_BYTES]
+        for start in range(0, max(data.size, 1), _HASH_CHUNK_BYTES)
+    ]
+    if not parallel:
+        return [_buffer_digest(chunk) for chunk in chunks]
+    return _parallel_map(_buffer_digest, chunks, data.size)
+
+
+def _pandas_values_digest(obj: Any) -> bytes:
+    """Return the digest of all values of a pandas Series or Index.
+
+    Numeric, boolean and datetime values are hashed from their raw buffer.
+    Object values (e.g. strings) are converted to Arrow and hashed from the
+    Arrow buffers, which is much faster than hashing them one by one. All
+    other values are hashed with `pandas.util.hash_pandas_object`.
+
+    This is called on the hashing thread pool.
+    """
+    import numpy as np
+    import pandas as pd
+
+    if isinstance(obj, pd.RangeIndex):
+        return b"range:%d:%d:%d" % (obj.start, obj.stop, obj.step)
+
+    dtype = obj.dtype
+    if isinstance(dtype, np.dtype) and dtype.kind in "biufcmM":
+        return b"".join(_numpy_digests(obj.to_numpy(), parallel=False))
+
+    if isinstance(dtype, np.dtype) and dtype.kind == "O":
+        import pyarrow as pa
+
+        try:
+            arr = pa.array(obj, from_pandas=True)
+        except (pa.ArrowException, TypeError, ValueError):
+            # Mixed types that can't be converted to Arrow.
+            pass
+        else:
+            digests = [str(arr.type).encode()]
+            digests.extend(
+                _buffer_digest(buffer) for buffer in arr.buffers() if buffer is not None
+            )
+            return b"".join(digests)
+
+    values = pd.util.hash_pandas_object(obj, index=False, categorize=False)
+    return b"".join(_numpy_digests(values.to_numpy(), parallel=False))
+
+
+class _ArrowHashSink:
+    """A file-like object that hashes everything written to it."""
+
+    def __init__(self):
+        self.hasher = hashlib.new("sha1", usedforsecurity=False)
+        self.closed = False
+
+    def write(self, data: Any) -> int:
+        self.hasher.update(data)
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def _is_arrow_data(obj: Any) -> bool:
+    if "pyarrow" not in sys.modules:
+        return False
+
+    import pyarrow as pa
+
+    return isinstance(obj, (pa.Table, pa.RecordBatch, pa.Array, pa.ChunkedArray))
+
+
+def _arrow_digest(obj: Any) -> bytes:
+    """Return the digest of an Arrow table, record batch, or array.
+
+    The value is written in the Arrow IPC stream format directly into the
+    hasher, which only includes the sliced part of the buffers and also
+    includes dictionaries, without copying the data.
+    """
+    import pyarrow as pa
+
+    if isinstance(obj, pa.Array):
+        obj = pa.record_batch([obj], names=[""])
+    elif isinstance(obj, pa.ChunkedArray):
+        obj = pa.table([obj], names=[""])
+
+    sink = _ArrowHashSink()
+    with pa.ipc.new_stream(pa.PythonFile(sink, mode="w"), obj.schema) as writer:
+        writer.write(obj)
+    return sink.hasher.digest()
+
+
 class _CacheFuncHasher:
-    """A hasher that can hash objects with cycles."""
+    """A hasher that can hash objects with cycles.
+
+    In strict mode (the default), dataframes and arrays are hashed in full.
+    In approximate mode, only a sample of large dataframes and arrays is
+    hashed, which means that values that only differ outside of the sample
+    get the same hash.
+    """
 
-    def __init__(self, cache_type: CacheType, hash_funcs: HashFuncsDict | None = None):
+    def __init__(
+        self,
+        cache_type: CacheType,
+        hash_funcs: HashFuncsDict | None = None,
+        strict: bool = True,
+        memo: dict[Any, Any] | None = None,
+        memoize_mutable: bool = False,
+    ):
         # Can't use types as the keys in the internal _hash_funcs because
         # we always remove user-written modules from memory when rerunning a
         # script in order to reload it and grab the latest code changes.
@@ -302,6 +555,12 @@ class _CacheFuncHasher:
         self.size = 0
 
         self.cache_type = cache_type
+        self.strict = strict
+
+        # Hashes of large values that were already hashed in the current
+        # script run, see _hash_memo_fingerprint.
+        self._memo = memo
+        self._memoize_mutable = memoize_mutable
 
     def __repr__(self) -> str:
         return util.repr_(self)
@@ -316,6 +575,24 @@ class _CacheFuncHasher:
             if key in self._hashes:
                 return self._hashes[key]
 
+        memo_key = None
+        fingerprint = None
+        if (
+            self._memo is not None
+            and key[1] is NoResult
+            and type_util.get_fqn_type(obj) not in self._hash_funcs
+        ):
+            fingerprint = _hash_memo_fingerprint(obj, self._memoize_mutable)
+            if fingerprint is not None:
+                memo_key = (id(obj), self.strict)
+                entry = self._memo.get(memo_key)
+                if (
+                    entry is not None
+                    and entry[0]() is obj
+                    and entry[1][0] == fingerprint[0]
+                ):
+                    return entry[2]
+
         # Break recursive cycles.
         if obj in hash_stacks.current:
             return _CYCLE_PLACEHOLDER
@@ -333,6 +610,11 @@ class _CacheFuncHasher:
             if key[1] is not NoResult:
                 self._hashes[key] = b
 
+            if memo_key is not None and self._memo is not None:
+                # Only a weak reference is kept, so that the memo doesn't
+                # keep values alive. It also detects reused ids.
+                self._memo[memo_key] = (weakref.ref(obj), fingerprint, b)
+
         finally:
             # In case an UnhashableTypeError (or other) error is thrown, clean up the
             # stack so we don't get false positives in future hashing calls
@@ -421,10 +703,16 @@ class _CacheFuncHasher:
             self.update(h, obj.size)
             self.update(h, obj.dtype.name)
 
-            if len(obj) >= _PANDAS_ROWS_LARGE:
-                obj = obj.sample(n=_PANDAS_SAMPLE_SIZE, random_state=0)
-
             try:
+                if self.strict:
+                    digests = _parallel_map(
+                        _pandas_values_digest, [obj.index, obj], obj.nbytes
+                    )
+                    self.update(h, b"".join(digests))
+                    return h.digest()
+
+                if len(obj) >= _PANDAS_ROWS_LARGE:
+                    obj = obj.sample(n=_PANDAS_SAMPLE_SIZE, random_state=0)
                 self.update(h, pd.util.hash_pandas_object(obj).to_numpy().tobytes())
                 return h.digest()
             except TypeError:
@@ -443,13 +731,26 @@ class _CacheFuncHasher:
             obj = cast(pd.DataFrame, obj)
             self.update(h, obj.shape)
 
-            if len(obj) >= _PANDAS_ROWS_LARGE:
-                obj = obj.sample(n=_PANDAS_SAMPLE_SIZE, random_state=0)
             try:
                 column_hash_bytes = self.to_bytes(
                     pd.util.hash_pandas_object(obj.dtypes)
                 )
                 self.update(h, column_hash_bytes)
+
+                if self.strict:
+                    # Hash the index and every column separately, so that the
+                    # columns can be hashed in parallel.
+                    values = [obj.index] + [obj.iloc[:, i] for i in range(obj.shape[1])]
+                    digests = _parallel_map(
+                        _pandas_values_digest,
+                        values,
+                        obj.memory_usage(index=True, deep=False).sum(),
+                    )
+                    self.update(h, b"".join(digests))
+                    return h.digest()
+
+                if len(obj) >= _PANDAS_ROWS_LARGE:
+                    obj = obj.sample(n=_PANDAS_SAMPLE_SIZE, random_state=0)
                 values_hash_bytes = self.to_bytes(pd.util.hash_pandas_object(obj))
                 self.update(h, values_hash_bytes)
                 return h.digest()
@@ -470,10 +771,15 @@ class _CacheFuncHasher:
             self.update(h, str(obj.dtype).encode())
             self.update(h, obj.shape)
 
-            if len(obj) >= _PANDAS_ROWS_LARGE:
-                obj = obj.sample(n=_PANDAS_SAMPLE_SIZE, seed=0)
-
             try:
+                if self.strict:
+                    self.update(
+                        h, b"".join(_numpy_digests(obj.hash(seed=0).to_numpy()))
+                    )
+                    return h.digest()
+
+                if len(obj) >= _PANDAS_ROWS_LARGE:
+                    obj = obj.sample(n=_PANDAS_SAMPLE_SIZE, seed=0)
                 self.update(h, obj.hash(seed=0).to_arrow().to_string().encode())
                 return h.digest()
             except TypeError:
@@ -491,13 +797,19 @@ class _CacheFuncHasher:
             obj = cast(pl.DataFrame, obj)
             self.update(h, obj.shape)
 
-            if len(obj) >= _PANDAS_ROWS_LARGE:
-                obj = obj.sample(n=_PANDAS_SAMPLE_SIZE, seed=0)
             try:
                 for c, t in obj.schema.items():
                     self.update(h, c.encode())
                     self.update(h, str(t).encode())
 
+                if self.strict:
+                    # Polars hashes the rows on its own thread pool.
+                    row_hashes = obj.hash_rows(seed=0).to_numpy()
+                    self.update(h, b"".join(_numpy_digests(row_hashes)))
+                    return h.digest()
+
+                if len(obj) >= _PANDAS_ROWS_LARGE:
+                    obj = obj.sample(n=_PANDAS_SAMPLE_SIZE, seed=0)
                 values_hash_bytes = (
                     obj.hash_rows(seed=0).hash(seed=0).to_arrow().to_string().encode()
                 )
@@ -513,6 +825,9 @@ class _CacheFuncHasher:
                 # Use pickle if polars cannot hash the object for example if
                 # it contains unhashable objects.
                 return b"%s" % pickle.dumps(obj, pickle.HIGHEST_PROTOCOL)
+        elif _is_arrow_data(obj):
+            return _arrow_digest(obj)
+
         elif type_util.is_type(obj, "numpy.ndarray"):
             import numpy as np
 
@@ -522,9 +837,11 @@ class _CacheFuncHasher:
             self.update(h, obj.shape)
             self.update(h, str(obj.dtype))
 
-            if obj.size >= _NP_SIZE_LARGE:
-                import numpy as np
+            if self.strict and not obj.dtype.hasobject:
+                self.update(h, b"".join(_numpy_digests(obj)))
+                return h.digest()
 
+            if obj.size >= _NP_SIZE_LARGE:
                 state = np.random.RandomState(0)
                 obj = state.choice(obj.flat, size=_NP_SAMPLE_SIZE)
 
@@ -537,7 +854,7 @@ class _CacheFuncHasher:
             obj = cast(Image, obj)
 
             # we don't just hash the results of obj.tobytes() because we want to use
-            # the sampling logic for numpy data
+            # the hashing logic for numpy data
             np_array = np.frombuffer(obj.tobytes(), dtype="uint8")
             return self.to_bytes(np_array)
 
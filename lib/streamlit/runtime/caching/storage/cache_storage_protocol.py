@@ -57,7 +57,10 @@ from __future__ import annotations
 
 from abc import abstractmethod
 from dataclasses import dataclass
-from typing import Literal, Protocol
+from typing import TYPE_CHECKING, Any, Literal, Protocol
+
+if TYPE_CHECKING:
+    from contextlib import AbstractContextManager
 
 
 class CacheStorageError(Exception):
@@ -102,6 +105,10 @@ class CacheStorageContext:
         Legacy parameter, that used in Streamlit current cache storage implementation.
         Could be ignored by cache storage implementation, if storage does not support
         persistence or it persistent by default.
+
+    max_size : int or None
+        The maximum total size in bytes of the entries to store in the cache
+        storage. If None, the cache storage will not limit the size of entries.
     """
 
     function_key: str
@@ -109,6 +116,7 @@ class CacheStorageContext:
     ttl_seconds: float | None = None
     max_entries: int | None = None
     persist: Literal["disk"] | None = None
+    max_size: int | None = None
 
 
 class CacheStorage(Protocol):
@@ -126,9 +134,12 @@ class CacheStorage(Protocol):
     """
 
     @abstractmethod
-    def get(self, key: str) -> bytes:
+    def get(self, key: str) -> bytes | memoryview:
         """Returns the stored value for the key.
 
+        Storages may return a memoryview instead of bytes, e.g. of a
+        memory-mapped file, to avoid copying large values.
+
         Raises
         ------
         CacheStorageKeyNotFoundError
@@ -158,6 +169,17 @@ class CacheStorage(Protocol):
         """
         pass
 
+    def compute_value_lock(self, key: str) -> AbstractContextManager[Any] | None:
+        """Returns a lock that is held while the value for the given key is
+        computed, or None if the storage doesn't provide one. It is optional to
+        implement, and should be used by storages that are shared between
+        processes, so that only one process computes a missing value.
+
+        The lock is acquired after the in-process lock for the key, so it
+        is never acquired concurrently by multiple threads of one process.
+        """
+        return None
+
 
 class CacheStorageManager(Protocol):
     """Cache storage manager protocol, that should be implemented by the concrete
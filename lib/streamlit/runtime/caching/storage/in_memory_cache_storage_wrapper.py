@@ -15,8 +15,8 @@ from __future__ import annotations
 
 import math
 import threading
-
-from cachetools import TTLCache
+from collections import deque
+from typing import TYPE_CHECKING, Any, Final
 
 from streamlit.logger import get_logger
 from streamlit.runtime.caching import cache_utils
@@ -27,8 +27,17 @@ from streamlit.runtime.caching.storage.cache_storage_protocol import (
 )
 from streamlit.runtime.stats import CacheStat
 
+if TYPE_CHECKING:
+    from contextlib import AbstractContextManager
+
+    from cachetools import TTLCache
+
 _LOGGER = get_logger(__name__)
 
+# The maximum number of memory cache hits whose access order isn't applied
+# to the memory cache yet. Older hits are dropped from the access order.
+_MAX_PENDING_HITS: Final = 1024
+
 
 class InMemoryCacheStorageWrapper(CacheStorage):
     """
@@ -41,7 +50,8 @@ class InMemoryCacheStorageWrapper(CacheStorage):
     automatically removed if a given time to live (TTL) has passed.
 
     The in-memory cache is also an LRU cache, which means that the entries
-    are automatically removed if the cache size exceeds a given maxsize.
+    are automatically removed if the number of entries exceeds max_entries,
+    or if the total size of the entries in bytes exceeds max_size.
 
     If the storage implements its strategy for maxsize, it is recommended
     (but not necessary) that the storage implement the same LRU strategy,
@@ -52,6 +62,11 @@ class InMemoryCacheStorageWrapper(CacheStorage):
     -----
     Threading: in-memory caching layer is thread safe: we hold self._mem_cache_lock for
     working with this self._mem_cache object.
+    Memory cache hits don't take the lock, so that concurrent reads of the
+    same function don't wait for each other. They read from a plain dict with
+    the entries of self._mem_cache, which is kept in sync under the lock, and
+    record the key, so that the access order is applied to self._mem_cache on
+    its next update.
     However, we do not hold this lock when calling into the underlying storage,
     so it is the responsibility of the that storage to ensure that it is safe to use
     it from multiple threads.
@@ -62,12 +77,21 @@ class InMemoryCacheStorageWrapper(CacheStorage):
         self.function_display_name = context.function_display_name
         self._ttl_seconds = context.ttl_seconds
         self._max_entries = context.max_entries
-        self._mem_cache: TTLCache[str, bytes] = TTLCache(
-            maxsize=self.max_entries,
-            ttl=self.ttl_seconds,
-            timer=cache_utils.TTLCACHE_TIMER,
+        self._max_size = context.max_size
+        self._mem_cache: TTLCache[str, bytes | memoryview] = (
+            cache_utils.create_ttl_cache(
+                max_entries=self.max_entries,
+                ttl_seconds=self.ttl_seconds,
+                max_size=self.max_size,
+                getsizeof=len,
+            )
         )
         self._mem_cache_lock = threading.Lock()
+        # The entries of self._mem_cache with their expiration times, which
+        # are read without holding the lock.
+        self._mem_cache_entries: dict[str, tuple[bytes | memoryview, float]] = {}
+        # The keys of the memory cache hits since the last update.
+        self._pending_hits: deque[str] = deque(maxlen=_MAX_PENDING_HITS)
         self._persist_storage = persist_storage
 
     @property
@@ -78,7 +102,11 @@ class InMemoryCacheStorageWrapper(CacheStorage):
     def max_entries(self) -> float:
         return float(self._max_entries) if self._max_entries is not None else math.inf
 
-    def get(self, key: str) -> bytes:
+    @property
+    def max_size(self) -> float:
+        return float(self._max_size) if self._max_size is not None else math.inf
+
+    def get(self, key: str) -> bytes | memoryview:
         """
         Returns the stored value for the key or raise CacheStorageKeyNotFoundError if
         the key is not found
@@ -92,7 +120,12 @@ class InMemoryCacheStorageWrapper(CacheStorage):
 
     def set(self, key: str, value: bytes) -> None:
         """Sets the value for a given key"""
-        self._write_to_mem_cache(key, value)
+        if not self._write_to_mem_cache(key, value):
+            _LOGGER.warning(
+                "The result of the cached function '%s' is larger than its "
+                "max_size and won't be kept in memory.",
+                self.function_display_name,
+            )
         self._persist_storage.set(key, value)
 
     def delete(self, key: str) -> None:
@@ -104,42 +137,98 @@ class InMemoryCacheStorageWrapper(CacheStorage):
         """Delete all keys for the in memory cache, and also the persistent storage"""
         with self._mem_cache_lock:
             self._mem_cache.clear()
+            self._mem_cache_entries.clear()
+            self._pending_hits.clear()
         self._persist_storage.clear()
 
     def get_stats(self) -> list[CacheStat]:
-        """Returns a list of stats in bytes for the cache memory storage per item"""
-        stats = []
-
+        """Returns the stats in bytes for the cache memory storage"""
         with self._mem_cache_lock:
-            for item in self._mem_cache.values():
-                stats.append(
-                    CacheStat(
-                        category_name="st_cache_data",
-                        cache_name=self.function_display_name,
-                        byte_length=len(item),
-                    )
-                )
-        return stats
+            # The memory cache keeps the total size of its entries, expired
+            # entries are removed first so that they aren't counted.
+            self._mem_cache.expire()
+            self._sync_mem_cache_entries()
+            if len(self._mem_cache) == 0:
+                return []
+            byte_length = int(self._mem_cache.currsize)
+
+        return [
+            CacheStat(
+                category_name="st_cache_data",
+                cache_name=self.function_display_name,
+                byte_length=byte_length,
+            )
+        ]
 
     def close(self) -> None:
         """Closes the cache storage"""
         self._persist_storage.close()
 
-    def _read_from_mem_cache(self, key: str) -> bytes:
+    def compute_value_lock(self, key: str) -> AbstractContextManager[Any] | None:
+        """Returns the compute lock of the persistent storage"""
+        # Custom storages that don't inherit from CacheStorage may not
+        # implement this optional method.
+        compute_value_lock = getattr(self._persist_storage, "compute_value_lock", None)
+        if compute_value_lock is None:
+            return None
+        return compute_value_lock(key)
+
+    def _read_from_mem_cache(self, key: str) -> bytes | memoryview:
+        # Reading a single key of a dict is atomic, so hits don't need the lock.
+        entry = self._mem_cache_entries.get(key)
+        if entry is not None and entry[1] > cache_utils.TTLCACHE_TIMER():
+            self._pending_hits.append(key)
+            _LOGGER.debug("Memory cache HIT: %s", key)
+            # The stored bytes are immutable, so we can return them
+            # without making a copy.
+            return entry[0]
+
+        _LOGGER.debug("Memory cache MISS: %s", key)
+        raise CacheStorageKeyNotFoundError("Key not found in mem cache")
+
+    def _write_to_mem_cache(self, key: str, entry_bytes: bytes | memoryview) -> bool:
+        """Write an entry to the memory cache. Returns False if the entry is
+        larger than max_size, in which case it isn't kept in memory.
+        """
+        # Computed before the entry is written, so the entry doesn't expire
+        # later here than in self._mem_cache.
+        expires_at = cache_utils.TTLCACHE_TIMER() + self.ttl_seconds
         with self._mem_cache_lock:
-            if key in self._mem_cache:
-                entry = bytes(self._mem_cache[key])
-                _LOGGER.debug("Memory cache HIT: %s", key)
-                return entry
-
+            self._apply_pending_hits()
+            try:
+                self._mem_cache[key] = entry_bytes
+            except ValueError:
+                return False
             else:
-                _LOGGER.debug("Memory cache MISS: %s", key)
-                raise CacheStorageKeyNotFoundError("Key not found in mem cache")
-
-    def _write_to_mem_cache(self, key: str, entry_bytes: bytes) -> None:
-        with self._mem_cache_lock:
-            self._mem_cache[key] = entry_bytes
+                self._mem_cache_entries[key] = (entry_bytes, expires_at)
+            finally:
+                # Writing may have evicted or expired other entries.
+                self._sync_mem_cache_entries()
+        return True
 
     def _remove_from_mem_cache(self, key: str) -> None:
         with self._mem_cache_lock:
             self._mem_cache.pop(key, None)
+            self._mem_cache_entries.pop(key, None)
+
+    def _apply_pending_hits(self) -> None:
+        """Move the keys of the memory cache hits to the end of the least
+        recently used order of self._mem_cache.
+
+        Thread safety: callers must hold `self._mem_cache_lock`.
+        """
+        while self._pending_hits:
+            key = self._pending_hits.popleft()
+            if key in self._mem_cache:
+                self._mem_cache[key]
+
+    def _sync_mem_cache_entries(self) -> None:
+        """Remove the entries that self._mem_cache evicted or expired from
+        self._mem_cache_entries.
+
+        Thread safety: callers must hold `self._mem_cache_lock`.
+        """
+        if len(self._mem_cache_entries) == len(self._mem_cache):
+            return
+        for key in [k for k in self._mem_cache_entries if k not in self._mem_cache]:
+            del self._mem_cache_entries[key]
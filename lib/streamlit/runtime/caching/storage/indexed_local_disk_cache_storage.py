@@ -0,0 +1,552 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2025)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Declares the IndexedLocalDiskCacheStorage class, a disk cache storage that
+keeps an SQLite index of its cache files, and the
+IndexedLocalDiskCacheStorageManager class, which creates it.
+
+The index stores the size, expiration time and last access time of every
+cache file in the cache directory. This allows the storage to enforce the
+TTL and `max_entries` of persisted `@st.cache_data` functions, and a total
+byte quota for the cache directory, without listing the directory. When a
+limit is exceeded, the least recently used entries are evicted.
+
+The index is shared by all processes using the same cache directory.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import math
+import mmap
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import IO, TYPE_CHECKING, Any, Final
+
+from streamlit import env_util
+from streamlit.logger import get_logger
+from streamlit.runtime.caching.storage.cache_storage_protocol import (
+    CacheStorage,
+    CacheStorageContext,
+    CacheStorageError,
+    CacheStorageKeyNotFoundError,
+)
+from streamlit.runtime.caching.storage.local_disk_cache_storage import (
+    LocalDiskCacheStorage,
+    LocalDiskCacheStorageManager,
+    get_cache_file_path,
+    get_cache_folder_path,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from contextlib import AbstractContextManager
+
+_LOGGER: Final = get_logger(__name__)
+
+_INDEX_FILE_NAME: Final = "index.sqlite3"
+
+# Subdirectory of the cache directory that contains the compute lock files.
+_LOCKS_DIR_NAME: Final = "locks"
+
+# Values of at least this size are memory-mapped instead of read into memory.
+_MMAP_MIN_SIZE: Final = 1024 * 1024
+
+# The last access time of an entry is only updated on read if it is older
+# than this many seconds, so that most reads don't write to the index.
+_ACCESS_TIME_RESOLUTION: Final = 60.0
+
+# The maximum number of entries that are selected for eviction per query.
+_EVICTION_BATCH_SIZE: Final = 100
+
+# The timer used for expiration and access times. This is wall-clock time,
+# since the index is persisted and shared between processes.
+INDEX_TIMER = time.time
+
+# Stored in `PRAGMA user_version` once the schema is created.
+_SCHEMA_VERSION: Final = 1
+
+# The `functions` table keeps the number and total size of the entries per
+# function, maintained by triggers, so that eviction doesn't need to scan the
+# entries. It is rebuilt from the entries when the schema is created.
+_SCHEMA: Final = f"""
+BEGIN IMMEDIATE;
+CREATE TABLE IF NOT EXISTS entries (
+    function_key TEXT NOT NULL,
+    key TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    expires_at REAL,
+    last_access REAL NOT NULL,
+    PRIMARY KEY (function_key, key)
+);
+CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access);
+CREATE INDEX IF NOT EXISTS entries_expires_at ON entries (expires_at);
+CREATE INDEX IF NOT EXISTS entries_function_last_access
+    ON entries (function_key, last_access);
+CREATE TABLE IF NOT EXISTS functions (
+    function_key TEXT PRIMARY KEY,
+    num_entries INTEGER NOT NULL,
+    total_size INTEGER NOT NULL
+);
+CREATE TRIGGER IF NOT EXISTS entries_insert AFTER INSERT ON entries BEGIN
+    INSERT OR IGNORE INTO functions VALUES (NEW.function_key, 0, 0);
+    UPDATE functions
+        SET num_entries = num_entries + 1, total_size = total_size + NEW.size
+        WHERE function_key = NEW.function_key;
+END;
+CREATE TRIGGER IF NOT EXISTS entries_update AFTER UPDATE OF size ON entries BEGIN
+    UPDATE functions SET total_size = total_size - OLD.size + NEW.size
+        WHERE function_key = NEW.function_key;
+END;
+CREATE TRIGGER IF NOT EXISTS entries_delete AFTER DELETE ON entries BEGIN
+    UPDATE functions
+        SET num_entries = num_entries - 1, total_size = total_size - OLD.size
+        WHERE function_key = OLD.function_key;
+    DELETE FROM functions
+        WHERE function_key = OLD.function_key AND num_entries <= 0;
+END;
+DELETE FROM functions;
+INSERT INTO functions
+    SELECT function_key, COUNT(*), SUM(size) FROM entries GROUP BY function_key;
+PRAGMA user_version = {_SCHEMA_VERSION};
+COMMIT;
+"""
+
+# The open index connections of each thread, by index file path.
+_thread_local = threading.local()
+
+
+class IndexedLocalDiskCacheStorageManager(LocalDiskCacheStorageManager):
+    """Creates IndexedLocalDiskCacheStorage instances wrapped with in-memory
+    cache layer.
+
+    Parameters
+    ----------
+    max_disk_size : int or None
+        The maximum total size in bytes of all cache files in the cache
+        directory, or None for no limit.
+    """
+
+    def __init__(self, max_disk_size: int | None = None):
+        self._max_disk_size = max_disk_size
+
+    def create_persist_storage(self, context: CacheStorageContext) -> CacheStorage:
+        return IndexedLocalDiskCacheStorage(context, self._max_disk_size)
+
+    def check_context(self, context: CacheStorageContext) -> None:
+        # TTL is supported by this storage, so there is nothing to warn about.
+        pass
+
+
+class IndexedLocalDiskCacheStorage(LocalDiskCacheStorage):
+    """Cache storage that persists data to disk and keeps an index of the
+    persisted entries.
+
+    Compared to LocalDiskCacheStorage, this storage:
+
+    - Expires entries after `ttl_seconds`.
+    - Keeps at most `max_entries` entries per function on disk.
+    - Keeps the total size of all cache files below `max_disk_size`.
+    - Writes files atomically, so concurrent readers never see partial files.
+    - Memory-maps large files on read instead of copying them into memory.
+    - Provides a file lock per key, so that processes sharing the cache
+      directory don't compute the same value concurrently (POSIX only).
+
+    Parameters
+    ----------
+    context : CacheStorageContext
+        The context of the cached function.
+    max_disk_size : int or None
+        The maximum total size in bytes of all cache files in the cache
+        directory, or None for no limit.
+    cache_dir : str or None
+        The directory to store the cache files and index in. If None, the
+        default Streamlit cache folder is used.
+    """
+
+    def __init__(
+        self,
+        context: CacheStorageContext,
+        max_disk_size: int | None = None,
+        cache_dir: str | None = None,
+    ):
+        super().__init__(context)
+        self._max_disk_size = max_disk_size
+        self._cache_dir = cache_dir
+
+    @property
+    def cache_dir(self) -> str:
+        return (
+            self._cache_dir if self._cache_dir is not None else get_cache_folder_path()
+        )
+
+    def get(self, key: str) -> bytes | memoryview:
+        """
+        Returns the stored value for the key if persisted,
+        raise CacheStorageKeyNotFoundError if not found, expired, or not
+        configured with persist="disk"
+        """
+        if self.persist != "disk":
+            raise CacheStorageKeyNotFoundError(
+                f"Local disk cache storage is disabled (persist={self.persist})"
+            )
+
+        now = INDEX_TIMER()
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT expires_at, last_access FROM entries "
+                    "WHERE function_key = ? AND key = ?",
+                    (self.function_key, key),
+                ).fetchone()
+                if (
+                    row is not None
+                    and (row[0] is None or row[0] > now)
+                    and row[1] < now - _ACCESS_TIME_RESOLUTION
+                ):
+                    conn.execute(
+                        "UPDATE entries SET last_access = ? "
+                        "WHERE function_key = ? AND key = ?",
+                        (now, self.function_key, key),
+                    )
+        except sqlite3.Error as ex:
+            _LOGGER.exception("Error reading the disk cache index")
+            raise CacheStorageError("Unable to read from cache") from ex
+
+        if row is None:
+            raise CacheStorageKeyNotFoundError("Key not found in disk cache")
+        if row[0] is not None and row[0] <= now:
+            _LOGGER.debug("Disk cache EXPIRED: %s", key)
+            self.delete(key)
+            raise CacheStorageKeyNotFoundError("Key expired in disk cache")
+
+        try:
+            value = self._read_file(self._get_cache_file_path(key))
+        except FileNotFoundError:
+            # The file was removed outside of the index.
+            self.delete(key)
+            raise CacheStorageKeyNotFoundError("Key not found in disk cache")
+        except Exception as ex:
+            _LOGGER.exception("Error reading from cache")
+            raise CacheStorageError("Unable to read from cache") from ex
+
+        _LOGGER.debug("Disk cache HIT: %s", key)
+        return value
+
+    def set(self, key: str, value: bytes) -> None:
+        """Sets the value for a given key"""
+        if self.persist != "disk":
+            return
+
+        size = len(value)
+        if self._max_disk_size is not None and size > self._max_disk_size:
+            _LOGGER.debug("Entry too large for the disk cache: %s", key)
+            return
+
+        path = self._get_cache_file_path(key)
+        try:
+            self._write_file_atomic(path, value)
+        except OSError as ex:
+            _LOGGER.debug("Unable to write to cache", exc_info=ex)
+            raise CacheStorageError("Unable to write to cache") from ex
+
+        now = INDEX_TIMER()
+        expires_at = None if math.isinf(self.ttl_seconds) else now + self.ttl_seconds
+        try:
+            with self._connect() as conn:
+                # An upsert instead of INSERT OR REPLACE, since the delete
+                # trigger doesn't fire for replaced rows.
+                conn.execute(
+                    "INSERT INTO entries "
+                    "(function_key, key, size, expires_at, last_access) "
+                    "VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT (function_key, key) DO UPDATE SET "
+                    "size = excluded.size, expires_at = excluded.expires_at, "
+                    "last_access = excluded.last_access",
+                    (self.function_key, key, size, expires_at, now),
+                )
+                evicted = self._evict(conn, now)
+        except sqlite3.Error as ex:
+            _LOGGER.debug("Unable to update the disk cache index", exc_info=ex)
+            _remove_file(path)
+            raise CacheStorageError("Unable to write to cache") from ex
+
+        for function_key, evicted_key in evicted:
+            _LOGGER.debug("Evicting from disk cache: %s", evicted_key)
+            _remove_file(get_cache_file_path(function_key, evicted_key, self.cache_dir))
+
+    def delete(self, key: str) -> None:
+        """Delete a cache file and its index entry. Does not throw."""
+        if self.persist != "disk":
+            return
+
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "DELETE FROM entries WHERE function_key = ? AND key = ?",
+                    (self.function_key, key),
+                )
+        except sqlite3.Error as ex:
+            _LOGGER.exception("Unable to update the disk cache index", exc_info=ex)
+        _remove_file(self._get_cache_file_path(key))
+
+    def clear(self) -> None:
+        """Delete all keys for the current storage"""
+        cache_dir = self.cache_dir
+        if not os.path.isdir(cache_dir):
+            return
+
+        if os.path.isfile(os.path.join(cache_dir, _INDEX_FILE_NAME)):
+            try:
+                with self._connect() as conn:
+                    conn.execute(
+                        "DELETE FROM entries WHERE function_key = ?",
+                        (self.function_key,),
+                    )
+            except sqlite3.Error as ex:
+                _LOGGER.exception("Unable to update the disk cache index", exc_info=ex)
+
+        # Also remove files that are not in the index, to avoid leaving
+        # orphaned files in the cache directory.
+        for file_name in os.listdir(cache_dir):
+            if self._is_cache_file(file_name):
+                _remove_file(os.path.join(cache_dir, file_name))
+
+        locks_dir = os.path.join(cache_dir, _LOCKS_DIR_NAME)
+        if os.path.isdir(locks_dir) and not env_util.IS_WINDOWS:
+            for file_name in os.listdir(locks_dir):
+                if file_name.startswith(f"{self.function_key}-"):
+                    _FileLock.remove_unlocked(os.path.join(locks_dir, file_name))
+
+    def compute_value_lock(self, key: str) -> AbstractContextManager[Any] | None:
+        """Returns a file lock for the key that is shared by all processes
+        using the same cache directory.
+        """
+        if self.persist != "disk" or env_util.IS_WINDOWS:
+            return None
+        return _FileLock(
+            os.path.join(self.cache_dir, _LOCKS_DIR_NAME, f"{self.function_key}-{key}")
+        )
+
+    def _get_cache_file_path(self, value_key: str) -> str:
+        return get_cache_file_path(self.function_key, value_key, self.cache_dir)
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> list[tuple[str, str]]:
+        """Remove expired and least recently used entries from the index and
+        return the (function_key, key) pairs of the removed entries.
+
+        Every query is bounded by an index, so the cost doesn't grow with
+        the number of entries in the index. At most `_EVICTION_BATCH_SIZE`
+        expired entries are removed per call, the rest on later writes.
+        """
+        evicted = _delete_entries(
+            conn,
+            conn.execute(
+                "SELECT function_key, key FROM entries WHERE expires_at <= ? LIMIT ?",
+                (now, _EVICTION_BATCH_SIZE),
+            ).fetchall(),
+        )
+
+        if not math.isinf(self.max_entries):
+            row = conn.execute(
+                "SELECT num_entries FROM functions WHERE function_key = ?",
+                (self.function_key,),
+            ).fetchone()
+            excess = (row[0] if row is not None else 0) - int(self.max_entries)
+            if excess > 0:
+                evicted += _delete_entries(
+                    conn,
+                    conn.execute(
+                        "SELECT function_key, key FROM entries WHERE function_key = ? "
+                        "ORDER BY last_access LIMIT ?",
+                        (self.function_key, excess),
+                    ).fetchall(),
+                )
+
+        if self._max_disk_size is not None:
+            (total_size,) = conn.execute(
+                "SELECT COALESCE(SUM(total_size), 0) FROM functions"
+            ).fetchone()
+            while total_size > self._max_disk_size:
+                rows = conn.execute(
+                    "SELECT function_key, key, size FROM entries "
+                    "ORDER BY last_access LIMIT ?",
+                    (_EVICTION_BATCH_SIZE,),
+                ).fetchall()
+                if not rows:
+                    break
+                batch = []
+                for function_key, key, size in rows:
+                    if total_size <= self._max_disk_size:
+                        break
+                    batch.append((function_key, key))
+                    total_size -= size
+                evicted += _delete_entries(conn, batch)
+
+        return evicted
+
+    def _connect(self) -> AbstractContextManager[sqlite3.Connection]:
+        return connect_index(self.cache_dir)
+
+    @staticmethod
+    def _read_file(path: str) -> bytes | memoryview:
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            # Memory-mapped files can't be replaced or removed on Windows.
+            if size < _MMAP_MIN_SIZE or env_util.IS_WINDOWS:
+                return f.read()
+            # The mapping stays valid after the file is closed, and on POSIX
+            # systems also after the file is replaced or removed.
+            return memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    @staticmethod
+    def _write_file_atomic(path: str, value: bytes) -> None:
+        """Write the value to a temporary file and move it to the given path,
+        so that readers never see a partially written file.
+        """
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as output:
+                output.write(value)
+            os.replace(tmp_path, path)
+        except BaseException:
+            _remove_file(tmp_path)
+            raise
+
+
+class _FileLock:
+    """An exclusive lock on a file, shared by all processes (POSIX only).
+
+    The lock file is kept after the lock is released, since removing it
+    could let a waiting process lock the removed file while another process
+    locks a new file at the same path.
+    """
+
+    def __init__(self, path: str):
+        self._path = path
+        self._file: IO[bytes] | None = None
+
+    def __enter__(self) -> None:
+        import fcntl
+
+        os.makedirs(os.path.dirname(self._path), exist_ok=True)
+        lock_file = open(self._path, "ab")
+        try:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        except BaseException:
+            lock_file.close()
+            raise
+        self._file = lock_file
+
+    def __exit__(self, *args: object) -> None:
+        import fcntl
+
+        if self._file is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
+
+    @staticmethod
+    def remove_unlocked(path: str) -> None:
+        """Remove the lock file if it isn't locked by any process.
+
+        A process that opened the file but didn't lock it yet may still lock
+        the removed file. In that case, two processes may compute the same
+        value at the same time, which is only wasteful.
+        """
+        import fcntl
+
+        try:
+            lock_file = open(path, "ab")
+        except OSError:
+            return
+        with lock_file:
+            try:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                # The lock is held, so the file is still in use.
+                return
+            _remove_file(path)
+
+
+@contextlib.contextmanager
+def connect_index(cache_dir: str) -> Iterator[sqlite3.Connection]:
+    """Return the connection of the current thread to the index in the given
+    cache directory and commit it on success.
+
+    Connections are kept open per thread, since SQLite connections can't be
+    shared between threads. A connection is reopened if the index file was
+    removed or replaced, e.g. because the cache directory was cleared.
+    """
+    conn = _get_connection(cache_dir)
+    with conn:
+        yield conn
+
+
+def _get_connection(cache_dir: str) -> sqlite3.Connection:
+    path = os.path.join(cache_dir, _INDEX_FILE_NAME)
+    connections: dict[str, tuple[sqlite3.Connection, tuple[int, int]]] = (
+        _thread_local.__dict__.setdefault("connections", {})
+    )
+    file_id = _get_file_id(path)
+
+    cached = connections.pop(path, None)
+    if cached is not None:
+        conn, cached_file_id = cached
+        if file_id == cached_file_id:
+            connections[path] = cached
+            return conn
+        # The open connection keeps the removed file, and thereby its inode,
+        # alive, so a new index file can't have the same file ID.
+        conn.close()
+
+    os.makedirs(cache_dir, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30)
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        (version,) = conn.execute("PRAGMA user_version").fetchone()
+        if version < _SCHEMA_VERSION:
+            conn.executescript(_SCHEMA)
+        file_id = _get_file_id(path)
+    except BaseException:
+        conn.close()
+        raise
+    if file_id is not None:
+        connections[path] = (conn, file_id)
+    return conn
+
+
+def _get_file_id(path: str) -> tuple[int, int] | None:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_dev, stat.st_ino
+
+
+def _delete_entries(
+    conn: sqlite3.Connection, entries: list[tuple[str, str]]
+) -> list[tuple[str, str]]:
+    conn.executemany("DELETE FROM entries WHERE function_key = ? AND key = ?", entries)
+    return entries
+
+
+def _remove_file(path: str) -> None:
+    with contextlib.suppress(OSError):
+        os.remove(path)
@@ -92,11 +92,15 @@ _CACHED_FILE_EXTENSION: Final = "memo"
 class LocalDiskCacheStorageManager(CacheStorageManager):
     def create(self, context: CacheStorageContext) -> CacheStorage:
         """Creates a new cache storage instance wrapped with in-memory cache layer"""
-        persist_storage = LocalDiskCacheStorage(context)
+        persist_storage = self.create_persist_storage(context)
         return InMemoryCacheStorageWrapper(
             persist_storage=persist_storage, context=context
         )
 
+    def create_persist_storage(self, context: CacheStorageContext) -> CacheStorage:
+        """Creates the disk storage instance without the in-memory cache layer"""
+        return LocalDiskCacheStorage(context)
+
     def clear_all(self) -> None:
         cache_path = get_cache_folder_path()
         if os.path.isdir(cache_path):
@@ -207,10 +211,7 @@ class LocalDiskCacheStorage(CacheStorage):
 
     def _get_cache_file_path(self, value_key: str) -> str:
         """Return the path of the disk cache file for the given value."""
-        cache_dir = get_cache_folder_path()
-        return os.path.join(
-            cache_dir, f"{self.function_key}-{value_key}.{_CACHED_FILE_EXTENSION}"
-        )
+        return get_cache_file_path(self.function_key, value_key)
 
     def _is_cache_file(self, fname: str) -> bool:
         """Return true if the given file name is a cache file for this storage."""
@@ -221,3 +222,15 @@ class LocalDiskCacheStorage(CacheStorage):
 
 def get_cache_folder_path() -> str:
     return get_streamlit_file_path(_CACHE_DIR_NAME)
+
+
+def get_cache_file_path(
+    function_key: str, value_key: str, cache_dir: str | None = None
+) -> str:
+    """Return the path of the disk cache file for the given function and value.
+    If cache_dir is None, the default cache folder is used.
+    """
+    return os.path.join(
+        cache_dir if cache_dir is not None else get_cache_folder_path(),
+        f"{function_key}-{value_key}.{_CACHED_FILE_EXTENSION}",
+    )
@@ -0,0 +1,112 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2025)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Declares the SharedCacheStorageManager class, which creates cache storages
+that are shared by multiple Streamlit processes on the same host.
+
+When several Streamlit server processes serve the same app (e.g. behind a load
+balancer), each process would otherwise compute and hold its own copy of every
+`@st.cache_data` value. With the SharedCacheStorageManager, all values are
+written to a shared cache directory, and:
+
+- A value computed by one process is read by all other processes.
+- Only one process computes a missing value at a time, the others wait for
+  it and then read the computed value.
+- Large values are memory-mapped, so processes share the same pages of the
+  OS page cache instead of each holding a copy. Pointing the cache directory
+  to a memory-backed file system (e.g. `/dev/shm` on Linux) avoids disk I/O
+  entirely.
+
+Every process still keeps an in-memory cache layer in front of the shared
+storage, which means that clearing a cache in one process doesn't clear the
+in-memory layers of the other processes.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import dataclasses
+import os
+import sqlite3
+from typing import TYPE_CHECKING, Final
+
+from streamlit.logger import get_logger
+from streamlit.runtime.caching.storage.indexed_local_disk_cache_storage import (
+    IndexedLocalDiskCacheStorage,
+    IndexedLocalDiskCacheStorageManager,
+    connect_index,
+)
+from streamlit.runtime.caching.storage.local_disk_cache_storage import (
+    get_cache_file_path,
+)
+
+if TYPE_CHECKING:
+    from streamlit.runtime.caching.storage.cache_storage_protocol import (
+        CacheStorage,
+        CacheStorageContext,
+    )
+
+_LOGGER: Final = get_logger(__name__)
+
+
+class SharedCacheStorageManager(IndexedLocalDiskCacheStorageManager):
+    """Creates cache storages that store all values in a cache directory
+    shared by multiple processes, wrapped with in-memory cache layer.
+
+    Values are stored in the shared directory regardless of the `persist`
+    parameter of `@st.cache_data`. The TTL and `max_entries` of the cached
+    functions apply to the shared storage.
+
+    Parameters
+    ----------
+    cache_dir : str
+        The directory shared by the processes.
+    max_disk_size : int or None
+        The maximum total size in bytes of all values in the shared directory,
+        or None for no limit.
+    """
+
+    def __init__(self, cache_dir: str, max_disk_size: int | None = None):
+        super().__init__(max_disk_size=max_disk_size)
+        self._cache_dir = cache_dir
+
+    def create_persist_storage(self, context: CacheStorageContext) -> CacheStorage:
+        return IndexedLocalDiskCacheStorage(
+            dataclasses.replace(context, persist="disk"),
+            max_disk_size=self._max_disk_size,
+            cache_dir=self._cache_dir,
+        )
+
+    def clear_all(self) -> None:
+        """Remove all values from the shared directory.
+
+        Only the files that belong to the cache are removed, since the shared
+        directory may be configured to a directory that contains other files.
+        """
+        if not os.path.isdir(self._cache_dir):
+            return
+
+        try:
+            with connect_index(self._cache_dir) as conn:
+                entries = conn.execute(
+                    "SELECT function_key, key FROM entries"
+                ).fetchall()
+                conn.execute("DELETE FROM entries")
+        except sqlite3.Error as ex:
+            _LOGGER.exception("Unable to clear the shared cache index", exc_info=ex)
+            return
+
+        for function_key, key in entries:
+            with contextlib.suppress(OSError):
+                os.remove(get_cache_file_path(function_key, key, self._cache_dir))
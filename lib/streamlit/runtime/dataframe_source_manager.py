@@ -0,0 +1,142 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2025)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Keeps the tables of server-side paged dataframes in memory."""
+
+from __future__ import annotations
+
+import collections
+import threading
+import uuid
+from typing import TYPE_CHECKING, Final
+
+from streamlit.logger import get_logger
+from streamlit.runtime.media_file_manager import _get_session_id
+from streamlit.runtime.stats import CacheStat, CacheStatsProvider, group_stats
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+_LOGGER: Final = get_logger(__name__)
+
+DATAFRAME_SOURCE_ENDPOINT: Final = "/_stcore/dataframe"
+
+
+class DataframeSourceManager(CacheStatsProvider):
+    """In-memory manager for the data sources of server-side paged dataframes.
+
+    For dataframes that are too large to be sent to the browser in full, the
+    table is kept on the server and the frontend requests the rows it needs
+    from the dataframe source endpoint.
+
+    Similar to the MediaFileManager, this keeps track of which sources are used
+    by which AppSession and at which coordinates, so that sources can be
+    removed once no session references them anymore.
+    """
+
+    def __init__(self) -> None:
+        # Dict of [source_id -> pyarrow.Table]
+        self._sources: dict[str, pa.Table] = {}
+
+        # Dict[session ID][coordinates] -> source_id.
+        self._sources_by_session_and_coord: dict[str, dict[str, str]] = (
+            collections.defaultdict(dict)
+        )
+
+        # DataframeSourceManager is used from multiple threads, so all
+        # operations need to be protected with a Lock.
+        self._lock = threading.Lock()
+
+    def add(self, table: pa.Table, coordinates: str) -> str:
+        """Register a table for the element at the given coordinates and
+        return the URL that the frontend can use to query it.
+
+        Safe to call from any thread.
+
+        Parameters
+        ----------
+        table : pyarrow.Table
+            The full table of the dataframe element.
+        coordinates : str
+            Unique string identifying an element's location.
+
+        Returns
+        -------
+        str
+            The url that the frontend can use to fetch rows of the table.
+        """
+        session_id = _get_session_id()
+        source_id = uuid.uuid4().hex
+
+        with self._lock:
+            self._sources[source_id] = table
+            self._sources_by_session_and_coord[session_id][coordinates] = source_id
+
+        return f"{DATAFRAME_SOURCE_ENDPOINT}/{source_id}"
+
+    def get(self, source_id: str) -> pa.Table | None:
+        """Return the table with the given ID, or None if it doesn't exist.
+
+        Safe to call from any thread.
+        """
+        with self._lock:
+            return self._sources.get(source_id)
+
+    def clear_session_refs(self, session_id: str | None = None) -> None:
+        """Remove the given session's source references.
+
+        (This does not remove any sources from the manager - you must call
+        `remove_orphaned_sources` for that.)
+
+        Safe to call from any thread.
+        """
+        if session_id is None:
+            session_id = _get_session_id()
+
+        _LOGGER.debug("Disconnecting dataframe sources for session %s", session_id)
+
+        with self._lock:
+            self._sources_by_session_and_coord.pop(session_id, None)
+
+    def remove_orphaned_sources(self) -> None:
+        """Remove all sources that are no longer referenced by any session.
+
+        Safe to call from any thread.
+        """
+        with self._lock:
+            source_ids = set(self._sources.keys())
+            for session_source_ids in self._sources_by_session_and_coord.values():
+                source_ids.difference_update(session_source_ids.values())
+
+            for source_id in source_ids:
+                _LOGGER.debug("Deleting dataframe source: %s", source_id)
+                del self._sources[source_id]
+
+    def get_stats(self) -> list[CacheStat]:
+        """Return the manager's CacheStats.
+
+        Safe to call from any thread.
+        """
+        with self._lock:
+            tables = list(self._sources.values())
+
+        stats: list[CacheStat] = [
+            CacheStat(
+                category_name="DataframeSourceManager",
+                cache_name="",
+                byte_length=table.nbytes,
+            )
+            for table in tables
+        ]
+        return group_stats(stats)
@@ -0,0 +1,417 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2025)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""MediaFileStorage implementation that keeps files in memory up to a memory
+budget, and spills the rest to a temporary directory.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import itertools
+import os
+import os.path
+import shutil
+import tempfile
+import threading
+import weakref
+from collections import OrderedDict
+from typing import TYPE_CHECKING, BinaryIO, Final, NamedTuple, Union
+
+from typing_extensions import TypeAlias
+
+from streamlit.logger import get_logger
+from streamlit.runtime.media_file_storage import (
+    MediaFileKind,
+    MediaFileStorage,
+    MediaFileStorageError,
+)
+from streamlit.runtime.memory_media_file_storage import (
+    MemoryFile,
+    _calculate_file_id,
+    get_extension_for_mimetype,
+)
+from streamlit.runtime.stats import CacheStat, CacheStatsProvider, group_stats
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+_LOGGER: Final = get_logger(__name__)
+
+# The size of the chunks in which files are copied and served.
+_CHUNK_SIZE: Final = 64 * 1024
+
+
+class DiskFile(NamedTuple):
+    """A MediaFile stored in a file on disk."""
+
+    path: str
+    mimetype: str
+    kind: MediaFileKind
+    filename: str | None
+    content_size: int
+
+    @property
+    def content(self) -> bytes:
+        """Read the whole file into memory. Prefer `iter_content`."""
+        with open(self.path, "rb") as f:
+            return f.read()
+
+    def iter_content(
+        self, start: int | None = None, end: int | None = None
+    ) -> Iterator[bytes]:
+        """Return an iterator over the content between the start and end
+        offsets in chunks.
+
+        The file is opened before this returns, so the content can still be
+        read if the file is deleted from the storage in the meantime (on
+        POSIX). Raises OSError if the file can't be opened.
+        """
+        if start is None:
+            start = 0
+        if end is None:
+            end = self.content_size
+
+        f = open(self.path, "rb")
+        return _iter_file_chunks(f, start, end)
+
+
+def _iter_file_chunks(f: BinaryIO, start: int, end: int) -> Iterator[bytes]:
+    with f:
+        f.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            chunk = f.read(min(_CHUNK_SIZE, remaining))
+            if not chunk:
+                return
+            remaining -= len(chunk)
+            yield chunk
+
+
+MediaFile: TypeAlias = Union[MemoryFile, DiskFile]
+
+
+class DiskSpillingMediaFileStorage(MediaFileStorage, CacheStatsProvider):
+    def __init__(
+        self, media_endpoint: str, memory_budget: int, spill_dir: str | None = None
+    ):
+        """Create a new DiskSpillingMediaFileStorage instance
+
+        Parameters
+        ----------
+        media_endpoint
+            The name of the local endpoint that media is served from.
+            This endpoint should start with a forward-slash (e.g. "/media").
+        memory_budget
+            The maximum total size in bytes of the files kept in memory. When
+            it's exceeded, the least recently used files are spilled to disk.
+            Files that are larger than the budget are written to disk
+            directly.
+        spill_dir
+            The directory that spilled files are written to. If None, a
+            temporary directory is created when the first file is spilled, and
+            removed when the storage is garbage collected or the process
+            exits.
+        """
+        self._media_endpoint = media_endpoint
+        self._memory_budget = memory_budget
+        self._spill_dir = spill_dir
+        # Ordered from the least to the most recently used file.
+        self._files_by_id: OrderedDict[str, MediaFile] = OrderedDict()
+        # The total size of the files in memory, without the files that are
+        # being spilled to disk.
+        self._memory_size = 0
+        # The files in memory that are being spilled to disk, by ID.
+        self._spilling_files: dict[str, MemoryFile] = {}
+        self._lock = threading.Lock()
+        self._spill_dir_lock = threading.Lock()
+        # Every write gets its own path, so that deleting a file never
+        # removes a file that was written for the same ID later.
+        self._path_counter = itertools.count()
+
+    def load_and_get_id(
+        self,
+        path_or_data: str | bytes,
+        mimetype: str,
+        kind: MediaFileKind,
+        filename: str | None = None,
+    ) -> str:
+        """Add a file to the manager and return its ID."""
+        if isinstance(path_or_data, str):
+            try:
+                file_size = os.path.getsize(path_or_data)
+            except OSError as ex:
+                raise MediaFileStorageError(f"Error opening '{path_or_data}'") from ex
+
+            if file_size > self._memory_budget:
+                # Copy the file to disk in chunks instead of reading it into
+                # memory.
+                return self._copy_file(path_or_data, mimetype, kind, filename)
+
+            file_data = self._read_file(path_or_data)
+        else:
+            file_data = path_or_data
+
+        # Because our file_ids are stable, if we already have a file with the
+        # given ID, we don't need to create a new one.
+        file_id = _calculate_file_id(file_data, mimetype, filename)
+        files_to_spill: list[tuple[str, MemoryFile]] = []
+        with self._lock:
+            if file_id in self._files_by_id:
+                self._files_by_id.move_to_end(file_id)
+                return file_id
+
+            if len(file_data) <= self._memory_budget:
+                _LOGGER.debug("Adding media file %s", file_id)
+                self._files_by_id[file_id] = MemoryFile(
+                    content=file_data, mimetype=mimetype, kind=kind, filename=filename
+                )
+                self._memory_size += len(file_data)
+                files_to_spill = self._select_files_to_spill()
+
+        # Files are written without holding the lock, so that serving other
+        # files doesn't wait for the writes.
+        if len(file_data) > self._memory_budget:
+            self._add_disk_file(
+                file_id,
+                self._write_disk_file(file_id, file_data, mimetype, kind, filename),
+            )
+        else:
+            self._spill(files_to_spill)
+
+        return file_id
+
+    def get_file(self, filename: str) -> MediaFile:
+        """Return the MediaFile with the given filename. Filenames are of the
+        form "file_id.extension". (Note that this is *not* the optional
+        user-specified filename for download files.)
+
+        Raises a MediaFileStorageError if no such file exists.
+        """
+        file_id = os.path.splitext(filename)[0]
+        with self._lock:
+            try:
+                media_file = self._files_by_id[file_id]
+            except KeyError as e:
+                raise MediaFileStorageError(
+                    f"Bad filename '{filename}'. (No media file with id '{file_id}')"
+                ) from e
+            self._files_by_id.move_to_end(file_id)
+            return media_file
+
+    def get_url(self, file_id: str) -> str:
+        """Get a URL for a given media file. Raise a MediaFileStorageError if
+        no such file exists.
+        """
+        media_file = self.get_file(file_id)
+        extension = get_extension_for_mimetype(media_file.mimetype)
+        return f"{self._media_endpoint}/{file_id}{extension}"
+
+    def delete_file(self, file_id: str) -> None:
+        """Delete the file with the given ID."""
+        with self._lock:
+            media_file = self._files_by_id.pop(file_id, None)
+            if (
+                isinstance(media_file, MemoryFile)
+                and self._spilling_files.get(file_id) is not media_file
+            ):
+                self._memory_size -= media_file.content_size
+
+        if isinstance(media_file, DiskFile):
+            # A request that is still serving the file keeps its open file
+            # handle, so the file can be removed while it's served (on POSIX).
+            _remove_file(media_file.path)
+
+    def get_stats(self) -> list[CacheStat]:
+        with self._lock:
+            memory_files = [
+                file
+                for file in self._files_by_id.values()
+                if isinstance(file, MemoryFile)
+            ]
+
+        stats: list[CacheStat] = [
+            CacheStat(
+                category_name="st_disk_spilling_media_file_storage",
+                cache_name="",
+                byte_length=file.content_size,
+            )
+            for file in memory_files
+        ]
+        return group_stats(stats)
+
+    def _select_files_to_spill(self) -> list[tuple[str, MemoryFile]]:
+        """Select the least recently used files in memory to spill to disk
+        until the other files in memory fit the memory budget. The selected
+        files aren't counted in the memory size anymore.
+
+        Thread safety: callers must hold `self._lock`.
+        """
+        files_to_spill: list[tuple[str, MemoryFile]] = []
+        for file_id, media_file in self._files_by_id.items():
+            if self._memory_size <= self._memory_budget:
+                break
+            if (
+                isinstance(media_file, MemoryFile)
+                and file_id not in self._spilling_files
+            ):
+                files_to_spill.append((file_id, media_file))
+                self._spilling_files[file_id] = media_file
+                self._memory_size -= media_file.content_size
+        return files_to_spill
+
+    def _spill(self, files_to_spill: list[tuple[str, MemoryFile]]) -> None:
+        """Write the files to disk, and replace the files in memory with them
+        unless they were deleted in the meantime.
+
+        Thread safety: callers must NOT hold `self._lock`.
+        """
+        for file_id, media_file in files_to_spill:
+            _LOGGER.debug("Spilling media file %s to disk", file_id)
+            disk_file: DiskFile | None
+            try:
+                disk_file = self._write_disk_file(
+                    file_id,
+                    media_file.content,
+                    media_file.mimetype,
+                    media_file.kind,
+                    media_file.filename,
+                )
+            except MediaFileStorageError:
+                _LOGGER.warning(
+                    "Unable to spill media file %s to disk", file_id, exc_info=True
+                )
+                disk_file = None
+
+            with self._lock:
+                del self._spilling_files[file_id]
+                if self._files_by_id.get(file_id) is media_file:
+                    if disk_file is not None:
+                        # Replacing the value keeps the file's position in
+                        # the LRU order.
+                        self._files_by_id[file_id] = disk_file
+                        continue
+                    # The file stays in memory.
+                    self._memory_size += media_file.content_size
+
+            if disk_file is not None:
+                _remove_file(disk_file.path)
+
+    def _add_disk_file(self, file_id: str, disk_file: DiskFile) -> None:
+        """Add a file that was written to disk, unless a file with the same
+        ID was added in the meantime.
+        """
+        with self._lock:
+            if file_id not in self._files_by_id:
+                _LOGGER.debug("Adding media file %s", file_id)
+                self._files_by_id[file_id] = disk_file
+                return
+            self._files_by_id.move_to_end(file_id)
+        _remove_file(disk_file.path)
+
+    def _write_disk_file(
+        self,
+        file_id: str,
+        data: bytes,
+        mimetype: str,
+        kind: MediaFileKind,
+        filename: str | None,
+    ) -> DiskFile:
+        path = self._get_disk_path(file_id)
+        try:
+            with open(path, "wb") as f:
+                f.write(data)
+        except OSError as ex:
+            raise MediaFileStorageError(f"Error writing media file '{path}'") from ex
+        return DiskFile(
+            path=path,
+            mimetype=mimetype,
+            kind=kind,
+            filename=filename,
+            content_size=len(data),
+        )
+
+    def _copy_file(
+        self, path: str, mimetype: str, kind: MediaFileKind, filename: str | None
+    ) -> str:
+        """Copy the file at the given path to the spill directory in chunks,
+        computing its ID along the way, and return the ID.
+        """
+        # The same hash as `_calculate_file_id`, computed incrementally.
+        filehash = hashlib.new("sha224", usedforsecurity=False)
+        fd, tmp_path = tempfile.mkstemp(dir=self._get_spill_dir(), suffix=".tmp")
+        try:
+            content_size = 0
+            with open(path, "rb") as source, os.fdopen(fd, "wb") as output:
+                while chunk := source.read(_CHUNK_SIZE):
+                    filehash.update(chunk)
+                    output.write(chunk)
+                    content_size += len(chunk)
+        except Exception as ex:
+            _remove_file(tmp_path)
+            raise MediaFileStorageError(f"Error opening '{path}'") from ex
+
+        filehash.update(bytes(mimetype.encode()))
+        if filename is not None:
+            filehash.update(bytes(filename.encode()))
+        file_id = filehash.hexdigest()
+
+        with self._lock:
+            if file_id in self._files_by_id:
+                self._files_by_id.move_to_end(file_id)
+                _remove_file(tmp_path)
+                return file_id
+
+            _LOGGER.debug("Adding media file %s", file_id)
+            disk_path = self._get_disk_path(file_id)
+            os.replace(tmp_path, disk_path)
+            self._files_by_id[file_id] = DiskFile(
+                path=disk_path,
+                mimetype=mimetype,
+                kind=kind,
+                filename=filename,
+                content_size=content_size,
+            )
+        return file_id
+
+    def _get_disk_path(self, file_id: str) -> str:
+        return os.path.join(
+            self._get_spill_dir(), f"{file_id}-{next(self._path_counter)}"
+        )
+
+    def _get_spill_dir(self) -> str:
+        with self._spill_dir_lock:
+            if self._spill_dir is None:
+                self._spill_dir = tempfile.mkdtemp(prefix="streamlit-media-")
+                # Remove the directory along with the storage, or on exit.
+                weakref.finalize(
+                    self, shutil.rmtree, self._spill_dir, ignore_errors=True
+                )
+            else:
+                os.makedirs(self._spill_dir, exist_ok=True)
+            return self._spill_dir
+
+    def _read_file(self, filename: str) -> bytes:
+        """Read a file into memory. Raise MediaFileStorageError if we can't."""
+        try:
+            with open(filename, "rb") as f:
+                return f.read()
+        except Exception as ex:
+            raise MediaFileStorageError(f"Error opening '{filename}'") from ex
+
+
+def _remove_file(path: str) -> None:
+    with contextlib.suppress(OSError):
+        os.remove(path)
@@ -0,0 +1,181 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2025)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import contextlib
+import mmap
+import os
+import shutil
+import tempfile
+import threading
+import weakref
+from collections import defaultdict
+
+from streamlit.runtime.memory_uploaded_file_manager import MemoryUploadedFileManager
+from streamlit.runtime.uploaded_file_manager import UploadedFileRec
+
+
+class DiskUploadedFileManager(MemoryUploadedFileManager):
+    """Holds files uploaded by users of the running Streamlit app in files on
+    disk, which are memory-mapped instead of read into memory.
+
+    Uploads are streamed to disk (see StreamingUploadFileRequestHandler), and
+    the space they use is reserved while they're streamed, so that quotas are
+    enforced before an upload finishes. Files added with `add_file` are kept
+    in memory and don't count towards the quotas.
+
+    This class can be used safely from multiple threads simultaneously.
+    """
+
+    def __init__(
+        self,
+        upload_endpoint: str,
+        upload_dir: str | None = None,
+        max_total_size: int | None = None,
+        max_session_size: int | None = None,
+    ):
+        """
+        Parameters
+        ----------
+        upload_endpoint
+            The endpoint that files are uploaded to.
+        upload_dir
+            The directory that uploaded files are written to. If None, a
+            temporary directory is created for the first upload, and removed
+            when the manager is garbage collected or the process exits.
+        max_total_size
+            The maximum total size in bytes of the uploaded files of all
+            sessions, or None for no limit.
+        max_session_size
+            The maximum total size in bytes of the uploaded files of a single
+            session, or None for no limit.
+        """
+        super().__init__(upload_endpoint)
+        self._upload_dir = upload_dir
+        self._max_total_size = max_total_size
+        self._max_session_size = max_session_size
+
+        # The bytes used by stored files and uploads in progress.
+        self._total_size = 0
+        self._session_sizes: dict[str, int] = defaultdict(int)
+        # Mapping of (session_id, file_id): (path, reserved bytes)
+        self._file_paths: dict[tuple[str, str], tuple[str, int]] = {}
+        self._lock = threading.Lock()
+        self._upload_dir_lock = threading.Lock()
+
+    def reserve(self, session_id: str, num_bytes: int) -> bool:
+        """Reserve space for an upload in progress.
+
+        Returns False, and reserves nothing, if the reservation would exceed
+        the total or the session quota.
+        """
+        with self._lock:
+            total_size = self._total_size + num_bytes
+            session_size = self._session_sizes.get(session_id, 0) + num_bytes
+            if (
+                self._max_total_size is not None and total_size > self._max_total_size
+            ) or (
+                self._max_session_size is not None
+                and session_size > self._max_session_size
+            ):
+                return False
+
+            self._total_size = total_size
+            self._session_sizes[session_id] = session_size
+            return True
+
+    def release(self, session_id: str, num_bytes: int) -> None:
+        """Release space that was reserved with `reserve`."""
+        with self._lock:
+            self._release(session_id, num_bytes)
+
+    def create_upload_file(self) -> tuple[int, str]:
+        """Create a new file for an upload in progress, and return its file
+        descriptor and path.
+        """
+        return tempfile.mkstemp(dir=self._get_upload_dir(), suffix=".upload")
+
+    def add_file_from_path(
+        self,
+        session_id: str,
+        file_id: str,
+        name: str,
+        type: str,
+        path: str,
+        reserved_size: int,
+    ) -> None:
+        """Add an uploaded file that was written to the given path.
+
+        The manager takes over the file and the space reserved for it, which
+        are released when the file is removed.
+        """
+        data: bytes | mmap.mmap
+        if os.path.getsize(path) == 0:
+            # Empty files can't be memory-mapped.
+            data = b""
+        else:
+            with open(path, "rb") as f:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        file = UploadedFileRec(file_id=file_id, name=name, type=type, data=data)
+        with self._lock:
+            self._remove_file(session_id, file_id)
+            self._store_file(session_id, file)
+            self._file_paths[(session_id, file_id)] = (path, reserved_size)
+
+    def remove_file(self, session_id, file_id):
+        """Remove file with given file_id associated with a given session."""
+        with self._lock:
+            self._remove_file(session_id, file_id)
+
+    def remove_session_files(self, session_id: str) -> None:
+        """Remove all files associated with a given session."""
+        with self._lock:
+            for file_id in list(self.file_storage.get(session_id, {})):
+                self._remove_file(session_id, file_id)
+            super().remove_session_files(session_id)
+
+    def _remove_file(self, session_id: str, file_id: str) -> None:
+        """Thread safety: callers must hold `self._lock`."""
+        self._pop_file(session_id, file_id)
+        path_and_size = self._file_paths.pop((session_id, file_id), None)
+        if path_and_size is None:
+            return
+
+        path, reserved_size = path_and_size
+        self._release(session_id, reserved_size)
+        # UploadedFiles that still use the file keep their memory map, so the
+        # file can be removed while it's in use (on POSIX).
+        with contextlib.suppress(OSError):
+            os.remove(path)
+
+    def _release(self, session_id: str, num_bytes: int) -> None:
+        """Thread safety: callers must hold `self._lock`."""
+        self._total_size -= num_bytes
+        self._session_sizes[session_id] -= num_bytes
+        if self._session_sizes[session_id] <= 0:
+            del self._session_sizes[session_id]
+
+    def _get_upload_dir(self) -> str:
+        with self._upload_dir_lock:
+            if self._upload_dir is None:
+                self._upload_dir = tempfile.mkdtemp(prefix="streamlit-uploads-")
+                # Remove the directory along with the manager, or on exit.
+                weakref.finalize(
+                    self, shutil.rmtree, self._upload_dir, ignore_errors=True
+                )
+            else:
+                os.makedirs(self._upload_dir, exist_ok=True)
+            return self._upload_dir
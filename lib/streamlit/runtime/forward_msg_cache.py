@@ -14,13 +14,19 @@
 
 from __future__ import annotations
 
+from collections import OrderedDict
 from typing import TYPE_CHECKING, Final
 from weakref import WeakKeyDictionary
 
 from streamlit import config, util
 from streamlit.logger import get_logger
 from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
-from streamlit.runtime.stats import CacheStat, CacheStatsProvider, group_stats
+from streamlit.runtime.stats import (
+    CacheCounter,
+    CacheCountersProvider,
+    CacheStat,
+    CacheStatsProvider,
+)
 
 if TYPE_CHECKING:
     from collections.abc import MutableMapping
@@ -29,8 +35,51 @@ if TYPE_CHECKING:
 
 _LOGGER: Final = get_logger(__name__)
 
+try:
+    from xxhash import xxh3_128 as _xxh3_128
+except ImportError:
+    _xxh3_128 = None
 
-def populate_hash_if_needed(msg: ForwardMsg) -> str:
+
+def serialize_forward_msg_payload(msg: ForwardMsg) -> bytes:
+    """Serialize the content of a ForwardMsg, i.e. everything except its
+    hash and metadata.
+
+    Protobuf messages can be encoded with their fields in any order, so
+    the serialized payload can later be prefixed with the serialized hash and
+    metadata to produce the full message that's sent to the client (see
+    `runtime_util.serialize_forward_msg`). This lets us serialize a message
+    only once to both hash it and send it.
+    """
+    # Move the message's hash and metadata aside. They're not part of
+    # the payload.
+    msg_hash = msg.hash
+    metadata = msg.metadata if msg.HasField("metadata") else None
+    msg.ClearField("hash")
+    msg.ClearField("metadata")
+
+    payload = msg.SerializeToString()
+
+    # Restore hash and metadata.
+    msg.hash = msg_hash
+    if metadata is not None:
+        msg.metadata.CopyFrom(metadata)
+
+    return payload
+
+
+def calc_payload_hash(payload: bytes) -> str:
+    """Return the hash of a serialized ForwardMsg payload.
+
+    We only need uniqueness, so we use xxhash if it's installed, and fall back
+    to MD5 otherwise.
+    """
+    if _xxh3_128 is not None:
+        return _xxh3_128(payload).hexdigest()
+    return util.calc_md5(payload)
+
+
+def populate_hash_if_needed(msg: ForwardMsg, payload: bytes | None = None) -> str:
     """Computes and assigns the unique hash for a ForwardMsg.
 
     If the ForwardMsg already has a hash, this is a no-op.
@@ -38,6 +87,10 @@ def populate_hash_if_needed(msg: ForwardMsg) -> str:
     Parameters
     ----------
     msg : ForwardMsg
+    payload : bytes | None
+        The message's serialized payload, as returned by
+        `serialize_forward_msg_payload`. If None, the message will be
+        serialized to compute its hash.
 
     Returns
     -------
@@ -48,16 +101,9 @@ def populate_hash_if_needed(msg: ForwardMsg) -> str:
 
     """
     if msg.hash == "":
-        # Move the message's metadata aside. It's not part of the
-        # hash calculation.
-        metadata = msg.metadata
-        msg.ClearField("metadata")
-
-        # MD5 is good enough for what we need, which is uniqueness.
-        msg.hash = util.calc_md5(msg.SerializeToString())
-
-        # Restore metadata.
-        msg.metadata.CopyFrom(metadata)
+        if payload is None:
+            payload = serialize_forward_msg_payload(msg)
+        msg.hash = calc_payload_hash(payload)
 
     return msg.hash
 
@@ -86,7 +132,7 @@ def create_reference_msg(msg: ForwardMsg) -> ForwardMsg:
     return ref_msg
 
 
-class ForwardMsgCache(CacheStatsProvider):
+class ForwardMsgCache(CacheStatsProvider, CacheCountersProvider):
     """A cache of ForwardMsgs.
 
     Large ForwardMsgs (e.g. those containing big DataFrame payloads) are
@@ -94,6 +140,11 @@ class ForwardMsgCache(CacheStatsProvider):
     rather than the message itself, to a client. Clients can then
     request messages from this cache via another endpoint.
 
+    Entries are kept in least-recently-used order. If the
+    `server.messageCacheMaxBytes` config option is set, the least recently
+    used entries are evicted once the total size of the messages stored in
+    memory exceeds that budget.
+
     This cache is *not* thread safe. It's intended to only be accessed by
     the server thread.
 
@@ -105,10 +156,28 @@ class ForwardMsgCache(CacheStatsProvider):
         Stores the cached message, and the set of AppSessions
         that we've sent the cached message to.
 
+        The message is stored serialized, split into a small header (its hash
+        and metadata) and its payload. The payload bytes are immutable, so the
+        same bytes object can be sent to every session that receives the
+        message, rather than serializing the message again for each of them.
+
         """
 
-        def __init__(self, msg: ForwardMsg | None):
-            self.msg = msg
+        def __init__(self, msg: ForwardMsg | None, payload: bytes | None = None):
+            self.header: ForwardMsg | None = None
+            self.payload: bytes | None = None
+            self.byte_size = 0
+
+            if msg is not None:
+                self.header = ForwardMsg(hash=msg.hash)
+                self.header.metadata.CopyFrom(msg.metadata)
+                self.payload = (
+                    payload
+                    if payload is not None
+                    else serialize_forward_msg_payload(msg)
+                )
+                self.byte_size = self.header.ByteSize() + len(self.payload)
+
             self._session_script_run_counts: MutableMapping[AppSession, int] = (
                 WeakKeyDictionary()
             )
@@ -116,6 +185,17 @@ class ForwardMsgCache(CacheStatsProvider):
         def __repr__(self) -> str:
             return util.repr_(self)
 
+        @property
+        def msg(self) -> ForwardMsg | None:
+            """The cached message, deserialized from its header and payload."""
+            if self.header is None or self.payload is None:
+                return None
+
+            msg = ForwardMsg()
+            msg.CopyFrom(self.header)
+            msg.MergeFromString(self.payload)
+            return msg
+
         def add_session_ref(self, session: AppSession, script_run_count: int) -> None:
             """Adds a reference to a AppSession that has referenced
             this Entry's message.
@@ -153,6 +233,12 @@ class ForwardMsgCache(CacheStatsProvider):
         def remove_session_ref(self, session: AppSession) -> None:
             del self._session_script_run_counts[session]
 
+        def remove_all_session_refs(self) -> list[AppSession]:
+            """Remove the references from all AppSessions and return them."""
+            sessions = list(self._session_script_run_counts.keys())
+            self._session_script_run_counts.clear()
+            return sessions
+
         def has_refs(self) -> bool:
             """True if this Entry has references from any AppSession.
 
@@ -161,13 +247,27 @@ class ForwardMsgCache(CacheStatsProvider):
             return len(self._session_script_run_counts) > 0
 
     def __init__(self):
-        self._entries: dict[str, ForwardMsgCache.Entry] = {}
+        # Mapping of message hash -> Entry, in least-recently-used order.
+        self._entries: OrderedDict[str, ForwardMsgCache.Entry] = OrderedDict()
+        # Mapping of AppSession -> hashes of the entries it references. This
+        # lets us clean up a session's refs without scanning every entry.
+        self._session_hashes: MutableMapping[AppSession, set[str]] = WeakKeyDictionary()
+        # Total size of the messages stored in memory.
+        self._total_bytes = 0
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
 
     def __repr__(self) -> str:
         return util.repr_(self)
 
     def add_message(
-        self, msg: ForwardMsg, session: AppSession, script_run_count: int
+        self,
+        msg: ForwardMsg,
+        session: AppSession,
+        script_run_count: int,
+        payload: bytes | None = None,
     ) -> None:
         """Add a ForwardMsg to the cache.
 
@@ -181,17 +281,28 @@ class ForwardMsgCache(CacheStatsProvider):
         session : AppSession
         script_run_count : int
             The number of times the session's script has run
+        payload : bytes | None
+            The message's serialized payload, as returned by
+            `serialize_forward_msg_payload`. If None and the message isn't
+            cached yet, it will be serialized.
 
         """
-        populate_hash_if_needed(msg)
+        populate_hash_if_needed(msg, payload)
         entry = self._entries.get(msg.hash, None)
         if entry is None:
             if config.get_option("global.storeCachedForwardMessagesInMemory"):
-                entry = ForwardMsgCache.Entry(msg)
+                entry = ForwardMsgCache.Entry(msg, payload)
             else:
                 entry = ForwardMsgCache.Entry(None)
             self._entries[msg.hash] = entry
+            self._total_bytes += entry.byte_size
+        else:
+            self._entries.move_to_end(msg.hash)
+
         entry.add_session_ref(session, script_run_count)
+        self._session_hashes.setdefault(session, set()).add(msg.hash)
+
+        self._maybe_evict_entries()
 
     def get_message(self, hash: str) -> ForwardMsg | None:
         """Return the message with the given ID if it exists in the cache.
@@ -207,7 +318,38 @@ class ForwardMsgCache(CacheStatsProvider):
 
         """
         entry = self._entries.get(hash, None)
-        return entry.msg if entry else None
+        if entry is None:
+            return None
+
+        self._entries.move_to_end(hash)
+        return entry.msg
+
+    def get_serialized_payload(self, hash: str) -> bytes | None:
+        """Return the serialized payload of the message with the given ID if
+        it exists in the cache.
+
+        The returned bytes object is shared by every caller, which lets us
+        send identical messages to many sessions without serializing them
+        again.
+        """
+        entry = self._entries.get(hash, None)
+        if entry is None:
+            return None
+
+        self._entries.move_to_end(hash)
+        return entry.payload
+
+    def get_message_header(self, hash: str) -> ForwardMsg | None:
+        """Return a copy of the hash and metadata of the message with the
+        given ID if it exists in the cache, as a ForwardMsg without payload.
+        """
+        entry = self._entries.get(hash, None)
+        if entry is None or entry.header is None:
+            return None
+
+        header = ForwardMsg()
+        header.CopyFrom(entry.header)
+        return header
 
     def has_message_reference(
         self, msg: ForwardMsg, session: AppSession, script_run_count: int
@@ -217,11 +359,17 @@ class ForwardMsgCache(CacheStatsProvider):
 
         entry = self._entries.get(msg.hash, None)
         if entry is None or not entry.has_session_ref(session):
+            self._misses += 1
             return False
 
         # Ensure we're not expired
         age = entry.get_session_ref_age(session, script_run_count)
-        return age <= int(config.get_option("global.maxCachedMessageAge"))
+        if age > int(config.get_option("global.maxCachedMessageAge")):
+            self._misses += 1
+            return False
+
+        self._hits += 1
+        return True
 
     def remove_refs_for_session(self, session: AppSession) -> None:
         """Remove refs for all entries for the given session.
@@ -233,16 +381,18 @@ class ForwardMsgCache(CacheStatsProvider):
         session : AppSession
         """
 
-        # Operate on a copy of our entries dict.
-        # We may be deleting from it.
-        for msg_hash, entry in self._entries.copy().items():
+        for msg_hash in self._session_hashes.pop(session, set()):
+            entry = self._entries.get(msg_hash, None)
+            if entry is None:
+                continue
+
             if entry.has_session_ref(session):
                 entry.remove_session_ref(session)
 
             if not entry.has_refs():
                 # The entry has no more references. Remove it from
                 # the cache completely.
-                del self._entries[msg_hash]
+                self._remove_entry(msg_hash)
 
     def remove_expired_entries_for_session(
         self, session: AppSession, script_run_count: int
@@ -260,10 +410,16 @@ class ForwardMsgCache(CacheStatsProvider):
         """
         max_age = config.get_option("global.maxCachedMessageAge")
 
-        # Operate on a copy of our entries dict.
-        # We may be deleting from it.
-        for msg_hash, entry in self._entries.copy().items():
-            if not entry.has_session_ref(session):
+        session_hashes = self._session_hashes.get(session, None)
+        if not session_hashes:
+            return
+
+        # Operate on a copy of the session's hashes. We may be deleting
+        # from it.
+        for msg_hash in list(session_hashes):
+            entry = self._entries.get(msg_hash, None)
+            if entry is None or not entry.has_session_ref(session):
+                session_hashes.discard(msg_hash)
                 continue
 
             age = entry.get_session_ref_age(session, script_run_count)
@@ -275,22 +431,68 @@ class ForwardMsgCache(CacheStatsProvider):
                     age,
                 )
                 entry.remove_session_ref(session)
+                session_hashes.discard(msg_hash)
                 if not entry.has_refs():
                     # The entry has no more references. Remove it from
                     # the cache completely.
-                    del self._entries[msg_hash]
+                    self._remove_entry(msg_hash)
 
     def clear(self) -> None:
         """Remove all entries from the cache"""
         self._entries.clear()
+        self._session_hashes.clear()
+        self._total_bytes = 0
+
+    def _remove_entry(self, msg_hash: str) -> None:
+        """Remove an entry from the cache and update its byte count."""
+        entry = self._entries.pop(msg_hash)
+        self._total_bytes -= entry.byte_size
+
+    def _maybe_evict_entries(self) -> None:
+        """Evict the least recently used entries until the messages stored in
+        memory fit in `server.messageCacheMaxBytes`.
+
+        A value of 0 for the config option disables the limit.
+        """
+        max_bytes = config.get_option("server.messageCacheMaxBytes")
+        if max_bytes <= 0:
+            return
+
+        while self._total_bytes > max_bytes and self._entries:
+            msg_hash, entry = next(iter(self._entries.items()))
+            _LOGGER.debug(
+                "Evicting entry [hash=%s, bytes=%s]", msg_hash, entry.byte_size
+            )
+            for session in entry.remove_all_session_refs():
+                session_hashes = self._session_hashes.get(session, None)
+                if session_hashes is not None:
+                    session_hashes.discard(msg_hash)
+            self._remove_entry(msg_hash)
+            self._evictions += 1
 
     def get_stats(self) -> list[CacheStat]:
-        stats: list[CacheStat] = [
+        if not self._entries:
+            return []
+
+        return [
             CacheStat(
                 category_name="ForwardMessageCache",
                 cache_name="",
-                byte_length=entry.msg.ByteSize() if entry.msg is not None else 0,
+                byte_length=self._total_bytes,
+            )
+        ]
+
+    def get_counters(self) -> list[CacheCounter]:
+        return [
+            CacheCounter(
+                category_name="ForwardMessageCache",
+                cache_name="",
+                counter_name=counter_name,
+                value=value,
+            )
+            for counter_name, value in (
+                ("hits", self._hits),
+                ("misses", self._misses),
+                ("evictions", self._evictions),
             )
-            for _, entry in self._entries.items()
         ]
-        return group_stats(stats)
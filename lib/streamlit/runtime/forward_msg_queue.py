@@ -237,4 +237,6 @@ def _update_script_finished_message(
         or msg.script_finished != ForwardMsg.ScriptFinishedStatus.FINISHED_SUCCESSFULLY
     ):
         msg.script_finished = ForwardMsg.ScriptFinishedStatus.FINISHED_EARLY_FOR_RERUN
+        # The message's content changed, so a previously computed hash is stale.
+        msg.ClearField("hash")
     return msg
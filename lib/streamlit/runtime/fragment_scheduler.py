@@ -0,0 +1,117 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2025)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Server-side scheduling of fragments with `run_every`.
+
+If the `server.scheduleFragmentRuns` config option is set, the periodic runs
+of fragments are requested by the FragmentScheduler of the Runtime instead of
+by timers in the browser.
+
+The ticks of a fragment are aligned to multiples of its interval on the event
+loop clock, so sessions that show the same fragment run it at the same time
+and share the results of the cached functions it calls.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+from typing import Callable, Final
+
+from streamlit.logger import get_logger
+
+_LOGGER: Final = get_logger(__name__)
+
+
+class FragmentScheduler:
+    """Requests the periodic runs of fragments, per session.
+
+    Notes
+    -----
+    Threading: UNSAFE. Must only be used on the eventloop thread.
+    """
+
+    def __init__(self, request_fragment_run: Callable[[str, str], None]):
+        """Create a FragmentScheduler.
+
+        Parameters
+        ----------
+        request_fragment_run
+            Called with the session ID and the fragment ID on every tick of a
+            scheduled fragment.
+        """
+        self._request_fragment_run = request_fragment_run
+        # The interval and the timer of the next tick of the scheduled
+        # fragments, by session ID and fragment ID.
+        self._timers: dict[str, dict[str, tuple[float, asyncio.TimerHandle]]] = {}
+
+    def schedule(self, session_id: str, fragment_id: str, interval: float) -> None:
+        """Run the fragment of the session every `interval` seconds.
+
+        Scheduling a fragment again with the same interval keeps its timer.
+        """
+        if interval <= 0:
+            return
+
+        timers = self._timers.setdefault(session_id, {})
+        scheduled = timers.get(fragment_id)
+        if scheduled is not None:
+            if scheduled[0] == interval:
+                return
+            scheduled[1].cancel()
+
+        timers[fragment_id] = (
+            interval,
+            self._call_at_next_tick(session_id, fragment_id, interval),
+        )
+
+    def unschedule_session(self, session_id: str) -> None:
+        """Stop running the fragments of the session."""
+        for _, timer in self._timers.pop(session_id, {}).values():
+            timer.cancel()
+
+    def unschedule_all(self) -> None:
+        """Stop running the fragments of all sessions."""
+        for session_id in list(self._timers):
+            self.unschedule_session(session_id)
+
+    def is_scheduled(self, session_id: str, fragment_id: str) -> bool:
+        return fragment_id in self._timers.get(session_id, {})
+
+    def _call_at_next_tick(
+        self, session_id: str, fragment_id: str, interval: float
+    ) -> asyncio.TimerHandle:
+        loop = asyncio.get_running_loop()
+        next_tick = (math.floor(loop.time() / interval) + 1) * interval
+        return loop.call_at(next_tick, self._on_tick, session_id, fragment_id)
+
+    def _on_tick(self, session_id: str, fragment_id: str) -> None:
+        scheduled = self._timers.get(session_id, {}).get(fragment_id)
+        if scheduled is None:
+            return
+
+        interval = scheduled[0]
+        self._timers[session_id][fragment_id] = (
+            interval,
+            self._call_at_next_tick(session_id, fragment_id, interval),
+        )
+
+        try:
+            self._request_fragment_run(session_id, fragment_id)
+        except Exception:
+            _LOGGER.exception(
+                "Failed to request a run of fragment %s of session %s.",
+                fragment_id,
+                session_id,
+            )
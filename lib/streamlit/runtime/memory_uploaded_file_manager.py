@@ -14,12 +14,14 @@
 
 from __future__ import annotations
 
+import mmap
+import threading
 import uuid
-from collections import defaultdict
+from collections import Counter, defaultdict
 from typing import TYPE_CHECKING
 
 from streamlit import util
-from streamlit.runtime.stats import CacheStat, group_stats
+from streamlit.runtime.stats import CacheStat
 from streamlit.runtime.uploaded_file_manager import (
     UploadedFileManager,
     UploadedFileRec,
@@ -39,6 +41,13 @@ class MemoryUploadedFileManager(UploadedFileManager):
         self.file_storage: dict[str, dict[str, UploadedFileRec]] = defaultdict(dict)
         self.endpoint = upload_endpoint
 
+        # The number of stored files and the total size of their data, by the
+        # cache name they're reported under. They're maintained on add and
+        # remove so that `get_stats` doesn't need to iterate all files.
+        self._num_files: Counter[str] = Counter()
+        self._sizes: Counter[str] = Counter()
+        self._file_storage_lock = threading.Lock()
+
     def get_files(
         self, session_id: str, file_ids: Sequence[str]
     ) -> list[UploadedFileRec]:
@@ -69,7 +78,10 @@ class MemoryUploadedFileManager(UploadedFileManager):
 
     def remove_session_files(self, session_id: str) -> None:
         """Remove all files associated with a given session."""
-        self.file_storage.pop(session_id, None)
+        with self._file_storage_lock:
+            session_storage = self.file_storage.pop(session_id, None)
+            for file in (session_storage or {}).values():
+                self._untrack_file(file)
 
     def __repr__(self) -> str:
         return util.repr_(self)
@@ -90,12 +102,11 @@ class MemoryUploadedFileManager(UploadedFileManager):
             The file to add.
         """
 
-        self.file_storage[session_id][file.file_id] = file
+        self._store_file(session_id, file)
 
     def remove_file(self, session_id, file_id):
         """Remove file with given file_id associated with a given session."""
-        session_storage = self.file_storage[session_id]
-        session_storage.pop(file_id, None)
+        self._pop_file(session_id, file_id)
 
     def get_upload_urls(
         self, session_id: str, file_names: Sequence[str]
@@ -114,25 +125,52 @@ class MemoryUploadedFileManager(UploadedFileManager):
         return result
 
     def get_stats(self) -> list[CacheStat]:
-        """Return the manager's CacheStats.
+        """Return the manager's CacheStats. The size of memory-mapped files is
+        reported under the "disk" cache name.
 
         Safe to call from any thread.
         """
-        # Flatten all files into a single list
-        all_files: list[UploadedFileRec] = []
-        # Make copy of self.file_storage for thread safety, to be sure
-        # that main storage won't be changed form other thread
-        file_storage_copy = self.file_storage.copy()
-
-        for session_storage in file_storage_copy.values():
-            all_files.extend(session_storage.values())
-
-        stats: list[CacheStat] = [
-            CacheStat(
-                category_name="UploadedFileManager",
-                cache_name="",
-                byte_length=len(file.data),
-            )
-            for file in all_files
-        ]
-        return group_stats(stats)
+        with self._file_storage_lock:
+            return [
+                CacheStat(
+                    category_name="UploadedFileManager",
+                    cache_name=cache_name,
+                    byte_length=self._sizes[cache_name],
+                )
+                for cache_name, num_files in sorted(self._num_files.items())
+                if num_files > 0
+            ]
+
+    def _store_file(self, session_id: str, file: UploadedFileRec) -> None:
+        """Store a file, replacing the file with the same ID if it exists."""
+        with self._file_storage_lock:
+            session_storage = self.file_storage[session_id]
+            old_file = session_storage.get(file.file_id)
+            if old_file is not None:
+                self._untrack_file(old_file)
+            session_storage[file.file_id] = file
+            cache_name = _get_cache_name(file)
+            self._num_files[cache_name] += 1
+            self._sizes[cache_name] += len(file.data)
+
+    def _pop_file(self, session_id: str, file_id: str) -> UploadedFileRec | None:
+        """Remove a file and return it, or None if it doesn't exist."""
+        with self._file_storage_lock:
+            file = self.file_storage[session_id].pop(file_id, None)
+            if file is not None:
+                self._untrack_file(file)
+            return file
+
+    def _untrack_file(self, file: UploadedFileRec) -> None:
+        """Thread safety: callers must hold `self._file_storage_lock`."""
+        cache_name = _get_cache_name(file)
+        self._num_files[cache_name] -= 1
+        self._sizes[cache_name] -= len(file.data)
+
+
+def _get_cache_name(file: UploadedFileRec) -> str:
+    """Return the cache name that the file's size is reported under. Memory-
+    mapped files are reported separately, since they don't use the process's
+    memory.
+    """
+    return "disk" if isinstance(file.data, mmap.mmap) else ""
@@ -367,6 +367,7 @@ def gather_metrics(name: str, func: F | None = None) -> Callable[[F], F] | F:
 
         exec_start = timer()
         ctx = get_script_run_ctx(suppress_warning=True)
+        profile = ctx.profile if ctx is not None else None
 
         tracking_activated = (
             ctx is not None
@@ -406,6 +407,8 @@ def gather_metrics(name: str, func: F | None = None) -> Callable[[F], F] | F:
                 # Always capture all exceptions since we want to make sure that
                 # the telemetry never causes any issues.
                 _LOGGER.debug("Failed to collect command telemetry", exc_info=ex)
+        if profile is not None:
+            profile.enter_command(name)
         try:
             result = non_optional_func(*args, **kwargs)
         except RerunException as ex:
@@ -420,6 +423,8 @@ def gather_metrics(name: str, func: F | None = None) -> Callable[[F], F] | F:
             # flag to deactivate tracking.
             if ctx and has_set_command_tracking_deactivated:
                 ctx.command_tracking_deactivated = False
+            if profile is not None:
+                profile.exit_command(exec_start)
 
         if tracking_activated and command_telemetry:
             # Set the execution time to the measured value
@@ -17,6 +17,7 @@ from __future__ import annotations
 import asyncio
 import time
 import traceback
+from collections import deque
 from dataclasses import dataclass, field
 from enum import Enum
 from typing import TYPE_CHECKING, Final, NamedTuple
@@ -30,14 +31,18 @@ from streamlit.runtime.caching import (
     get_data_cache_stats_provider,
     get_resource_cache_stats_provider,
 )
+from streamlit.runtime.caching.cache_prewarm import prewarm_cached_functions
 from streamlit.runtime.caching.storage.local_disk_cache_storage import (
     LocalDiskCacheStorageManager,
 )
+from streamlit.runtime.dataframe_source_manager import DataframeSourceManager
 from streamlit.runtime.forward_msg_cache import (
     ForwardMsgCache,
     create_reference_msg,
     populate_hash_if_needed,
+    serialize_forward_msg_payload,
 )
+from streamlit.runtime.fragment_scheduler import FragmentScheduler
 from streamlit.runtime.media_file_manager import MediaFileManager
 from streamlit.runtime.memory_session_storage import MemorySessionStorage
 from streamlit.runtime.runtime_util import is_cacheable_msg
@@ -54,7 +59,7 @@ from streamlit.runtime.state import (
     SCRIPT_RUN_WITHOUT_ERRORS_KEY,
     SessionStateStatProvider,
 )
-from streamlit.runtime.stats import StatsManager
+from streamlit.runtime.stats import SampledStatsProvider, StatsManager
 from streamlit.runtime.websocket_session_manager import WebsocketSessionManager
 
 if TYPE_CHECKING:
@@ -69,6 +74,10 @@ if TYPE_CHECKING:
 # Wait for the script run result for 60s and if no result is available give up
 SCRIPT_RUN_CHECK_TIMEOUT: Final = 60
 
+# When prewarming caches, the script run may take much longer, since all of
+# its cached functions are called for the first time.
+CACHE_PREWARM_SCRIPT_TIMEOUT: Final = 600
+
 _LOGGER: Final = get_logger(__name__)
 
 
@@ -196,6 +205,9 @@ class Runtime:
         # to it so that it doesn't get garbage collected while running.
         self._loop_coroutine_task: asyncio.Task[None] | None = None
 
+        # The task that prewarms the caches, if prewarming was started.
+        self._prewarm_task: asyncio.Task[bool] | None = None
+
         self._main_script_path = config.script_path
         self._is_hello = config.is_hello
 
@@ -206,6 +218,7 @@ class Runtime:
         self._message_cache = ForwardMsgCache()
         self._uploaded_file_mgr = config.uploaded_file_manager
         self._media_file_mgr = MediaFileManager(storage=config.media_file_storage)
+        self._dataframe_source_mgr = DataframeSourceManager()
         self._cache_storage_manager = config.cache_storage_manager
         self._script_cache = ScriptCache()
 
@@ -216,12 +229,23 @@ class Runtime:
             message_enqueued_callback=self._enqueued_some_message,
         )
 
+        self._fragment_scheduler = FragmentScheduler(
+            self._request_scheduled_fragment_run
+        )
+
         self._stats_mgr = StatsManager()
         self._stats_mgr.register_provider(get_data_cache_stats_provider())
-        self._stats_mgr.register_provider(get_resource_cache_stats_provider())
+        # Resources and session states are measured with a deep size
+        # computation, which is too expensive to run for every stats request.
+        self._stats_mgr.register_provider(
+            SampledStatsProvider(get_resource_cache_stats_provider())
+        )
         self._stats_mgr.register_provider(self._message_cache)
         self._stats_mgr.register_provider(self._uploaded_file_mgr)
-        self._stats_mgr.register_provider(SessionStateStatProvider(self._session_mgr))
+        self._stats_mgr.register_provider(self._dataframe_source_mgr)
+        self._stats_mgr.register_provider(
+            SampledStatsProvider(SessionStateStatProvider(self._session_mgr))
+        )
 
     @property
     def state(self) -> RuntimeState:
@@ -247,10 +271,18 @@ class Runtime:
     def media_file_mgr(self) -> MediaFileManager:
         return self._media_file_mgr
 
+    @property
+    def dataframe_source_mgr(self) -> DataframeSourceManager:
+        return self._dataframe_source_mgr
+
     @property
     def stats_mgr(self) -> StatsManager:
         return self._stats_mgr
 
+    @property
+    def fragment_scheduler(self) -> FragmentScheduler:
+        return self._fragment_scheduler
+
     @property
     def stopped(self) -> Awaitable[None]:
         """A Future that completes when the Runtime's run loop has exited."""
@@ -315,6 +347,11 @@ class Runtime:
 
         await async_objs.started
 
+        if config.get_option("server.cachePrewarm"):
+            # Browsers only connect once the health check reports that we're
+            # ready, which is after prewarming has completed.
+            self._start_prewarm_task()
+
     def stop(self) -> None:
         """Request that Streamlit close all sessions and stop running.
         Note that Streamlit won't stop running immediately.
@@ -451,6 +488,7 @@ class Runtime:
         if session_info:
             self._message_cache.remove_refs_for_session(session_info.session)
             self._session_mgr.close_session(session_id)
+        self._fragment_scheduler.unschedule_session(session_id)
         self._on_session_disconnected()
 
     def disconnect_session(self, session_id: str) -> None:
@@ -549,13 +587,61 @@ class Runtime:
             RuntimeState.STOPPING,
             RuntimeState.STOPPED,
         ):
+            if self._prewarm_task is not None and not self._prewarm_task.done():
+                return False, "warming caches"
             return True, "ok"
 
         return False, "unavailable"
 
-    async def does_script_run_without_error(self) -> tuple[bool, str]:
+    async def prewarm_caches(self) -> bool:
+        """Prewarm the caches of the app's cached functions.
+
+        The app's script is run once in a temporary session, which computes
+        the values of all cached functions that it calls with the default
+        widget values, and registers the cached functions that declare
+        `prewarm` argument sets. These functions are then called with their
+        argument sets on a thread pool.
+
+        Returns
+        -------
+        True if the script and all prewarm calls completed without error.
+
+        Notes
+        -----
+        Threading: UNSAFE. Must be called on the eventloop thread.
+        """
+        return await self._start_prewarm_task()
+
+    def _start_prewarm_task(self) -> asyncio.Task[bool]:
+        if self._prewarm_task is None:
+            self._prewarm_task = asyncio.create_task(
+                self._prewarm_caches(), name="Runtime.prewarm_caches"
+            )
+        return self._prewarm_task
+
+    async def _prewarm_caches(self) -> bool:
+        ok, msg = await self.does_script_run_without_error(
+            timeout=CACHE_PREWARM_SCRIPT_TIMEOUT
+        )
+        if not ok:
+            _LOGGER.warning("The app's script failed while prewarming caches: %s", msg)
+
+        failures = await asyncio.get_running_loop().run_in_executor(
+            None, prewarm_cached_functions
+        )
+        return ok and failures == 0
+
+    async def does_script_run_without_error(
+        self, timeout: float | None = None
+    ) -> tuple[bool, str]:
         """Load and execute the app's script to verify it runs without an error.
 
+        Parameters
+        ----------
+        timeout
+            The maximum time in seconds to wait for the script run to complete.
+            Defaults to SCRIPT_RUN_CHECK_TIMEOUT.
+
         Returns
         -------
         (True, "ok") if the script completes without error, or (False, err_msg)
@@ -576,13 +662,16 @@ class Runtime:
             user_info={"email": "test@example.com"},
         )
 
+        if timeout is None:
+            timeout = SCRIPT_RUN_CHECK_TIMEOUT
+
         try:
             session.request_rerun(None)
 
             now = time.perf_counter()
             while (
                 SCRIPT_RUN_WITHOUT_ERRORS_KEY not in session.session_state
-                and (time.perf_counter() - now) < SCRIPT_RUN_CHECK_TIMEOUT
+                and (time.perf_counter() - now) < timeout
             ):
                 await asyncio.sleep(0.1)
 
@@ -642,22 +731,13 @@ class Runtime:
                 elif self._state == RuntimeState.ONE_OR_MORE_SESSIONS_CONNECTED:
                     async_objs.need_send_data.clear()
 
-                    for active_session_info in self._session_mgr.list_active_sessions():
-                        msg_list = active_session_info.session.flush_browser_queue()
-                        for msg in msg_list:
-                            try:
-                                self._send_message(active_session_info, msg)
-                            except SessionClientDisconnectedError:
-                                self._session_mgr.disconnect_session(
-                                    active_session_info.session.id
-                                )
-
-                            # Yield for a tick after sending a message.
-                            await asyncio.sleep(0)
+                    await self._flush_browser_queues()
 
                     # Yield for a few milliseconds between session message
                     # flushing.
-                    await asyncio.sleep(0.01)
+                    await asyncio.sleep(
+                        config.get_option("server.forwardMsgFlushInterval")
+                    )
                 else:
                     # Break out of the thread loop if we encounter any other state.
                     break
@@ -683,6 +763,7 @@ class Runtime:
                 # now, but this may change in the future if/when our notion of a session
                 # is no longer so tightly coupled to a browser tab.
                 self._session_mgr.close_session(session_info.session.id)
+            self._fragment_scheduler.unschedule_all()
 
             self._set_state(RuntimeState.STOPPED)
             async_objs.stopped.set_result(None)
@@ -696,6 +777,71 @@ Please report this bug at https://github.com/streamlit/streamlit/issues.
 """
             )
 
+    def _request_scheduled_fragment_run(
+        self, session_id: str, fragment_id: str
+    ) -> None:
+        """Request a scheduled run of a fragment of a session.
+
+        Notes
+        -----
+        Threading: UNSAFE. Must be called on the eventloop thread.
+        """
+        if self._session_mgr.get_session_info(session_id) is None:
+            # The session was closed, e.g. because its disconnected session
+            # expired from the session storage.
+            self._fragment_scheduler.unschedule_session(session_id)
+            return
+
+        session_info = self._session_mgr.get_active_session_info(session_id)
+        if session_info is None:
+            # Skip the runs of disconnected sessions, nobody would see them.
+            # The fragment keeps its schedule in case the session reconnects.
+            return
+
+        session_info.session.request_scheduled_fragment_run(fragment_id)
+
+    async def _flush_browser_queues(self) -> None:
+        """Flush the browser queue of every active session and send the
+        resulting ForwardMsgs to their clients.
+
+        Messages are sent in batches of at most `server.forwardMsgBatchSize`
+        per session. Sessions are served round-robin, and we yield to the
+        eventloop once per batch rather than once per message, so that a
+        session that enqueued thousands of deltas can't starve the others.
+
+        Notes
+        -----
+        Threading: UNSAFE. Must be called on the eventloop thread.
+        """
+        batch_size = max(1, config.get_option("server.forwardMsgBatchSize"))
+
+        pending: deque[tuple[ActiveSessionInfo, deque[ForwardMsg]]] = deque()
+        for active_session_info in self._session_mgr.list_active_sessions():
+            msg_list = active_session_info.session.flush_browser_queue()
+            if msg_list:
+                pending.append((active_session_info, deque(msg_list)))
+
+        while pending:
+            session_info, msgs = pending.popleft()
+            session_id = session_info.session.id
+
+            # The session may have been disconnected while we yielded.
+            if not self._session_mgr.is_active_session(session_id):
+                continue
+
+            try:
+                for _ in range(min(batch_size, len(msgs))):
+                    self._send_message(session_info, msgs.popleft())
+            except SessionClientDisconnectedError:
+                self._session_mgr.disconnect_session(session_id)
+                continue
+
+            if msgs:
+                pending.append((session_info, msgs))
+
+            # Yield for a tick after sending a batch of messages.
+            await asyncio.sleep(0)
+
     def _send_message(self, session_info: ActiveSessionInfo, msg: ForwardMsg) -> None:
         """Send a message to a client.
 
@@ -714,10 +860,17 @@ Please report this bug at https://github.com/streamlit/streamlit/issues.
         -----
         Threading: UNSAFE. Must be called on the eventloop thread.
         """
-        msg.metadata.cacheable = is_cacheable_msg(msg)
+        # Cacheable messages are usually hashed when they're enqueued, in
+        # which case we can reuse their serialized payload.
+        payload = (
+            session_info.session.get_serialized_payload(msg.hash) if msg.hash else None
+        )
+        msg.metadata.cacheable = is_cacheable_msg(msg, payload)
         msg_to_send = msg
         if msg.metadata.cacheable:
-            populate_hash_if_needed(msg)
+            if payload is None and msg.hash == "":
+                payload = serialize_forward_msg_payload(msg)
+            populate_hash_if_needed(msg, payload)
 
             if self._message_cache.has_message_reference(
                 msg, session_info.session, session_info.script_run_count
@@ -732,9 +885,18 @@ Please report this bug at https://github.com/streamlit/streamlit/issues.
             # age.
             _LOGGER.debug("Caching message (hash=%s)", msg.hash)
             self._message_cache.add_message(
-                msg, session_info.session, session_info.script_run_count
+                msg, session_info.session, session_info.script_run_count, payload
             )
 
+            if msg_to_send is msg:
+                # Prefer the cache's copy of the payload, which is shared by
+                # every session that receives this message.
+                payload = (
+                    self._message_cache.get_serialized_payload(msg.hash) or payload
+                )
+            else:
+                payload = None
+
         # If this was a `script_finished` message, we increment the
         # script_run_count for this session, and update the cache
         if msg.WhichOneof("type") == "script_finished" and (
@@ -757,8 +919,15 @@ Please report this bug at https://github.com/streamlit/streamlit/issues.
                 session_info.session, session_info.script_run_count
             )
 
-        # Ship it off!
-        session_info.client.write_forward_msg(msg_to_send)
+        # Ship it off! SessionClients that don't subclass SessionClient may
+        # not implement write_serialized_forward_msg.
+        write_serialized_forward_msg = getattr(
+            session_info.client, "write_serialized_forward_msg", None
+        )
+        if payload is not None and write_serialized_forward_msg is not None:
+            write_serialized_forward_msg(msg_to_send, payload)
+        else:
+            session_info.client.write_forward_msg(msg_to_send)
 
     def _enqueued_some_message(self) -> None:
         """Callback called by AppSession after the AppSession has enqueued a
@@ -16,15 +16,13 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any
+from typing import Any
 
 from streamlit import config
 from streamlit.errors import MarkdownFormattedException, StreamlitAPIException
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
 from streamlit.runtime.forward_msg_cache import populate_hash_if_needed
 
-if TYPE_CHECKING:
-    from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
-
 
 class MessageSizeError(MarkdownFormattedException):
     """Exception raised when a websocket message is larger than the configured limit."""
@@ -60,22 +58,37 @@ class BadDurationStringError(StreamlitAPIException):
         )
 
 
-def is_cacheable_msg(msg: ForwardMsg) -> bool:
-    """True if the given message qualifies for caching."""
+def is_cacheable_msg(msg: ForwardMsg, payload: bytes | None = None) -> bool:
+    """True if the given message qualifies for caching.
+
+    If the message's serialized payload is given, its length is used as the
+    message size instead of serializing the message again.
+    """
     if msg.WhichOneof("type") in {"ref_hash", "initialize"}:
         # Some message types never get cached
         return False
-    return msg.ByteSize() >= int(config.get_option("global.minCachedMessageSize"))
+    msg_size = len(payload) if payload is not None else msg.ByteSize()
+    return msg_size >= int(config.get_option("global.minCachedMessageSize"))
 
 
-def serialize_forward_msg(msg: ForwardMsg) -> bytes:
+def serialize_forward_msg(msg: ForwardMsg, payload: bytes | None = None) -> bytes:
     """Serialize a ForwardMsg to send to a client.
 
+    If the message's serialized payload (as returned by
+    `forward_msg_cache.serialize_forward_msg_payload`) is given, only the
+    message's hash and metadata are serialized, and the payload bytes are
+    reused as-is.
+
     If the message is too large, it will be converted to an exception message
     instead.
     """
-    populate_hash_if_needed(msg)
-    msg_str = msg.SerializeToString()
+    populate_hash_if_needed(msg, payload)
+    if payload is not None:
+        header = ForwardMsg(hash=msg.hash)
+        header.metadata.CopyFrom(msg.metadata)
+        msg_str = header.SerializeToString() + payload
+    else:
+        msg_str = msg.SerializeToString()
 
     if len(msg_str) > get_max_message_size_bytes():
         import streamlit.elements.exception as exception
@@ -0,0 +1,363 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2025)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Developer profiling of script runs.
+
+If the `runner.profileScriptRuns` config option is set, every script run
+records a ScriptRunProfile with:
+
+- The wall time of each `st.*` command.
+- The cache hits and misses of each cached function.
+- The size of each enqueued delta.
+- The time spent deserializing widget values.
+
+The profiles of the most recent script runs are kept in memory, and are
+served by the `/_stcore/profile` endpoint as JSON or as Chrome trace events
+(which can be opened in e.g. `chrome://tracing` or Perfetto). They can
+additionally be written to a directory as Chrome trace files.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Any, Callable, Final, NamedTuple
+
+from streamlit import config
+from streamlit.logger import get_logger
+from streamlit.runtime.scriptrunner_utils.script_run_context import get_script_run_ctx
+
+if TYPE_CHECKING:
+    from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+_LOGGER: Final = get_logger(__name__)
+
+# The number of most recent profiles that are kept in memory.
+_MAX_RECENT_PROFILES: Final = 50
+
+# The maximum number of events recorded per script run, to bound the memory
+# used by scripts that e.g. write elements in a long loop.
+_MAX_EVENTS_PER_PROFILE: Final = 10_000
+
+COMMAND_CATEGORY: Final = "command"
+CACHE_HIT_CATEGORY: Final = "cache_hit"
+CACHE_MISS_CATEGORY: Final = "cache_miss"
+DELTA_CATEGORY: Final = "delta"
+WIDGET_DESERIALIZATION_CATEGORY: Final = "widget_deserialization"
+
+
+class ProfileEvent(NamedTuple):
+    """An event recorded during a script run.
+
+    Properties
+    ----------
+    category : str
+        The kind of event, e.g. "command" or "cache_hit".
+    name : str
+        The name of the command, cached function, element type or widget
+        the event belongs to.
+    start : float
+        The start of the event in seconds since the start of the script run.
+    duration : float
+        The duration of the event in seconds. Zero for instant events such
+        as enqueued deltas.
+    args : dict
+        Additional data of the event, e.g. the number of bytes of a delta.
+    """
+
+    category: str
+    name: str
+    start: float
+    duration: float
+    args: dict[str, Any]
+
+
+class ScriptRunProfile:
+    """The profile of a single script run.
+
+    Events are recorded from the script thread (and helper threads attached
+    to its ScriptRunContext), and the profile is only read after it finished.
+    """
+
+    def __init__(
+        self,
+        session_id: str,
+        page_script_hash: str,
+        fragment_ids: list[str] | None = None,
+    ):
+        self.session_id = session_id
+        self.page_script_hash = page_script_hash
+        self.fragment_ids = list(fragment_ids or [])
+        # The wall clock time the run started at, in seconds since the epoch.
+        self.start_time = time.time()
+        self.duration: float | None = None
+        self.prep_duration: float | None = None
+        self.events: list[ProfileEvent] = []
+        self.num_dropped_events = 0
+        self._start = time.perf_counter()
+        # The names of the commands that are currently running, outermost first.
+        self._command_stack: list[str] = []
+
+    def enter_command(self, name: str) -> None:
+        """Mark the start of a command. Must be followed by `exit_command`."""
+        self._command_stack.append(name)
+
+    def exit_command(self, start: float) -> None:
+        """Record the command started by the last `enter_command`.
+
+        `start` is the `time.perf_counter()` value when the command started.
+        """
+        name = self._command_stack.pop()
+        self._add_event(
+            COMMAND_CATEGORY, name, start, {"depth": len(self._command_stack)}
+        )
+
+    def record_cache_access(
+        self, func: Callable[..., Any], hit: bool, start: float
+    ) -> None:
+        """Record a cache hit or miss of a cached function, that started at
+        the given `time.perf_counter()` value.
+        """
+        self._add_event(
+            CACHE_HIT_CATEGORY if hit else CACHE_MISS_CATEGORY,
+            f"{func.__module__}.{func.__qualname__}",
+            start,
+            {},
+        )
+
+    def record_delta(self, msg: ForwardMsg) -> None:
+        """Record an enqueued delta message."""
+        delta_type = msg.delta.WhichOneof("type")
+        if delta_type == "new_element":
+            name = msg.delta.new_element.WhichOneof("type") or delta_type
+        else:
+            name = delta_type or "delta"
+
+        args: dict[str, Any] = {
+            "bytes": msg.ByteSize(),
+            "deltaPath": list(msg.metadata.delta_path),
+        }
+        if self._command_stack:
+            args["command"] = self._command_stack[0]
+        self._add_event(DELTA_CATEGORY, name, time.perf_counter(), args)
+
+    def record_widget_deserialization(self, widget_id: str, start: float) -> None:
+        """Record the deserialization of a widget value, that started at the
+        given `time.perf_counter()` value.
+        """
+        self._add_event(WIDGET_DESERIALIZATION_CATEGORY, widget_id, start, {})
+
+    def finish(self, prep_duration: float) -> None:
+        """Mark the end of the script run.
+
+        `prep_duration` is the time in seconds it took to prepare the run,
+        e.g. to compile the script.
+        """
+        self.duration = time.perf_counter() - self._start
+        self.prep_duration = prep_duration
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a JSON-serializable summary of the profile."""
+        commands: list[dict[str, Any]] = []
+        caches: dict[str, dict[str, Any]] = {}
+        deltas: list[dict[str, Any]] = []
+        widget_deserialization: dict[str, Any] = {"count": 0, "duration": 0.0}
+
+        for event in self.events:
+            if event.category == COMMAND_CATEGORY:
+                # Nested commands are part of the wall time of their
+                # outermost command, they're only included in the trace.
+                if event.args["depth"] == 0:
+                    commands.append(
+                        {
+                            "name": event.name,
+                            "start": event.start,
+                            "duration": event.duration,
+                        }
+                    )
+            elif event.category in (CACHE_HIT_CATEGORY, CACHE_MISS_CATEGORY):
+                cache = caches.setdefault(
+                    event.name, {"hits": 0, "misses": 0, "missDuration": 0.0}
+                )
+                if event.category == CACHE_HIT_CATEGORY:
+                    cache["hits"] += 1
+                else:
+                    cache["misses"] += 1
+                    cache["missDuration"] += event.duration
+            elif event.category == DELTA_CATEGORY:
+                deltas.append({"type": event.name, **event.args})
+            elif event.category == WIDGET_DESERIALIZATION_CATEGORY:
+                widget_deserialization["count"] += 1
+                widget_deserialization["duration"] += event.duration
+
+        return {
+            "sessionId": self.session_id,
+            "pageScriptHash": self.page_script_hash,
+            "fragmentIds": self.fragment_ids,
+            "startTime": self.start_time,
+            "duration": self.duration,
+            "prepDuration": self.prep_duration,
+            "commands": commands,
+            "caches": caches,
+            "deltas": deltas,
+            "deltaBytes": sum(delta["bytes"] for delta in deltas),
+            "widgetDeserialization": widget_deserialization,
+            "numDroppedEvents": self.num_dropped_events,
+        }
+
+    def to_trace_events(self, pid: int, tid: int) -> list[dict[str, Any]]:
+        """Return the profile as a list of Chrome trace events."""
+        start_us = self.start_time * 1_000_000
+        trace_events: list[dict[str, Any]] = [
+            {
+                "name": "script_run",
+                "cat": "script_run",
+                "ph": "X",
+                "ts": start_us,
+                "dur": (self.duration or 0) * 1_000_000,
+                "pid": pid,
+                "tid": tid,
+                "args": {
+                    "pageScriptHash": self.page_script_hash,
+                    "fragmentIds": self.fragment_ids,
+                },
+            }
+        ]
+        for event in self.events:
+            trace_event: dict[str, Any] = {
+                "name": event.name,
+                "cat": event.category,
+                "ts": start_us + event.start * 1_000_000,
+                "pid": pid,
+                "tid": tid,
+                "args": event.args,
+            }
+            if event.category == DELTA_CATEGORY:
+                trace_event.update(ph="i", s="t")
+            else:
+                trace_event.update(ph="X", dur=event.duration * 1_000_000)
+            trace_events.append(trace_event)
+        return trace_events
+
+    def _add_event(
+        self, category: str, name: str, start: float, args: dict[str, Any]
+    ) -> None:
+        if len(self.events) >= _MAX_EVENTS_PER_PROFILE:
+            self.num_dropped_events += 1
+            return
+
+        end = time.perf_counter()
+        self.events.append(
+            ProfileEvent(
+                category=category,
+                name=name,
+                start=start - self._start,
+                duration=end - start if category != DELTA_CATEGORY else 0.0,
+                args=args,
+            )
+        )
+
+
+_recent_profiles: deque[ScriptRunProfile] = deque(maxlen=_MAX_RECENT_PROFILES)
+_recent_profiles_lock = threading.Lock()
+
+
+def is_profiling_enabled() -> bool:
+    return bool(config.get_option("runner.profileScriptRuns"))
+
+
+def start_profile(
+    session_id: str, page_script_hash: str, fragment_ids: list[str] | None = None
+) -> ScriptRunProfile | None:
+    """Return a new profile for a script run, or None if profiling is
+    disabled.
+    """
+    if not is_profiling_enabled():
+        return None
+    return ScriptRunProfile(session_id, page_script_hash, fragment_ids)
+
+
+def finish_profile(profile: ScriptRunProfile, prep_duration: float) -> None:
+    """Finish a profile, keep it in memory and write it to the trace
+    directory if configured.
+    """
+    profile.finish(prep_duration)
+    with _recent_profiles_lock:
+        _recent_profiles.append(profile)
+
+    trace_dir = config.get_option("runner.profileTraceDir")
+    if trace_dir:
+        try:
+            _write_trace_file(profile, trace_dir)
+        except OSError:
+            _LOGGER.warning("Failed to write the profile trace.", exc_info=True)
+
+
+def get_current_profile() -> ScriptRunProfile | None:
+    """Return the profile of the current script run, or None if the current
+    thread isn't profiling a script run.
+    """
+    ctx = get_script_run_ctx(suppress_warning=True)
+    return ctx.profile if ctx is not None else None
+
+
+def get_recent_profiles(session_id: str | None = None) -> list[ScriptRunProfile]:
+    """Return the profiles of the most recent script runs, oldest first.
+    Only profiles of the given session are returned if session_id is set.
+    """
+    with _recent_profiles_lock:
+        profiles = list(_recent_profiles)
+    if session_id is not None:
+        profiles = [p for p in profiles if p.session_id == session_id]
+    return profiles
+
+
+def clear_profiles() -> None:
+    """Forget all recent profiles."""
+    with _recent_profiles_lock:
+        _recent_profiles.clear()
+
+
+def to_chrome_trace(profiles: list[ScriptRunProfile]) -> dict[str, Any]:
+    """Return the profiles as a Chrome trace, with a trace thread per session."""
+    pid = os.getpid()
+    session_tids: dict[str, int] = {}
+    trace_events: list[dict[str, Any]] = []
+
+    for profile in profiles:
+        tid = session_tids.get(profile.session_id)
+        if tid is None:
+            tid = session_tids[profile.session_id] = len(session_tids) + 1
+            trace_events.append(
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": pid,
+                    "tid": tid,
+                    "args": {"name": f"Session {profile.session_id}"},
+                }
+            )
+        trace_events.extend(profile.to_trace_events(pid, tid))
+
+    return {"traceEvents": trace_events, "displayTimeUnit": "ms"}
+
+
+def _write_trace_file(profile: ScriptRunProfile, trace_dir: str) -> None:
+    os.makedirs(trace_dir, exist_ok=True)
+    filename = f"{int(profile.start_time * 1000)}-{profile.session_id}.trace.json"
+    with open(os.path.join(trace_dir, filename), "w", encoding="utf-8") as f:
+        json.dump(to_chrome_trace([profile]), f)
@@ -14,25 +14,59 @@
 
 from __future__ import annotations
 
-import os.path
+import contextlib
+import hashlib
+import importlib.util
+import marshal
+import os
+import sys
+import tempfile
 import threading
-from typing import Any
+from collections import defaultdict
+from types import CodeType
+from typing import Any, Final
 
 from streamlit import config
+from streamlit.logger import get_logger
 from streamlit.runtime.scriptrunner import magic
 from streamlit.source_util import open_python_file
+from streamlit.version import STREAMLIT_VERSION_STRING
+
+_LOGGER: Final = get_logger(__name__)
+
+# The options that change how a script is transformed before it's compiled.
+_MAGIC_OPTIONS: Final = (
+    "runner.magicEnabled",
+    "magic.displayRootDocString",
+    "magic.displayLastExprIfNoSemicolon",
+)
 
 
 class ScriptCache:
-    """Thread-safe cache of Python script bytecode."""
+    """Thread-safe cache of Python script bytecode.
+
+    Compiled bytecode is cached in memory. If the `runner.bytecodeCacheDir`
+    config option is set, it's also persisted to that directory, so that
+    restarted processes don't need to compile the scripts again.
+    """
 
     def __init__(self):
         # Mapping of script_path: bytecode
         self._cache: dict[str, Any] = {}
+        # Mapping of script_path: lock that is held while the script is
+        # compiled, so that different scripts can be compiled concurrently.
+        self._path_locks: dict[str, threading.Lock] = defaultdict(threading.Lock)
+        # Incremented by `clear`, so that scripts that were being compiled
+        # while the cache was cleared aren't added to the cache.
+        self._generation = 0
+        # Guards _cache, _path_locks and _generation.
         self._lock = threading.Lock()
 
     def clear(self) -> None:
-        """Remove all entries from the cache.
+        """Remove all entries from the in-memory cache.
+
+        Entries persisted in `runner.bytecodeCacheDir` are kept, since they
+        are invalidated when their script changes.
 
         Notes
         -----
@@ -40,6 +74,7 @@ class ScriptCache:
         """
         with self._lock:
             self._cache.clear()
+            self._generation += 1
 
     def get_bytecode(self, script_path: str) -> Any:
         """Return the bytecode for the Python script at the given path.
@@ -63,27 +98,132 @@ class ScriptCache:
             if bytecode is not None:
                 # Fast path: the code is already cached.
                 return bytecode
-
-            # Populate the cache
-            with open_python_file(script_path) as f:
-                filebody = f.read()
-
-            if config.get_option("runner.magicEnabled"):
-                filebody = magic.add_magic(filebody, script_path)
-
-            bytecode = compile(  # type: ignore
-                filebody,
-                # Pass in the file path so it can show up in exceptions.
-                script_path,
-                # We're compiling entire blocks of Python, so we need "exec"
-                # mode (as opposed to "eval" or "single").
-                mode="exec",
-                # Don't inherit any flags or "future" statements.
-                flags=0,
-                dont_inherit=1,
-                # Use the default optimization options.
-                optimize=-1,
-            )
-
-            self._cache[script_path] = bytecode
+            path_lock = self._path_locks[script_path]
+
+        with path_lock:
+            with self._lock:
+                # Another thread may have compiled the script while we were
+                # waiting for the lock.
+                bytecode = self._cache.get(script_path, None)
+                if bytecode is not None:
+                    return bytecode
+                generation = self._generation
+
+            bytecode = self._load_bytecode(script_path)
+
+            with self._lock:
+                if generation == self._generation:
+                    self._cache[script_path] = bytecode
             return bytecode
+
+    def _load_bytecode(self, script_path: str) -> CodeType:
+        """Read the bytecode of the script from the persisted cache, or
+        compile the script if it isn't persisted.
+        """
+        cache_dir = config.get_option("runner.bytecodeCacheDir")
+
+        with open_python_file(script_path) as f:
+            cache_path = None
+            script_version = None
+            if cache_dir:
+                cache_path = _get_persisted_bytecode_path(cache_dir, script_path)
+                script_version = _get_script_version(os.fstat(f.fileno()))
+                bytecode = _read_persisted_bytecode(cache_path, script_version)
+                if bytecode is not None:
+                    return bytecode
+
+            filebody = f.read()
+
+        if config.get_option("runner.magicEnabled"):
+            filebody = magic.add_magic(filebody, script_path)
+
+        bytecode = compile(  # type: ignore
+            filebody,
+            # Pass in the file path so it can show up in exceptions.
+            script_path,
+            # We're compiling entire blocks of Python, so we need "exec"
+            # mode (as opposed to "eval" or "single").
+            mode="exec",
+            # Don't inherit any flags or "future" statements.
+            flags=0,
+            dont_inherit=1,
+            # Use the default optimization options.
+            optimize=-1,
+        )
+
+        if cache_path is not None and script_version is not None:
+            _write_persisted_bytecode(cache_path, script_version, bytecode)
+        return bytecode
+
+
+def _get_persisted_bytecode_path(cache_dir: str, script_path: str) -> str:
+    """Return the path of the persisted bytecode of the script.
+
+    The path changes whenever the Python or Streamlit version, or the options
+    that affect how the script is compiled change. It doesn't change when the
+    script is modified, so that the outdated bytecode is overwritten instead
+    of accumulating in the cache directory.
+    """
+    key_parts = [
+        script_path,
+        sys.version,
+        importlib.util.MAGIC_NUMBER.hex(),
+        STREAMLIT_VERSION_STRING,
+        *(repr(config.get_option(option)) for option in _MAGIC_OPTIONS),
+    ]
+    key = hashlib.new(
+        "sha1", "\0".join(key_parts).encode("utf-8"), usedforsecurity=False
+    ).hexdigest()
+    return os.path.join(cache_dir, f"{key}.bytecode")
+
+
+def _get_script_version(stat: os.stat_result) -> tuple[int, int]:
+    """Return the modification time and size of the script, which are stored
+    with its persisted bytecode to detect when the script has changed.
+    """
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _read_persisted_bytecode(
+    path: str, script_version: tuple[int, int]
+) -> CodeType | None:
+    """Return the bytecode persisted at the given path, or None if it can't be
+    read or was compiled from a different version of the script.
+    """
+    try:
+        with open(path, "rb") as f:
+            persisted_version = marshal.load(f)
+            if persisted_version != script_version:
+                return None
+            bytecode = marshal.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception:
+        _LOGGER.debug("Unable to read persisted bytecode %s", path, exc_info=True)
+        return None
+    return bytecode if isinstance(bytecode, CodeType) else None
+
+
+def _write_persisted_bytecode(
+    path: str, script_version: tuple[int, int], bytecode: CodeType
+) -> None:
+    """Persist the bytecode at the given path, along with the version of the
+    script it was compiled from. Errors are logged and ignored, since the
+    bytecode can always be compiled again.
+    """
+    tmp_path = None
+    try:
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as output:
+            marshal.dump(script_version, output)
+            marshal.dump(bytecode, output)
+        # Replace atomically, so that other processes never read a partially
+        # written file.
+        os.replace(tmp_path, path)
+    except Exception:
+        _LOGGER.debug("Unable to persist bytecode %s", path, exc_info=True)
+        if tmp_path is not None:
+            with contextlib.suppress(OSError):
+                os.remove(tmp_path)
@@ -30,6 +30,7 @@ from streamlit.errors import FragmentStorageKeyError
 from streamlit.logger import get_logger
 from streamlit.proto.ClientState_pb2 import ClientState
 from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.runtime import script_run_profile
 from streamlit.runtime.metrics_util import (
     create_page_profile_message,
     to_microseconds,
@@ -472,6 +473,7 @@ class ScriptRunner:
                 # download buttons/links to them present in the app, which will result
                 # in a 404 should the user click on them.
                 runtime.get_instance().media_file_mgr.clear_session_refs()
+                runtime.get_instance().dataframe_source_mgr.clear_session_refs()
 
             self._pages_manager.set_script_intent(
                 rerun_data.page_script_hash, rerun_data.page_name
@@ -516,6 +518,9 @@ class ScriptRunner:
                 fragment_ids_this_run=fragment_ids_this_run,
                 context_info=rerun_data.context_info,
             )
+            ctx.profile = script_run_profile.start_profile(
+                ctx.session_id, page_script_hash, fragment_ids_this_run
+            )
 
             self.on_event.send(
                 self,
@@ -686,6 +691,9 @@ class ScriptRunner:
                     # Always capture all exceptions since we want to make sure that
                     # the telemetry never causes any issues.
                     _LOGGER.debug("Failed to create page profile", exc_info=ex)
+            if ctx.profile is not None:
+                script_run_profile.finish_profile(ctx.profile, prep_time)
+                ctx.profile = None
             self._on_script_finished(ctx, finished_event, premature_stop)
 
             # # Use _log_if_error() to make sure we never ever ever stop running the
@@ -714,6 +722,7 @@ class ScriptRunner:
         # Remove orphaned files now that the script has run and files in use
         # are marked as active.
         runtime.get_instance().media_file_mgr.remove_orphaned_files()
+        runtime.get_instance().dataframe_source_mgr.remove_orphaned_sources()
 
         # Force garbage collection to run, to help avoid memory use building up
         # This is usually not an issue, but sometimes GC takes time to kick in and
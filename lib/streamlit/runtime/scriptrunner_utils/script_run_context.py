@@ -22,6 +22,7 @@ from collections import Counter
 from dataclasses import dataclass, field
 from typing import (
     TYPE_CHECKING,
+    Any,
     Callable,
     Final,
     Union,
@@ -46,6 +47,7 @@ if TYPE_CHECKING:
     from streamlit.proto.PageProfile_pb2 import Command
     from streamlit.runtime.fragment import FragmentStorage
     from streamlit.runtime.pages_manager import PagesManager
+    from streamlit.runtime.script_run_profile import ScriptRunProfile
     from streamlit.runtime.scriptrunner_utils.script_requests import ScriptRequests
     from streamlit.runtime.state import SafeSessionState
     from streamlit.runtime.uploaded_file_manager import UploadedFileManager
@@ -101,6 +103,11 @@ class ScriptRunContext:
     current_fragment_id: str | None = None
     fragment_ids_this_run: list[str] | None = None
     new_fragment_ids: set[str] = field(default_factory=set)
+    # Memoized hashes of the cached function arguments hashed in this run,
+    # see streamlit.runtime.caching.hashing.
+    hash_memo: dict[Any, Any] = field(default_factory=dict)
+    # The developer profile of this run, if script runs are profiled.
+    profile: ScriptRunProfile | None = None
     _active_script_hash: str = ""
     # we allow only one dialog to be open at the same time
     has_dialog_opened: bool = False
@@ -160,6 +167,8 @@ class ScriptRunContext:
         self.current_fragment_delta_path: list[int] = []
         self.fragment_ids_this_run = fragment_ids_this_run
         self.new_fragment_ids = set()
+        self.hash_memo = {}
+        self.profile = None
         self.has_dialog_opened = False
         in_cached_function.set(False)
 
@@ -192,6 +201,9 @@ class ScriptRunContext:
 
         msg.metadata.active_script_hash = self.active_script_hash
 
+        if self.profile is not None and msg.HasField("delta"):
+            self.profile.record_delta(msg)
+
         # Pass the message up to our associated ScriptRunner.
         self._enqueue(msg)
 
@@ -42,6 +42,19 @@ class SessionClient(Protocol):
         """
         raise NotImplementedError
 
+    def write_serialized_forward_msg(self, msg: ForwardMsg, payload: bytes) -> None:
+        """Deliver a ForwardMsg whose payload has already been serialized.
+
+        `payload` is the serialized content of the message, excluding its hash
+        and metadata (see `forward_msg_cache.serialize_forward_msg_payload`).
+        SessionClients that send serialized messages can reuse it to avoid
+        serializing the message again. The default implementation ignores it.
+
+        If the SessionClient has been disconnected, it should raise a
+        SessionClientDisconnectedError.
+        """
+        self.write_forward_msg(msg)
+
 
 @dataclass
 class ActiveSessionInfo:
@@ -16,6 +16,7 @@ from __future__ import annotations
 
 import json
 import pickle
+import time
 from collections.abc import Iterator, KeysView, MutableMapping
 from copy import deepcopy
 from dataclasses import dataclass, field, replace
@@ -34,6 +35,7 @@ from streamlit import config, util
 from streamlit.errors import StreamlitAPIException, UnserializableSessionStateError
 from streamlit.proto.WidgetStates_pb2 import WidgetState as WidgetStateProto
 from streamlit.proto.WidgetStates_pb2 import WidgetStates as WidgetStatesProto
+from streamlit.runtime.script_run_profile import get_current_profile
 from streamlit.runtime.scriptrunner_utils.script_run_context import get_script_run_ctx
 from streamlit.runtime.state.common import (
     RegisterWidgetResult,
@@ -125,7 +127,11 @@ class WStates(MutableMapping[str, Any]):
         elif value_field_name == "json_value":
             value = json.loads(value)
 
+        profile = get_current_profile()
+        start_time = time.perf_counter()
         deserialized = metadata.deserializer(value, metadata.id)
+        if profile is not None:
+            profile.record_widget_deserialization(k, start_time)
 
         # Update metadata to reflect information from WidgetState proto
         self.set_widget_metadata(
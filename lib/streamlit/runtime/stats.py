@@ -15,12 +15,22 @@
 from __future__ import annotations
 
 import itertools
+import threading
+import time
 from abc import abstractmethod
-from typing import TYPE_CHECKING, NamedTuple, Protocol, runtime_checkable
+from typing import TYPE_CHECKING, Final, NamedTuple, Protocol, runtime_checkable
+
+from streamlit.logger import get_logger
 
 if TYPE_CHECKING:
     from streamlit.proto.openmetrics_data_model_pb2 import Metric as MetricProto
 
+_LOGGER: Final = get_logger(__name__)
+
+# The default number of seconds that a SampledStatsProvider returns the same
+# stats for before it recomputes them.
+SAMPLED_STATS_MAX_AGE_SECONDS: Final = 30.0
+
 
 class CacheStat(NamedTuple):
     """Describes a single cache entry.
@@ -60,6 +70,51 @@ class CacheStat(NamedTuple):
         metric_point.gauge_value.int_value = self.byte_length
 
 
+class CacheCounter(NamedTuple):
+    """Describes a monotonically increasing counter of a cache, such as its
+    number of hits, misses or evictions.
+
+    Properties
+    ----------
+    category_name : str
+        A human-readable name for the cache "category" that the counter
+        belongs to - e.g. "ForwardMessageCache".
+    cache_name : str
+        A human-readable name for cache instance that the counter belongs to.
+        If the cache category doesn't have multiple separate cache instances,
+        this can just be the empty string.
+    counter_name : str
+        The name of the counter - e.g. "hits", "misses" or "evictions".
+    value : int
+        The current value of the counter.
+    """
+
+    category_name: str
+    cache_name: str
+    counter_name: str
+    value: int
+
+    @property
+    def metric_name(self) -> str:
+        return f"cache_{self.counter_name}"
+
+    def to_metric_str(self) -> str:
+        return f'{self.metric_name}_total{{cache_type="{self.category_name}",cache="{self.cache_name}"}} {self.value}'
+
+    def marshall_metric_proto(self, metric: MetricProto) -> None:
+        """Fill an OpenMetrics `Metric` protobuf object."""
+        label = metric.labels.add()
+        label.name = "cache_type"
+        label.value = self.category_name
+
+        label = metric.labels.add()
+        label.name = "cache"
+        label.value = self.cache_name
+
+        metric_point = metric.metric_points.add()
+        metric_point.counter_value.int_value = self.value
+
+
 def group_stats(stats: list[CacheStat]) -> list[CacheStat]:
     """Group a list of CacheStats by category_name and cache_name and sum byte_length"""
 
@@ -89,6 +144,82 @@ class CacheStatsProvider(Protocol):
         raise NotImplementedError
 
 
+@runtime_checkable
+class CacheCountersProvider(Protocol):
+    """A CacheStatsProvider that additionally exposes counters, such as its
+    number of hits, misses and evictions.
+    """
+
+    @abstractmethod
+    def get_counters(self) -> list[CacheCounter]:
+        raise NotImplementedError
+
+
+class SampledStatsProvider(CacheStatsProvider):
+    """Wraps a CacheStatsProvider whose stats are expensive to compute, e.g.
+    because it measures the deep size of objects.
+
+    The wrapped provider's stats are computed once synchronously, and then
+    returned from a cache. Requesting stats that are older than max_age_seconds
+    returns the cached stats and recomputes them on a background thread, so
+    that requesting stats never waits for the wrapped provider after the first
+    time.
+    """
+
+    def __init__(
+        self,
+        provider: CacheStatsProvider,
+        max_age_seconds: float = SAMPLED_STATS_MAX_AGE_SECONDS,
+    ):
+        self._provider = provider
+        self._max_age_seconds = max_age_seconds
+        self._stats: list[CacheStat] | None = None
+        self._computed_at = 0.0
+        self._refreshing = False
+        self._lock = threading.Lock()
+        # Held while computing the stats synchronously, so that concurrent
+        # first requests compute them only once.
+        self._compute_lock = threading.Lock()
+
+    def get_stats(self) -> list[CacheStat]:
+        with self._lock:
+            stats = self._stats
+            if stats is not None:
+                is_stale = time.monotonic() - self._computed_at > self._max_age_seconds
+                if is_stale and not self._refreshing:
+                    self._refreshing = True
+                    threading.Thread(
+                        target=self._refresh,
+                        name="StreamlitStatsSampler",
+                        daemon=True,
+                    ).start()
+                return stats
+
+        with self._compute_lock:
+            with self._lock:
+                if self._stats is not None:
+                    return self._stats
+            stats = self._provider.get_stats()
+            with self._lock:
+                self._stats = stats
+                self._computed_at = time.monotonic()
+            return stats
+
+    def _refresh(self) -> None:
+        try:
+            stats = self._provider.get_stats()
+        except Exception:
+            _LOGGER.warning("Failed to compute stats.", exc_info=True)
+            with self._lock:
+                self._refreshing = False
+            return
+
+        with self._lock:
+            self._stats = stats
+            self._computed_at = time.monotonic()
+            self._refreshing = False
+
+
 class StatsManager:
     def __init__(self):
         self._cache_stats_providers: list[CacheStatsProvider] = []
@@ -107,3 +238,14 @@ class StatsManager:
             all_stats.extend(provider.get_stats())
 
         return all_stats
+
+    def get_counters(self) -> list[CacheCounter]:
+        """Return a list containing all counters from each registered provider
+        that implements CacheCountersProvider.
+        """
+        all_counters: list[CacheCounter] = []
+        for provider in self._cache_stats_providers:
+            if isinstance(provider, CacheCountersProvider):
+                all_counters.extend(provider.get_counters())
+
+        return all_counters
@@ -15,25 +15,30 @@
 from __future__ import annotations
 
 import io
+import mmap
 from abc import abstractmethod
-from typing import TYPE_CHECKING, NamedTuple, Protocol
+from typing import TYPE_CHECKING, Any, NamedTuple, Protocol
 
 from streamlit import util
 from streamlit.runtime.stats import CacheStatsProvider
 
 if TYPE_CHECKING:
-    from collections.abc import Sequence
+    from collections.abc import Iterable, Sequence
 
     from streamlit.proto.Common_pb2 import FileURLs as FileURLsProto
 
 
 class UploadedFileRec(NamedTuple):
-    """Metadata and raw bytes for an uploaded file. Immutable."""
+    """Metadata and raw bytes for an uploaded file. Immutable.
+
+    The raw bytes can be a read-only memory map of a file on disk, for
+    uploaded file managers that store files on disk.
+    """
 
     file_id: str
     name: str
     type: str
-    data: bytes
+    data: bytes | mmap.mmap
 
 
 class UploadFileUrlInfo(NamedTuple):
@@ -64,6 +69,17 @@ class UploadedFile(io.BytesIO):
     initialized with `bytes`.
     """
 
+    def __new__(cls, record: UploadedFileRec | None = None, *args: Any, **kwargs: Any):
+        # Files stored on disk are memory-mapped, rather than copied into the
+        # BytesIO buffer.
+        if (
+            cls is UploadedFile
+            and record is not None
+            and isinstance(record.data, mmap.mmap)
+        ):
+            cls = _MappedUploadedFile
+        return super().__new__(cls)
+
     def __init__(self, record: UploadedFileRec, file_urls: FileURLsProto):
         # BytesIO's copy-on-write semantics doesn't seem to be mentioned in
         # the Python docs - possibly because it's a CPython-only optimization
@@ -85,6 +101,135 @@ class UploadedFile(io.BytesIO):
         return util.repr_(self)
 
 
+class _MappedUploadedFile(UploadedFile):
+    """An UploadedFile whose content is a read-only memory map of a file on
+    disk, which is shared by all UploadedFiles of the same record.
+
+    Reads are served from the memory map, so the content isn't copied into
+    memory. The first write copies the content into the BytesIO buffer, after
+    which the file behaves like any other UploadedFile.
+    """
+
+    def __init__(self, record: UploadedFileRec, file_urls: FileURLsProto):
+        # Initialize the BytesIO buffer empty, instead of copying the content.
+        super().__init__(record._replace(data=b""), file_urls)
+        self.size = len(record.data)
+        self._mapping: mmap.mmap | None = record.data  # type: ignore[assignment]
+        self._pos = 0
+
+    def _materialize(self) -> None:
+        """Copy the content into the BytesIO buffer, if it's memory-mapped."""
+        if self._mapping is None:
+            return
+        content = self._mapping[:]
+        pos = self._pos
+        self._mapping = None
+        super().write(content)
+        super().seek(pos)
+
+    def read(self, size: int | None = -1) -> bytes:
+        if self._mapping is None:
+            return super().read(size)
+        start = self._pos
+        end = len(self._mapping)
+        if size is not None and size >= 0:
+            end = min(end, start + size)
+        data = self._mapping[start:end]
+        self._pos += len(data)
+        return data
+
+    def read1(self, size: int | None = -1) -> bytes:
+        return self.read(size)
+
+    def readinto(self, buffer: Any) -> int:
+        if self._mapping is None:
+            return super().readinto(buffer)
+        view = memoryview(buffer).cast("B")
+        data = self.read(len(view))
+        view[: len(data)] = data
+        return len(data)
+
+    def readline(self, size: int | None = -1) -> bytes:
+        if self._mapping is None:
+            return super().readline(size)
+        newline = self._mapping.find(b"\n", self._pos)
+        end = len(self._mapping) if newline == -1 else newline + 1
+        if size is not None and size >= 0:
+            end = min(end, self._pos + size)
+        return self.read(max(end - self._pos, 0))
+
+    def readlines(self, hint: int | None = -1) -> list[bytes]:
+        if self._mapping is None:
+            return super().readlines(hint)
+        lines = []
+        total_size = 0
+        while line := self.readline():
+            lines.append(line)
+            total_size += len(line)
+            if hint is not None and 0 < hint <= total_size:
+                break
+        return lines
+
+    def __next__(self) -> bytes:
+        if self._mapping is None:
+            return super().__next__()
+        line = self.readline()
+        if not line:
+            raise StopIteration
+        return line
+
+    def seek(self, pos: int, whence: int = io.SEEK_SET) -> int:
+        if self._mapping is None:
+            return super().seek(pos, whence)
+        if whence == io.SEEK_CUR:
+            pos += self._pos
+        elif whence == io.SEEK_END:
+            pos += len(self._mapping)
+        elif whence != io.SEEK_SET:
+            raise ValueError(f"invalid whence ({whence}, should be 0, 1 or 2)")
+        if pos < 0:
+            raise ValueError(f"negative seek value {pos}")
+        self._pos = pos
+        return pos
+
+    def tell(self) -> int:
+        if self._mapping is None:
+            return super().tell()
+        return self._pos
+
+    def getvalue(self) -> bytes:
+        if self._mapping is None:
+            return super().getvalue()
+        return self._mapping[:]
+
+    def getbuffer(self) -> memoryview:
+        if self._mapping is None:
+            return super().getbuffer()
+        return memoryview(self._mapping)
+
+    def write(self, data: Any) -> int:
+        self._materialize()
+        return super().write(data)
+
+    def writelines(self, lines: Iterable[Any]) -> None:
+        self._materialize()
+        super().writelines(lines)
+
+    def truncate(self, size: int | None = None) -> int:
+        self._materialize()
+        return super().truncate(size)
+
+    def close(self) -> None:
+        self._mapping = None
+        super().close()
+
+    def __getstate__(self) -> tuple[bytes, int, dict[str, Any]]:
+        # Pickled files are restored with the content in the BytesIO buffer.
+        state = self.__dict__.copy()
+        state["_mapping"] = None
+        return self.getvalue(), self.tell(), state
+
+
 class UploadedFileManager(CacheStatsProvider, Protocol):
     """UploadedFileManager protocol, that should be implemented by the concrete
     uploaded file managers.
@@ -149,6 +149,7 @@ class LocalScriptRunner(ScriptRunner):
         # Remove orphaned files now that the script has run and files in use
         # are marked as active.
         runtime.get_instance().media_file_mgr.remove_orphaned_files()
+        runtime.get_instance().dataframe_source_mgr.remove_orphaned_sources()
 
     def _new_module(self, name: str) -> types.ModuleType:
         module = types.ModuleType(name)
@@ -64,6 +64,11 @@ class FolderBlackList:
         if config.get_option("global.developmentMode"):
             self._folder_blacklist.append(os.path.dirname(__file__))
 
+        # Mapping of directory: whether it's blacklisted. The globs only match
+        # the directory of a path, so the result can be shared by all files in
+        # a directory.
+        self._blacklisted_dirs: dict[str, bool] = {}
+
     def __repr__(self) -> str:
         return util.repr_(self)
 
@@ -76,7 +81,12 @@ class FolderBlackList:
             File path that we intend to test.
 
         """
-        return any(
-            file_util.file_is_in_folder_glob(filepath, blacklisted_folder)
-            for blacklisted_folder in self._folder_blacklist
-        )
+        file_dir = os.path.dirname(filepath)
+        is_blacklisted = self._blacklisted_dirs.get(file_dir)
+        if is_blacklisted is None:
+            is_blacklisted = any(
+                file_util.file_is_in_folder_glob(filepath, blacklisted_folder)
+                for blacklisted_folder in self._folder_blacklist
+            )
+            self._blacklisted_dirs[file_dir] = is_blacklisted
+        return is_blacklisted
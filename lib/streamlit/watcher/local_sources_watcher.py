@@ -44,6 +44,10 @@ class WatchedModule(NamedTuple):
 # thus initializing config options when this file is first imported.
 PathWatcher = None
 
+# Incremented whenever a LocalSourcesWatcher unloads its watched modules. Since
+# sys.modules is shared by all sessions, this affects the runs of all sessions.
+_num_module_unloads = 0
+
 
 class LocalSourcesWatcher:
     def __init__(self, pages_manager: PagesManager):
@@ -59,9 +63,20 @@ class LocalSourcesWatcher:
             config.get_option("server.folderWatchBlacklist")
         )
 
+        # Mapping of directory: whether files in it are in the script folder
+        # or in PYTHONPATH. Memoized since many modules share a directory.
+        self._watchable_dirs: dict[tuple[str, str], bool] = {}
+
         self._watched_modules: dict[str, WatchedModule] = {}
         self._watched_pages: set[str] = set()
 
+        # Mapping of page_script_hash: paths of the watched modules the page
+        # may depend on.
+        self._page_dependencies: dict[str, set[str]] = {}
+
+        # The value of _num_module_unloads when the current run started.
+        self._num_module_unloads_at_run_start: int | None = None
+
         self.update_watched_pages()
 
     def update_watched_pages(self) -> None:
@@ -89,6 +104,66 @@ class LocalSourcesWatcher:
 
         self._watched_pages = self._watched_pages.union(new_pages_paths)
 
+    def mark_run_started(self) -> None:
+        """Record that a run started, see `update_page_dependencies`."""
+        self._num_module_unloads_at_run_start = _num_module_unloads
+
+    def update_page_dependencies(
+        self, page_script_hash: str, full_run: bool = True
+    ) -> None:
+        """Record the watched modules that the page may depend on after a run.
+
+        A module that was already imported when the page ran doesn't show up
+        in the `sys.modules` delta of the run, even if the page imports it, so
+        every watched module that is loaded at the end of the run is a
+        possible dependency. Since `on_file_changed` unloads all watched
+        modules, the modules that are loaded again are increasingly only the
+        ones the page actually imports.
+
+        Parameters
+        ----------
+        page_script_hash : str
+            The hash of the page that ran.
+        full_run : bool
+            Whether the whole page ran to completion. The modules loaded after
+            partial runs (e.g. fragment runs or runs that were interrupted by a
+            rerun) are added to the page's dependencies instead of replacing
+            them. This also applies to full runs during which the watched
+            modules were unloaded (by this or any other session), since the
+            modules the page imported before may not be loaded anymore.
+        """
+        if self._is_closed:
+            return
+
+        self.update_watched_modules()
+        loaded_paths = {
+            filepath
+            for filepath, wm in self._watched_modules.items()
+            if wm.module_name is not None and wm.module_name in sys.modules
+        }
+        modules_unloaded_during_run = (
+            self._num_module_unloads_at_run_start != _num_module_unloads
+        )
+        if (
+            full_run and not modules_unloaded_during_run
+        ) or page_script_hash not in self._page_dependencies:
+            self._page_dependencies[page_script_hash] = loaded_paths
+        else:
+            self._page_dependencies[page_script_hash] |= loaded_paths
+
+    def page_depends_on(self, page_script_hash: str, filepath: str) -> bool:
+        """Return whether the page may depend on the watched file.
+
+        Pages that haven't run yet and files that aren't watched modules (e.g.
+        page scripts) are assumed to be dependencies.
+        """
+        wm = self._watched_modules.get(filepath)
+        if wm is None or wm.module_name is None:
+            return True
+
+        dependencies = self._page_dependencies.get(page_script_hash)
+        return dependencies is None or filepath in dependencies
+
     def register_file_change_callback(self, cb: Callable[[str], None]) -> None:
         self._on_file_changed.append(cb)
 
@@ -109,6 +184,8 @@ class LocalSourcesWatcher:
         # However, determining all import paths for a given loaded module is
         # non-trivial, and so as a workaround we simply unload all watched
         # modules.
+        global _num_module_unloads
+        _num_module_unloads += 1
         for wm in self._watched_modules.values():
             if wm.module_name is not None and wm.module_name in sys.modules:
                 del sys.modules[wm.module_name]
@@ -121,6 +198,7 @@ class LocalSourcesWatcher:
             wm.watcher.close()
         self._watched_modules = {}
         self._watched_pages = set()
+        self._page_dependencies = {}
         self._is_closed = True
 
     def _register_watcher(self, filepath, module_name):
@@ -159,22 +237,37 @@ class LocalSourcesWatcher:
 
     def _file_should_be_watched(self, filepath):
         # Using short circuiting for performance.
-        return self._file_is_new(filepath) and (
-            file_util.file_is_in_folder_glob(filepath, self._script_folder)
-            or file_util.file_in_pythonpath(filepath)
-        )
+        return self._file_is_new(filepath) and self._dir_is_watchable(filepath)
+
+    def _dir_is_watchable(self, filepath: str) -> bool:
+        # Both checks only depend on the directory of the file (and on
+        # PYTHONPATH, which may change while the server runs).
+        key = (os.path.dirname(filepath), os.environ.get("PYTHONPATH", ""))
+        watchable = self._watchable_dirs.get(key)
+        if watchable is None:
+            watchable = file_util.file_is_in_folder_glob(
+                filepath, self._script_folder
+            ) or file_util.file_in_pythonpath(filepath)
+            self._watchable_dirs[key] = watchable
+        return watchable
 
     def update_watched_modules(self):
         if self._is_closed:
             return
 
-        if set(sys.modules) != self._cached_sys_modules:
+        modules = dict(sys.modules)
+        if modules.keys() != self._cached_sys_modules:
+            # Only examine the modules that were imported since the last
+            # update. Modules that were removed from sys.modules (e.g. by
+            # `on_file_changed`) are examined again when they're re-imported.
             modules_paths = {
                 name: self._exclude_blacklisted_paths(get_module_paths(module))
-                for name, module in dict(sys.modules).items()
+                for name, module in modules.items()
+                if name not in self._cached_sys_modules
             }
-            self._cached_sys_modules = set(sys.modules)
-            self._register_necessary_watchers(modules_paths)
+            self._cached_sys_modules = set(modules)
+            if modules_paths:
+                self._register_necessary_watchers(modules_paths)
 
     def _register_necessary_watchers(self, module_paths: dict[str, set[str]]) -> None:
         for name, paths in module_paths.items():
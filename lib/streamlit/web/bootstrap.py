@@ -293,6 +293,22 @@ def _install_config_watchers(flag_options: dict[str, Any]) -> None:
             watch_file(filename, on_config_changed)
 
 
+def prewarm_caches(
+    main_script_path: str, args: list[str], flag_options: dict[str, Any]
+) -> bool:
+    """Run a script once and prewarm the caches of its cached functions,
+    without starting a server.
+
+    Returns True if the script and all prewarm calls completed without error.
+    """
+    _fix_sys_path(main_script_path)
+    _fix_sys_argv(main_script_path, args)
+    _fix_pydeck_mapbox_api_warning()
+
+    server = Server(main_script_path, is_hello=False)
+    return asyncio.run(server.prewarm_caches())
+
+
 def run(
     main_script_path: str,
     is_hello: bool,
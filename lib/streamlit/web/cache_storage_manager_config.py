@@ -16,9 +16,16 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
+from streamlit import config
+from streamlit.runtime.caching.storage.indexed_local_disk_cache_storage import (
+    IndexedLocalDiskCacheStorageManager,
+)
 from streamlit.runtime.caching.storage.local_disk_cache_storage import (
     LocalDiskCacheStorageManager,
 )
+from streamlit.runtime.caching.storage.shared_cache_storage_manager import (
+    SharedCacheStorageManager,
+)
 
 if TYPE_CHECKING:
     from streamlit.runtime.caching.storage import CacheStorageManager
@@ -35,4 +42,16 @@ def create_default_cache_storage_manager() -> CacheStorageManager:
         The cache storage manager.
 
     """
+    max_disk_size = config.get_option("server.cacheDataDiskMaxSize")
+    shared_path = config.get_option("server.cacheDataSharedPath")
+
+    if shared_path:
+        return SharedCacheStorageManager(
+            cache_dir=shared_path,
+            max_disk_size=max_disk_size if max_disk_size > 0 else None,
+        )
+    if config.get_option("server.cacheDataDiskIndex"):
+        return IndexedLocalDiskCacheStorageManager(
+            max_disk_size=max_disk_size if max_disk_size > 0 else None
+        )
     return LocalDiskCacheStorageManager()
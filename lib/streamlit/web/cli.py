@@ -299,6 +299,27 @@ def cache_clear():
     caching.cache_resource.clear()
 
 
+@cache.command("warm")
+@configurator_options
+@click.argument("target", required=True, envvar="STREAMLIT_RUN_TARGET")
+@click.argument("args", nargs=-1)
+def cache_warm(target: str, args=None, **kwargs):
+    """Prewarm the st.cache_data caches of a Streamlit app.
+
+    Runs the app's script once and calls its cached functions with the
+    argument sets declared with their `prewarm` parameter. Only values that
+    outlive this command are prewarmed, e.g. values of functions with
+    `persist="disk"` or values stored in `server.cacheDataSharedPath`.
+    """
+    bootstrap.load_config_options(flag_options=kwargs)
+
+    if not os.path.exists(target):
+        raise click.BadParameter(f"File does not exist: {target}")
+
+    if not bootstrap.prewarm_caches(target, list(args or []), kwargs):
+        sys.exit(1)
+
+
 # SUBCOMMAND: config
 
 
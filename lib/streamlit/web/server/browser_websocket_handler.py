@@ -121,6 +121,15 @@ class BrowserWebSocketHandler(WebSocketHandler, SessionClient):
         except tornado.websocket.WebSocketClosedError as e:
             raise SessionClientDisconnectedError from e
 
+    def write_serialized_forward_msg(self, msg: ForwardMsg, payload: bytes) -> None:
+        """Send a ForwardMsg whose payload has already been serialized to the
+        browser.
+        """
+        try:
+            self.write_message(serialize_forward_msg(msg, payload), binary=True)
+        except tornado.websocket.WebSocketClosedError as e:
+            raise SessionClientDisconnectedError from e
+
     def select_subprotocol(self, subprotocols: list[str]) -> str | None:
         """Return the first subprotocol in the given list.
 
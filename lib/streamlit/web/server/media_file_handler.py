@@ -19,6 +19,10 @@ from urllib.parse import quote
 import tornado.web
 
 from streamlit.logger import get_logger
+from streamlit.runtime.disk_spilling_media_file_storage import (
+    DiskFile,
+    DiskSpillingMediaFileStorage,
+)
 from streamlit.runtime.media_file_storage import MediaFileKind, MediaFileStorageError
 from streamlit.runtime.memory_media_file_storage import (
     MemoryMediaFileStorage,
@@ -30,11 +34,13 @@ _LOGGER = get_logger(__name__)
 
 
 class MediaFileHandler(tornado.web.StaticFileHandler):
-    _storage: MemoryMediaFileStorage
+    _storage: MemoryMediaFileStorage | DiskSpillingMediaFileStorage
 
     @classmethod
-    def initialize_storage(cls, storage: MemoryMediaFileStorage) -> None:
-        """Set the MemoryMediaFileStorage object used by instances of this
+    def initialize_storage(
+        cls, storage: MemoryMediaFileStorage | DiskSpillingMediaFileStorage
+    ) -> None:
+        """Set the MediaFileStorage object used by instances of this
         handler. Must be called on server startup.
         """
         # This is a class method, rather than an instance method, because
@@ -111,6 +117,12 @@ class MediaFileHandler(tornado.web.StaticFileHandler):
         # path itself. In the MediaFileHandler, it's just the filename
         return path
 
+    @classmethod
+    def get_content_version(cls, abspath: str) -> str:
+        # File IDs are hashes of the file content, so there's no need to hash
+        # the content again (as StaticFileHandler does) to compute the ETag.
+        return abspath
+
     @classmethod
     def get_content(
         cls, abspath: str, start: int | None = None, end: int | None = None
@@ -128,6 +140,15 @@ class MediaFileHandler(tornado.web.StaticFileHandler):
             "MediaFileHandler: Sending %s file %s", media_file.mimetype, abspath
         )
 
+        if isinstance(media_file, DiskFile):
+            # Stream files on disk in chunks, instead of reading them into
+            # memory.
+            try:
+                return media_file.iter_content(start, end)
+            except OSError:
+                _LOGGER.error("MediaFileHandler: Missing file %s", abspath)
+                raise tornado.web.HTTPError(404, "not found")
+
         # If there is no start and end, just return the full content
         if start is None and end is None:
             return media_file.content
@@ -0,0 +1,69 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2025)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import ipaddress
+import json
+
+import tornado.web
+
+from streamlit.runtime import script_run_profile
+
+
+class ProfileRequestHandler(tornado.web.RequestHandler):
+    """Serves the profiles of the most recent script runs to local clients.
+
+    Query parameters
+    ----------------
+    format
+        "json" (the default) for a summary of each script run, or "trace"
+        for Chrome trace events.
+    session_id
+        Only return the profiles of the given session.
+    """
+
+    def get(self) -> None:
+        if not _is_loopback_address(self.request.remote_ip):
+            self.set_status(403)
+            self.write("Profiles are only served to local clients.")
+            return
+
+        profiles = script_run_profile.get_recent_profiles(
+            self.get_query_argument("session_id", None)
+        )
+        response_format = self.get_query_argument("format", "json")
+        if response_format == "trace":
+            body = script_run_profile.to_chrome_trace(profiles)
+        elif response_format == "json":
+            body = {"profiles": [profile.to_dict() for profile in profiles]}
+        else:
+            # The format isn't echoed back, to not reflect user input.
+            self.set_status(400)
+            self.set_header("Content-Type", "text/plain")
+            self.write('Unsupported format, expected "json" or "trace".')
+            return
+
+        self.set_header("Content-Type", "application/json")
+        self.write(json.dumps(body))
+        self.set_status(200)
+
+
+def _is_loopback_address(remote_ip: str | None) -> bool:
+    if remote_ip is None:
+        return False
+    try:
+        return ipaddress.ip_address(remote_ip).is_loopback
+    except ValueError:
+        return False
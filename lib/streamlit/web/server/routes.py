@@ -19,7 +19,7 @@ from typing import TYPE_CHECKING, Final
 
 import tornado.web
 
-from streamlit import config, file_util
+from streamlit import config, dataframe_util, file_util
 from streamlit.logger import get_logger
 from streamlit.runtime.runtime_util import serialize_forward_msg
 from streamlit.web.server.server_util import (
@@ -273,8 +273,9 @@ class MessageCacheHandler(tornado.web.RequestHandler):
             self.set_status(404)
             raise tornado.web.Finish()
 
-        message = self._cache.get_message(msg_hash)
-        if message is None:
+        header = self._cache.get_message_header(msg_hash)
+        payload = self._cache.get_serialized_payload(msg_hash)
+        if header is None or payload is None:
             # Message not in our cache.
             _LOGGER.error(
                 "HTTP request for cached message could not be fulfilled. "
@@ -284,7 +285,7 @@ class MessageCacheHandler(tornado.web.RequestHandler):
             raise tornado.web.Finish()
 
         _LOGGER.debug("MessageCache HIT")
-        msg_str = serialize_forward_msg(message)
+        msg_str = serialize_forward_msg(header, payload)
         self.set_header("Content-Type", "application/octet-stream")
         self.write(msg_str)
         self.set_status(200)
@@ -293,3 +294,64 @@ class MessageCacheHandler(tornado.web.RequestHandler):
         """/OPTIONS handler for preflight CORS checks."""
         self.set_status(204)
         self.finish()
+
+
+class DataframeSourceHandler(_SpecialRequestHandler):
+    """Returns row ranges of server-side paged dataframes as Arrow IPC bytes.
+
+    Supported query arguments:
+    - start, stop: The range of rows to return.
+    - sort, ascending: The column to sort by and the sort direction.
+    - filter_column, filter_value: Only return rows where the given column
+      contains the given value.
+
+    The total number of rows matching the filter is returned in the
+    ``X-Streamlit-Row-Count`` header.
+    """
+
+    def initialize(self, dataframe_source_mgr):
+        """Initializes the handler.
+
+        Parameters
+        ----------
+        dataframe_source_mgr : DataframeSourceManager
+
+        """
+        self._dataframe_source_mgr = dataframe_source_mgr
+
+    def get(self, source_id: str) -> None:
+        table = self._dataframe_source_mgr.get(source_id)
+        if table is None:
+            self.set_status(404)
+            raise tornado.web.Finish()
+
+        filter_column = self.get_argument("filter_column", None)
+        try:
+            start = int(self.get_argument("start", "0"))
+            stop_arg = self.get_argument("stop", None)
+            stop = int(stop_arg) if stop_arg is not None else None
+            page, num_rows = dataframe_util.query_arrow_table(
+                table,
+                start=start,
+                stop=stop,
+                sort_column=self.get_argument("sort", None),
+                ascending=self.get_argument("ascending", "true").lower() != "false",
+                filters=(
+                    {filter_column: self.get_argument("filter_value", "")}
+                    if filter_column is not None
+                    else None
+                ),
+            )
+        except (KeyError, ValueError, NotImplementedError) as ex:
+            # The error isn't sent to the client, since it may contain the
+            # requested column names or filter values.
+            _LOGGER.warning("Invalid dataframe source request: %s", ex)
+            self.set_status(400)
+            self.set_header("Content-Type", "text/plain")
+            self.write("Invalid dataframe source request.")
+            raise tornado.web.Finish()
+
+        self.set_header("Content-Type", "application/vnd.apache.arrow.stream")
+        self.set_header("X-Streamlit-Row-Count", str(num_rows))
+        self.write(dataframe_util.convert_arrow_table_to_arrow_bytes(page))
+        self.set_status(200)
@@ -33,7 +33,12 @@ from streamlit import cli_util, config, file_util, util
 from streamlit.auth_util import is_authlib_installed
 from streamlit.config_option import ConfigOption
 from streamlit.logger import get_logger
-from streamlit.runtime import Runtime, RuntimeConfig, RuntimeState
+from streamlit.runtime import Runtime, RuntimeConfig, RuntimeState, script_run_profile
+from streamlit.runtime.dataframe_source_manager import DATAFRAME_SOURCE_ENDPOINT
+from streamlit.runtime.disk_spilling_media_file_storage import (
+    DiskSpillingMediaFileStorage,
+)
+from streamlit.runtime.disk_uploaded_file_manager import DiskUploadedFileManager
 from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
 from streamlit.runtime.memory_session_storage import MemorySessionStorage
 from streamlit.runtime.memory_uploaded_file_manager import MemoryUploadedFileManager
@@ -45,8 +50,10 @@ from streamlit.web.server.app_static_file_handler import AppStaticFileHandler
 from streamlit.web.server.browser_websocket_handler import BrowserWebSocketHandler
 from streamlit.web.server.component_request_handler import ComponentRequestHandler
 from streamlit.web.server.media_file_handler import MediaFileHandler
+from streamlit.web.server.profile_request_handler import ProfileRequestHandler
 from streamlit.web.server.routes import (
     AddSlashHandler,
+    DataframeSourceHandler,
     HealthHandler,
     HostConfigHandler,
     MessageCacheHandler,
@@ -60,7 +67,10 @@ from streamlit.web.server.server_util import (
     make_url_path_regex,
 )
 from streamlit.web.server.stats_request_handler import StatsRequestHandler
-from streamlit.web.server.upload_file_request_handler import UploadFileRequestHandler
+from streamlit.web.server.upload_file_request_handler import (
+    StreamingUploadFileRequestHandler,
+    UploadFileRequestHandler,
+)
 
 if TYPE_CHECKING:
     from collections.abc import Awaitable
@@ -95,6 +105,7 @@ MEDIA_ENDPOINT: Final = "/media"
 UPLOAD_FILE_ENDPOINT: Final = "/_stcore/upload_file"
 STREAM_ENDPOINT: Final = r"_stcore/stream"
 METRIC_ENDPOINT: Final = r"(?:st-metrics|_stcore/metrics)"
+PROFILE_ENDPOINT: Final = r"_stcore/profile"
 MESSAGE_ENDPOINT: Final = r"_stcore/message"
 NEW_HEALTH_ENDPOINT: Final = "_stcore/health"
 HEALTH_ENDPOINT: Final = rf"(?:healthz|{NEW_HEALTH_ENDPOINT})"
@@ -248,10 +259,31 @@ class Server:
         self._main_script_path = main_script_path
 
         # Initialize MediaFileStorage and its associated endpoint
-        media_file_storage = MemoryMediaFileStorage(MEDIA_ENDPOINT)
+        media_file_storage: MemoryMediaFileStorage | DiskSpillingMediaFileStorage
+        media_file_memory_budget = config.get_option("server.mediaFileMemoryBudget")
+        if media_file_memory_budget > 0:
+            media_file_storage = DiskSpillingMediaFileStorage(
+                MEDIA_ENDPOINT, memory_budget=media_file_memory_budget * 1024 * 1024
+            )
+        else:
+            media_file_storage = MemoryMediaFileStorage(MEDIA_ENDPOINT)
         MediaFileHandler.initialize_storage(media_file_storage)
 
-        uploaded_file_mgr = MemoryUploadedFileManager(UPLOAD_FILE_ENDPOINT)
+        uploaded_file_mgr: MemoryUploadedFileManager
+        if config.get_option("server.streamUploadsToDisk"):
+            max_total_upload_size = config.get_option("server.maxTotalUploadSize")
+            max_session_upload_size = config.get_option("server.maxSessionUploadSize")
+            uploaded_file_mgr = DiskUploadedFileManager(
+                UPLOAD_FILE_ENDPOINT,
+                max_total_size=max_total_upload_size * 1024 * 1024
+                if max_total_upload_size > 0
+                else None,
+                max_session_size=max_session_upload_size * 1024 * 1024
+                if max_session_upload_size > 0
+                else None,
+            )
+        else:
+            uploaded_file_mgr = MemoryUploadedFileManager(UPLOAD_FILE_ENDPOINT)
 
         self._runtime = Runtime(
             RuntimeConfig(
@@ -300,6 +332,20 @@ class Server:
 
         await self._runtime.start()
 
+    async def prewarm_caches(self) -> bool:
+        """Start the runtime without listening for connections, prewarm the
+        caches of the app, and stop the runtime again.
+
+        Returns True if the app's script and all prewarm calls completed
+        without error.
+        """
+        await self._runtime.start()
+        try:
+            return await self._runtime.prewarm_caches()
+        finally:
+            self._runtime.stop()
+            await self._runtime.stopped
+
     @property
     def stopped(self) -> Awaitable[None]:
         """A Future that completes when the Server's run loop has exited."""
@@ -339,7 +385,9 @@ class Server:
                     base,
                     rf"{UPLOAD_FILE_ENDPOINT}/(?P<session_id>[^/]+)/(?P<file_id>[^/]+)",
                 ),
-                UploadFileRequestHandler,
+                StreamingUploadFileRequestHandler
+                if isinstance(self._runtime.uploaded_file_mgr, DiskUploadedFileManager)
+                else UploadFileRequestHandler,
                 {
                     "file_mgr": self._runtime.uploaded_file_mgr,
                     "is_active_session": self._runtime.is_active_session,
@@ -350,6 +398,11 @@ class Server:
                 MediaFileHandler,
                 {"path": ""},
             ),
+            (
+                make_url_path_regex(base, f"{DATAFRAME_SOURCE_ENDPOINT}/([^/]+)"),
+                DataframeSourceHandler,
+                {"dataframe_source_mgr": self._runtime.dataframe_source_mgr},
+            ),
             (
                 make_url_path_regex(base, "component/(.*)"),
                 ComponentRequestHandler,
@@ -357,6 +410,11 @@ class Server:
             ),
         ]
 
+        if script_run_profile.is_profiling_enabled():
+            routes.append(
+                (make_url_path_regex(base, PROFILE_ENDPOINT), ProfileRequestHandler)
+            )
+
         if config.get_option("server.scriptHealthCheckEnabled"):
             routes.extend(
                 [
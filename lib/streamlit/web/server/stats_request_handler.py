@@ -14,6 +14,8 @@
 
 from __future__ import annotations
 
+import asyncio
+import itertools
 from typing import TYPE_CHECKING
 
 import tornado.web
@@ -23,7 +25,7 @@ from streamlit.web.server.server_util import emit_endpoint_deprecation_notice
 
 if TYPE_CHECKING:
     from streamlit.proto.openmetrics_data_model_pb2 import MetricSet as MetricSetProto
-    from streamlit.runtime.stats import CacheStat, StatsManager
+    from streamlit.runtime.stats import CacheCounter, CacheStat, StatsManager
 
 
 class StatsRequestHandler(tornado.web.RequestHandler):
@@ -39,41 +41,69 @@ class StatsRequestHandler(tornado.web.RequestHandler):
         self.set_status(204)
         self.finish()
 
-    def get(self) -> None:
+    async def get(self) -> None:
         if self.request.uri and "_stcore/" not in self.request.uri:
             emit_endpoint_deprecation_notice(self, new_path="/_stcore/metrics")
 
-        stats = self._manager.get_stats()
+        # Gathering stats may take a while for providers that don't keep
+        # running totals, so we do it off the event loop thread.
+        stats, counters = await asyncio.get_running_loop().run_in_executor(
+            None, self._get_stats_and_counters
+        )
 
         # If the request asked for protobuf output, we return a serialized
         # protobuf. Else we return text.
         if "application/x-protobuf" in self.request.headers.get_list("Accept"):
-            self.write(self._stats_to_proto(stats).SerializeToString())
+            self.write(self._stats_to_proto(stats, counters).SerializeToString())
             self.set_header("Content-Type", "application/x-protobuf")
             self.set_status(200)
         else:
-            self.write(self._stats_to_text(self._manager.get_stats()))
+            self.write(self._stats_to_text(stats, counters))
             self.set_header("Content-Type", "application/openmetrics-text")
             self.set_status(200)
 
+    def _get_stats_and_counters(self) -> tuple[list[CacheStat], list[CacheCounter]]:
+        return self._manager.get_stats(), self._manager.get_counters()
+
+    @staticmethod
+    def _group_counters(
+        counters: list[CacheCounter],
+    ) -> list[tuple[str, list[CacheCounter]]]:
+        """Group counters by metric name. Counters keep their order within a group."""
+        sorted_counters = sorted(counters, key=lambda counter: counter.metric_name)
+        return [
+            (metric_name, list(group))
+            for metric_name, group in itertools.groupby(
+                sorted_counters, key=lambda counter: counter.metric_name
+            )
+        ]
+
     @staticmethod
-    def _stats_to_text(stats: list[CacheStat]) -> str:
+    def _stats_to_text(
+        stats: list[CacheStat], counters: list[CacheCounter] | None = None
+    ) -> str:
         metric_type = "# TYPE cache_memory_bytes gauge"
         metric_unit = "# UNIT cache_memory_bytes bytes"
         metric_help = "# HELP Total memory consumed by a cache."
         openmetrics_eof = "# EOF\n"
 
-        # Format: header, stats, EOF
+        # Format: header, stats, [counter header, counters], EOF
         result = [metric_type, metric_unit, metric_help]
         result.extend(stat.to_metric_str() for stat in stats)
+        for metric_name, group in StatsRequestHandler._group_counters(counters or []):
+            result.append(f"# TYPE {metric_name} counter")
+            result.append(f"# HELP Total number of {group[0].counter_name} of a cache.")
+            result.extend(counter.to_metric_str() for counter in group)
         result.append(openmetrics_eof)
 
         return "\n".join(result)
 
     @staticmethod
-    def _stats_to_proto(stats: list[CacheStat]) -> MetricSetProto:
+    def _stats_to_proto(
+        stats: list[CacheStat], counters: list[CacheCounter] | None = None
+    ) -> MetricSetProto:
         # Lazy load the import of this proto message for better performance:
-        from streamlit.proto.openmetrics_data_model_pb2 import GAUGE
+        from streamlit.proto.openmetrics_data_model_pb2 import COUNTER, GAUGE
         from streamlit.proto.openmetrics_data_model_pb2 import (
             MetricSet as MetricSetProto,
         )
@@ -92,4 +122,15 @@ class StatsRequestHandler(tornado.web.RequestHandler):
 
         metric_set = MetricSetProto()
         metric_set.metric_families.append(metric_family)
+
+        for metric_name, group in StatsRequestHandler._group_counters(counters or []):
+            counter_family = metric_set.metric_families.add()
+            counter_family.name = metric_name
+            counter_family.type = COUNTER
+            counter_family.help = f"Total number of {group[0].counter_name} of a cache."
+
+            for counter in group:
+                metric_proto = counter_family.metrics.add()
+                counter.marshall_metric_proto(metric_proto)
+
         return metric_set
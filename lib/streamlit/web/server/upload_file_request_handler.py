@@ -14,7 +14,10 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any, Callable
+import contextlib
+import email.parser
+import os
+from typing import IO, TYPE_CHECKING, Any, Callable, Final, NamedTuple
 
 import tornado.httputil
 import tornado.web
@@ -25,8 +28,12 @@ from streamlit.web.server import routes, server_util
 from streamlit.web.server.server_util import is_xsrf_enabled
 
 if TYPE_CHECKING:
+    from streamlit.runtime.disk_uploaded_file_manager import DiskUploadedFileManager
     from streamlit.runtime.memory_uploaded_file_manager import MemoryUploadedFileManager
 
+# The maximum size of the headers of a part of a multipart body.
+_MAX_PART_HEADERS_SIZE: Final = 64 * 1024
+
 
 class UploadFileRequestHandler(tornado.web.RequestHandler):
     """Implements the POST /upload_file endpoint."""
@@ -135,3 +142,254 @@ class UploadFileRequestHandler(tornado.web.RequestHandler):
 
         self._file_mgr.remove_file(session_id=session_id, file_id=file_id)
         self.set_status(204)
+
+
+class _UploadedPart(NamedTuple):
+    """A file in a multipart body that was written to disk."""
+
+    name: str
+    content_type: str
+    path: str
+
+
+class _MultipartFileParser:
+    """Incrementally parses a multipart/form-data body, and writes the content
+    of its file parts to files as it arrives.
+
+    Parts that aren't files (i.e. that don't have a filename) are discarded.
+    """
+
+    def __init__(self, boundary: bytes, create_file: Callable[[], tuple[int, str]]):
+        self._delimiter = b"\r\n--" + boundary
+        # The body starts with a delimiter without the leading CRLF.
+        self._buffer = b"\r\n"
+        self._state = "preamble"
+        self._create_file = create_file
+        self._output: IO[bytes] | None = None
+        self._part: _UploadedPart | None = None
+        self.files: list[_UploadedPart] = []
+
+    def feed(self, data: bytes) -> None:
+        """Parse the next chunk of the body.
+
+        Raises
+        ------
+        ValueError
+            Raised if the body is malformed.
+        """
+        self._buffer += data
+        while self._parse_buffer():
+            pass
+
+    def close(self) -> None:
+        """Finish parsing, after the whole body has been fed.
+
+        Raises
+        ------
+        ValueError
+            Raised if the body is incomplete.
+        """
+        self._close_output()
+        if self._state != "epilogue":
+            raise ValueError("Incomplete multipart body")
+
+    def remove_files(self) -> None:
+        """Remove all files that were written."""
+        self._close_output()
+        for part in self.files:
+            with contextlib.suppress(OSError):
+                os.remove(part.path)
+        if self._part is not None:
+            with contextlib.suppress(OSError):
+                os.remove(self._part.path)
+            self._part = None
+
+    def _parse_buffer(self) -> bool:
+        """Parse as much of the buffer as possible in the current state, and
+        return whether parsing can continue in the next state.
+        """
+        if self._state in ("preamble", "body"):
+            index = self._buffer.find(self._delimiter)
+            if index == -1:
+                # Keep the end of the buffer, which may be the start of a
+                # delimiter that is split across chunks.
+                keep = len(self._delimiter) - 1
+                self._write(self._buffer[:-keep])
+                self._buffer = self._buffer[-keep:]
+                return False
+
+            self._write(self._buffer[:index])
+            self._buffer = self._buffer[index + len(self._delimiter) :]
+            self._finish_part()
+            self._state = "delimiter"
+            return True
+
+        if self._state == "delimiter":
+            if len(self._buffer) < 2:
+                return False
+            if self._buffer.startswith(b"--"):
+                self._state = "epilogue"
+                self._buffer = b""
+                return False
+            if not self._buffer.startswith(b"\r\n"):
+                raise ValueError("Invalid multipart boundary")
+            self._buffer = self._buffer[2:]
+            self._state = "headers"
+            return True
+
+        if self._state == "headers":
+            index = self._buffer.find(b"\r\n\r\n")
+            if index == -1:
+                if len(self._buffer) > _MAX_PART_HEADERS_SIZE:
+                    raise ValueError("Multipart headers too large")
+                return False
+
+            self._start_part(self._buffer[:index])
+            self._buffer = self._buffer[index + 4 :]
+            self._state = "body"
+            return True
+
+        # The epilogue is ignored.
+        self._buffer = b""
+        return False
+
+    def _start_part(self, raw_headers: bytes) -> None:
+        headers = email.parser.HeaderParser().parsestr(
+            raw_headers.decode("utf-8") + "\r\n\r\n"
+        )
+        filename = headers.get_filename()
+        if not filename:
+            return
+
+        fd, path = self._create_file()
+        self._output = os.fdopen(fd, "wb")
+        self._part = _UploadedPart(
+            name=filename,
+            content_type=headers.get("Content-Type", "application/unknown"),
+            path=path,
+        )
+
+    def _finish_part(self) -> None:
+        self._close_output()
+        if self._part is not None:
+            self.files.append(self._part)
+            self._part = None
+
+    def _write(self, data: bytes) -> None:
+        if self._output is not None and data:
+            self._output.write(data)
+
+    def _close_output(self) -> None:
+        if self._output is not None:
+            self._output.close()
+            self._output = None
+
+
+@tornado.web.stream_request_body
+class StreamingUploadFileRequestHandler(UploadFileRequestHandler):
+    """Implements the PUT /upload_file endpoint for DiskUploadedFileManager.
+
+    The request body is streamed to disk as it arrives, instead of being
+    buffered in memory, and the space it uses is reserved in the manager while
+    it's streamed, so that uploads that exceed a quota fail early.
+    """
+
+    _file_mgr: DiskUploadedFileManager
+    _parser: _MultipartFileParser | None = None
+    _reserved_size = 0
+    _file_added = False
+
+    def prepare(self) -> None:
+        if self.request.method != "PUT":
+            return
+
+        session_id = self.path_kwargs["session_id"]
+        try:
+            if not self._is_active_session(session_id):
+                raise Exception("Invalid session_id")
+        except Exception as e:
+            self.send_error(400, reason=str(e))
+            return
+
+        content_type, params = _parse_content_type(
+            self.request.headers.get("Content-Type", "")
+        )
+        boundary = params.get("boundary")
+        if content_type != "multipart/form-data" or not boundary:
+            self.send_error(400, reason="Expected a multipart/form-data body")
+            return
+
+        self._parser = _MultipartFileParser(
+            boundary.encode("latin1"), self._file_mgr.create_upload_file
+        )
+
+    def data_received(self, chunk: bytes) -> None:
+        if self._parser is None or self._finished:
+            return
+
+        session_id = self.path_kwargs["session_id"]
+        if not self._file_mgr.reserve(session_id, len(chunk)):
+            self._discard_upload()
+            self.send_error(413, reason="Upload quota exceeded")
+            return
+        self._reserved_size += len(chunk)
+
+        try:
+            self._parser.feed(chunk)
+        except ValueError as e:
+            self._discard_upload()
+            self.send_error(400, reason=str(e))
+
+    def put(self, **kwargs):
+        """Add the file that was streamed to disk to our UploadedFileManager."""
+        if self._parser is None or self._finished:
+            return
+
+        try:
+            self._parser.close()
+        except ValueError as e:
+            self._discard_upload()
+            self.send_error(400, reason=str(e))
+            return
+
+        files = self._parser.files
+        if len(files) != 1:
+            self._discard_upload()
+            self.send_error(400, reason=f"Expected 1 file, but got {len(files)}")
+            return
+
+        self._file_mgr.add_file_from_path(
+            session_id=self.path_kwargs["session_id"],
+            file_id=self.path_kwargs["file_id"],
+            name=files[0].name,
+            type=files[0].content_type,
+            path=files[0].path,
+            reserved_size=self._reserved_size,
+        )
+        self._file_added = True
+        self.set_status(204)
+
+    def on_finish(self) -> None:
+        if not self._file_added:
+            self._discard_upload()
+
+    def on_connection_close(self) -> None:
+        super().on_connection_close()
+        if not self._file_added:
+            self._discard_upload()
+
+    def _discard_upload(self) -> None:
+        """Remove the files written so far and release their space."""
+        if self._parser is not None:
+            self._parser.remove_files()
+            self._parser = None
+        if self._reserved_size:
+            self._file_mgr.release(self.path_kwargs["session_id"], self._reserved_size)
+            self._reserved_size = 0
+
+
+def _parse_content_type(value: str) -> tuple[str, dict[str, str]]:
+    """Parse a Content-Type header into its mimetype and parameters."""
+    headers = email.parser.HeaderParser().parsestr(f"Content-Type: {value}\r\n\r\n")
+    params = dict(headers.get_params(failobj=[])[1:])
+    return headers.get_content_type(), params
@@ -415,11 +415,14 @@ class ConfigTest(unittest.TestCase):
                 "logger.enableRich",
                 "logger.level",
                 "logger.messageFormat",
+                "runner.bytecodeCacheDir",
                 "runner.enforceSerializableSessionState",
                 "runner.magicEnabled",
                 "runner.postScriptGC",
                 "runner.fastReruns",
                 "runner.enumCoercion",
+                "runner.profileScriptRuns",
+                "runner.profileTraceDir",
                 "magic.displayRootDocString",
                 "magic.displayLastExprIfNoSemicolon",
                 "mapbox.token",
@@ -437,10 +440,26 @@ class ConfigTest(unittest.TestCase):
                 "server.allowRunOnSave",
                 "server.port",
                 "server.runOnSave",
+                "server.rerunOnlyDependentPages",
+                "server.scheduleFragmentRuns",
                 "server.maxUploadSize",
+                "server.mediaFileMemoryBudget",
+                "server.streamUploadsToDisk",
+                "server.maxTotalUploadSize",
+                "server.maxSessionUploadSize",
                 "server.maxMessageSize",
+                "server.messageCacheMaxBytes",
                 "server.enableStaticServing",
                 "server.enableArrowTruncation",
+                "server.forwardMsgBatchSize",
+                "server.forwardMsgFlushInterval",
+                "server.dataframePageSize",
+                "server.cacheDataDiskIndex",
+                "server.cacheDataDiskMaxSize",
+                "server.cacheDataSharedPath",
+                "server.cacheHashingMode",
+                "server.cacheHashMemoizeMutable",
+                "server.cachePrewarm",
                 "server.sslCertFile",
                 "server.sslKeyFile",
                 "server.disconnectedSessionTTL",
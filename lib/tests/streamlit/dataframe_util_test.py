@@ -217,6 +217,69 @@ class DataframeUtilTest(unittest.TestCase):
         self.assertEqual(reconstructed_df.shape[0], metadata.expected_rows)
         self.assertEqual(reconstructed_df.shape[1], metadata.expected_cols)
 
+    def test_convert_arrow_table_to_arrow_bytes_matches_stream_format(self):
+        """Test that `convert_arrow_table_to_arrow_bytes` produces the same
+        Arrow IPC stream as writing the table to a growable output stream,
+        including for chunked and dictionary-encoded columns.
+        """
+        table = pa.concat_tables(
+            [
+                pa.table(
+                    {
+                        "ints": pa.array(range(i * 100, (i + 1) * 100)),
+                        "cats": pa.array(["a", "b"] * 50).dictionary_encode(),
+                    }
+                )
+                for i in range(3)
+            ]
+        )
+
+        sink = pa.BufferOutputStream()
+        with pa.RecordBatchStreamWriter(sink, table.schema) as writer:
+            writer.write_table(table)
+
+        converted_bytes = dataframe_util.convert_arrow_table_to_arrow_bytes(table)
+
+        self.assertIsInstance(converted_bytes, bytes)
+        self.assertEqual(sink.getvalue().to_pybytes(), converted_bytes)
+        self.assertEqual(
+            table, pa.ipc.open_stream(converted_bytes).read_all().combine_chunks()
+        )
+
+    def test_query_arrow_table(self):
+        """Test that `query_arrow_table` filters, sorts and slices the table."""
+        table = pa.table({"a": [3, 1, 4, 1, 5], "b": ["x", "yy", "y", None, "z"]})
+
+        result, num_rows = dataframe_util.query_arrow_table(table, 1, 3)
+        self.assertEqual(num_rows, 5)
+        self.assertEqual(result.column("a").to_pylist(), [1, 4])
+
+        result, num_rows = dataframe_util.query_arrow_table(
+            table, 0, 2, sort_column="a", ascending=False
+        )
+        self.assertEqual(num_rows, 5)
+        self.assertEqual(result.column("a").to_pylist(), [5, 4])
+
+        result, num_rows = dataframe_util.query_arrow_table(
+            table, 0, None, sort_column="a", filters={"b": "y"}
+        )
+        self.assertEqual(num_rows, 2)
+        self.assertEqual(result.column("b").to_pylist(), ["yy", "y"])
+
+        # Out of range requests return an empty table:
+        result, num_rows = dataframe_util.query_arrow_table(table, 10, 20)
+        self.assertEqual(num_rows, 5)
+        self.assertEqual(result.num_rows, 0)
+
+    def test_query_arrow_table_unknown_column(self):
+        """Test that `query_arrow_table` raises a KeyError for unknown columns."""
+        table = pa.table({"a": [1, 2, 3]})
+
+        with pytest.raises(KeyError):
+            dataframe_util.query_arrow_table(table, sort_column="b")
+        with pytest.raises(KeyError):
+            dataframe_util.query_arrow_table(table, filters={"b": "1"})
+
     @parameterized.expand(
         [
             # Complex numbers:
@@ -853,6 +916,33 @@ class TestArrowTruncation(DeltaGeneratorTestCase):
         self.assertIn("due to data size limitations", el.markdown.body)
         self.assertTrue(el.markdown.is_caption)
 
+    @patch_config_options(
+        {"server.maxMessageSize": 3, "server.enableArrowTruncation": True}
+    )
+    def test_truncate_to_exact_row_cutoff(self):
+        """Test that `_maybe_truncate_table` keeps as many rows as fit into the
+        max message size, including for wide tables and variable-width columns.
+        """
+        # 2MB available for the table (3MB - 1MB overhead):
+        max_table_size = 2 * int(1e6)
+
+        for table in [
+            pa.table({f"col {i}": range(20000) for i in range(300)}),
+            pa.table(
+                {
+                    "strings": ["x" * (i % 50) for i in range(200000)],
+                    "categories": pa.array(["a", "b"] * 100000).dictionary_encode(),
+                    "floats": [None if i % 3 else 1.0 for i in range(200000)],
+                }
+            ),
+        ]:
+            truncated_table = dataframe_util._maybe_truncate_table(table)
+            self.assertLessEqual(truncated_table.nbytes, max_table_size)
+            # One more row would exceed the limit:
+            self.assertGreater(
+                table.slice(0, truncated_table.num_rows + 1).nbytes, max_table_size
+            )
+
     @patch_config_options(
         {"server.maxMessageSize": 3, "server.enableArrowTruncation": True}
     )
@@ -924,3 +1014,17 @@ class TestArrowTruncation(DeltaGeneratorTestCase):
         el = self.get_delta_from_queue(-2).new_element
         self.assertIn("due to data size limitations", el.markdown.body)
         self.assertTrue(el.markdown.is_caption)
+
+
+@pytest.mark.usefixtures("benchmark")
+@pytest.mark.parametrize(
+    ("num_columns", "num_rows"),
+    [(3, 200000), (300, 20000), (3000, 2000)],
+)
+def test_truncate_table_performance(benchmark, num_columns: int, num_rows: int):
+    """Benchmark `_maybe_truncate_table` against table width and row count."""
+    table = pa.table({f"col {i}": np.arange(num_rows) for i in range(num_columns)})
+    with patch_config_options(
+        {"server.maxMessageSize": 3, "server.enableArrowTruncation": True}
+    ):
+        benchmark(dataframe_util._maybe_truncate_table, table)
@@ -30,8 +30,11 @@ from streamlit.dataframe_util import (
 from streamlit.elements.lib.column_config_utils import INDEX_IDENTIFIER
 from streamlit.errors import StreamlitAPIException
 from streamlit.proto.Arrow_pb2 import Arrow as ArrowProto
+from streamlit.proto.ClientState_pb2 import ContextInfo
+from streamlit.runtime import Runtime
 from tests.delta_generator_test_case import DeltaGeneratorTestCase
 from tests.streamlit.data_test_cases import SHARED_TEST_CASES, CaseMetadata
+from tests.testutil import patch_config_options
 
 
 def mock_data_frame():
@@ -100,6 +103,46 @@ class ArrowDataFrameProtoTest(DeltaGeneratorTestCase):
         proto = self.get_delta_from_queue().new_element.arrow_data_frame
         self.assertEqual(proto.column_order, [])
 
+    @patch_config_options({"server.dataframePageSize": 2})
+    def test_server_side_paging(self):
+        """Test that large dataframes are kept on the server and only
+        the first page is sent to the frontend."""
+        self.script_run_ctx.context_info = ContextInfo(supports_dataframe_sources=True)
+        df = pd.DataFrame({"a": [1, 2, 3, 4, 5]})
+        st.dataframe(df)
+
+        proto = self.get_delta_from_queue().new_element.arrow_data_frame
+        pd.testing.assert_frame_equal(
+            convert_arrow_bytes_to_pandas_df(proto.data), df.iloc[:2]
+        )
+        self.assertEqual(proto.data_source_num_rows, 5)
+        self.assertTrue(proto.data_source_url.startswith("/_stcore/dataframe/"))
+
+        source_id = proto.data_source_url.rsplit("/", 1)[-1]
+        table = Runtime._instance.dataframe_source_mgr.get(source_id)
+        self.assertEqual(table.num_rows, 5)
+
+    @patch_config_options({"server.dataframePageSize": 2})
+    def test_no_server_side_paging_without_client_support(self):
+        """Test that clients that don't request the other rows of a data
+        source are sent the full table."""
+        df = pd.DataFrame({"a": [1, 2, 3, 4, 5]})
+        st.dataframe(df)
+
+        proto = self.get_delta_from_queue().new_element.arrow_data_frame
+        pd.testing.assert_frame_equal(convert_arrow_bytes_to_pandas_df(proto.data), df)
+        self.assertEqual(proto.data_source_url, "")
+
+    @patch_config_options({"server.dataframePageSize": 10})
+    def test_no_server_side_paging_for_small_dataframes(self):
+        """Test that dataframes smaller than the page size are sent in full."""
+        df = pd.DataFrame({"a": [1, 2, 3, 4, 5]})
+        st.dataframe(df)
+
+        proto = self.get_delta_from_queue().new_element.arrow_data_frame
+        pd.testing.assert_frame_equal(convert_arrow_bytes_to_pandas_df(proto.data), df)
+        self.assertEqual(proto.data_source_url, "")
+
     @parameterized.expand(SHARED_TEST_CASES)
     def test_with_compatible_data(
         self,
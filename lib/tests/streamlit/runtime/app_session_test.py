@@ -38,6 +38,7 @@ from streamlit.runtime.app_session import AppSession, AppSessionState
 from streamlit.runtime.caching.storage.dummy_cache_storage import (
     MemoryCacheStorageManager,
 )
+from streamlit.runtime.forward_msg_cache import serialize_forward_msg_payload
 from streamlit.runtime.forward_msg_queue import ForwardMsgQueue
 from streamlit.runtime.fragment import MemoryFragmentStorage
 from streamlit.runtime.media_file_manager import MediaFileManager
@@ -58,6 +59,7 @@ from streamlit.runtime.uploaded_file_manager import (
     UploadFileUrlInfo,
 )
 from streamlit.watcher.local_sources_watcher import LocalSourcesWatcher
+from tests.streamlit.message_mocks import create_dataframe_msg
 from tests.testutil import patch_config_options
 
 
@@ -330,6 +332,46 @@ class AppSessionTest(unittest.TestCase):
         # And a new ScriptRunner should *not* be created.
         mock_create_scriptrunner.assert_not_called()
 
+    @patch("streamlit.runtime.app_session.AppSession._create_scriptrunner")
+    def test_request_scheduled_fragment_run(self, mock_create_scriptrunner: MagicMock):
+        """A scheduled fragment run keeps the session's widget states and
+        uses the query string the browser currently shows.
+        """
+        session = _create_test_session()
+        session._fragment_storage.set("my_fragment_id", lambda: None)
+        session._client_state.page_script_hash = "page_hash"
+        session.request_rerun(ClientState(query_string="foo=bar"))
+        mock_create_scriptrunner.reset_mock()
+
+        session.request_scheduled_fragment_run("my_fragment_id")
+
+        mock_create_scriptrunner.assert_called_once_with(
+            RerunData(
+                query_string="foo=bar",
+                page_script_hash="page_hash",
+                fragment_id="my_fragment_id",
+                is_auto_rerun=True,
+            )
+        )
+
+    @patch("streamlit.runtime.app_session.AppSession._create_scriptrunner")
+    def test_request_scheduled_fragment_run_skipped(
+        self, mock_create_scriptrunner: MagicMock
+    ):
+        """Scheduled fragment runs are skipped while a script run is in
+        progress and for fragments that don't exist anymore.
+        """
+        session = _create_test_session()
+        session._fragment_storage.set("my_fragment_id", lambda: None)
+
+        session._state = AppSessionState.APP_IS_RUNNING
+        session.request_scheduled_fragment_run("my_fragment_id")
+
+        session._state = AppSessionState.APP_NOT_RUNNING
+        session.request_scheduled_fragment_run("other_fragment_id")
+
+        mock_create_scriptrunner.assert_not_called()
+
     @patch("streamlit.runtime.app_session.ScriptRunner")
     def test_create_scriptrunner(self, mock_scriptrunner: MagicMock):
         """Test that _create_scriptrunner does what it should."""
@@ -477,6 +519,35 @@ class AppSessionTest(unittest.TestCase):
 
         assert msg.debug_last_backmsg_id == "some backmsg id"
 
+    @patch_config_options({"global.minCachedMessageSize": 0})
+    def test_hashes_cacheable_msgs_on_enqueue(self):
+        """Cacheable messages are hashed when enqueued, and their serialized
+        payload is available once they're flushed."""
+        session = _create_test_session()
+
+        msg = create_dataframe_msg([1, 2, 3])
+        session._enqueue_forward_msg(msg)
+        self.assertNotEqual("", msg.hash)
+        self.assertIsNone(session.get_serialized_payload(msg.hash))
+
+        session.flush_browser_queue()
+        self.assertEqual(
+            serialize_forward_msg_payload(msg),
+            session.get_serialized_payload(msg.hash),
+        )
+
+        # Payloads are only kept until the next flush.
+        session.flush_browser_queue()
+        self.assertIsNone(session.get_serialized_payload(msg.hash))
+
+    @patch_config_options({"global.minCachedMessageSize": 1000000})
+    def test_does_not_hash_uncacheable_msgs_on_enqueue(self):
+        session = _create_test_session()
+
+        msg = create_dataframe_msg([1, 2, 3])
+        session._enqueue_forward_msg(msg)
+        self.assertEqual("", msg.hash)
+
     @patch("streamlit.runtime.app_session.config.on_config_parsed")
     @patch(
         "streamlit.runtime.app_session.secrets_singleton.file_change_listener.connect"
@@ -832,6 +903,54 @@ class AppSessionScriptEventTest(IsolatedAsyncioTestCase):
 
         assert session._client_state.page_script_hash == "some_other_page_script_hash"
 
+    @patch("streamlit.runtime.app_session.runtime.exists", MagicMock(return_value=True))
+    @patch("streamlit.runtime.app_session.runtime.get_instance")
+    async def test_auto_rerun_scheduled_on_server(self, mock_get_instance: MagicMock):
+        """With server.scheduleFragmentRuns, fragments with run_every are
+        scheduled by the runtime instead of the browser.
+        """
+        with patch_config_options({"server.scheduleFragmentRuns": True}):
+            session = _create_test_session(asyncio.get_running_loop())
+            mock_scriptrunner = MagicMock(spec=ScriptRunner)
+            session._scriptrunner = mock_scriptrunner
+            session._clear_queue = MagicMock()
+            mock_scheduler = mock_get_instance.return_value.fragment_scheduler
+
+            session._on_scriptrunner_event(
+                sender=mock_scriptrunner,
+                event=ScriptRunnerEvent.SCRIPT_STARTED,
+                page_script_hash="",
+            )
+            msg = ForwardMsg()
+            msg.auto_rerun.interval = 2
+            msg.auto_rerun.fragment_id = "my_fragment_id"
+            session._on_scriptrunner_event(
+                sender=mock_scriptrunner,
+                event=ScriptRunnerEvent.ENQUEUE_FORWARD_MSG,
+                forward_msg=msg,
+            )
+            await asyncio.sleep(0)
+
+        mock_scheduler.unschedule_session.assert_called_once_with(session.id)
+        mock_scheduler.schedule.assert_called_once_with(session.id, "my_fragment_id", 2)
+        assert not any(m.HasField("auto_rerun") for m in session._browser_queue._queue)
+
+    async def test_query_string_tracked_from_page_info_changed(self):
+        session = _create_test_session(asyncio.get_running_loop())
+        mock_scriptrunner = MagicMock(spec=ScriptRunner)
+        session._scriptrunner = mock_scriptrunner
+
+        msg = ForwardMsg()
+        msg.page_info_changed.query_string = "foo=bar"
+        session._on_scriptrunner_event(
+            sender=mock_scriptrunner,
+            event=ScriptRunnerEvent.ENQUEUE_FORWARD_MSG,
+            forward_msg=msg,
+        )
+        await asyncio.sleep(0)
+
+        assert session._client_state.query_string == "foo=bar"
+
     async def test_events_handled_on_event_loop(self):
         """ScriptRunner events should be handled on the main thread only."""
         session = _create_test_session(asyncio.get_running_loop())
@@ -1160,3 +1279,21 @@ class ShouldRerunOnFileChangeTest(unittest.TestCase):
         session._client_state.page_script_hash = "hash2"
 
         assert not session._should_rerun_on_file_change("page1.py")
+
+    def test_returns_false_if_current_page_does_not_depend_on_module(self):
+        session = _create_test_session()
+        session._client_state.page_script_hash = "hash1"
+        session._local_sources_watcher.page_depends_on.return_value = False
+
+        assert not session._should_rerun_on_file_change("helper.py")
+        session._local_sources_watcher.page_depends_on.assert_called_once_with(
+            "hash1", "helper.py"
+        )
+
+    @patch_config_options({"server.rerunOnlyDependentPages": False})
+    def test_ignores_page_dependencies_if_disabled(self):
+        session = _create_test_session()
+        session._client_state.page_script_hash = "hash1"
+        session._local_sources_watcher.page_depends_on.return_value = False
+
+        assert session._should_rerun_on_file_change("helper.py")
@@ -622,6 +622,200 @@ class CacheDataStatsProviderTest(unittest.TestCase):
             set(expected), set(get_data_cache_stats_provider().get_stats())
         )
 
+    def test_max_size_stats(self):
+        """The stats of a function with max_size never exceed max_size."""
+
+        @st.cache_data(max_size=1000)
+        def foo(count):
+            return b"x" * count
+
+        for i in range(10):
+            foo(200 + i)
+
+        stats = get_data_cache_stats_provider().get_stats()
+        self.assertEqual(1, len(stats))
+        self.assertLessEqual(stats[0].byte_length, 1000)
+        self.assertGreater(stats[0].byte_length, 0)
+
+
+class CacheDataMaxSizeTest(unittest.TestCase):
+    def setUp(self) -> None:
+        # Caching functions rely on an active script run ctx
+        add_script_run_ctx(threading.current_thread(), create_mock_script_run_ctx())
+        mock_runtime = MagicMock(spec=Runtime)
+        mock_runtime.cache_storage_manager = MemoryCacheStorageManager()
+        Runtime._instance = mock_runtime
+
+    def tearDown(self):
+        st.cache_data.clear()
+
+    def test_evicts_least_recently_used_entries(self):
+        """Entries are evicted once their total size exceeds max_size."""
+        calls = []
+        entry_size = get_byte_length(as_cached_result(b"x" * 100))
+
+        @st.cache_data(max_size=entry_size * 2)
+        def foo(key):
+            calls.append(key)
+            return b"x" * 100
+
+        foo(1)
+        foo(2)
+        foo(1)
+        # Evicts 2, since 1 was used more recently:
+        foo(3)
+        foo(1)
+        self.assertEqual([1, 2, 3], calls)
+        foo(2)
+        self.assertEqual([1, 2, 3, 2], calls)
+
+    def test_too_large_entries_are_not_cached(self):
+        """Entries larger than max_size are recomputed on every call, with a
+        warning.
+        """
+        calls = []
+
+        @st.cache_data(max_size=10)
+        def foo():
+            calls.append(1)
+            return b"x" * 100
+
+        with self.assertLogs(
+            "streamlit.runtime.caching.storage.in_memory_cache_storage_wrapper",
+            level="WARNING",
+        ) as logs:
+            self.assertEqual(b"x" * 100, foo())
+        self.assertIn("larger than its max_size", logs.output[0])
+
+        self.assertEqual(b"x" * 100, foo())
+        self.assertEqual(2, len(calls))
+
+
+class CacheDataStaleWhileRevalidateTest(unittest.TestCase):
+    def setUp(self) -> None:
+        # Caching functions rely on an active script run ctx
+        add_script_run_ctx(threading.current_thread(), create_mock_script_run_ctx())
+        mock_runtime = MagicMock(spec=Runtime)
+        mock_runtime.cache_storage_manager = MemoryCacheStorageManager()
+        Runtime._instance = mock_runtime
+
+        self.now = 0.0
+        # Background recomputations are collected and run explicitly.
+        self.executor = MagicMock()
+        patchers = [
+            patch(
+                "streamlit.runtime.caching.cache_utils.TTLCACHE_TIMER",
+                lambda: self.now,
+            ),
+            patch(
+                "streamlit.runtime.caching.cache_data_api.STALE_TIMER",
+                lambda: self.now,
+            ),
+            patch(
+                "streamlit.runtime.caching.cache_utils._get_revalidation_executor",
+                return_value=self.executor,
+            ),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        st.cache_data.clear()
+
+    def _run_revalidations(self) -> None:
+        for call in self.executor.submit.call_args_list:
+            call.args[0]()
+        self.executor.submit.reset_mock()
+
+    def test_stale_value_is_revalidated_in_background(self):
+        calls = []
+
+        @st.cache_data(ttl=10, stale_while_revalidate=20)
+        def foo():
+            calls.append(1)
+            return len(calls)
+
+        self.assertEqual(1, foo())
+
+        self.now = 15
+        # The stale value is returned, and recomputed only once.
+        self.assertEqual(1, foo())
+        self.assertEqual(1, foo())
+        self.assertEqual(1, self.executor.submit.call_count)
+        self.assertEqual(1, len(calls))
+
+        self._run_revalidations()
+        self.assertEqual(2, foo())
+        self.assertEqual(0, self.executor.submit.call_count)
+
+    def test_expired_value_is_recomputed(self):
+        """Values are recomputed in the script thread after the
+        stale_while_revalidate period.
+        """
+        calls = []
+
+        @st.cache_data(ttl=10, stale_while_revalidate=20)
+        def foo():
+            calls.append(1)
+            return len(calls)
+
+        foo()
+        self.now = 30
+
+        self.assertEqual(2, foo())
+        self.assertEqual(0, self.executor.submit.call_count)
+
+    def test_failed_revalidation_keeps_stale_value(self):
+        calls = []
+
+        @st.cache_data(ttl=10, stale_while_revalidate=20)
+        def foo():
+            calls.append(1)
+            if len(calls) == 2:
+                raise RuntimeError("failed")
+            return len(calls)
+
+        foo()
+        self.now = 15
+        foo()
+
+        with self.assertLogs(
+            "streamlit.runtime.caching.cache_utils", level=logging.WARNING
+        ):
+            self._run_revalidations()
+
+        # The value is recomputed again on the next call.
+        self.assertEqual(1, foo())
+        self._run_revalidations()
+        self.assertEqual(3, foo())
+
+    def test_values_with_messages_are_recomputed(self):
+        """Values whose function calls Streamlit commands are recomputed in
+        the script thread, since the commands can't be recorded in the
+        background.
+        """
+        calls = []
+
+        @st.cache_data(ttl=10, stale_while_revalidate=20)
+        def foo():
+            calls.append(1)
+            st.text("foo")
+            return len(calls)
+
+        foo()
+        self.now = 15
+
+        self.assertEqual(2, foo())
+        self.assertEqual(0, self.executor.submit.call_count)
+
+    def test_requires_ttl(self):
+        with self.assertRaises(StreamlitAPIException):
+
+            @st.cache_data(stale_while_revalidate=20)
+            def foo():
+                pass
+
 
 class CacheDataValidateParamsTest(DeltaGeneratorTestCase):
     """st.cache_data disk persistence tests"""
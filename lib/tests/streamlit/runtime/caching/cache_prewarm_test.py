@@ -0,0 +1,106 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2025)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""cache_prewarm unit tests."""
+
+from __future__ import annotations
+
+import threading
+import unittest
+from unittest.mock import MagicMock
+
+import streamlit as st
+from streamlit.errors import StreamlitAPIException
+from streamlit.runtime import Runtime
+from streamlit.runtime.caching.cache_prewarm import (
+    clear_prewarm_functions,
+    prewarm_cached_functions,
+)
+from streamlit.runtime.caching.storage.dummy_cache_storage import (
+    MemoryCacheStorageManager,
+)
+from streamlit.runtime.scriptrunner import add_script_run_ctx
+from tests.testutil import create_mock_script_run_ctx
+
+
+class CachePrewarmTest(unittest.TestCase):
+    def setUp(self) -> None:
+        # Caching functions rely on an active script run ctx
+        add_script_run_ctx(threading.current_thread(), create_mock_script_run_ctx())
+        mock_runtime = MagicMock(spec=Runtime)
+        mock_runtime.cache_storage_manager = MemoryCacheStorageManager()
+        Runtime._instance = mock_runtime
+
+    def tearDown(self) -> None:
+        clear_prewarm_functions()
+        st.cache_data.clear()
+        st.cache_resource.clear()
+
+    def test_prewarm(self):
+        """Prewarming computes the values of all declared argument sets, which
+        are then returned from the cache.
+        """
+        calls = []
+
+        @st.cache_data(prewarm=[(1,), {"a": 2, "b": 3}])
+        def add(a, b=0):
+            calls.append((a, b))
+            return a + b
+
+        @st.cache_resource(prewarm=[()])
+        def resource():
+            calls.append("resource")
+            return object()
+
+        self.assertEqual(0, prewarm_cached_functions())
+        self.assertCountEqual([(1, 0), (2, 3), "resource"], calls)
+
+        self.assertEqual(1, add(1))
+        self.assertEqual(5, add(a=2, b=3))
+        resource()
+        self.assertEqual(3, len(calls))
+
+    def test_prewarm_without_registered_functions(self):
+        self.assertEqual(0, prewarm_cached_functions())
+
+    def test_failures_are_counted(self):
+        @st.cache_data(prewarm=[(1,), (0,)])
+        def invert(value):
+            return 1 / value
+
+        with self.assertLogs(
+            "streamlit.runtime.caching.cache_prewarm", level="WARNING"
+        ):
+            self.assertEqual(1, prewarm_cached_functions())
+        self.assertEqual(1, invert(1))
+
+    def test_redecorating_replaces_registration(self):
+        """Rerunning a script registers a function only once."""
+        calls = []
+
+        for _ in range(2):
+
+            @st.cache_data(prewarm=[()])
+            def foo():
+                calls.append(1)
+
+        prewarm_cached_functions()
+        self.assertEqual(1, len(calls))
+
+    def test_invalid_argument_set(self):
+        with self.assertRaises(StreamlitAPIException):
+
+            @st.cache_data(prewarm=[1])
+            def foo(value):
+                pass
@@ -242,6 +242,37 @@ If you think this is actually a Streamlit bug, please
         # So the call to foo() should return the new value 2
         assert example_instance.foo(1) == 2
 
+    def test_max_size(self):
+        """Entries are evicted once their total size exceeds max_size."""
+        calls = []
+
+        @st.cache_resource(max_size=asizeof(as_cached_result(b"x" * 1000)) * 2)
+        def foo(key):
+            calls.append(key)
+            return b"x" * 1000
+
+        foo(1)
+        foo(2)
+        foo(1)
+        # Evicts 2, since 1 was used more recently:
+        foo(3)
+        foo(1)
+        foo(2)
+        self.assertEqual([1, 2, 3, 2], calls)
+
+    def test_max_size_too_large_entry(self):
+        """Entries larger than max_size are not cached."""
+        calls = []
+
+        @st.cache_resource(max_size=10)
+        def foo():
+            calls.append(1)
+            return b"x" * 1000
+
+        foo()
+        foo()
+        self.assertEqual(2, len(calls))
+
 
 class CacheResourceValidateTest(unittest.TestCase):
     def setUp(self) -> None:
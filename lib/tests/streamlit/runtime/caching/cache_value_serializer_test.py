@@ -0,0 +1,203 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2025)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""cache_value_serializer unit tests."""
+
+from __future__ import annotations
+
+import pickle
+import unittest
+
+import numpy as np
+import pandas as pd
+import polars as pl
+import pyarrow as pa
+import pytest
+
+from streamlit.runtime.caching import cache_value_serializer
+from streamlit.runtime.caching.cached_message_replay import CachedResult
+
+
+class CustomDataFrame(pd.DataFrame):
+    pass
+
+
+def _as_cached_result(value):
+    return CachedResult(value, [], "main", "sidebar")
+
+
+def _create_df(num_rows: int) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "int": np.arange(num_rows),
+            "float": np.random.rand(num_rows),
+            "str": [f"value-{i}" for i in range(num_rows)],
+            "date": pd.date_range("2020-01-01", periods=num_rows, freq="s", tz="UTC"),
+        },
+        index=pd.RangeIndex(10, 10 + num_rows, name="idx"),
+    )
+
+
+class CacheValueSerializerTest(unittest.TestCase):
+    def test_pandas_roundtrip(self):
+        """Pandas DataFrames are stored as Arrow and restored exactly."""
+        df = _create_df(10)
+        df.attrs["source"] = "test"
+
+        data = cache_value_serializer.dumps(_as_cached_result(df))
+        self.assertTrue(data.startswith(cache_value_serializer._MAGIC))
+
+        entry = cache_value_serializer.loads(data)
+        self.assertIsInstance(entry, CachedResult)
+        self.assertEqual("main", entry.main_id)
+        self.assertEqual("sidebar", entry.sidebar_id)
+        pd.testing.assert_frame_equal(df, entry.value)
+        self.assertEqual({"source": "test"}, entry.value.attrs)
+
+    def test_pandas_result_is_writable(self):
+        """Deserialized DataFrames can be mutated without affecting the cache."""
+        df = _create_df(10)
+        data = cache_value_serializer.dumps(_as_cached_result(df))
+
+        first = cache_value_serializer.loads(data).value
+        first.loc[10, "int"] = 100
+
+        second = cache_value_serializer.loads(data).value
+        self.assertEqual(0, second.loc[10, "int"])
+
+    def test_polars_roundtrip(self):
+        df = pl.DataFrame({"a": [1, 2, 3], "b": ["x", "y", None]})
+
+        data = cache_value_serializer.dumps(_as_cached_result(df))
+        self.assertTrue(data.startswith(cache_value_serializer._MAGIC))
+
+        value = cache_value_serializer.loads(data).value
+        self.assertIsInstance(value, pl.DataFrame)
+        self.assertTrue(df.equals(value))
+
+    def test_pyarrow_roundtrip(self):
+        table = pa.table({"a": [1, 2, 3], "b": ["x", "y", None]})
+
+        data = cache_value_serializer.dumps(_as_cached_result(table))
+        self.assertTrue(data.startswith(cache_value_serializer._MAGIC))
+
+        self.assertTrue(table.equals(cache_value_serializer.loads(data).value))
+
+    def test_other_values_are_pickled(self):
+        """Values without a special serializer use the plain pickle format."""
+        for value in [1, "foo", [1, 2, 3], {"a": pd.Series([1, 2])}]:
+            entry = _as_cached_result(value)
+            data = cache_value_serializer.dumps(entry)
+            self.assertEqual(pickle.dumps(entry), data)
+
+    def test_pandas_subclasses_are_pickled(self):
+        """Subclasses of supported types aren't stored as Arrow."""
+        data = cache_value_serializer.dumps(_as_cached_result(CustomDataFrame()))
+        self.assertFalse(data.startswith(cache_value_serializer._MAGIC))
+
+    def test_unconvertible_dataframe_is_pickled(self):
+        """DataFrames that can't be converted to Arrow fall back to pickle."""
+        df = pd.DataFrame({"a": [1, "mixed", 2.5]})
+
+        data = cache_value_serializer.dumps(_as_cached_result(df))
+        self.assertFalse(data.startswith(cache_value_serializer._MAGIC))
+        pd.testing.assert_frame_equal(df, cache_value_serializer.loads(data).value)
+
+    def test_dataframes_with_other_objects_are_pickled(self):
+        """DataFrames whose object columns or index hold values other than
+        strings or bytes are pickled, since Arrow would change their types.
+        """
+        for df in [
+            pd.DataFrame({"a": [[1, 2], [3]], "b": [(1,), (2,)], "c": [{1}, {2}]}),
+            pd.DataFrame({"a": pd.Series([1, 2], dtype=object)}),
+            pd.DataFrame(
+                {"a": [1, 2]}, index=pd.Index([(1, 2), (3, 4)], tupleize_cols=False)
+            ),
+        ]:
+            data = cache_value_serializer.dumps(_as_cached_result(df))
+            self.assertFalse(data.startswith(cache_value_serializer._MAGIC))
+
+            value = cache_value_serializer.loads(data).value
+            pd.testing.assert_frame_equal(df, value)
+            self.assertEqual(type(df.iloc[0, 0]), type(value.iloc[0, 0]))
+
+    def test_dataframes_that_change_in_arrow_are_pickled(self):
+        """DataFrames that Arrow wouldn't restore exactly are pickled, so that
+        a cache hit returns the same DataFrame as the cached function.
+        """
+        with_nan = pd.DataFrame({"a": ["x", np.nan, "z"]})
+        with_nan_index = pd.DataFrame({"a": [1, 2]}, index=["x", np.nan])
+        categorical = pd.DataFrame({"a": pd.Categorical(["x", "y", "x"])})
+        categorical_index = pd.DataFrame(
+            {"a": [1, 2]}, index=pd.CategoricalIndex(["x", "y"])
+        )
+        disallows_duplicate_labels = pd.DataFrame({"a": [1, 2]}).set_flags(
+            allows_duplicate_labels=False
+        )
+
+        for df in [
+            with_nan,
+            with_nan_index,
+            categorical,
+            categorical_index,
+            disallows_duplicate_labels,
+        ]:
+            data = cache_value_serializer.dumps(_as_cached_result(df))
+            self.assertFalse(data.startswith(cache_value_serializer._MAGIC))
+            pd.testing.assert_frame_equal(df, cache_value_serializer.loads(data).value)
+
+        value = cache_value_serializer.loads(
+            cache_value_serializer.dumps(_as_cached_result(with_nan))
+        ).value
+        self.assertTrue(np.isnan(value.loc[1, "a"]))
+
+        value = cache_value_serializer.loads(
+            cache_value_serializer.dumps(_as_cached_result(categorical))
+        ).value
+        value.loc[0, "a"] = "y"
+        self.assertEqual("y", value.loc[0, "a"])
+
+        value = cache_value_serializer.loads(
+            cache_value_serializer.dumps(_as_cached_result(disallows_duplicate_labels))
+        ).value
+        self.assertFalse(value.flags.allows_duplicate_labels)
+
+    def test_dataframes_with_str_and_bytes_objects_use_arrow(self):
+        df = pd.DataFrame({"a": ["x", None], "b": [b"x", b"y"]}, index=["i", "j"])
+
+        data = cache_value_serializer.dumps(_as_cached_result(df))
+        self.assertTrue(data.startswith(cache_value_serializer._MAGIC))
+        value = cache_value_serializer.loads(data).value
+        pd.testing.assert_frame_equal(df, value)
+        self.assertIsNone(value.loc["j", "a"])
+
+    def test_corrupted_entry(self):
+        """Corrupted Arrow entries raise an UnpicklingError."""
+        data = cache_value_serializer.dumps(_as_cached_result(_create_df(10)))
+
+        with self.assertRaises(pickle.UnpicklingError):
+            cache_value_serializer.loads(data[:-100])
+
+
+@pytest.mark.usefixtures("benchmark")
+@pytest.mark.parametrize("serialize", ["pickle", "arrow"])
+def test_read_dataframe_performance(benchmark, serialize: str):
+    """Benchmark reading a cached DataFrame with string columns."""
+    entry = _as_cached_result(_create_df(200000))
+    if serialize == "pickle":
+        data = pickle.dumps(entry)
+    else:
+        data = cache_value_serializer.dumps(entry)
+
+    benchmark(cache_value_serializer.loads, data)
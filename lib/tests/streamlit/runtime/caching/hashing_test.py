@@ -29,7 +29,8 @@ import uuid
 from dataclasses import dataclass
 from enum import Enum, auto
 from io import BytesIO, StringIO
-from unittest.mock import MagicMock, Mock
+from typing import Any
+from unittest.mock import MagicMock, Mock, patch
 
 import numpy as np
 import pandas as pd
@@ -38,17 +39,19 @@ from parameterized import parameterized
 from PIL import Image
 
 from streamlit.proto.Common_pb2 import FileURLs
-from streamlit.runtime.caching import cache_data, cache_resource
+from streamlit.runtime.caching import cache_data, cache_resource, hashing
 from streamlit.runtime.caching.cache_errors import UnhashableTypeError
 from streamlit.runtime.caching.cache_type import CacheType
 from streamlit.runtime.caching.hashing import (
     _NP_SIZE_LARGE,
     _PANDAS_ROWS_LARGE,
+    _PANDAS_SAMPLE_SIZE,
     UserHashError,
     update_hash,
 )
 from streamlit.runtime.uploaded_file_manager import UploadedFile, UploadedFileRec
 from streamlit.type_util import is_type
+from tests.testutil import patch_config_options
 
 get_main_script_director = MagicMock(return_value=os.getcwd())
 
@@ -343,6 +346,71 @@ class HashTest(unittest.TestCase):
         df1 = pd.DataFrame(np.zeros((_PANDAS_ROWS_LARGE, 4)), columns=list("ABCD"))
         self.benchmark(lambda: get_hash(df1))
 
+    def test_pandas_large_dataframe_strict(self):
+        """In strict mode, large dataframes that only differ in a single row
+        get different hashes. In approximate mode, only a sample is hashed.
+        """
+        df1 = pd.DataFrame(np.zeros((_PANDAS_ROWS_LARGE * 2, 4)), columns=list("ABCD"))
+        df2 = df1.copy()
+        # Find a row that is not part of the sample.
+        sampled_rows = df1.sample(n=_PANDAS_SAMPLE_SIZE, random_state=0).index
+        row = next(i for i in range(len(df1)) if i not in set(sampled_rows))
+        df2.loc[row, "A"] = 1
+
+        self.assertNotEqual(get_hash(df1), get_hash(df2))
+        with patch_config_options({"server.cacheHashingMode": "approximate"}):
+            self.assertEqual(get_hash(df1), get_hash(df2))
+
+    @parameterized.expand(
+        [
+            ("strings", ["a", "b", "c"], ["a", "b", "d"]),
+            ("mixed types", [1, "b", 2.5], [1, "b", 3.5]),
+            ("categorical", pd.Categorical(["a", "b"]), pd.Categorical(["a", "c"])),
+            ("nullable", pd.array([1, None], "Int64"), pd.array([1, 2], "Int64")),
+            (
+                "datetime",
+                pd.date_range("2020-01-01", periods=2, tz="UTC"),
+                pd.date_range("2020-01-02", periods=2, tz="UTC"),
+            ),
+        ]
+    )
+    def test_pandas_dataframe_column_types(self, _, values1, values2):
+        df1 = pd.DataFrame({"A": values1})
+        df2 = pd.DataFrame({"A": values2})
+
+        self.assertEqual(get_hash(df1), get_hash(pd.DataFrame({"A": values1})))
+        self.assertNotEqual(get_hash(df1), get_hash(df2))
+
+    def test_pandas_dataframe_hashed_in_parallel(self):
+        """Dataframes are hashed on the thread pool if they are large enough."""
+        df1 = pd.DataFrame({"A": [1, 2, 3], "B": ["a", "b", "c"]}, index=[5, 6, 7])
+        df2 = pd.DataFrame({"A": [1, 2, 3], "B": ["a", "b", "d"]}, index=[5, 6, 7])
+
+        with patch("streamlit.runtime.caching.hashing._HASH_CHUNK_BYTES", 8):
+            self.assertEqual(get_hash(df1), get_hash(df1.copy()))
+            self.assertNotEqual(get_hash(df1), get_hash(df2))
+            self.assertEqual(get_hash(df1["A"]), get_hash(df1["A"].copy()))
+            self.assertEqual(
+                get_hash(df1["A"].to_numpy()), get_hash(np.array([1, 2, 3]))
+            )
+
+    def test_arrow(self):
+        import pyarrow as pa
+
+        table = pa.table({"A": [1, 2, 3], "B": ["a", "b", "c"]})
+
+        self.assertEqual(get_hash(table), get_hash(pa.table(table.to_pydict())))
+        self.assertNotEqual(
+            get_hash(table), get_hash(pa.table({"A": [1, 2, 3], "B": ["a", "b", "d"]}))
+        )
+        self.assertNotEqual(get_hash(table), get_hash(table.to_batches()[0]))
+        self.assertEqual(get_hash(table["A"]), get_hash(pa.chunked_array([[1, 2, 3]])))
+        self.assertEqual(get_hash(pa.array([2, 3])), get_hash(pa.array([1, 2, 3])[1:]))
+        self.assertNotEqual(
+            get_hash(pa.array(["a", "b"]).dictionary_encode()),
+            get_hash(pa.array(["b", "a"]).dictionary_encode()),
+        )
+
     @parameterized.expand(
         [
             (pd.DataFrame({"foo": [12]}), pd.DataFrame({"foo": [12]}), True),
@@ -466,6 +534,21 @@ class HashTest(unittest.TestCase):
         self.assertEqual(get_hash(df1), get_hash(df3))
         self.assertNotEqual(get_hash(df1), get_hash(df2))
 
+    @pytest.mark.require_integration
+    def test_polars_large_dataframe_strict(self):
+        import polars as pl
+
+        df1 = pl.DataFrame(np.zeros((_PANDAS_ROWS_LARGE * 2, 4)), schema=list("abcd"))
+        df2 = df1.with_columns(
+            pl.when(pl.int_range(pl.len()) == len(df1) - 1)
+            .then(1.0)
+            .otherwise(pl.col("a"))
+            .alias("a")
+        )
+
+        self.assertNotEqual(get_hash(df1), get_hash(df2))
+        self.assertNotEqual(get_hash(df1["a"]), get_hash(df2["a"]))
+
     @pytest.mark.usefixtures("benchmark")
     def test_polars_large_dataframe_performance(self):
         # We put the try/except here to avoid the test failing if polars is not
@@ -499,6 +582,22 @@ class HashTest(unittest.TestCase):
 
         self.assertEqual(get_hash(np4), get_hash(np5))
 
+    def test_numpy_large_array_strict(self):
+        np1 = np.zeros(_NP_SIZE_LARGE * 2)
+        np2 = np1.copy()
+        np2[-1] = 1
+
+        self.assertNotEqual(get_hash(np1), get_hash(np2))
+        with patch_config_options({"server.cacheHashingMode": "approximate"}):
+            self.assertEqual(get_hash(np1), get_hash(np2))
+
+    def test_numpy_non_contiguous(self):
+        """Non-contiguous arrays are hashed by their values."""
+        arr = np.arange(20).reshape(4, 5)
+
+        self.assertEqual(get_hash(arr[:, 1]), get_hash(np.array([1, 6, 11, 16])))
+        self.assertEqual(get_hash(arr.T), get_hash(np.ascontiguousarray(arr.T)))
+
     def test_numpy_similar_dtypes(self):
         np1 = np.ones(10, dtype="u8")
         np2 = np.ones(10, dtype="i8")
@@ -646,6 +745,150 @@ class HashTest(unittest.TestCase):
         self.assertNotEqual(get_hash(enum_a), get_hash(enum_b))
 
 
+class HashMemoTest(unittest.TestCase):
+    """Tests for memoizing the hashes of large values within a script run."""
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.ctx = MagicMock(hash_memo={})
+        patcher = patch(
+            "streamlit.runtime.caching.hashing.get_script_run_ctx",
+            return_value=self.ctx,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        # Count how often values are actually hashed.
+        original_to_bytes = hashing._CacheFuncHasher._to_bytes
+        self.hashed: list[Any] = []
+
+        def _to_bytes(hasher, obj):
+            self.hashed.append(obj)
+            return original_to_bytes(hasher, obj)
+
+        patcher = patch.object(hashing._CacheFuncHasher, "_to_bytes", _to_bytes)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _hash_count(self, obj) -> int:
+        return sum(1 for hashed in self.hashed if hashed is obj)
+
+    def test_arrow_table(self):
+        """Arrow tables are immutable, so their hash is always memoized."""
+        import pyarrow as pa
+
+        table = pa.table({"A": [1, 2, 3]})
+
+        self.assertEqual(get_hash(table), get_hash(table))
+        self.assertEqual(get_hash([table]), get_hash([table]))
+        self.assertEqual(1, self._hash_count(table))
+        self.assertEqual(get_hash(table), get_hash(pa.table({"A": [1, 2, 3]})))
+
+    def test_read_only_numpy_array(self):
+        arr = np.arange(10)
+        arr.flags.writeable = False
+        view = arr[2:]
+
+        self.assertEqual(get_hash(arr), get_hash(arr))
+        self.assertEqual(get_hash(view), get_hash(view))
+        self.assertEqual(1, self._hash_count(arr))
+        self.assertEqual(1, self._hash_count(view))
+
+    def test_mutable_values_are_not_memoized_by_default(self):
+        arr = np.arange(10)
+        read_only_view = arr[2:]
+        read_only_view.flags.writeable = False
+        df = pd.DataFrame({"A": [1, 2, 3]})
+
+        hashes = [get_hash(arr), get_hash(read_only_view), get_hash(df)]
+        arr[5] = 100
+        df.loc[0, "A"] = 100
+
+        self.assertNotEqual(hashes[0], get_hash(arr))
+        self.assertNotEqual(hashes[1], get_hash(read_only_view))
+        self.assertNotEqual(hashes[2], get_hash(df))
+
+    @patch_config_options({"server.cacheHashMemoizeMutable": True})
+    def test_mutable_values(self):
+        """With server.cacheHashMemoizeMutable, the hashes of mutable values
+        are memoized until their shape, dtypes, or index change.
+        """
+        df = pd.DataFrame({"A": [1, 2, 3]})
+        df_hash = get_hash(df)
+
+        self.assertEqual(df_hash, get_hash(df))
+        self.assertEqual(1, self._hash_count(df))
+
+        df.index = [4, 5, 6]
+        self.assertNotEqual(df_hash, get_hash(df))
+
+        df["B"] = 1
+        df_hash = get_hash(df)
+        df["B"] = 1.0
+        self.assertNotEqual(df_hash, get_hash(df))
+        self.assertEqual(4, self._hash_count(df))
+
+        arr = np.arange(10)
+        arr_hash = get_hash(arr)
+        self.assertEqual(arr_hash, get_hash(arr))
+        self.assertNotEqual(arr_hash, get_hash(arr.reshape(2, 5)))
+
+    @patch_config_options({"server.cacheHashMemoizeMutable": True})
+    def test_clear_hash_memo(self):
+        df = pd.DataFrame({"A": [1, 2, 3]})
+        other_df = pd.DataFrame({"A": [1, 2, 3]})
+        df_hash = get_hash(df)
+        get_hash(other_df)
+
+        df.loc[0, "A"] = 100
+        self.assertEqual(df_hash, get_hash(df))
+
+        hashing.clear_hash_memo(df)
+        self.assertNotEqual(df_hash, get_hash(df))
+        get_hash(other_df)
+        self.assertEqual(1, self._hash_count(other_df))
+
+        hashing.clear_hash_memo()
+        self.assertEqual({}, self.ctx.hash_memo)
+
+    def test_hashing_mode(self):
+        """Hashes are memoized separately for each hashing mode."""
+        arr = np.arange(_NP_SIZE_LARGE + 1)
+        arr.flags.writeable = False
+
+        strict_hash = get_hash(arr)
+        with patch_config_options({"server.cacheHashingMode": "approximate"}):
+            self.assertNotEqual(strict_hash, get_hash(arr))
+        self.assertEqual(strict_hash, get_hash(arr))
+        self.assertEqual(2, self._hash_count(arr))
+
+    def test_hash_funcs(self):
+        """Values with a custom hash function aren't memoized."""
+        import pyarrow as pa
+
+        table = pa.table({"A": [1, 2, 3]})
+        hash_funcs = {pa.Table: lambda x: x.num_rows}
+
+        self.assertEqual(
+            get_hash(table, hash_funcs=hash_funcs),
+            get_hash(table, hash_funcs=hash_funcs),
+        )
+        self.assertEqual({}, self.ctx.hash_memo)
+
+    def test_outside_of_script_run(self):
+        import pyarrow as pa
+
+        table = pa.table({"A": [1, 2, 3]})
+
+        with patch(
+            "streamlit.runtime.caching.hashing.get_script_run_ctx", return_value=None
+        ):
+            get_hash(table)
+            get_hash(table)
+
+        self.assertEqual(2, self._hash_count(table))
+
+
 class NotHashableTest(unittest.TestCase):
     """Tests for various unhashable types."""
 
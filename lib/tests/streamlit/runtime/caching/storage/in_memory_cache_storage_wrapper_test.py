@@ -16,9 +16,11 @@
 
 from __future__ import annotations
 
+import threading
 import unittest
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
+import pytest
 from testfixtures import TempDirectory
 
 from streamlit.runtime.caching.storage import (
@@ -179,3 +181,122 @@ class InMemoryCacheStorageWrapperTest(unittest.TestCase):
         ) as mock_persist_close:
             wrapped_storage.close()
             mock_persist_close.assert_called_once()
+
+    def test_in_memory_cache_storage_wrapper_compute_value_lock(self):
+        """Test that the compute lock of the persist storage is returned, and
+        that persist storages without compute_value_lock are supported.
+        """
+        context = self.get_storage_context()
+        lock = MagicMock()
+        persist_storage = MagicMock(spec=["compute_value_lock"])
+        persist_storage.compute_value_lock.return_value = lock
+        wrapped_storage = InMemoryCacheStorageWrapper(
+            persist_storage=persist_storage, context=context
+        )
+        self.assertIs(lock, wrapped_storage.compute_value_lock("some-key"))
+        persist_storage.compute_value_lock.assert_called_once_with("some-key")
+
+        wrapped_storage = InMemoryCacheStorageWrapper(
+            persist_storage=MagicMock(spec=["get", "set", "delete", "clear"]),
+            context=context,
+        )
+        self.assertIsNone(wrapped_storage.compute_value_lock("some-key"))
+
+    def test_in_memory_cache_storage_wrapper_hits_do_not_lock(self):
+        """Memory cache hits don't wait for the memory cache lock."""
+        wrapped_storage = InMemoryCacheStorageWrapper(
+            persist_storage=DummyCacheStorage(), context=self.get_storage_context()
+        )
+        wrapped_storage.set("some-key", b"some-value")
+        results = []
+
+        with wrapped_storage._mem_cache_lock:
+            thread = threading.Thread(
+                target=lambda: results.append(wrapped_storage.get("some-key"))
+            )
+            thread.start()
+            thread.join(timeout=5)
+
+        self.assertEqual([b"some-value"], results)
+
+    def test_in_memory_cache_storage_wrapper_hits_update_lru_order(self):
+        """Memory cache hits count as accesses for the max_entries eviction."""
+        wrapped_storage = InMemoryCacheStorageWrapper(
+            persist_storage=DummyCacheStorage(),
+            context=CacheStorageContext(
+                function_key="func-key",
+                function_display_name="func-display-name",
+                max_entries=2,
+            ),
+        )
+        wrapped_storage.set("a", b"a")
+        wrapped_storage.set("b", b"b")
+        wrapped_storage.get("a")
+        wrapped_storage.set("c", b"c")
+
+        self.assertEqual(b"a", wrapped_storage.get("a"))
+        self.assertEqual(b"c", wrapped_storage.get("c"))
+        with self.assertRaises(CacheStorageKeyNotFoundError):
+            wrapped_storage.get("b")
+        self.assertEqual({"a", "c"}, set(wrapped_storage._mem_cache_entries))
+
+    @patch("streamlit.runtime.caching.cache_utils.TTLCACHE_TIMER")
+    def test_in_memory_cache_storage_wrapper_expired_hits(self, timer: MagicMock):
+        """Expired entries aren't returned by memory cache hits."""
+        timer.return_value = 0
+        wrapped_storage = InMemoryCacheStorageWrapper(
+            persist_storage=DummyCacheStorage(),
+            context=CacheStorageContext(
+                function_key="func-key",
+                function_display_name="func-display-name",
+                ttl_seconds=10,
+            ),
+        )
+        wrapped_storage.set("some-key", b"some-value")
+
+        timer.return_value = 9
+        self.assertEqual(b"some-value", wrapped_storage.get("some-key"))
+
+        timer.return_value = 10
+        with self.assertRaises(CacheStorageKeyNotFoundError):
+            wrapped_storage.get("some-key")
+
+    def test_in_memory_cache_storage_wrapper_clear(self):
+        """Cleared entries aren't returned by memory cache hits."""
+        wrapped_storage = InMemoryCacheStorageWrapper(
+            persist_storage=DummyCacheStorage(), context=self.get_storage_context()
+        )
+        wrapped_storage.set("some-key", b"some-value")
+
+        wrapped_storage.clear()
+
+        with self.assertRaises(CacheStorageKeyNotFoundError):
+            wrapped_storage.get("some-key")
+
+
+@pytest.mark.usefixtures("benchmark")
+def test_concurrent_cache_hits_performance(benchmark):
+    """Benchmark concurrent memory cache hits from many threads."""
+    storage = InMemoryCacheStorageWrapper(
+        persist_storage=DummyCacheStorage(),
+        context=CacheStorageContext(
+            function_key="func-key", function_display_name="func-display-name"
+        ),
+    )
+    keys = [f"key-{i}" for i in range(64)]
+    for key in keys:
+        storage.set(key, b"x" * 1024)
+
+    def read_keys():
+        for _ in range(50):
+            for key in keys:
+                storage.get(key)
+
+    def run_threads():
+        threads = [threading.Thread(target=read_keys) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    benchmark(run_threads)
@@ -0,0 +1,388 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2025)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Unit tests for IndexedLocalDiskCacheStorage"""
+
+from __future__ import annotations
+
+import os
+import pickle
+import sqlite3
+import threading
+import unittest
+from unittest.mock import patch
+
+from testfixtures import TempDirectory
+
+from streamlit import env_util
+from streamlit.runtime.caching.storage import (
+    CacheStorageContext,
+    CacheStorageError,
+    CacheStorageKeyNotFoundError,
+)
+from streamlit.runtime.caching.storage.in_memory_cache_storage_wrapper import (
+    InMemoryCacheStorageWrapper,
+)
+from streamlit.runtime.caching.storage.indexed_local_disk_cache_storage import (
+    IndexedLocalDiskCacheStorage,
+    IndexedLocalDiskCacheStorageManager,
+    connect_index,
+)
+from streamlit.web.cache_storage_manager_config import (
+    create_default_cache_storage_manager,
+)
+from tests.testutil import patch_config_options
+
+_MODULE = "streamlit.runtime.caching.storage.indexed_local_disk_cache_storage"
+
+
+def get_storage_context(
+    function_key: str = "func-key",
+    ttl_seconds: float | None = None,
+    max_entries: int | None = None,
+) -> CacheStorageContext:
+    return CacheStorageContext(
+        function_key=function_key,
+        function_display_name="func-display-name",
+        persist="disk",
+        ttl_seconds=ttl_seconds,
+        max_entries=max_entries,
+    )
+
+
+class IndexedLocalDiskCacheStorageTest(unittest.TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.tempdir = TempDirectory(create=True)
+        self.patchers = [
+            patch(
+                "streamlit.runtime.caching.storage.local_disk_cache_storage.get_cache_folder_path",
+                return_value=self.tempdir.path,
+            ),
+            patch(f"{_MODULE}.get_cache_folder_path", return_value=self.tempdir.path),
+            patch(f"{_MODULE}.INDEX_TIMER", return_value=0),
+        ]
+        for patcher in self.patchers:
+            patcher.start()
+
+    def tearDown(self) -> None:
+        super().tearDown()
+        for patcher in self.patchers:
+            patcher.stop()
+        self.tempdir.cleanup()
+
+    def _cache_files(self) -> list[str]:
+        return sorted(f for f in os.listdir(self.tempdir.path) if f.endswith(".memo"))
+
+    def _last_access(self, key: str) -> float:
+        with connect_index(self.tempdir.path) as conn:
+            return conn.execute(
+                "SELECT last_access FROM entries WHERE key = ?", (key,)
+            ).fetchone()[0]
+
+    def _function_totals(self) -> list[tuple[str, int, int]]:
+        with connect_index(self.tempdir.path) as conn:
+            return conn.execute(
+                "SELECT * FROM functions ORDER BY function_key"
+            ).fetchall()
+
+    def test_get_set_delete(self):
+        storage = IndexedLocalDiskCacheStorage(get_storage_context())
+
+        with self.assertRaises(CacheStorageKeyNotFoundError):
+            storage.get("key")
+
+        storage.set("key", b"value")
+        self.assertEqual(b"value", storage.get("key"))
+        self.assertEqual(["func-key-key.memo"], self._cache_files())
+
+        storage.delete("key")
+        with self.assertRaises(CacheStorageKeyNotFoundError):
+            storage.get("key")
+        self.assertEqual([], self._cache_files())
+
+    def test_persist_none(self):
+        """Nothing is written if persist is None."""
+        storage = IndexedLocalDiskCacheStorage(
+            CacheStorageContext(function_key="func-key", function_display_name="name")
+        )
+        storage.set("key", b"value")
+
+        with self.assertRaises(CacheStorageKeyNotFoundError):
+            storage.get("key")
+        self.assertEqual([], os.listdir(self.tempdir.path))
+
+    def test_ttl(self):
+        """Entries expire after ttl_seconds, and expired files are removed."""
+        storage = IndexedLocalDiskCacheStorage(get_storage_context(ttl_seconds=10))
+        storage.set("key", b"value")
+
+        with patch(f"{_MODULE}.INDEX_TIMER", return_value=9):
+            self.assertEqual(b"value", storage.get("key"))
+
+        with (
+            patch(f"{_MODULE}.INDEX_TIMER", return_value=10),
+            self.assertRaises(CacheStorageKeyNotFoundError),
+        ):
+            storage.get("key")
+        self.assertEqual([], self._cache_files())
+
+    def test_expired_entries_are_evicted_on_write(self):
+        """Expired entries of all functions are removed when writing."""
+        storage1 = IndexedLocalDiskCacheStorage(
+            get_storage_context(function_key="func1", ttl_seconds=10)
+        )
+        storage2 = IndexedLocalDiskCacheStorage(
+            get_storage_context(function_key="func2")
+        )
+        storage1.set("key", b"value")
+
+        with patch(f"{_MODULE}.INDEX_TIMER", return_value=20):
+            storage2.set("key", b"value")
+
+        self.assertEqual(["func2-key.memo"], self._cache_files())
+
+    def test_max_entries(self):
+        """The least recently used entries are evicted above max_entries."""
+        storage = IndexedLocalDiskCacheStorage(get_storage_context(max_entries=2))
+
+        for timestamp, key in [(0, "a"), (100, "b")]:
+            with patch(f"{_MODULE}.INDEX_TIMER", return_value=timestamp):
+                storage.set(key, b"value")
+        # Access "a", so that "b" becomes the least recently used entry.
+        with patch(f"{_MODULE}.INDEX_TIMER", return_value=200):
+            storage.get("a")
+        with patch(f"{_MODULE}.INDEX_TIMER", return_value=300):
+            storage.set("c", b"value")
+
+        self.assertEqual(["func-key-a.memo", "func-key-c.memo"], self._cache_files())
+        with self.assertRaises(CacheStorageKeyNotFoundError):
+            storage.get("b")
+
+    def test_recent_access_time_is_not_updated(self):
+        """Reads only update the access time if it is older than the
+        resolution, so that most reads don't write to the index.
+        """
+        storage = IndexedLocalDiskCacheStorage(get_storage_context())
+        storage.set("key", b"value")
+
+        with patch(f"{_MODULE}.INDEX_TIMER", return_value=30):
+            storage.get("key")
+        self.assertEqual(0, self._last_access("key"))
+
+        with patch(f"{_MODULE}.INDEX_TIMER", return_value=90):
+            storage.get("key")
+        self.assertEqual(90, self._last_access("key"))
+
+    def test_max_entries_is_per_function(self):
+        storage1 = IndexedLocalDiskCacheStorage(
+            get_storage_context(function_key="func1", max_entries=1)
+        )
+        storage2 = IndexedLocalDiskCacheStorage(
+            get_storage_context(function_key="func2")
+        )
+
+        storage2.set("a", b"value")
+        storage2.set("b", b"value")
+        storage1.set("a", b"value")
+
+        self.assertEqual(3, len(self._cache_files()))
+
+    def test_max_disk_size(self):
+        """The least recently used entries of all functions are evicted when
+        the total size exceeds max_disk_size.
+        """
+        storage1 = IndexedLocalDiskCacheStorage(
+            get_storage_context(function_key="func1"), max_disk_size=25
+        )
+        storage2 = IndexedLocalDiskCacheStorage(
+            get_storage_context(function_key="func2"), max_disk_size=25
+        )
+
+        with patch(f"{_MODULE}.INDEX_TIMER", return_value=1):
+            storage1.set("key", b"x" * 10)
+        with patch(f"{_MODULE}.INDEX_TIMER", return_value=2):
+            storage2.set("key", b"x" * 10)
+        with patch(f"{_MODULE}.INDEX_TIMER", return_value=3):
+            storage2.set("other", b"x" * 10)
+
+        self.assertEqual(["func2-key.memo", "func2-other.memo"], self._cache_files())
+
+        # Entries that are larger than the quota are not written at all.
+        storage1.set("large", b"x" * 30)
+        self.assertEqual(["func2-key.memo", "func2-other.memo"], self._cache_files())
+
+    def test_function_totals(self):
+        """The number and total size of the entries per function are kept up
+        to date on insert, overwrite and delete.
+        """
+        storage1 = IndexedLocalDiskCacheStorage(
+            get_storage_context(function_key="func1")
+        )
+        storage2 = IndexedLocalDiskCacheStorage(
+            get_storage_context(function_key="func2")
+        )
+        storage1.set("a", b"x" * 10)
+        storage1.set("b", b"x" * 5)
+        storage2.set("a", b"x" * 3)
+        storage1.set("a", b"x" * 20)
+        self.assertEqual([("func1", 2, 25), ("func2", 1, 3)], self._function_totals())
+
+        storage1.delete("b")
+        storage2.clear()
+        self.assertEqual([("func1", 1, 20)], self._function_totals())
+
+    def test_function_totals_are_built_from_existing_index(self):
+        """The function totals are built for an index without them."""
+        conn = sqlite3.connect(os.path.join(self.tempdir.path, "index.sqlite3"))
+        with conn:
+            conn.execute(
+                "CREATE TABLE entries (function_key TEXT NOT NULL, "
+                "key TEXT NOT NULL, size INTEGER NOT NULL, expires_at REAL, "
+                "last_access REAL NOT NULL, PRIMARY KEY (function_key, key))"
+            )
+            conn.execute("INSERT INTO entries VALUES ('func-key', 'a', 10, NULL, 0)")
+        conn.close()
+
+        storage = IndexedLocalDiskCacheStorage(get_storage_context())
+        storage.set("b", b"x" * 5)
+
+        self.assertEqual([("func-key", 2, 15)], self._function_totals())
+
+    def test_connection_is_reused(self):
+        """The index connection is kept open per thread."""
+        storage = IndexedLocalDiskCacheStorage(get_storage_context())
+
+        with patch(f"{_MODULE}.sqlite3.connect", wraps=sqlite3.connect) as connect_mock:
+            storage.set("key", b"value")
+            storage.get("key")
+            storage.set("other", b"value")
+            storage.delete("key")
+
+            thread = threading.Thread(target=storage.get, args=("other",))
+            thread.start()
+            thread.join()
+
+        self.assertEqual(2, connect_mock.call_count)
+
+    def test_clear(self):
+        storage1 = IndexedLocalDiskCacheStorage(
+            get_storage_context(function_key="func1")
+        )
+        storage2 = IndexedLocalDiskCacheStorage(
+            get_storage_context(function_key="func2")
+        )
+        storage1.set("key", b"value")
+        storage2.set("key", b"value")
+
+        storage1.clear()
+
+        self.assertEqual(["func2-key.memo"], self._cache_files())
+        with self.assertRaises(CacheStorageKeyNotFoundError):
+            storage1.get("key")
+        self.assertEqual(b"value", storage2.get("key"))
+
+    @unittest.skipIf(env_util.IS_WINDOWS, "Compute locks are POSIX only")
+    def test_clear_removes_unlocked_lock_files(self):
+        """Clearing a function removes its lock files, except held ones."""
+        storage1 = IndexedLocalDiskCacheStorage(
+            get_storage_context(function_key="func1")
+        )
+        storage2 = IndexedLocalDiskCacheStorage(
+            get_storage_context(function_key="func2")
+        )
+        for storage in (storage1, storage2):
+            with storage.compute_value_lock("key"):
+                pass
+
+        with storage1.compute_value_lock("held"):
+            storage1.clear()
+            self.assertEqual(
+                ["func1-held", "func2-key"],
+                sorted(os.listdir(os.path.join(self.tempdir.path, "locks"))),
+            )
+
+    def test_file_removed_outside_of_index(self):
+        storage = IndexedLocalDiskCacheStorage(get_storage_context())
+        storage.set("key", b"value")
+        os.remove(os.path.join(self.tempdir.path, "func-key-key.memo"))
+
+        with self.assertRaises(CacheStorageKeyNotFoundError):
+            storage.get("key")
+
+    def test_cache_directory_removed(self):
+        """The storage recovers if the cache directory is removed."""
+        manager = IndexedLocalDiskCacheStorageManager()
+        storage = manager.create_persist_storage(get_storage_context())
+        storage.set("key", b"value")
+
+        self.tempdir.cleanup()
+
+        with self.assertRaises(CacheStorageKeyNotFoundError):
+            storage.get("key")
+        storage.set("key", b"value")
+        self.assertEqual(b"value", storage.get("key"))
+
+    def test_large_values_are_memory_mapped(self):
+        """Large values are returned as memory-mapped buffers, which can be
+        loaded directly.
+        """
+        storage = IndexedLocalDiskCacheStorage(get_storage_context())
+        value = pickle.dumps(b"x" * 2 * 1024 * 1024)
+        storage.set("key", value)
+
+        with patch(f"{_MODULE}.env_util.IS_WINDOWS", False):
+            result = storage.get("key")
+
+        self.assertIsInstance(result, memoryview)
+        self.assertEqual(value, bytes(result))
+        self.assertEqual(b"x" * 2 * 1024 * 1024, pickle.loads(result))
+
+    def test_atomic_write(self):
+        """A failed write keeps the previous file and leaves no temp files."""
+        storage = IndexedLocalDiskCacheStorage(get_storage_context())
+        storage.set("key", b"value")
+
+        with (
+            patch(f"{_MODULE}.os.replace", side_effect=OSError),
+            self.assertRaises(CacheStorageError),
+        ):
+            storage.set("key", b"new value")
+
+        self.assertEqual(b"value", storage.get("key"))
+        self.assertEqual(
+            ["func-key-key.memo", "index.sqlite3"],
+            sorted(f for f in os.listdir(self.tempdir.path) if "sqlite3-" not in f),
+        )
+
+    def test_manager(self):
+        manager = IndexedLocalDiskCacheStorageManager()
+        storage = manager.create(get_storage_context(ttl_seconds=10))
+
+        self.assertIsInstance(storage, InMemoryCacheStorageWrapper)
+        with self.assertNoLogs(level="WARNING"):
+            manager.check_context(get_storage_context(ttl_seconds=10))
+
+    def test_default_cache_storage_manager(self):
+        """The indexed storage is selected via config."""
+        with patch_config_options(
+            {"server.cacheDataDiskIndex": True, "server.cacheDataDiskMaxSize": 100}
+        ):
+            manager = create_default_cache_storage_manager()
+        self.assertIsInstance(manager, IndexedLocalDiskCacheStorageManager)
+        self.assertEqual(100, manager._max_disk_size)
+
+        storage = manager.create(get_storage_context())
+        self.assertIsInstance(storage, InMemoryCacheStorageWrapper)
+        self.assertIsInstance(storage._persist_storage, IndexedLocalDiskCacheStorage)
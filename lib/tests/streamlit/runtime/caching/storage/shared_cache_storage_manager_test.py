@@ -0,0 +1,141 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2025)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Unit tests for SharedCacheStorageManager"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+import unittest
+
+import pytest
+from testfixtures import TempDirectory
+
+from streamlit import env_util
+from streamlit.runtime.caching.cache_data_api import DataCache
+from streamlit.runtime.caching.storage import CacheStorageContext
+from streamlit.runtime.caching.storage.shared_cache_storage_manager import (
+    SharedCacheStorageManager,
+)
+from streamlit.web.cache_storage_manager_config import (
+    create_default_cache_storage_manager,
+)
+from tests.testutil import patch_config_options
+
+
+def get_storage_context(ttl_seconds: float | None = None) -> CacheStorageContext:
+    return CacheStorageContext(
+        function_key="func-key",
+        function_display_name="func-display-name",
+        ttl_seconds=ttl_seconds,
+    )
+
+
+class SharedCacheStorageManagerTest(unittest.TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.tempdir = TempDirectory(create=True)
+
+    def tearDown(self) -> None:
+        super().tearDown()
+        self.tempdir.cleanup()
+
+    def _create_storage(self):
+        # Every call simulates a separate process with its own manager and
+        # in-memory cache layer.
+        manager = SharedCacheStorageManager(cache_dir=self.tempdir.path)
+        return manager.create(get_storage_context())
+
+    def test_values_are_shared(self):
+        """Values written by one storage can be read by another one, even if
+        the function isn't persisted.
+        """
+        storage1 = self._create_storage()
+        storage2 = self._create_storage()
+
+        storage1.set("key", b"value")
+
+        self.assertEqual(b"value", storage2.get("key"))
+        self.assertIn("func-key-key.memo", os.listdir(self.tempdir.path))
+
+    def test_clear_all_only_removes_cache_files(self):
+        other_file = os.path.join(self.tempdir.path, "other.txt")
+        with open(other_file, "w") as f:
+            f.write("other")
+
+        manager = SharedCacheStorageManager(cache_dir=self.tempdir.path)
+        manager.create(get_storage_context()).set("key", b"value")
+
+        manager.clear_all()
+
+        self.assertNotIn("func-key-key.memo", os.listdir(self.tempdir.path))
+        self.assertTrue(os.path.isfile(other_file))
+
+    def test_check_context_with_ttl(self):
+        manager = SharedCacheStorageManager(cache_dir=self.tempdir.path)
+        with self.assertNoLogs(level="WARNING"):
+            manager.check_context(get_storage_context(ttl_seconds=60))
+
+    @pytest.mark.skipif(env_util.IS_WINDOWS, reason="File locks require POSIX")
+    def test_compute_value_lock_is_shared(self):
+        """Only one holder of the compute lock for a key can run at a time,
+        even across separate storages.
+        """
+        caches = [
+            DataCache(
+                key="func-key",
+                storage=self._create_storage(),
+                persist=None,
+                max_entries=None,
+                ttl_seconds=None,
+                display_name="func-display-name",
+            )
+            for _ in range(4)
+        ]
+        active = 0
+        max_active = 0
+        active_lock = threading.Lock()
+
+        def compute(cache: DataCache):
+            nonlocal active, max_active
+            with cache.compute_value_lock("value-key"):
+                with active_lock:
+                    active += 1
+                    max_active = max(max_active, active)
+                time.sleep(0.05)
+                with active_lock:
+                    active -= 1
+
+        threads = [threading.Thread(target=compute, args=(c,)) for c in caches]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(1, max_active)
+
+    def test_default_cache_storage_manager(self):
+        """The shared storage is selected via config."""
+        with patch_config_options(
+            {
+                "server.cacheDataSharedPath": self.tempdir.path,
+                "server.cacheDataDiskMaxSize": 100,
+            }
+        ):
+            manager = create_default_cache_storage_manager()
+
+        self.assertIsInstance(manager, SharedCacheStorageManager)
+        self.assertEqual(100, manager._max_disk_size)
@@ -0,0 +1,91 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2025)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Unit tests for DataframeSourceManager"""
+
+from __future__ import annotations
+
+from unittest import TestCase, mock
+
+import pyarrow as pa
+
+from streamlit.runtime.dataframe_source_manager import (
+    DATAFRAME_SOURCE_ENDPOINT,
+    DataframeSourceManager,
+)
+from streamlit.runtime.stats import CacheStat
+
+
+def _get_source_id(url: str) -> str:
+    return url.rsplit("/", 1)[-1]
+
+
+class DataframeSourceManagerTest(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.manager = DataframeSourceManager()
+
+    @mock.patch("streamlit.runtime.dataframe_source_manager._get_session_id")
+    def test_add_and_get(self, mock_get_session_id):
+        """Tables can be looked up by the ID in their URL."""
+        mock_get_session_id.return_value = "mock_session"
+        table = pa.table({"a": [1, 2, 3]})
+
+        url = self.manager.add(table, "1.(2).3")
+
+        self.assertTrue(url.startswith(f"{DATAFRAME_SOURCE_ENDPOINT}/"))
+        self.assertIs(table, self.manager.get(_get_source_id(url)))
+        self.assertIsNone(self.manager.get("non_existent"))
+
+    @mock.patch("streamlit.runtime.dataframe_source_manager._get_session_id")
+    def test_remove_orphaned_sources(self, mock_get_session_id):
+        """Sources are only removed once no session references them."""
+        mock_get_session_id.return_value = "session1"
+        url1 = self.manager.add(pa.table({"a": [1]}), "1.(2).3")
+        mock_get_session_id.return_value = "session2"
+        url2 = self.manager.add(pa.table({"a": [2]}), "1.(2).3")
+
+        # Replacing the source at the same coordinates orphans the old one.
+        url3 = self.manager.add(pa.table({"a": [3]}), "1.(2).3")
+        self.manager.remove_orphaned_sources()
+        self.assertIsNotNone(self.manager.get(_get_source_id(url1)))
+        self.assertIsNone(self.manager.get(_get_source_id(url2)))
+        self.assertIsNotNone(self.manager.get(_get_source_id(url3)))
+
+        self.manager.clear_session_refs("session1")
+        self.manager.remove_orphaned_sources()
+        self.assertIsNone(self.manager.get(_get_source_id(url1)))
+        self.assertIsNotNone(self.manager.get(_get_source_id(url3)))
+
+    @mock.patch("streamlit.runtime.dataframe_source_manager._get_session_id")
+    def test_get_stats(self, mock_get_session_id):
+        """The stats contain the size of all stored tables."""
+        mock_get_session_id.return_value = "mock_session"
+        self.assertEqual([], self.manager.get_stats())
+
+        table1 = pa.table({"a": [1, 2, 3]})
+        table2 = pa.table({"b": ["x", "y"]})
+        self.manager.add(table1, "1.(2).3")
+        self.manager.add(table2, "1.(2).4")
+
+        self.assertEqual(
+            [
+                CacheStat(
+                    category_name="DataframeSourceManager",
+                    cache_name="",
+                    byte_length=table1.nbytes + table2.nbytes,
+                )
+            ],
+            self.manager.get_stats(),
+        )
@@ -0,0 +1,246 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2025)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Unit tests for DiskSpillingMediaFileStorage"""
+
+from __future__ import annotations
+
+import os
+import threading
+import unittest
+from unittest.mock import patch
+
+from testfixtures import TempDirectory
+
+from streamlit import env_util
+from streamlit.runtime.disk_spilling_media_file_storage import (
+    DiskFile,
+    DiskSpillingMediaFileStorage,
+)
+from streamlit.runtime.media_file_storage import MediaFileKind, MediaFileStorageError
+from streamlit.runtime.memory_media_file_storage import (
+    MemoryFile,
+    MemoryMediaFileStorage,
+)
+
+
+class DiskSpillingMediaFileStorageTest(unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.tempdir = TempDirectory(create=True)
+        self.spill_dir = os.path.join(self.tempdir.path, "spill")
+        self.storage = DiskSpillingMediaFileStorage(
+            media_endpoint="/mock/media", memory_budget=10, spill_dir=self.spill_dir
+        )
+
+    def tearDown(self):
+        super().tearDown()
+        self.tempdir.cleanup()
+
+    def _load(self, data: bytes) -> str:
+        return self.storage.load_and_get_id(
+            data, mimetype="video/mp4", kind=MediaFileKind.MEDIA
+        )
+
+    def test_small_files_are_kept_in_memory(self):
+        file_id = self._load(b"12345")
+        self.assertEqual(
+            MemoryFile(
+                content=b"12345",
+                mimetype="video/mp4",
+                kind=MediaFileKind.MEDIA,
+                filename=None,
+            ),
+            self.storage.get_file(file_id),
+        )
+        self.assertEqual(5, self.storage.get_stats()[0].byte_length)
+
+    def test_large_files_are_written_to_disk(self):
+        file_id = self._load(b"0123456789abc")
+
+        media_file = self.storage.get_file(file_id)
+        self.assertIsInstance(media_file, DiskFile)
+        self.assertEqual(13, media_file.content_size)
+        self.assertEqual(b"0123456789abc", media_file.content)
+        self.assertEqual([], self.storage.get_stats())
+
+    def test_least_recently_used_files_are_spilled(self):
+        file_id1 = self._load(b"1111")
+        file_id2 = self._load(b"2222")
+        # Use the first file, so that the second file is the least recently
+        # used one.
+        self.storage.get_file(file_id1)
+
+        file_id3 = self._load(b"3333")
+
+        self.assertIsInstance(self.storage.get_file(file_id1), MemoryFile)
+        self.assertIsInstance(self.storage.get_file(file_id2), DiskFile)
+        self.assertIsInstance(self.storage.get_file(file_id3), MemoryFile)
+        self.assertEqual(b"2222", self.storage.get_file(file_id2).content)
+        self.assertEqual(8, self.storage.get_stats()[0].byte_length)
+
+    def test_load_with_path(self):
+        """Large files are copied to disk in chunks, with the same ID as in
+        MemoryMediaFileStorage.
+        """
+        path = self.tempdir.write("large.bin", b"x" * 100)
+
+        file_id = self.storage.load_and_get_id(
+            path, mimetype="video/mp4", kind=MediaFileKind.MEDIA, filename="a.mp4"
+        )
+
+        memory_storage = MemoryMediaFileStorage(media_endpoint="/mock/media")
+        self.assertEqual(
+            memory_storage.load_and_get_id(
+                path, mimetype="video/mp4", kind=MediaFileKind.MEDIA, filename="a.mp4"
+            ),
+            file_id,
+        )
+        media_file = self.storage.get_file(file_id)
+        self.assertIsInstance(media_file, DiskFile)
+        self.assertEqual(b"x" * 100, media_file.content)
+        self.assertEqual([f"{file_id}-0"], os.listdir(self.spill_dir))
+
+    def test_load_with_bad_path(self):
+        with self.assertRaises(MediaFileStorageError):
+            self.storage.load_and_get_id(
+                "mock/file/path", mimetype="video/mp4", kind=MediaFileKind.MEDIA
+            )
+
+    def test_iter_content(self):
+        file_id = self._load(b"0123456789abc")
+        media_file = self.storage.get_file(file_id)
+
+        self.assertEqual(b"0123456789abc", b"".join(media_file.iter_content()))
+        self.assertEqual(b"234", b"".join(media_file.iter_content(2, 5)))
+
+    def test_delete_file(self):
+        memory_file_id = self._load(b"12345")
+        disk_file_id = self._load(b"0123456789abc")
+
+        self.storage.delete_file(memory_file_id)
+        self.storage.delete_file(disk_file_id)
+        # Deleting a file that doesn't exist is a no-op.
+        self.storage.delete_file(disk_file_id)
+
+        self.assertEqual([], os.listdir(self.spill_dir))
+        self.assertEqual(0, self.storage._memory_size)
+        with self.assertRaises(MediaFileStorageError):
+            self.storage.get_file(disk_file_id)
+
+    def test_delete_file_keeps_file_written_again(self):
+        """A file that is added again while its previous file is deleted is
+        kept, since every write uses its own path.
+        """
+        file_id = self._load(b"0123456789abc")
+        remove = os.remove
+
+        def add_file_again_and_remove(path: str) -> None:
+            self._load(b"0123456789abc")
+            remove(path)
+
+        with patch(
+            "streamlit.runtime.disk_spilling_media_file_storage.os.remove",
+            side_effect=add_file_again_and_remove,
+        ):
+            self.storage.delete_file(file_id)
+
+        self.assertEqual(b"0123456789abc", self.storage.get_file(file_id).content)
+
+    @unittest.skipIf(env_util.IS_WINDOWS, "Open files can't be removed on Windows")
+    def test_iter_content_of_deleted_file(self):
+        """The file is opened when the iterator is created, so its content
+        can be read after the file is deleted.
+        """
+        file_id = self._load(b"0123456789abc")
+        content = self.storage.get_file(file_id).iter_content()
+
+        self.storage.delete_file(file_id)
+
+        self.assertEqual(b"0123456789abc", b"".join(content))
+
+    def _block_disk_writes(self) -> tuple[threading.Event, threading.Event]:
+        """Make disk writes wait until the returned `release` event is set.
+        The returned `started` event is set when a write starts.
+        """
+        started = threading.Event()
+        release = threading.Event()
+        write_disk_file = self.storage._write_disk_file
+
+        def blocking_write_disk_file(*args, **kwargs):
+            started.set()
+            release.wait(timeout=5)
+            return write_disk_file(*args, **kwargs)
+
+        self.storage._write_disk_file = blocking_write_disk_file
+        return started, release
+
+    def test_get_file_does_not_wait_for_spill(self):
+        """Files can be looked up while other files are spilled to disk."""
+        file_id1 = self._load(b"1111")
+        file_id2 = self._load(b"2222")
+        started, release = self._block_disk_writes()
+
+        loader = threading.Thread(target=self._load, args=(b"3333",))
+        loader.start()
+        self.assertTrue(started.wait(timeout=5))
+
+        # file_id1 is being spilled, but can still be served from memory.
+        results = []
+        reader = threading.Thread(
+            target=lambda: results.extend(
+                self.storage.get_file(file_id).content
+                for file_id in (file_id1, file_id2)
+            )
+        )
+        reader.start()
+        reader.join(timeout=5)
+        self.assertEqual([b"1111", b"2222"], results)
+
+        release.set()
+        loader.join(timeout=5)
+        # file_id2 was used more recently than file_id1 when the spill started.
+        self.assertIsInstance(self.storage.get_file(file_id1), DiskFile)
+        self.assertEqual(8, self.storage._memory_size)
+
+    def test_file_deleted_during_spill(self):
+        """A file that is deleted while it's spilled isn't added back."""
+        file_id1 = self._load(b"1111")
+        self._load(b"2222")
+        started, release = self._block_disk_writes()
+
+        loader = threading.Thread(target=self._load, args=(b"3333",))
+        loader.start()
+        self.assertTrue(started.wait(timeout=5))
+        self.storage.delete_file(file_id1)
+        release.set()
+        loader.join(timeout=5)
+
+        with self.assertRaises(MediaFileStorageError):
+            self.storage.get_file(file_id1)
+        self.assertEqual([], os.listdir(self.spill_dir))
+        self.assertEqual(8, self.storage._memory_size)
+
+    def test_temporary_spill_dir_is_removed(self):
+        storage = DiskSpillingMediaFileStorage(
+            media_endpoint="/mock/media", memory_budget=0
+        )
+        file_id = storage.load_and_get_id(
+            b"data", mimetype="video/mp4", kind=MediaFileKind.MEDIA
+        )
+        spill_dir = os.path.dirname(storage.get_file(file_id).path)
+        self.assertTrue(os.path.isdir(spill_dir))
+
+        del storage
+        self.assertFalse(os.path.exists(spill_dir))
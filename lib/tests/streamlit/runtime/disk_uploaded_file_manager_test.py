@@ -0,0 +1,137 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2025)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Unit tests for DiskUploadedFileManager"""
+
+from __future__ import annotations
+
+import io
+import os
+import pickle
+import unittest
+
+from testfixtures import TempDirectory
+
+from streamlit.proto.Common_pb2 import FileURLs as FileURLsProto
+from streamlit.runtime.disk_uploaded_file_manager import DiskUploadedFileManager
+from streamlit.runtime.stats import CacheStat
+from streamlit.runtime.uploaded_file_manager import UploadedFile
+
+
+class DiskUploadedFileManagerTest(unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.tempdir = TempDirectory(create=True)
+        self.mgr = DiskUploadedFileManager(
+            "/mock/upload",
+            upload_dir=self.tempdir.path,
+            max_total_size=100,
+            max_session_size=60,
+        )
+
+    def tearDown(self):
+        super().tearDown()
+        self.tempdir.cleanup()
+
+    def _add_file(self, session_id: str, file_id: str, data: bytes) -> None:
+        self.assertTrue(self.mgr.reserve(session_id, len(data)))
+        fd, path = self.mgr.create_upload_file()
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        self.mgr.add_file_from_path(
+            session_id, file_id, "name.txt", "text/plain", path, len(data)
+        )
+
+    def test_add_file_from_path(self):
+        self._add_file("session", "file", b"line1\nline2")
+        self._add_file("session", "empty", b"")
+
+        rec, empty_rec = self.mgr.get_files("session", ["file", "empty"])
+        self.assertEqual(b"line1\nline2", rec.data[:])
+        self.assertEqual(b"", empty_rec.data)
+        # Memory-mapped files are reported separately from memory use.
+        self.assertEqual(
+            [
+                CacheStat("UploadedFileManager", "", 0),
+                CacheStat("UploadedFileManager", "disk", len(b"line1\nline2")),
+            ],
+            self.mgr.get_stats(),
+        )
+
+    def test_quotas(self):
+        self._add_file("session1", "file", b"x" * 50)
+
+        # The session quota is exceeded.
+        self.assertFalse(self.mgr.reserve("session1", 20))
+        # The total quota is exceeded.
+        self.assertTrue(self.mgr.reserve("session2", 40))
+        self.assertFalse(self.mgr.reserve("session3", 20))
+
+        self.mgr.release("session2", 40)
+        self.assertTrue(self.mgr.reserve("session3", 20))
+
+    def test_remove_files_releases_space(self):
+        self._add_file("session", "file1", b"x" * 30)
+        self._add_file("session", "file2", b"x" * 30)
+        self.assertFalse(self.mgr.reserve("session", 1))
+
+        self.mgr.remove_file("session", "file1")
+        self.assertEqual(1, len(os.listdir(self.tempdir.path)))
+        self.assertTrue(self.mgr.reserve("session", 30))
+        self.mgr.release("session", 30)
+
+        self.mgr.remove_session_files("session")
+        self.assertEqual([], os.listdir(self.tempdir.path))
+        self.assertEqual(0, self.mgr._total_size)
+        self.assertEqual({}, self.mgr._session_sizes)
+
+    def test_replacing_file_releases_space(self):
+        self._add_file("session", "file", b"x" * 40)
+        self._add_file("session", "file", b"y" * 10)
+
+        self.assertEqual(10, self.mgr._total_size)
+        self.assertEqual(1, len(os.listdir(self.tempdir.path)))
+
+    def test_uploaded_file_is_memory_mapped(self):
+        self._add_file("session", "file", b"line1\nline2")
+        (rec,) = self.mgr.get_files("session", ["file"])
+
+        uploaded_file = UploadedFile(rec, FileURLsProto())
+        self.assertIsInstance(uploaded_file, io.BytesIO)
+        self.assertEqual(11, uploaded_file.size)
+        self.assertEqual([b"line1\n", b"line2"], uploaded_file.readlines())
+        uploaded_file.seek(-5, io.SEEK_END)
+        self.assertEqual(b"li", uploaded_file.read(2))
+        self.assertEqual(b"line1\nline2", uploaded_file.getvalue())
+
+        # Files can still be used after they're removed from the manager.
+        self.mgr.remove_session_files("session")
+        uploaded_file.seek(0)
+        self.assertEqual(b"line1", uploaded_file.read(5))
+
+        # Writes copy the content into memory.
+        uploaded_file.write(b"!")
+        self.assertEqual(b"line1!line2", uploaded_file.getvalue())
+
+    def test_uploaded_file_can_be_pickled(self):
+        self._add_file("session", "file", b"content")
+        (rec,) = self.mgr.get_files("session", ["file"])
+        uploaded_file = UploadedFile(rec, FileURLsProto())
+        uploaded_file.read(3)
+
+        restored = pickle.loads(pickle.dumps(uploaded_file))
+
+        self.assertEqual(uploaded_file, restored)
+        self.assertEqual(3, restored.tell())
+        self.assertEqual(b"tent", restored.read())
@@ -20,13 +20,15 @@ import unittest
 from unittest.mock import MagicMock
 
 from streamlit import config
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
 from streamlit.runtime import app_session
 from streamlit.runtime.forward_msg_cache import (
     ForwardMsgCache,
     create_reference_msg,
     populate_hash_if_needed,
+    serialize_forward_msg_payload,
 )
-from streamlit.runtime.stats import CacheStat
+from streamlit.runtime.stats import CacheCounter, CacheStat
 from streamlit.testing.v1.util import patch_config_options
 from tests.streamlit.message_mocks import create_dataframe_msg
 
@@ -53,6 +55,35 @@ class ForwardMsgCacheTest(unittest.TestCase):
         msg2 = create_dataframe_msg([1, 2, 3], 2)
         self.assertEqual(populate_hash_if_needed(msg1), populate_hash_if_needed(msg2))
 
+    def test_msg_hash_from_payload(self):
+        """Test that hashing a message from its serialized payload gives the
+        same hash as hashing the message itself."""
+        msg1 = create_dataframe_msg([1, 2, 3], 1)
+        msg2 = create_dataframe_msg([1, 2, 3], 2)
+        payload = serialize_forward_msg_payload(msg2)
+
+        self.assertEqual(
+            populate_hash_if_needed(msg1), populate_hash_if_needed(msg2, payload)
+        )
+
+    def test_serialize_payload_preserves_msg(self):
+        """Test that serializing a message's payload leaves its hash and
+        metadata untouched, and excludes them from the payload."""
+        msg = create_dataframe_msg([1, 2, 3], 1)
+        msg.metadata.cacheable = True
+        populate_hash_if_needed(msg)
+        original = ForwardMsg()
+        original.CopyFrom(msg)
+
+        payload = serialize_forward_msg_payload(msg)
+
+        self.assertEqual(original, msg)
+        parsed = ForwardMsg()
+        parsed.ParseFromString(payload)
+        self.assertEqual("", parsed.hash)
+        self.assertFalse(parsed.HasField("metadata"))
+        self.assertEqual(msg.delta, parsed.delta)
+
     def test_reference_msg(self):
         """Test creation of 'reference' ForwardMsgs"""
         msg = create_dataframe_msg([1, 2, 3], 34)
@@ -81,6 +112,36 @@ class ForwardMsgCacheTest(unittest.TestCase):
         cache.add_message(msg, session, 0)
         self.assertEqual(msg, cache.get_message(msg_hash))
 
+    def test_get_serialized_payload(self):
+        """Test that the cached payload is shared between sessions."""
+        cache = ForwardMsgCache()
+        msg1 = create_dataframe_msg([1, 2, 3], 1)
+        msg2 = create_dataframe_msg([1, 2, 3], 2)
+        payload1 = serialize_forward_msg_payload(msg1)
+        payload2 = serialize_forward_msg_payload(msg2)
+
+        cache.add_message(msg1, _create_mock_session(), 0, payload1)
+        cache.add_message(msg2, _create_mock_session(), 0, payload2)
+
+        self.assertIs(payload1, cache.get_serialized_payload(msg1.hash))
+        self.assertIs(payload1, cache.get_serialized_payload(msg2.hash))
+        self.assertIsNone(cache.get_serialized_payload("non_existent"))
+
+    def test_get_message_header(self):
+        """Test that the message header contains the hash and metadata of the
+        cached message, and is a copy."""
+        cache = ForwardMsgCache()
+        msg = create_dataframe_msg([1, 2, 3], 1)
+        cache.add_message(msg, _create_mock_session(), 0)
+
+        header = cache.get_message_header(msg.hash)
+        self.assertEqual(msg.hash, header.hash)
+        self.assertEqual(msg.metadata, header.metadata)
+        self.assertIsNone(header.WhichOneof("type"))
+
+        header.hash = "modified"
+        self.assertEqual(msg.hash, cache.get_message_header(msg.hash).hash)
+
     def test_clear(self):
         """Test MessageCache.clear"""
         cache = ForwardMsgCache()
@@ -191,6 +252,7 @@ class ForwardMsgCacheTest(unittest.TestCase):
 
         # Cache should not store message content for messages.
         self.assertEqual(message_content, None)
+        self.assertEqual(cache.get_serialized_payload(msg_hash), None)
 
     def test_cache_stats_provider(self):
         """Test ForwardMsgCache's CacheStatsProvider implementation."""
@@ -217,3 +279,112 @@ class ForwardMsgCacheTest(unittest.TestCase):
             ),
         ]
         self.assertEqual(set(expected), set(cache.get_stats()))
+
+    def test_remove_refs_for_session_updates_session_index(self):
+        """Test that removing a session's refs only touches that session's
+        entries, and that the session is dropped from the reverse index."""
+        cache = ForwardMsgCache()
+        session1 = _create_mock_session()
+        session2 = _create_mock_session()
+
+        msg1 = create_dataframe_msg([1, 2, 3])
+        msg2 = create_dataframe_msg([4, 5, 6])
+        cache.add_message(msg1, session1, 0)
+        cache.add_message(msg2, session2, 0)
+
+        self.assertEqual({msg1.hash}, cache._session_hashes[session1])
+        self.assertEqual({msg2.hash}, cache._session_hashes[session2])
+
+        cache.remove_refs_for_session(session1)
+
+        self.assertNotIn(session1, cache._session_hashes)
+        self.assertIsNone(cache.get_message(msg1.hash))
+        self.assertEqual(msg2, cache.get_message(msg2.hash))
+
+    def test_remove_expired_entries_updates_session_index(self):
+        """Test that expired hashes are dropped from the session's index."""
+        config._set_option("global.maxCachedMessageAge", 1, "test")
+
+        cache = ForwardMsgCache()
+        session = _create_mock_session()
+
+        old_msg = create_dataframe_msg([1, 2, 3])
+        cache.add_message(old_msg, session, 0)
+        new_msg = create_dataframe_msg([4, 5, 6])
+        cache.add_message(new_msg, session, 2)
+
+        cache.remove_expired_entries_for_session(session, 2)
+
+        self.assertEqual({new_msg.hash}, cache._session_hashes[session])
+        self.assertIsNone(cache.get_message(old_msg.hash))
+        self.assertEqual(new_msg, cache.get_message(new_msg.hash))
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entries are evicted when the
+        cache grows beyond server.messageCacheMaxBytes."""
+        session = _create_mock_session()
+        msg1 = create_dataframe_msg([1, 2, 3])
+        msg2 = create_dataframe_msg([4, 5, 6])
+        msg3 = create_dataframe_msg([7, 8, 9])
+        for msg in (msg1, msg2, msg3):
+            populate_hash_if_needed(msg)
+
+        max_bytes = msg1.ByteSize() + msg2.ByteSize()
+        with patch_config_options({"server.messageCacheMaxBytes": max_bytes}):
+            cache = ForwardMsgCache()
+            cache.add_message(msg1, session, 0)
+            cache.add_message(msg2, session, 0)
+
+            # Access msg1 so that msg2 becomes the least recently used entry.
+            cache.get_message(msg1.hash)
+            cache.add_message(msg3, session, 0)
+
+        self.assertEqual(msg1, cache.get_message(msg1.hash))
+        self.assertIsNone(cache.get_message(msg2.hash))
+        self.assertEqual(msg3, cache.get_message(msg3.hash))
+        self.assertFalse(cache.has_message_reference(msg2, session, 0))
+        self.assertEqual({msg1.hash, msg3.hash}, cache._session_hashes[session])
+        self.assertEqual(
+            [
+                CacheStat(
+                    category_name="ForwardMessageCache",
+                    cache_name="",
+                    byte_length=msg1.ByteSize() + msg3.ByteSize(),
+                )
+            ],
+            cache.get_stats(),
+        )
+
+    def test_no_eviction_without_max_bytes(self):
+        """Test that a server.messageCacheMaxBytes of 0 disables eviction."""
+        cache = ForwardMsgCache()
+        session = _create_mock_session()
+
+        with patch_config_options({"server.messageCacheMaxBytes": 0}):
+            for i in range(10):
+                cache.add_message(create_dataframe_msg([i]), session, 0)
+
+        self.assertEqual(10, len(cache._entries))
+
+    def test_cache_counters(self):
+        """Test ForwardMsgCache's hit, miss and eviction counters."""
+        session = _create_mock_session()
+        msg1 = create_dataframe_msg([1, 2, 3])
+        msg2 = create_dataframe_msg([4, 5, 6])
+        populate_hash_if_needed(msg1)
+
+        with patch_config_options({"server.messageCacheMaxBytes": msg1.ByteSize()}):
+            cache = ForwardMsgCache()
+            self.assertFalse(cache.has_message_reference(msg1, session, 0))
+            cache.add_message(msg1, session, 0)
+            self.assertTrue(cache.has_message_reference(msg1, session, 0))
+            cache.add_message(msg2, session, 0)
+
+        self.assertEqual(
+            [
+                CacheCounter("ForwardMessageCache", "", "hits", 1),
+                CacheCounter("ForwardMessageCache", "", "misses", 1),
+                CacheCounter("ForwardMessageCache", "", "evictions", 1),
+            ],
+            cache.get_counters(),
+        )
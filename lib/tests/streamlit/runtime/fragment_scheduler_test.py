@@ -0,0 +1,100 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2025)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Unit tests for fragment_scheduler.py"""
+
+from __future__ import annotations
+
+import asyncio
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import MagicMock
+
+from streamlit.runtime.fragment_scheduler import FragmentScheduler
+
+INTERVAL = 0.02
+
+
+class FragmentSchedulerTest(IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.request_fragment_run = MagicMock()
+        self.scheduler = FragmentScheduler(self.request_fragment_run)
+
+    def tearDown(self) -> None:
+        self.scheduler.unschedule_all()
+        super().tearDown()
+
+    async def test_requests_runs_every_interval(self):
+        self.scheduler.schedule("session", "fragment", INTERVAL)
+
+        await asyncio.sleep(INTERVAL * 3.5)
+
+        self.assertGreaterEqual(self.request_fragment_run.call_count, 2)
+        self.request_fragment_run.assert_called_with("session", "fragment")
+
+    async def test_ticks_are_aligned_across_sessions(self):
+        """Sessions that show the same fragment run it on the same ticks."""
+        ticks: dict[str, list[float]] = {}
+        loop = asyncio.get_running_loop()
+
+        def request_fragment_run(session_id: str, fragment_id: str) -> None:
+            ticks.setdefault(session_id, []).append(loop.time())
+
+        self.request_fragment_run.side_effect = request_fragment_run
+
+        self.scheduler.schedule("session1", "fragment", INTERVAL)
+        await asyncio.sleep(INTERVAL / 2)
+        self.scheduler.schedule("session2", "fragment", INTERVAL)
+        await asyncio.sleep(INTERVAL * 2)
+
+        self.assertAlmostEqual(
+            ticks["session1"][-1], ticks["session2"][-1], delta=INTERVAL / 4
+        )
+
+    async def test_schedule_again_keeps_timer(self):
+        self.scheduler.schedule("session", "fragment", INTERVAL)
+        timer = self.scheduler._timers["session"]["fragment"][1]
+
+        self.scheduler.schedule("session", "fragment", INTERVAL)
+        self.assertIs(timer, self.scheduler._timers["session"]["fragment"][1])
+
+        self.scheduler.schedule("session", "fragment", INTERVAL * 2)
+        self.assertTrue(timer.cancelled())
+
+    async def test_unschedule_session(self):
+        self.scheduler.schedule("session1", "fragment", INTERVAL)
+        self.scheduler.schedule("session2", "fragment", INTERVAL)
+
+        self.scheduler.unschedule_session("session1")
+        await asyncio.sleep(INTERVAL * 1.5)
+
+        self.assertFalse(self.scheduler.is_scheduled("session1", "fragment"))
+        self.assertTrue(self.scheduler.is_scheduled("session2", "fragment"))
+        self.request_fragment_run.assert_called_with("session2", "fragment")
+        self.assertNotIn(
+            "session1", [c.args[0] for c in self.request_fragment_run.call_args_list]
+        )
+
+    async def test_failed_request_keeps_schedule(self):
+        self.request_fragment_run.side_effect = RuntimeError("boom")
+        self.scheduler.schedule("session", "fragment", INTERVAL)
+
+        await asyncio.sleep(INTERVAL * 2.5)
+
+        self.assertGreaterEqual(self.request_fragment_run.call_count, 2)
+
+    async def test_ignores_non_positive_interval(self):
+        self.scheduler.schedule("session", "fragment", 0)
+
+        self.assertFalse(self.scheduler.is_scheduled("session", "fragment"))
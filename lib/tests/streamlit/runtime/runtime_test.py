@@ -35,7 +35,10 @@ from streamlit.runtime import (
 from streamlit.runtime.caching.storage.local_disk_cache_storage import (
     LocalDiskCacheStorageManager,
 )
-from streamlit.runtime.forward_msg_cache import populate_hash_if_needed
+from streamlit.runtime.forward_msg_cache import (
+    populate_hash_if_needed,
+    serialize_forward_msg_payload,
+)
 from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
 from streamlit.runtime.memory_session_storage import MemorySessionStorage
 from streamlit.runtime.memory_uploaded_file_manager import MemoryUploadedFileManager
@@ -60,6 +63,20 @@ class MockSessionClient(SessionClient):
         self.forward_msgs.append(msg)
 
 
+class PayloadRecordingSessionClient(SessionClient):
+    """A SessionClient that captures the serialized payloads it's asked to
+    send, and fails if a message has to be serialized from scratch."""
+
+    def __init__(self):
+        self.payloads: list[bytes] = []
+
+    def write_forward_msg(self, msg: ForwardMsg) -> None:
+        raise AssertionError("Payload was not reused")
+
+    def write_serialized_forward_msg(self, msg: ForwardMsg, payload: bytes) -> None:
+        self.payloads.append(payload)
+
+
 class RuntimeConfigTests(unittest.TestCase):
     def test_runtime_config_defaults(self):
         config = RuntimeConfig(
@@ -272,6 +289,39 @@ class RuntimeTest(RuntimeTestCase):
             patched_on_session_disconnected.assert_called_once()
             patched_remove_refs_for_session.assert_called_once_with(session)
 
+    async def test_scheduled_fragment_runs(self):
+        """Scheduled fragment runs are requested from connected sessions
+        only, and closed sessions are unscheduled.
+        """
+        await self.runtime.start()
+
+        session_id = self.runtime.connect_session(
+            client=MockSessionClient(), user_info=MagicMock()
+        )
+        session = self.runtime._session_mgr.get_session_info(session_id).session
+        scheduler = self.runtime.fragment_scheduler
+        scheduler.schedule(session_id, "my_fragment_id", 1)
+
+        with patch.object(
+            session, "request_scheduled_fragment_run"
+        ) as patched_request_run:
+            self.runtime._request_scheduled_fragment_run(session_id, "my_fragment_id")
+            patched_request_run.assert_called_once_with("my_fragment_id")
+
+            # A disconnected session keeps its schedule, but isn't run.
+            patched_request_run.reset_mock()
+            with patch.object(
+                self.runtime._session_mgr, "get_active_session_info", return_value=None
+            ):
+                self.runtime._request_scheduled_fragment_run(
+                    session_id, "my_fragment_id"
+                )
+            patched_request_run.assert_not_called()
+            assert scheduler.is_scheduled(session_id, "my_fragment_id")
+
+        self.runtime.close_session(session_id)
+        assert not scheduler.is_scheduled(session_id, "my_fragment_id")
+
     async def test_multiple_sessions(self):
         """Multiple sessions can be connected."""
         await self.runtime.start()
@@ -476,6 +526,54 @@ class RuntimeTest(RuntimeTestCase):
         # It is expected that there are a couple of tasks, but not one per loop:
         self.assertLess(len(asyncio.all_tasks()), 10)
 
+    async def test_flush_interleaves_sessions_in_batches(self):
+        """Test that a session with many queued messages doesn't starve other
+        sessions: messages are sent round-robin in batches of
+        `server.forwardMsgBatchSize`.
+        """
+        with patch_config_options({"server.forwardMsgBatchSize": 2}):
+            await self.runtime.start()
+
+            sent: list[str] = []
+
+            class RecordingSessionClient(SessionClient):
+                def __init__(self, name: str):
+                    self.name = name
+
+                def write_forward_msg(self, msg: ForwardMsg) -> None:
+                    sent.append(self.name)
+
+            session_a = self.runtime.connect_session(
+                client=RecordingSessionClient("a"), user_info=MagicMock()
+            )
+            session_b = self.runtime.connect_session(
+                client=RecordingSessionClient("b"), user_info=MagicMock()
+            )
+
+            for i in range(5):
+                self.enqueue_forward_msg(session_a, create_dataframe_msg([i], i))
+            self.enqueue_forward_msg(session_b, create_dataframe_msg([1], 1))
+            await self.tick_runtime_loop()
+
+            self.assertEqual(["a", "a", "b", "a", "a", "a"], sent)
+
+    async def test_flush_drops_batch_of_disconnected_session(self):
+        """Test that the remaining messages of a session whose client
+        disconnected mid-batch are not sent.
+        """
+        await self.runtime.start()
+
+        client = MagicMock(spec=SessionClient)
+        client.write_forward_msg = MagicMock(side_effect=SessionClientDisconnectedError)
+        session_id = self.runtime.connect_session(client, MagicMock())
+
+        for i in range(3):
+            self.enqueue_forward_msg(session_id, create_dataframe_msg([i], i))
+        await self.tick_runtime_loop()
+
+        client.write_forward_msg.assert_called_once()
+        self.assertFalse(self.runtime.is_active_session(session_id))
+
     async def test_forwardmsg_hashing(self):
         """Test that outgoing ForwardMsgs contain hashes."""
         await self.runtime.start()
@@ -493,6 +591,59 @@ class RuntimeTest(RuntimeTestCase):
         received = client.forward_msgs.pop()
         self.assertEqual(populate_hash_if_needed(msg), received.hash)
 
+    async def test_forwardmsg_reuses_serialized_payload(self):
+        """Test that cacheable messages are sent with the payload that was
+        serialized when they were enqueued."""
+        await self.runtime.start()
+
+        client = PayloadRecordingSessionClient()
+        session_id = self.runtime.connect_session(client=client, user_info=MagicMock())
+
+        with patch_config_options({"global.minCachedMessageSize": 0}):
+            msg = create_dataframe_msg([1, 2, 3])
+            self.enqueue_forward_msg(session_id, msg)
+            await self.tick_runtime_loop()
+
+        self.assertEqual([serialize_forward_msg_payload(msg)], client.payloads)
+
+    async def test_forwardmsg_sent_to_client_without_serialized_writes(self):
+        """Test that SessionClients that don't subclass SessionClient, and so
+        may not implement write_serialized_forward_msg, still get messages."""
+        await self.runtime.start()
+
+        client = MagicMock(spec=["write_forward_msg"])
+        session_id = self.runtime.connect_session(client=client, user_info=MagicMock())
+
+        with patch_config_options({"global.minCachedMessageSize": 0}):
+            msg = create_dataframe_msg([1, 2, 3])
+            self.enqueue_forward_msg(session_id, msg)
+            await self.tick_runtime_loop()
+
+        client.write_forward_msg.assert_called_once()
+
+    async def test_forwardmsg_payload_shared_across_sessions(self):
+        """Test that identical messages sent to different sessions reuse the
+        same serialized payload bytes."""
+        await self.runtime.start()
+
+        client1 = PayloadRecordingSessionClient()
+        client2 = PayloadRecordingSessionClient()
+        session_id1 = self.runtime.connect_session(
+            client=client1, user_info=MagicMock()
+        )
+        session_id2 = self.runtime.connect_session(
+            client=client2, user_info=MagicMock()
+        )
+
+        with patch_config_options({"global.minCachedMessageSize": 0}):
+            self.enqueue_forward_msg(session_id1, create_dataframe_msg([1, 2, 3]))
+            self.enqueue_forward_msg(session_id2, create_dataframe_msg([1, 2, 3]))
+            await self.tick_runtime_loop()
+
+        self.assertEqual(1, len(client1.payloads))
+        self.assertEqual(1, len(client2.payloads))
+        self.assertIs(client1.payloads[0], client2.payloads[0])
+
     async def test_forwardmsg_cacheable_flag(self):
         """Test that the metadata.cacheable flag is set properly on outgoing
         ForwardMsgs."""
@@ -698,6 +849,80 @@ class RuntimeTest(RuntimeTestCase):
         self.assertIsInstance(self.runtime._get_async_objs(), AsyncObjects)
 
 
+class CachePrewarmTest(RuntimeTestCase):
+    """Tests for Runtime.prewarm_caches"""
+
+    async def test_prewarm_caches(self):
+        """The script is run, and then the registered functions are called."""
+        await self.runtime.start()
+
+        with (
+            patch.object(
+                self.runtime,
+                "does_script_run_without_error",
+                return_value=(True, "ok"),
+            ) as does_script_run_without_error,
+            patch(
+                "streamlit.runtime.runtime.prewarm_cached_functions", return_value=0
+            ) as prewarm_cached_functions,
+        ):
+            self.assertTrue(await self.runtime.prewarm_caches())
+            # Prewarming only runs once.
+            self.assertTrue(await self.runtime.prewarm_caches())
+
+        does_script_run_without_error.assert_called_once_with(timeout=ANY)
+        prewarm_cached_functions.assert_called_once()
+
+    async def test_prewarm_caches_failure(self):
+        await self.runtime.start()
+
+        with (
+            patch.object(
+                self.runtime,
+                "does_script_run_without_error",
+                return_value=(True, "ok"),
+            ),
+            patch("streamlit.runtime.runtime.prewarm_cached_functions", return_value=1),
+        ):
+            self.assertFalse(await self.runtime.prewarm_caches())
+
+    async def test_not_ready_while_prewarming(self):
+        """The runtime isn't ready for connections until prewarming completes."""
+        script_done = asyncio.Event()
+
+        async def does_script_run_without_error(timeout):
+            await script_done.wait()
+            return True, "ok"
+
+        with (
+            patch_config_options({"server.cachePrewarm": True}),
+            patch.object(
+                self.runtime,
+                "does_script_run_without_error",
+                side_effect=does_script_run_without_error,
+            ),
+            patch("streamlit.runtime.runtime.prewarm_cached_functions", return_value=0),
+        ):
+            await self.runtime.start()
+            self.assertEqual(
+                (False, "warming caches"),
+                await self.runtime.is_ready_for_browser_connection,
+            )
+
+            script_done.set()
+            await self.runtime.prewarm_caches()
+
+        self.assertEqual(
+            (True, "ok"), await self.runtime.is_ready_for_browser_connection
+        )
+
+    async def test_ready_without_prewarming(self):
+        await self.runtime.start()
+        self.assertEqual(
+            (True, "ok"), await self.runtime.is_ready_for_browser_connection
+        )
+
+
 class ScriptCheckTest(RuntimeTestCase):
     """Tests for Runtime.does_script_run_without_error"""
 
@@ -20,6 +20,7 @@ import unittest
 
 from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
 from streamlit.runtime import runtime_util
+from streamlit.runtime.forward_msg_cache import serialize_forward_msg_payload
 from streamlit.runtime.runtime_util import is_cacheable_msg, serialize_forward_msg
 from tests.streamlit.message_mocks import create_dataframe_msg
 from tests.testutil import patch_config_options
@@ -34,6 +35,33 @@ class RuntimeUtilTest(unittest.TestCase):
         with patch_config_options({"global.minCachedMessageSize": 1000}):
             self.assertFalse(is_cacheable_msg(create_dataframe_msg([1, 2, 3])))
 
+    def test_should_cache_msg_with_payload(self):
+        """Test that is_cacheable_msg uses the payload length if given."""
+        msg = create_dataframe_msg([1, 2, 3])
+        payload = serialize_forward_msg_payload(msg)
+
+        with patch_config_options({"global.minCachedMessageSize": len(payload)}):
+            self.assertTrue(is_cacheable_msg(msg, payload))
+
+        with patch_config_options({"global.minCachedMessageSize": len(payload) + 1}):
+            self.assertFalse(is_cacheable_msg(msg, payload))
+
+    def test_serialize_forward_msg_with_payload(self):
+        """Test that serializing a message with a pre-serialized payload
+        produces the same message as serializing it from scratch."""
+        msg = create_dataframe_msg([1, 2, 3], 5)
+        msg.metadata.cacheable = True
+        payload = serialize_forward_msg_payload(msg)
+
+        expected = ForwardMsg()
+        expected.ParseFromString(serialize_forward_msg(msg))
+
+        deserialized_msg = ForwardMsg()
+        deserialized_msg.ParseFromString(serialize_forward_msg(msg, payload))
+
+        self.assertNotEqual("", deserialized_msg.hash)
+        self.assertEqual(expected, deserialized_msg)
+
     def test_should_limit_msg_size(self):
         max_message_size_mb = 50
 
@@ -0,0 +1,197 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2025)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Unit tests for script_run_profile.py"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+import unittest
+from unittest.mock import patch
+
+from testfixtures import TempDirectory
+
+import streamlit as st
+from streamlit.proto.WidgetStates_pb2 import WidgetState as WidgetStateProto
+from streamlit.runtime import script_run_profile
+from streamlit.runtime.script_run_profile import ScriptRunProfile
+from streamlit.runtime.state.common import WidgetMetadata
+from streamlit.runtime.state.session_state import WStates
+from tests.delta_generator_test_case import DeltaGeneratorTestCase
+from tests.testutil import patch_config_options
+
+
+class ScriptRunProfileTest(unittest.TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.profile = ScriptRunProfile("session", "page_hash", ["fragment"])
+
+    def tearDown(self) -> None:
+        super().tearDown()
+        script_run_profile.clear_profiles()
+
+    def test_nested_commands_only_in_trace(self):
+        """Only the outermost commands are listed in the summary, nested
+        commands are part of the trace.
+        """
+        outer_start = time.perf_counter()
+        self.profile.enter_command("outer")
+        inner_start = time.perf_counter()
+        self.profile.enter_command("inner")
+        self.profile.exit_command(inner_start)
+        self.profile.exit_command(outer_start)
+        self.profile.finish(prep_duration=0.5)
+
+        summary = self.profile.to_dict()
+        self.assertEqual(["outer"], [c["name"] for c in summary["commands"]])
+        self.assertEqual(0.5, summary["prepDuration"])
+        self.assertEqual(["fragment"], summary["fragmentIds"])
+
+        trace_events = self.profile.to_trace_events(pid=1, tid=2)
+        self.assertEqual(
+            ["script_run", "inner", "outer"], [e["name"] for e in trace_events]
+        )
+        self.assertEqual({"X"}, {e["ph"] for e in trace_events})
+
+    def test_caches_are_aggregated(self):
+        def func():
+            pass
+
+        start = time.perf_counter()
+        self.profile.record_cache_access(func, hit=False, start=start)
+        self.profile.record_cache_access(func, hit=True, start=start)
+        self.profile.record_cache_access(func, hit=True, start=start)
+
+        caches = self.profile.to_dict()["caches"]
+        self.assertEqual([f"{__name__}.{func.__qualname__}"], list(caches))
+        cache = next(iter(caches.values()))
+        self.assertEqual(2, cache["hits"])
+        self.assertEqual(1, cache["misses"])
+        self.assertGreaterEqual(cache["missDuration"], 0)
+
+    @patch("streamlit.runtime.script_run_profile._MAX_EVENTS_PER_PROFILE", 2)
+    def test_events_are_bounded(self):
+        for _ in range(5):
+            self.profile.record_widget_deserialization("widget", time.perf_counter())
+
+        summary = self.profile.to_dict()
+        self.assertEqual(2, summary["widgetDeserialization"]["count"])
+        self.assertEqual(3, summary["numDroppedEvents"])
+
+    def test_start_profile_if_enabled(self):
+        self.assertIsNone(script_run_profile.start_profile("session", "page_hash"))
+
+        with patch_config_options({"runner.profileScriptRuns": True}):
+            profile = script_run_profile.start_profile("session", "page_hash")
+        self.assertIsInstance(profile, ScriptRunProfile)
+
+    def test_finished_profiles_are_kept(self):
+        other_profile = ScriptRunProfile("other_session", "page_hash")
+        script_run_profile.finish_profile(self.profile, prep_duration=0)
+        script_run_profile.finish_profile(other_profile, prep_duration=0)
+
+        self.assertEqual(
+            [self.profile, other_profile], script_run_profile.get_recent_profiles()
+        )
+        self.assertEqual(
+            [other_profile], script_run_profile.get_recent_profiles("other_session")
+        )
+
+        trace = script_run_profile.to_chrome_trace([self.profile, other_profile])
+        thread_names = [
+            e["args"]["name"] for e in trace["traceEvents"] if e["ph"] == "M"
+        ]
+        self.assertEqual(["Session session", "Session other_session"], thread_names)
+
+    def test_write_trace_file(self):
+        with (
+            TempDirectory(create=True) as tempdir,
+            patch_config_options({"runner.profileTraceDir": tempdir.path}),
+        ):
+            script_run_profile.finish_profile(self.profile, prep_duration=0)
+
+            filenames = os.listdir(tempdir.path)
+            self.assertEqual(1, len(filenames))
+            self.assertTrue(filenames[0].endswith("-session.trace.json"))
+            with open(os.path.join(tempdir.path, filenames[0])) as f:
+                trace = json.load(f)
+            self.assertEqual("script_run", trace["traceEvents"][1]["name"])
+
+
+class ScriptRunProfileIntegrationTest(DeltaGeneratorTestCase):
+    """Events are recorded by commands, cached functions, enqueued deltas
+    and widget deserialization while the script run is profiled.
+    """
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.profile = ScriptRunProfile("session", "page_hash")
+        self.script_run_ctx.profile = self.profile
+
+    def tearDown(self) -> None:
+        st.cache_data.clear()
+        super().tearDown()
+
+    def test_records_commands_and_deltas(self):
+        st.markdown("hello")
+        st.text("world")
+
+        summary = self.profile.to_dict()
+        self.assertEqual(["markdown", "text"], [c["name"] for c in summary["commands"]])
+        self.assertEqual(
+            [("markdown", "markdown"), ("text", "text")],
+            [(d["command"], d["type"]) for d in summary["deltas"]],
+        )
+        self.assertEqual(
+            sum(msg.ByteSize() for msg in self.forward_msg_queue._queue),
+            summary["deltaBytes"],
+        )
+
+    def test_records_cache_hits_and_misses(self):
+        @st.cache_data
+        def cached_func():
+            return 42
+
+        cached_func()
+        cached_func()
+
+        cache = next(iter(self.profile.to_dict()["caches"].values()))
+        self.assertEqual(1, cache["hits"])
+        self.assertEqual(1, cache["misses"])
+
+    def test_records_widget_deserialization(self):
+        wstates = WStates()
+        widget_state = WidgetStateProto()
+        widget_state.id = "widget_id"
+        widget_state.int_value = 5
+        wstates.set_widget_from_proto(widget_state)
+        wstates.set_widget_metadata(
+            WidgetMetadata(
+                id="widget_id",
+                deserializer=lambda x, s: str(x),
+                serializer=lambda x: int(x),
+                value_type="int_value",
+            )
+        )
+
+        self.assertEqual("5", wstates["widget_id"])
+        self.assertEqual(1, self.profile.to_dict()["widgetDeserialization"]["count"])
+
+    def test_nothing_recorded_without_profile(self):
+        self.script_run_ctx.profile = None
+        st.markdown("hello")
+
+        self.assertEqual([], self.profile.events)
@@ -13,12 +13,16 @@
 # limitations under the License.
 
 import os.path
+import threading
 import unittest
 from unittest import mock
 from unittest.mock import Mock
 
+from testfixtures import TempDirectory
+
 from streamlit import source_util
 from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+from tests.testutil import patch_config_options
 
 
 def _get_script_path(name: str) -> str:
@@ -70,3 +74,111 @@ class ScriptCacheTest(unittest.TestCase):
         cache = ScriptCache()
         with self.assertRaises(SyntaxError):
             cache.get_bytecode(_get_script_path("compile_error.py.txt"))
+
+    @mock.patch("streamlit.runtime.scriptrunner.script_cache.magic.add_magic")
+    def test_compiles_script_once_per_path(self, mock_add_magic: Mock):
+        """Concurrent `get_bytecode` calls for the same script compile it once."""
+        compile_started = threading.Event()
+        release_compile = threading.Event()
+
+        def add_magic(code: str, script_path: str):
+            compile_started.set()
+            release_compile.wait(timeout=5)
+            return code
+
+        mock_add_magic.side_effect = add_magic
+        cache = ScriptCache()
+        script_path = _get_script_path("good_script.py")
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(cache.get_bytecode(script_path))
+            )
+            for _ in range(3)
+        ]
+        for thread in threads:
+            thread.start()
+        compile_started.wait(timeout=5)
+        release_compile.set()
+        for thread in threads:
+            thread.join()
+
+        mock_add_magic.assert_called_once()
+        self.assertEqual(3, len(results))
+        self.assertTrue(all(result is results[0] for result in results))
+
+
+class PersistedBytecodeTest(unittest.TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.tempdir = TempDirectory(create=True)
+        self.cache_dir = os.path.join(self.tempdir.path, "bytecode")
+        self.script_path = os.path.join(self.tempdir.path, "script.py")
+        self._write_script("x = 1\n")
+
+    def tearDown(self) -> None:
+        super().tearDown()
+        self.tempdir.cleanup()
+
+    def _write_script(self, source: str) -> None:
+        with open(self.script_path, "w") as f:
+            f.write(source)
+
+    def _exec(self, cache: ScriptCache) -> dict:
+        namespace: dict = {}
+        exec(cache.get_bytecode(self.script_path), namespace)
+        return namespace
+
+    def test_bytecode_is_reused_across_caches(self):
+        """A new cache reads persisted bytecode instead of compiling the script."""
+        with patch_config_options({"runner.bytecodeCacheDir": self.cache_dir}):
+            self.assertEqual(1, self._exec(ScriptCache())["x"])
+            self.assertEqual(1, len(os.listdir(self.cache_dir)))
+
+            with mock.patch(
+                "streamlit.runtime.scriptrunner.script_cache.magic.add_magic"
+            ) as mock_add_magic:
+                self.assertEqual(1, self._exec(ScriptCache())["x"])
+                mock_add_magic.assert_not_called()
+
+    def test_changed_script_is_compiled_again(self):
+        """Persisted bytecode of an outdated script version isn't used."""
+        with patch_config_options({"runner.bytecodeCacheDir": self.cache_dir}):
+            self._exec(ScriptCache())
+
+            self._write_script("x = 22\n")
+            self.assertEqual(22, self._exec(ScriptCache())["x"])
+
+            # The outdated bytecode was overwritten.
+            self.assertEqual(1, len(os.listdir(self.cache_dir)))
+            with mock.patch(
+                "streamlit.runtime.scriptrunner.script_cache.magic.add_magic"
+            ) as mock_add_magic:
+                self.assertEqual(22, self._exec(ScriptCache())["x"])
+                mock_add_magic.assert_not_called()
+
+    def test_magic_options_are_part_of_the_key(self):
+        """Bytecode compiled with different magic options isn't shared."""
+        with patch_config_options({"runner.bytecodeCacheDir": self.cache_dir}):
+            self._exec(ScriptCache())
+        with patch_config_options(
+            {"runner.bytecodeCacheDir": self.cache_dir, "runner.magicEnabled": False}
+        ):
+            self._exec(ScriptCache())
+
+        self.assertEqual(2, len(os.listdir(self.cache_dir)))
+
+    def test_corrupt_bytecode_is_ignored(self):
+        """Unreadable persisted bytecode falls back to compiling the script."""
+        with patch_config_options({"runner.bytecodeCacheDir": self.cache_dir}):
+            self._exec(ScriptCache())
+            (filename,) = os.listdir(self.cache_dir)
+            with open(os.path.join(self.cache_dir, filename), "wb") as f:
+                f.write(b"not bytecode")
+
+            self.assertEqual(1, self._exec(ScriptCache())["x"])
+
+    def test_disabled_by_default(self):
+        """Without the config option, nothing is written to disk."""
+        self._exec(ScriptCache())
+        self.assertFalse(os.path.exists(self.cache_dir))
@@ -30,7 +30,7 @@ from streamlit.delta_generator import DeltaGenerator
 from streamlit.delta_generator_singletons import context_dg_stack
 from streamlit.elements.exception import _GENERIC_UNCAUGHT_EXCEPTION_TEXT
 from streamlit.proto.WidgetStates_pb2 import WidgetState, WidgetStates
-from streamlit.runtime import Runtime
+from streamlit.runtime import Runtime, script_run_profile
 from streamlit.runtime.forward_msg_queue import ForwardMsgQueue
 from streamlit.runtime.fragment import MemoryFragmentStorage, _fragment
 from streamlit.runtime.media_file_manager import MediaFileManager
@@ -600,6 +600,22 @@ class ScriptRunnerTest(AsyncTestCase):
             assert call_kwargs["prep_time"] > 0
             assert call_kwargs["uncaught_exception"] == "AttributeError"
 
+    def test_script_run_gets_profiled(self):
+        """Tests that script runs are profiled if enabled."""
+        self.addCleanup(script_run_profile.clear_profiles)
+        with testutil.patch_config_options({"runner.profileScriptRuns": True}):
+            scriptrunner = TestScriptRunner("good_script.py")
+            scriptrunner.request_rerun(RerunData())
+            scriptrunner.start()
+            scriptrunner.join()
+
+        profiles = script_run_profile.get_recent_profiles()
+        self.assertEqual(1, len(profiles))
+        summary = profiles[0].to_dict()
+        self.assertEqual(["text"], [c["name"] for c in summary["commands"]])
+        self.assertEqual(1, len(summary["deltas"]))
+        self.assertGreater(summary["duration"], 0)
+
     @parameterized.expand([(True,), (False,)])
     def test_runtime_error(self, show_error_details: bool):
         """Tests that we correctly handle scripts with runtime errors."""
@@ -157,6 +157,25 @@ class ScriptRunContextTest(unittest.TestCase):
         except StreamlitAPIException:
             self.fail("set_page_config should have succeeded after reset!")
 
+    def test_hash_memo_reset(self):
+        """The memoized argument hashes are forgotten after a rerun."""
+        ctx = ScriptRunContext(
+            session_id="TestSessionID",
+            _enqueue=lambda msg: None,
+            query_string="",
+            session_state=SafeSessionState(SessionState(), lambda: None),
+            uploaded_file_mgr=MemoryUploadedFileManager("/mock/upload"),
+            main_script_path="",
+            user_info={"email": "test@example.com"},
+            fragment_storage=MemoryFragmentStorage(),
+            pages_manager=PagesManager(""),
+        )
+        ctx.hash_memo["key"] = "value"
+
+        ctx.reset()
+
+        self.assertEqual({}, ctx.hash_memo)
+
     def test_active_script_hash(self):
         """ensures active script hash is set correctly when enqueueing messages"""
 
@@ -20,10 +20,12 @@ from dataclasses import dataclass
 from typing import get_args
 from unittest.mock import ANY, MagicMock, call, patch
 
+import pytest
 from parameterized import parameterized
 
 import streamlit as st
 from streamlit import errors
+from streamlit.elements.lib import utils
 from streamlit.elements.lib.utils import (
     _compute_element_id,
     compute_and_register_element_id,
@@ -602,6 +604,85 @@ class ComputeElementIdTests(DeltaGeneratorTestCase):
         with self.assertRaises(errors.DuplicateWidgetID):
             st.data_editor(data=[], disabled=True)
 
+    def test_compute_element_id_is_stable(self):
+        kwargs = {"label": "label", "options": ["a", "b"], "index": 0, "help": None}
+        self.assertEqual(
+            _compute_element_id("selectbox", "key", **kwargs),
+            _compute_element_id("selectbox", "key", **dict(kwargs)),
+        )
+
+    def test_compute_element_id_memoizes_short_inputs(self):
+        """Digests of short inputs are memoized, and the memo is bounded."""
+        with (
+            patch.dict(utils._element_id_digests, clear=True),
+            patch.object(utils, "_MAX_MEMOIZED_ELEMENT_IDS", 2),
+        ):
+            element_id = _compute_element_id("checkbox", None, label="a")
+            self.assertEqual(1, len(utils._element_id_digests))
+            self.assertEqual(
+                element_id, _compute_element_id("checkbox", None, label="a")
+            )
+
+            _compute_element_id("checkbox", None, label="a" * 1000)
+            self.assertEqual(1, len(utils._element_id_digests))
+
+            _compute_element_id("checkbox", None, label="b")
+            _compute_element_id("checkbox", None, label="c")
+            self.assertEqual(1, len(utils._element_id_digests))
+
+    @parameterized.expand(
+        [
+            ("different_items", ["a", "b"], ["a", "c"]),
+            ("different_order", ["a", "b"], ["b", "a"]),
+            ("split_item", ["a\x00b"], ["a", "b"]),
+            ("moved_separator", ["a\x00", "b"], ["a", "\x00b"]),
+            ("empty_item", [""], []),
+            ("non_string_items", [1], ["1"]),
+            ("str_of_sequence", ("",), [1]),
+        ]
+    )
+    def test_compute_element_id_distinguishes_sequences(self, _, options1, options2):
+        self.assertNotEqual(
+            _compute_element_id("selectbox", None, options=options1),
+            _compute_element_id("selectbox", None, options=options2),
+        )
+
+    @pytest.mark.usefixtures("benchmark")
+    def test_compute_element_id_performance(self):
+        """Benchmark the element IDs of a widget-heavy app: a grid of
+        checkboxes and a few selectboxes with many options.
+        """
+        checkbox_kwargs = [
+            {
+                "form_id": "form",
+                "label": f"Row {i}",
+                "value": False,
+                "help": None,
+                "active_script_hash": "hash",
+            }
+            for i in range(1000)
+        ]
+        options = [f"Option {i}" for i in range(1000)]
+        selectbox_kwargs = [
+            {
+                "label": f"Select {i}",
+                "options": options,
+                "index": 0,
+                "help": None,
+                "placeholder": "Choose an option",
+                "active_script_hash": "hash",
+            }
+            for i in range(10)
+        ]
+
+        def compute_element_ids():
+            for kwargs in checkbox_kwargs:
+                _compute_element_id("checkbox", None, **kwargs)
+            for kwargs in selectbox_kwargs:
+                _compute_element_id("selectbox", None, **kwargs)
+
+        self.benchmark(compute_element_ids)
+
 
 class RegisterWidgetsTest(DeltaGeneratorTestCase):
     @parameterized.expand(WIDGET_ELEMENTS)
@@ -14,11 +14,16 @@
 
 from __future__ import annotations
 
+import threading
 import unittest
+from unittest.mock import patch
 
 from streamlit.runtime.stats import (
+    CacheCounter,
+    CacheCountersProvider,
     CacheStat,
     CacheStatsProvider,
+    SampledStatsProvider,
     StatsManager,
     group_stats,
 )
@@ -32,6 +37,17 @@ class MockStatsProvider(CacheStatsProvider):
         return self.stats
 
 
+class MockCountersProvider(CacheStatsProvider, CacheCountersProvider):
+    def __init__(self):
+        self.counters: list[CacheCounter] = []
+
+    def get_stats(self) -> list[CacheStat]:
+        return []
+
+    def get_counters(self) -> list[CacheCounter]:
+        return self.counters
+
+
 class StatsManagerTest(unittest.TestCase):
     def test_get_stats(self):
         """StatsManager.get_stats should return all providers' stats."""
@@ -57,6 +73,23 @@ class StatsManagerTest(unittest.TestCase):
 
         self.assertEqual(provider1.stats + provider2.stats, manager.get_stats())
 
+    def test_get_counters(self):
+        """StatsManager.get_counters should return the counters of all
+        providers that implement CacheCountersProvider."""
+        manager = StatsManager()
+        stats_provider = MockStatsProvider()
+        counters_provider = MockCountersProvider()
+        manager.register_provider(stats_provider)
+        manager.register_provider(counters_provider)
+
+        self.assertEqual([], manager.get_counters())
+
+        counters_provider.counters = [
+            CacheCounter("provider", "foo", "hits", 1),
+            CacheCounter("provider", "foo", "misses", 2),
+        ]
+        self.assertEqual(counters_provider.counters, manager.get_counters())
+
     def test_group_stats(self):
         """Should return stats grouped by category_name and cache_name.
         byte_length should be summed."""
@@ -108,3 +141,57 @@ class StatsManagerTest(unittest.TestCase):
                 CacheStat("provider3", "boo", 7),
             },
         )
+
+
+class SampledStatsProviderTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.provider = MockStatsProvider()
+        self.provider.stats = [CacheStat("provider", "foo", 1)]
+        self.sampled = SampledStatsProvider(self.provider, max_age_seconds=10)
+
+    @patch("streamlit.runtime.stats.time.monotonic", return_value=100)
+    def test_returns_cached_stats(self, _):
+        """Stats are computed on the first request, and then cached."""
+        self.assertEqual([CacheStat("provider", "foo", 1)], self.sampled.get_stats())
+
+        self.provider.stats = [CacheStat("provider", "foo", 2)]
+        self.assertEqual([CacheStat("provider", "foo", 1)], self.sampled.get_stats())
+
+    def test_refreshes_stale_stats_in_background(self):
+        """Stale stats are returned while they're recomputed on a thread."""
+        with patch("streamlit.runtime.stats.time.monotonic", return_value=100):
+            self.sampled.get_stats()
+
+        refreshed = threading.Event()
+        original_refresh = self.sampled._refresh
+
+        def refresh():
+            original_refresh()
+            refreshed.set()
+
+        self.provider.stats = [CacheStat("provider", "foo", 2)]
+        with (
+            patch.object(self.sampled, "_refresh", refresh),
+            patch("streamlit.runtime.stats.time.monotonic", return_value=111),
+        ):
+            self.assertEqual(
+                [CacheStat("provider", "foo", 1)], self.sampled.get_stats()
+            )
+            self.assertTrue(refreshed.wait(timeout=5))
+            self.assertEqual(
+                [CacheStat("provider", "foo", 2)], self.sampled.get_stats()
+            )
+
+    def test_failed_refresh_keeps_stats(self):
+        with patch("streamlit.runtime.stats.time.monotonic", return_value=100):
+            self.sampled.get_stats()
+
+        self.provider.get_stats = lambda: 1 / 0
+        with self.assertLogs("streamlit.runtime.stats", level="WARNING"):
+            self.sampled._refresh()
+
+        self.assertFalse(self.sampled._refreshing)
+        with patch("streamlit.runtime.stats.time.monotonic", return_value=100):
+            self.assertEqual(
+                [CacheStat("provider", "foo", 1)], self.sampled.get_stats()
+            )
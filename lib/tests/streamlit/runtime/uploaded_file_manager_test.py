@@ -110,6 +110,19 @@ class UploadedFileManagerTest(unittest.TestCase):
         ]
         self.assertEqual(expected, self.mgr.get_stats())
 
+        # The stats are kept up to date when files are replaced and removed
+        self.mgr.add_file("session1", FILE_1)
+        self.mgr.add_file("session2", FILE_1)
+        self.mgr.remove_file("session1", FILE_2.file_id)
+        self.assertEqual(
+            [CacheStat("UploadedFileManager", "", 2 * len(FILE_1.data))],
+            self.mgr.get_stats(),
+        )
+
+        self.mgr.remove_session_files("session1")
+        self.mgr.remove_session_files("session2")
+        self.assertEqual([], self.mgr.get_stats())
+
 
 class UploadedFileManagerThreadingTest(unittest.TestCase):
     # The number of threads to run our tests on
@@ -17,7 +17,9 @@
 from __future__ import annotations
 
 import unittest
+from unittest.mock import patch
 
+from streamlit import file_util
 from streamlit.watcher.folder_black_list import FolderBlackList
 
 
@@ -54,3 +56,21 @@ class FileIsInFolderTest(unittest.TestCase):
 
         self.assertFalse(is_blacklisted("/foo/not_blacklisted/script.py"))
         self.assertFalse(is_blacklisted("/foo/not_blacklisted/.hidden_script.py"))
+
+    def test_memoizes_per_directory(self):
+        """Files in the same directory share the blacklist decision."""
+        folder_black_list = FolderBlackList([])
+
+        with patch(
+            "streamlit.watcher.folder_black_list.file_util.file_is_in_folder_glob",
+            wraps=file_util.file_is_in_folder_glob,
+        ) as file_is_in_folder_glob:
+            self.assertTrue(folder_black_list.is_blacklisted("/foo/venv/a.py"))
+            calls = file_is_in_folder_glob.call_count
+            self.assertTrue(folder_black_list.is_blacklisted("/foo/venv/b.py"))
+            self.assertFalse(folder_black_list.is_blacklisted("/foo/bar/c.py"))
+            self.assertGreater(file_is_in_folder_glob.call_count, calls)
+
+            calls = file_is_in_folder_glob.call_count
+            self.assertFalse(folder_black_list.is_blacklisted("/foo/bar/d.py"))
+            self.assertEqual(calls, file_is_in_folder_glob.call_count)
@@ -321,6 +321,104 @@ class LocalSourcesWatcherTest(unittest.TestCase):
         lsw.update_watched_modules()
         register.assert_not_called()
 
+    @patch("streamlit.watcher.local_sources_watcher.PathWatcher")
+    def test_only_new_modules_are_examined(self, _fob):
+        lsw = local_sources_watcher.LocalSourcesWatcher(PagesManager(SCRIPT_PATH))
+        lsw.update_watched_modules()
+
+        with patch(
+            "streamlit.watcher.local_sources_watcher.get_module_paths",
+            wraps=local_sources_watcher.get_module_paths,
+        ) as get_module_paths:
+            sys.modules["DUMMY_MODULE_1"] = DUMMY_MODULE_1
+            lsw.update_watched_modules()
+            get_module_paths.assert_called_once_with(DUMMY_MODULE_1)
+            self.assertIn(DUMMY_MODULE_1_FILE, lsw._watched_modules)
+
+            # A module that was unloaded is examined again once it's
+            # re-imported.
+            get_module_paths.reset_mock()
+            del sys.modules["DUMMY_MODULE_1"]
+            lsw.update_watched_modules()
+            get_module_paths.assert_not_called()
+
+            sys.modules["DUMMY_MODULE_1"] = DUMMY_MODULE_1
+            lsw.update_watched_modules()
+            get_module_paths.assert_called_once_with(DUMMY_MODULE_1)
+
+    @patch.dict(sys.modules)
+    @patch("streamlit.watcher.local_sources_watcher.PathWatcher")
+    def test_page_dependencies(self, _fob):
+        lsw = local_sources_watcher.LocalSourcesWatcher(PagesManager(SCRIPT_PATH))
+
+        # Pages that haven't run may depend on any module.
+        self.assertTrue(lsw.page_depends_on("page1", DUMMY_MODULE_1_FILE))
+
+        lsw.mark_run_started()
+        sys.modules["DUMMY_MODULE_1"] = DUMMY_MODULE_1
+        lsw.update_page_dependencies("page1")
+
+        # Simulate a change to DUMMY_MODULE_1, which unloads it.
+        lsw.on_file_changed(DUMMY_MODULE_1_FILE)
+        lsw.mark_run_started()
+        sys.modules["DUMMY_MODULE_2"] = DUMMY_MODULE_2
+        lsw.update_page_dependencies("page2")
+
+        self.assertTrue(lsw.page_depends_on("page1", DUMMY_MODULE_1_FILE))
+        self.assertFalse(lsw.page_depends_on("page1", DUMMY_MODULE_2_FILE))
+        self.assertFalse(lsw.page_depends_on("page2", DUMMY_MODULE_1_FILE))
+        self.assertTrue(lsw.page_depends_on("page2", DUMMY_MODULE_2_FILE))
+
+        # Files that aren't watched modules are always dependencies.
+        self.assertTrue(lsw.page_depends_on("page2", SCRIPT_PATH))
+
+        # Partial runs add to the dependencies of a page, full runs replace
+        # them.
+        sys.modules["DUMMY_MODULE_1"] = DUMMY_MODULE_1
+        lsw.update_page_dependencies("page2", full_run=False)
+        del sys.modules["DUMMY_MODULE_2"]
+        lsw.update_page_dependencies("page2", full_run=False)
+        self.assertTrue(lsw.page_depends_on("page2", DUMMY_MODULE_2_FILE))
+
+        lsw.mark_run_started()
+        lsw.update_page_dependencies("page2")
+        self.assertFalse(lsw.page_depends_on("page2", DUMMY_MODULE_2_FILE))
+
+    @patch.dict(sys.modules)
+    @patch("streamlit.watcher.local_sources_watcher.PathWatcher")
+    def test_page_dependencies_kept_if_modules_unloaded_during_run(self, _fob):
+        """Full runs add to the dependencies of a page if any session unloaded
+        the watched modules during the run.
+        """
+        lsw = local_sources_watcher.LocalSourcesWatcher(PagesManager(SCRIPT_PATH))
+        other_lsw = local_sources_watcher.LocalSourcesWatcher(PagesManager(SCRIPT_PATH))
+
+        lsw.mark_run_started()
+        sys.modules["DUMMY_MODULE_1"] = DUMMY_MODULE_1
+        lsw.update_page_dependencies("page")
+
+        lsw.mark_run_started()
+        other_lsw.update_watched_modules()
+        # Another session unloads the modules during the run of this page,
+        # after the page imported DUMMY_MODULE_1.
+        other_lsw.on_file_changed(DUMMY_MODULE_1_FILE)
+        lsw.update_page_dependencies("page")
+
+        self.assertNotIn("DUMMY_MODULE_1", sys.modules)
+        self.assertTrue(lsw.page_depends_on("page", DUMMY_MODULE_1_FILE))
+
+    @patch("streamlit.watcher.local_sources_watcher.PathWatcher")
+    def test_watchable_dirs_are_memoized(self, _fob):
+        lsw = local_sources_watcher.LocalSourcesWatcher(PagesManager(SCRIPT_PATH))
+
+        with patch(
+            "streamlit.watcher.local_sources_watcher.file_util.file_is_in_folder_glob",
+            return_value=True,
+        ) as file_is_in_folder_glob:
+            self.assertTrue(lsw._file_should_be_watched("/foo/bar/a.py"))
+            self.assertTrue(lsw._file_should_be_watched("/foo/bar/b.py"))
+            file_is_in_folder_glob.assert_called_once()
+
     @patch(
         "streamlit.runtime.pages_manager.PagesManager.get_pages",
         MagicMock(
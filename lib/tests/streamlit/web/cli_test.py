@@ -24,7 +24,7 @@ import tempfile
 import unittest
 from pathlib import Path
 from unittest import mock
-from unittest.mock import MagicMock, patch
+from unittest.mock import ANY, MagicMock, patch
 
 import pytest
 import requests
@@ -446,6 +446,35 @@ class CliTest(unittest.TestCase):
         clear_resource_caches.assert_called_once()
         clear_data_caches.assert_called_once()
 
+    def test_cache_warm(self):
+        """cli.cache_warm should prewarm the caches of the given script"""
+        with (
+            patch("os.path.exists", return_value=True),
+            patch(
+                "streamlit.web.bootstrap.prewarm_caches", return_value=True
+            ) as prewarm_caches,
+        ):
+            result = self.runner.invoke(cli, ["cache", "warm", "app.py", "arg1"])
+
+        prewarm_caches.assert_called_once_with("app.py", ["arg1"], ANY)
+        self.assertEqual(0, result.exit_code)
+
+    def test_cache_warm_failure(self):
+        """cli.cache_warm should exit with an error if prewarming failed"""
+        with (
+            patch("os.path.exists", return_value=True),
+            patch("streamlit.web.bootstrap.prewarm_caches", return_value=False),
+        ):
+            result = self.runner.invoke(cli, ["cache", "warm", "app.py"])
+
+        self.assertEqual(1, result.exit_code)
+
+    def test_cache_warm_missing_file(self):
+        result = self.runner.invoke(cli, ["cache", "warm", "missing.py"])
+
+        self.assertNotEqual(0, result.exit_code)
+        self.assertIn("File does not exist", result.output)
+
     def test_activate_command(self):
         """Tests activating a credential"""
         mock_credential = MagicMock()
@@ -24,7 +24,9 @@ import tornado.websocket
 from streamlit.proto.BackMsg_pb2 import BackMsg
 from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
 from streamlit.runtime import Runtime, SessionClientDisconnectedError
+from streamlit.runtime.forward_msg_cache import serialize_forward_msg_payload
 from streamlit.web.server.server import BrowserWebSocketHandler
+from tests.streamlit.message_mocks import create_dataframe_msg
 from tests.streamlit.web.server.server_test_case import ServerTestCase
 from tests.testutil import patch_config_options
 
@@ -100,6 +102,61 @@ class BrowserWebSocketHandlerTest(ServerTestCase):
 
                 write_message_mock.assert_called_once()
 
+    @tornado.testing.gen_test
+    async def test_write_serialized_forward_msg(self):
+        """Messages with small and large serialized payloads are received
+        unchanged.
+        """
+        with (
+            self._patch_app_session(),
+            patch_config_options({"server.enableWebsocketCompression": False}),
+        ):
+            await self.server.start()
+            ws_client = await self.ws_connect(compression_options={})
+            self.assertNotIn("Sec-WebSocket-Extensions", ws_client.headers)
+
+            await self._check_write_serialized_forward_msg(ws_client)
+
+    @tornado.testing.gen_test
+    async def test_write_serialized_forward_msg_with_compression(self):
+        """Messages with small and large serialized payloads are received
+        unchanged over a compressed connection.
+        """
+        with (
+            self._patch_app_session(),
+            patch_config_options({"server.enableWebsocketCompression": True}),
+        ):
+            await self.server.start()
+            ws_client = await self.ws_connect(compression_options={})
+            self.assertIn(
+                "permessage-deflate", ws_client.headers["Sec-WebSocket-Extensions"]
+            )
+
+            await self._check_write_serialized_forward_msg(ws_client)
+
+    async def _check_write_serialized_forward_msg(self, ws_client):
+        session_info = self.server._runtime._session_mgr.list_active_sessions()[0]
+        websocket_handler = session_info.client
+
+        for body in ("small", "X" * 100_000):
+            msg = create_dataframe_msg([1, 2, 3])
+            msg.delta.new_element.markdown.body = body
+            msg.metadata.cacheable = True
+            payload = serialize_forward_msg_payload(msg)
+
+            with patch.object(
+                websocket_handler,
+                "write_message",
+                wraps=websocket_handler.write_message,
+            ) as write_message_mock:
+                websocket_handler.write_serialized_forward_msg(msg, payload)
+                write_message_mock.assert_called_once()
+
+            received = await self.read_forward_msg(ws_client)
+            self.assertEqual(msg.hash, received.hash)
+            self.assertTrue(received.metadata.cacheable)
+            self.assertEqual(body, received.delta.new_element.markdown.body)
+
     @tornado.testing.gen_test
     async def test_backmsg_deserialization_exception(self):
         """If BackMsg deserialization raises an Exception, we should call the Runtime's
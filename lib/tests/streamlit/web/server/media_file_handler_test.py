@@ -14,6 +14,7 @@
 
 from __future__ import annotations
 
+import os
 from typing import Final
 from unittest import mock
 from unittest.mock import MagicMock
@@ -22,6 +23,9 @@ import tornado.testing
 import tornado.web
 from parameterized import parameterized
 
+from streamlit.runtime.disk_spilling_media_file_storage import (
+    DiskSpillingMediaFileStorage,
+)
 from streamlit.runtime.media_file_manager import MediaFileManager
 from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
 from streamlit.web.server.media_file_handler import MediaFileHandler
@@ -107,3 +111,47 @@ class MediaFileHandlerTest(tornado.testing.AsyncHTTPTestCase):
         url = f"{MOCK_ENDPOINT}/invalid_media_file.mp4"
         rsp = self.fetch(url, method="GET")
         self.assertEqual(404, rsp.code)
+
+
+class DiskSpillingMediaFileHandlerTest(tornado.testing.AsyncHTTPTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        storage = DiskSpillingMediaFileStorage(MOCK_ENDPOINT, memory_budget=0)
+        self.media_file_manager = MediaFileManager(storage)
+        MediaFileHandler.initialize_storage(storage)
+
+    def get_app(self) -> tornado.web.Application:
+        return tornado.web.Application(
+            [(f"{MOCK_ENDPOINT}/(.*)", MediaFileHandler, {"path": ""})]
+        )
+
+    @mock.patch(
+        "streamlit.runtime.media_file_manager._get_session_id",
+        MagicMock(return_value="mock_session_id"),
+    )
+    def test_disk_file(self) -> None:
+        """Files on disk are served, including ranges."""
+        data = bytes(range(256)) * 1024
+        url = self.media_file_manager.add(data, "video/mp4", "mock_coords")
+
+        rsp = self.fetch(url, method="GET")
+        self.assertEqual(200, rsp.code)
+        self.assertEqual(data, rsp.body)
+        self.assertEqual(str(len(data)), rsp.headers["Content-Length"])
+
+        rsp = self.fetch(url, method="GET", headers={"Range": "bytes=10-19"})
+        self.assertEqual(206, rsp.code)
+        self.assertEqual(data[10:20], rsp.body)
+
+    @mock.patch(
+        "streamlit.runtime.media_file_manager._get_session_id",
+        MagicMock(return_value="mock_session_id"),
+    )
+    def test_missing_disk_file(self) -> None:
+        """A file that was removed from disk is not found."""
+        url = self.media_file_manager.add(b"mock_data", "video/mp4", "mock_coords")
+        file_id = url.split("/")[-1].split(".")[0]
+        os.remove(self.media_file_manager._storage.get_file(file_id).path)
+
+        rsp = self.fetch(url, method="GET")
+        self.assertEqual(404, rsp.code)
@@ -0,0 +1,97 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2025)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import json
+from unittest.mock import patch
+
+import tornado.testing
+import tornado.web
+
+from streamlit.runtime import script_run_profile
+from streamlit.runtime.script_run_profile import ScriptRunProfile
+from streamlit.web.server.profile_request_handler import (
+    ProfileRequestHandler,
+    _is_loopback_address,
+)
+from streamlit.web.server.server import PROFILE_ENDPOINT
+
+
+class ProfileRequestHandlerTest(tornado.testing.AsyncHTTPTestCase):
+    def get_app(self):
+        return tornado.web.Application(
+            [(rf"/{PROFILE_ENDPOINT}", ProfileRequestHandler)]
+        )
+
+    def setUp(self) -> None:
+        super().setUp()
+        for session_id in ("session1", "session2"):
+            script_run_profile.finish_profile(
+                ScriptRunProfile(session_id, "page_hash"), prep_duration=0
+            )
+
+    def tearDown(self) -> None:
+        script_run_profile.clear_profiles()
+        super().tearDown()
+
+    def test_json(self):
+        response = self.fetch("/_stcore/profile")
+        self.assertEqual(200, response.code)
+        self.assertEqual("application/json", response.headers["Content-Type"])
+
+        profiles = json.loads(response.body)["profiles"]
+        self.assertEqual(["session1", "session2"], [p["sessionId"] for p in profiles])
+
+    def test_session_id(self):
+        response = self.fetch("/_stcore/profile?session_id=session2")
+
+        profiles = json.loads(response.body)["profiles"]
+        self.assertEqual(["session2"], [p["sessionId"] for p in profiles])
+
+    def test_trace(self):
+        response = self.fetch("/_stcore/profile?format=trace")
+        self.assertEqual(200, response.code)
+
+        trace = json.loads(response.body)
+        self.assertEqual(
+            2, len([e for e in trace["traceEvents"] if e["name"] == "script_run"])
+        )
+
+    def test_unsupported_format(self):
+        response = self.fetch("/_stcore/profile?format=xml")
+        self.assertEqual(400, response.code)
+
+    def test_unsupported_format_is_not_reflected(self):
+        response = self.fetch(
+            "/_stcore/profile?format=%3Cscript%3Ealert(1)%3C/script%3E"
+        )
+        self.assertEqual(400, response.code)
+        self.assertEqual("text/plain", response.headers["Content-Type"])
+        self.assertNotIn(b"<script>", response.body)
+
+    @patch(
+        "streamlit.web.server.profile_request_handler._is_loopback_address",
+        return_value=False,
+    )
+    def test_remote_clients_are_forbidden(self, _):
+        response = self.fetch("/_stcore/profile")
+        self.assertEqual(403, response.code)
+
+    def test_is_loopback_address(self):
+        self.assertTrue(_is_loopback_address("127.0.0.1"))
+        self.assertTrue(_is_loopback_address("::1"))
+        self.assertFalse(_is_loopback_address("192.168.0.1"))
+        self.assertFalse(_is_loopback_address("invalid"))
+        self.assertFalse(_is_loopback_address(None))
@@ -20,11 +20,16 @@ import os
 import tempfile
 from unittest.mock import MagicMock
 
+import pyarrow as pa
 import tornado.httpserver
 import tornado.testing
 import tornado.web
 import tornado.websocket
 
+from streamlit.runtime.dataframe_source_manager import (
+    DATAFRAME_SOURCE_ENDPOINT,
+    DataframeSourceManager,
+)
 from streamlit.runtime.forward_msg_cache import ForwardMsgCache, populate_hash_if_needed
 from streamlit.runtime.runtime_util import serialize_forward_msg
 from streamlit.web.server import Server
@@ -35,6 +40,7 @@ from streamlit.web.server.server import (
     MESSAGE_ENDPOINT,
     NEW_HEALTH_ENDPOINT,
     AddSlashHandler,
+    DataframeSourceHandler,
     HealthHandler,
     HostConfigHandler,
     MessageCacheHandler,
@@ -128,6 +134,58 @@ class MessageCacheHandlerTest(tornado.testing.AsyncHTTPTestCase):
         self.assertEqual(404, self.fetch("/_stcore/message?id=non_existent").code)
 
 
+class DataframeSourceHandlerTest(tornado.testing.AsyncHTTPTestCase):
+    def get_app(self):
+        self._dataframe_source_mgr = DataframeSourceManager()
+        return tornado.web.Application(
+            [
+                (
+                    rf"{DATAFRAME_SOURCE_ENDPOINT}/([^/]+)",
+                    DataframeSourceHandler,
+                    dict(dataframe_source_mgr=self._dataframe_source_mgr),
+                )
+            ]
+        )
+
+    def test_dataframe_source(self):
+        table = pa.table({"a": [3, 1, 2, 5, 4], "b": ["x", "y", "x", "y", "x"]})
+        url = self._dataframe_source_mgr.add(table, "1.(2).3")
+
+        response = self.fetch(f"{url}?start=1&stop=3")
+        self.assertEqual(200, response.code)
+        self.assertEqual("5", response.headers["X-Streamlit-Row-Count"])
+        self.assertEqual(
+            [1, 2], pa.ipc.open_stream(response.body).read_all()["a"].to_pylist()
+        )
+
+        response = self.fetch(
+            f"{url}?sort=a&ascending=false&filter_column=b&filter_value=x"
+        )
+        self.assertEqual(200, response.code)
+        self.assertEqual("3", response.headers["X-Streamlit-Row-Count"])
+        self.assertEqual(
+            [4, 3, 2], pa.ipc.open_stream(response.body).read_all()["a"].to_pylist()
+        )
+
+    def test_invalid_requests(self):
+        url = self._dataframe_source_mgr.add(pa.table({"a": [1, 2]}), "1.(2).3")
+
+        self.assertEqual(404, self.fetch(f"{DATAFRAME_SOURCE_ENDPOINT}/unknown").code)
+        self.assertEqual(400, self.fetch(f"{url}?start=foo").code)
+        self.assertEqual(400, self.fetch(f"{url}?sort=unknown").code)
+
+    def test_invalid_request_is_not_reflected(self):
+        url = self._dataframe_source_mgr.add(pa.table({"a": [1, 2]}), "1.(2).3")
+
+        with self.assertLogs("streamlit.web.server.routes", level="WARNING") as logs:
+            response = self.fetch(f"{url}?sort=%3Cscript%3Ealert(1)%3C/script%3E")
+
+        self.assertEqual(400, response.code)
+        self.assertEqual("text/plain", response.headers["Content-Type"])
+        self.assertNotIn(b"<script>", response.body)
+        self.assertIn("<script>", logs.output[0])
+
+
 class StaticFileHandlerTest(tornado.testing.AsyncHTTPTestCase):
     def setUp(self) -> None:
         self._tmpdir = tempfile.TemporaryDirectory()
@@ -68,7 +68,9 @@ class ServerTestCase(tornado.testing.AsyncHTTPTestCase):
         parts[0] = "ws"
         return urllib.parse.urlunparse(tuple(parts))
 
-    async def ws_connect(self, existing_session_id=None) -> WebSocketClientConnection:
+    async def ws_connect(
+        self, existing_session_id=None, compression_options=None
+    ) -> WebSocketClientConnection:
         """Open a websocket connection to the server.
 
         Returns
@@ -86,6 +88,7 @@ class ServerTestCase(tornado.testing.AsyncHTTPTestCase):
         return await tornado.websocket.websocket_connect(
             self.get_ws_url("/_stcore/stream"),
             subprotocols=subprotocols,
+            compression_options=compression_options,
         )
 
     async def read_forward_msg(
@@ -14,6 +14,7 @@
 
 from __future__ import annotations
 
+import threading
 from unittest.mock import MagicMock
 
 import tornado.testing
@@ -22,7 +23,7 @@ from google.protobuf.json_format import MessageToDict
 from tornado.httputil import HTTPHeaders
 
 from streamlit.proto.openmetrics_data_model_pb2 import MetricSet as MetricSetProto
-from streamlit.runtime.stats import CacheStat
+from streamlit.runtime.stats import CacheCounter, CacheStat
 from streamlit.web.server.server import METRIC_ENDPOINT
 from streamlit.web.server.stats_request_handler import StatsRequestHandler
 
@@ -30,14 +31,20 @@ from streamlit.web.server.stats_request_handler import StatsRequestHandler
 class StatsHandlerTest(tornado.testing.AsyncHTTPTestCase):
     def get_app(self):
         self.mock_stats = []
-        mock_stats_manager = MagicMock()
-        mock_stats_manager.get_stats = MagicMock(side_effect=lambda: self.mock_stats)
+        self.mock_counters = []
+        self.mock_stats_manager = MagicMock()
+        self.mock_stats_manager.get_stats = MagicMock(
+            side_effect=lambda: self.mock_stats
+        )
+        self.mock_stats_manager.get_counters = MagicMock(
+            side_effect=lambda: self.mock_counters
+        )
         return tornado.web.Application(
             [
                 (
                     rf"/{METRIC_ENDPOINT}",
                     StatsRequestHandler,
-                    dict(stats_manager=mock_stats_manager),
+                    dict(stats_manager=self.mock_stats_manager),
                 )
             ]
         )
@@ -56,6 +63,23 @@ class StatsHandlerTest(tornado.testing.AsyncHTTPTestCase):
 
         self.assertEqual(expected_body, response.body)
 
+    def test_stats_are_gathered_once_off_the_event_loop(self):
+        """Stats and counters are gathered once per request, on a thread
+        other than the event loop's.
+        """
+        threads = []
+        self.mock_stats_manager.get_stats.side_effect = lambda: (
+            threads.append(threading.current_thread()) or self.mock_stats
+        )
+
+        response = self.fetch("/_stcore/metrics")
+        self.assertEqual(200, response.code)
+
+        self.mock_stats_manager.get_stats.assert_called_once()
+        self.mock_stats_manager.get_counters.assert_called_once()
+        self.assertEqual(1, len(threads))
+        self.assertIsNot(threading.current_thread(), threads[0])
+
     def test_deprecated_endpoint(self):
         response = self.fetch("/st-metrics")
 
@@ -97,6 +121,60 @@ class StatsHandlerTest(tornado.testing.AsyncHTTPTestCase):
 
         self.assertEqual(expected_body, response.body)
 
+    def test_has_counters(self):
+        self.mock_counters = [
+            CacheCounter("ForwardMessageCache", "", "misses", 2),
+            CacheCounter("ForwardMessageCache", "", "hits", 5),
+        ]
+
+        response = self.fetch("/_stcore/metrics")
+        self.assertEqual(200, response.code)
+
+        expected_body = (
+            b"# TYPE cache_memory_bytes gauge\n"
+            b"# UNIT cache_memory_bytes bytes\n"
+            b"# HELP Total memory consumed by a cache.\n"
+            b"# TYPE cache_hits counter\n"
+            b"# HELP Total number of hits of a cache.\n"
+            b'cache_hits_total{cache_type="ForwardMessageCache",cache=""} 5\n'
+            b"# TYPE cache_misses counter\n"
+            b"# HELP Total number of misses of a cache.\n"
+            b'cache_misses_total{cache_type="ForwardMessageCache",cache=""} 2\n'
+            b"# EOF\n"
+        )
+
+        self.assertEqual(expected_body, response.body)
+
+    def test_protobuf_counters(self):
+        """Counters are returned as COUNTER metric families in protobuf format."""
+        self.mock_counters = [CacheCounter("ForwardMessageCache", "", "hits", 5)]
+
+        response = self.fetch(
+            "/_stcore/metrics", headers={"Accept": "application/x-protobuf"}
+        )
+        self.assertEqual(200, response.code)
+
+        metric_set = MetricSetProto()
+        metric_set.ParseFromString(response.body)
+
+        self.assertEqual(
+            {
+                "name": "cache_hits",
+                "type": "COUNTER",
+                "help": "Total number of hits of a cache.",
+                "metrics": [
+                    {
+                        "labels": [
+                            {"name": "cache_type", "value": "ForwardMessageCache"},
+                            {"name": "cache"},
+                        ],
+                        "metricPoints": [{"counterValue": {"intValue": "5"}}],
+                    }
+                ],
+            },
+            MessageToDict(metric_set.metric_families[1]),
+        )
+
     def test_new_metrics_endpoint_should_not_display_deprecation_warning(self):
         response = self.fetch("/_stcore/metrics")
         self.assertNotIn("link", response.headers)
@@ -16,17 +16,27 @@
 
 from __future__ import annotations
 
+import os
+import tempfile
+import unittest
 from typing import NamedTuple
 
 import requests
 import tornado.testing
 import tornado.web
 import tornado.websocket
+from testfixtures import TempDirectory
 
 from streamlit.logger import get_logger
+from streamlit.runtime.disk_uploaded_file_manager import DiskUploadedFileManager
 from streamlit.runtime.memory_uploaded_file_manager import MemoryUploadedFileManager
+from streamlit.runtime.stats import CacheStat
 from streamlit.web.server.server import UPLOAD_FILE_ENDPOINT
-from streamlit.web.server.upload_file_request_handler import UploadFileRequestHandler
+from streamlit.web.server.upload_file_request_handler import (
+    StreamingUploadFileRequestHandler,
+    UploadFileRequestHandler,
+    _MultipartFileParser,
+)
 
 LOGGER = get_logger(__name__)
 
@@ -187,3 +197,166 @@ class UploadFileRequestHandlerInvalidSessionTest(tornado.testing.AsyncHTTPTestCa
         self.assertEqual(400, response.code)
         self.assertIn("Invalid session_id", response.reason)
         self.assertEqual(self.file_mgr.get_files("sessionId", ["fileId"]), [])
+
+
+class StreamingUploadFileRequestHandlerTest(tornado.testing.AsyncHTTPTestCase):
+    """Tests the /upload_file endpoint with a DiskUploadedFileManager."""
+
+    def get_app(self):
+        self.tempdir = TempDirectory(create=True)
+        self.file_mgr = DiskUploadedFileManager(
+            upload_endpoint=UPLOAD_FILE_ENDPOINT,
+            upload_dir=self.tempdir.path,
+            max_session_size=1000,
+        )
+        return tornado.web.Application(
+            [
+                (
+                    f"{UPLOAD_FILE_ENDPOINT}/(?P<session_id>[^/]+)/(?P<file_id>[^/]+)",
+                    StreamingUploadFileRequestHandler,
+                    dict(
+                        file_mgr=self.file_mgr,
+                        is_active_session=lambda session_id: session_id != "invalid",
+                    ),
+                ),
+            ]
+        )
+
+    def tearDown(self):
+        super().tearDown()
+        self.tempdir.cleanup()
+
+    def _upload_files(self, files_body, session_id, file_id):
+        req = requests.Request(
+            method="PUT",
+            url=self.get_url(f"{UPLOAD_FILE_ENDPOINT}/{session_id}/{file_id}"),
+            files=files_body,
+        ).prepare()
+
+        return self.fetch(
+            req.url,
+            method=req.method,
+            headers=req.headers,
+            body=req.body,
+        )
+
+    def test_upload_one_file(self):
+        """Uploaded files are written to disk and memory-mapped."""
+        response = self._upload_files(
+            {"file": ("image.png", b"1234", "image/png")},
+            session_id="session_id",
+            file_id="file_id",
+        )
+        self.assertEqual(204, response.code, response.reason)
+
+        (rec,) = self.file_mgr.get_files("session_id", ["file_id"])
+        self.assertEqual(("file_id", "image.png", "image/png"), rec[:3])
+        self.assertEqual(b"1234", rec.data[:])
+        self.assertEqual(1, len(os.listdir(self.tempdir.path)))
+
+        self.file_mgr.remove_file("session_id", "file_id")
+        self.assertEqual([], os.listdir(self.tempdir.path))
+        self.assertEqual(0, self.file_mgr._total_size)
+
+    def test_upload_stats(self):
+        """Streamed uploads are reported in the stats as disk usage."""
+        response = self._upload_files(
+            {"file": ("image.png", b"1234", "image/png")},
+            session_id="session_id",
+            file_id="file_id",
+        )
+        self.assertEqual(204, response.code, response.reason)
+
+        self.assertEqual(
+            [CacheStat("UploadedFileManager", "disk", 4)], self.file_mgr.get_stats()
+        )
+
+        self.file_mgr.remove_file("session_id", "file_id")
+        self.assertEqual([], self.file_mgr.get_stats())
+
+    def test_upload_multiple_files_error(self):
+        response = self._upload_files(
+            {"file1": ("file1", b"123"), "file2": ("file2", b"456")},
+            session_id="session_id",
+            file_id="file_id",
+        )
+        self.assertEqual(400, response.code)
+        self.assertIn("Expected 1 file, but got 2", response.reason)
+        self.assertEqual([], os.listdir(self.tempdir.path))
+        self.assertEqual(0, self.file_mgr._total_size)
+
+    def test_upload_missing_file_error(self):
+        response = self._upload_files(
+            {"file1": (None, b"123")}, session_id="session_id", file_id="file_id"
+        )
+        self.assertEqual(400, response.code)
+        self.assertIn("Expected 1 file, but got 0", response.reason)
+
+    def test_invalid_session(self):
+        response = self._upload_files(
+            {"file": ("file", b"123")}, session_id="invalid", file_id="file_id"
+        )
+        self.assertEqual(400, response.code)
+        self.assertIn("Invalid session_id", response.reason)
+        self.assertEqual([], os.listdir(self.tempdir.path))
+
+    def test_session_quota(self):
+        """Uploads that exceed the session quota are rejected, and the quota
+        includes previously uploaded files.
+        """
+        response = self._upload_files(
+            {"file": ("file", b"x" * 2000)}, session_id="session_id", file_id="big"
+        )
+        self.assertEqual(413, response.code)
+        self.assertEqual([], os.listdir(self.tempdir.path))
+        self.assertEqual(0, self.file_mgr._total_size)
+
+        response = self._upload_files(
+            {"file": ("file", b"x" * 600)}, session_id="session_id", file_id="file1"
+        )
+        self.assertEqual(204, response.code)
+        response = self._upload_files(
+            {"file": ("file", b"x" * 600)}, session_id="session_id", file_id="file2"
+        )
+        self.assertEqual(413, response.code)
+
+        # Other sessions have their own quota.
+        response = self._upload_files(
+            {"file": ("file", b"x" * 600)}, session_id="other_session", file_id="file"
+        )
+        self.assertEqual(204, response.code)
+
+
+class MultipartFileParserTest(unittest.TestCase):
+    def test_chunks_split_anywhere(self):
+        """Files are parsed correctly regardless of how the body is chunked."""
+        req = requests.Request(
+            method="PUT",
+            url="http://localhost/upload",
+            files={
+                "field": (None, b"value"),
+                "file": ("data.bin", b"\r\n--" + bytes(range(256)) * 4, "a/b"),
+            },
+        ).prepare()
+
+        tempdir = TempDirectory(create=True)
+        self.addCleanup(tempdir.cleanup)
+        boundary = req.headers["Content-Type"].split("boundary=")[1].encode()
+        for chunk_size in (1, 7, 64, len(req.body)):
+            parser = _MultipartFileParser(
+                boundary, lambda: tempfile.mkstemp(dir=tempdir.path)
+            )
+            for i in range(0, len(req.body), chunk_size):
+                parser.feed(req.body[i : i + chunk_size])
+            parser.close()
+
+            (part,) = parser.files
+            self.assertEqual(("data.bin", "a/b"), part[:2])
+            with open(part.path, "rb") as f:
+                self.assertEqual(b"\r\n--" + bytes(range(256)) * 4, f.read())
+
+    def test_incomplete_body(self):
+        parser = _MultipartFileParser(b"boundary", lambda: (0, ""))
+        parser.feed(b"--boundary\r\nContent-Disposition: form-data")
+        with self.assertRaises(ValueError):
+            parser.close()